@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark segmented downloads to tune download_segments / download_chunk_kb.
+
+Downloads one file from the configured storage (run `hei-datahub auth setup`
+first) with every combination of segment count and chunk size and prints
+the throughput of each. Pick a large file (hundreds of MB) for stable numbers.
+
+Usage:
+    python scripts/bench_download.py <remote-path> [--segments 1,2,4,8] [--chunk-kb 256,1024,4096] [--runs 2]
+"""
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from hei_datahub.services.segmented_download import SegmentedDownloader  # noqa: E402
+from hei_datahub.services.storage_manager import get_storage_backend  # noqa: E402
+
+
+def parse_list(value: str) -> list[int]:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("remote_path", help="File in the library, e.g. my-dataset/data.nc")
+    parser.add_argument("--segments", type=parse_list, default=[1, 2, 4, 8])
+    parser.add_argument("--chunk-kb", type=parse_list, default=[256, 1024, 4096])
+    parser.add_argument("--runs", type=int, default=2, help="Runs per combination (best is kept)")
+    args = parser.parse_args()
+
+    storage = get_storage_backend()
+    info = storage.probe(args.remote_path)
+    if info.size is None:
+        print("Error: server did not report a size for this file")
+        return 1
+    print(f"File: {args.remote_path} ({info.size / 1e6:.1f} MB, ranges: {'yes' if info.accepts_ranges else 'no'})")
+
+    results = []
+    workdir = Path(tempfile.mkdtemp(prefix="hei-bench-"))
+    try:
+        for segments in args.segments:
+            for chunk_kb in args.chunk_kb:
+                downloader = SegmentedDownloader(
+                    storage, segments=segments, chunk_size=chunk_kb * 1024, min_segment_size=1024 * 1024
+                )
+                best = None
+                for run in range(args.runs):
+                    target = workdir / f"run-{segments}-{chunk_kb}-{run}"
+                    start = time.monotonic()
+                    downloader.download(args.remote_path, target, info=info)
+                    elapsed = time.monotonic() - start
+                    target.unlink()
+                    best = elapsed if best is None else min(best, elapsed)
+
+                mb_per_s = info.size / best / 1e6
+                results.append((mb_per_s, segments, chunk_kb))
+                print(f"  segments={segments:<3} chunk={chunk_kb:>5} KB  {mb_per_s:8.1f} MB/s  ({best:.2f}s)")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    mb_per_s, segments, chunk_kb = max(results)
+    print(f"\nBest: {mb_per_s:.1f} MB/s. Suggested config.yaml settings:")
+    print("  storage:")
+    print(f"    download_segments: {segments}")
+    print(f"    download_chunk_kb: {chunk_kb}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
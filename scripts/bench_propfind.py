@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Benchmark directory listings on a synthetic multi-status response.
+
+A local HTTP server answers every PROPFIND with the same large Depth: 1
+body. Compares parsing the whole document at once (ET.fromstring plus eager
+date parsing per entry, as listings used to be parsed) with the storage
+backends' public listing API: listdir() and the streaming iter_listdir() of
+WebDAVStorage (requests) and PooledWebDAVStorage (asyncio). Reports total
+time, time until the first entry is available, and peak Python memory
+(tracemalloc) of each. No account or configuration needed.
+
+Usage:
+    python scripts/bench_propfind.py [--entries 50000] [--chunk-kb 64]
+"""
+import argparse
+import sys
+import threading
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from hei_datahub.services.async_webdav import PooledWebDAVStorage  # noqa: E402
+from hei_datahub.services.webdav_storage import WebDAVStorage  # noqa: E402
+
+LIBRARY = "bench-library"
+
+
+def build_multistatus(entries: int) -> bytes:
+    """Build a Depth: 1 multi-status body listing `entries` files and folders."""
+    date = formatdate(1700000000, usegmt=True)
+    parts = [
+        '<?xml version="1.0" encoding="utf-8"?>\n<d:multistatus xmlns:d="DAV:">',
+        f'<d:response><d:href>/seafdav/{LIBRARY}/</d:href><d:propstat><d:prop>'
+        f'<d:resourcetype><d:collection/></d:resourcetype><d:getetag>"root"</d:getetag>'
+        f'</d:prop><d:status>HTTP/1.1 200 OK</d:status></d:propstat></d:response>',
+    ]
+    for i in range(entries):
+        is_dir = i % 10 == 0
+        name = f"dataset-{i:06d}" if is_dir else f"file-{i:06d}.csv"
+        parts.append(
+            f'<d:response><d:href>/seafdav/{LIBRARY}/{name}{"/" if is_dir else ""}</d:href>'
+            f'<d:propstat><d:prop>'
+            f'<d:resourcetype>{"<d:collection/>" if is_dir else ""}</d:resourcetype>'
+            f'<d:getcontentlength>{0 if is_dir else i * 37}</d:getcontentlength>'
+            f'<d:getlastmodified>{date}</d:getlastmodified>'
+            f'<d:getcontenttype>{"httpd/unix-directory" if is_dir else "text/csv"}</d:getcontenttype>'
+            f'<d:getetag>"{i:x}"</d:getetag>'
+            f'</d:prop><d:status>HTTP/1.1 200 OK</d:status></d:propstat></d:response>'
+        )
+    parts.append("</d:multistatus>")
+    return "".join(parts).encode("utf-8")
+
+
+def parse_whole(body: bytes) -> tuple[list, float]:
+    """Parse the complete document at once, dates included (previous approach)."""
+    start = time.perf_counter()
+    root = ET.fromstring(body.decode("utf-8"))
+    ns = {"d": "DAV:"}
+    entries = []
+    for response in root.findall("d:response", ns):
+        href = response.findtext("d:href", namespaces=ns)
+        prop = response.find("d:propstat/d:prop", ns)
+        modified = prop.findtext("d:getlastmodified", namespaces=ns)
+        if modified:
+            modified = datetime.strptime(modified, "%a, %d %b %Y %H:%M:%S %Z")
+        entries.append((href, prop.findtext("d:getcontentlength", namespaces=ns), modified))
+    # Nothing is usable before the whole document is parsed
+    return entries[1:], time.perf_counter() - start
+
+
+class _ListingHandler(BaseHTTPRequestHandler):
+    """Answers every PROPFIND with the server's prebuilt multi-status body."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+    def do_PROPFIND(self) -> None:
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        body = self.server.body
+        self.send_response(207)
+        self.send_header("Content-Type", "application/xml; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        view = memoryview(body)
+        for offset in range(0, len(body), self.server.chunk_size):
+            self.wfile.write(view[offset:offset + self.server.chunk_size])
+
+
+def start_server(body: bytes, chunk_size: int) -> ThreadingHTTPServer:
+    """Serve the multi-status body on a free local port."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ListingHandler)
+    server.daemon_threads = True
+    server.body = body
+    server.chunk_size = chunk_size
+    threading.Thread(target=server.serve_forever, name="bench-propfind", daemon=True).start()
+    return server
+
+
+def list_streaming(storage) -> tuple[list, float]:
+    """Consume iter_listdir(), noting when the first entry is available."""
+    start = time.perf_counter()
+    first = None
+    entries = []
+    for entry in storage.iter_listdir(""):
+        if first is None:
+            first = time.perf_counter() - start
+        entries.append(entry)
+    return entries, first
+
+
+def list_whole(storage) -> tuple[list, float]:
+    """Call listdir(): nothing is returned before the listing is complete."""
+    start = time.perf_counter()
+    entries = storage.listdir("")
+    return entries, time.perf_counter() - start
+
+
+def measure(label: str, func, *args) -> None:
+    """Run a parser once for timing and once under tracemalloc, and print its numbers."""
+    start = time.perf_counter()
+    entries, first = func(*args)
+    elapsed = time.perf_counter() - start
+    del entries
+
+    # Tracing slows parsing down a lot, so memory gets its own run
+    tracemalloc.start()
+    entries, _ = func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"  {label:<28} {len(entries):>7} entries  total {elapsed * 1000:8.1f} ms  "
+        f"first entry {first * 1000:8.1f} ms  peak {peak / 1e6:7.1f} MB"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=50_000)
+    parser.add_argument("--chunk-kb", type=int, default=64, help="Size of the chunks the server writes")
+    args = parser.parse_args()
+
+    body = build_multistatus(args.entries)
+    print(f"Multi-status body: {args.entries} entries, {len(body) / 1e6:.1f} MB")
+    # The whole-document parser also needs the body in memory; the streaming one only a chunk
+    measure("whole document", parse_whole, body)
+
+    server = start_server(body, args.chunk_kb * 1024)
+    host, port = server.server_address[:2]
+    # Listings are never cached, so every run sends a PROPFIND
+    options = dict(
+        base_url=f"http://{host}:{port}/seafdav",
+        library=LIBRARY,
+        username="bench",
+        password="bench",
+        cache_ttl=0,
+        coalesce_window=0,
+    )
+    pooled = PooledWebDAVStorage(**options)
+    try:
+        for transport, storage in (("requests", WebDAVStorage(**options)), ("asyncio", pooled)):
+            measure(f"{transport} listdir()", list_whole, storage)
+            measure(f"{transport} iter_listdir()", list_streaming, storage)
+    finally:
+        pooled.close()
+        server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
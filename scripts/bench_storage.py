@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Benchmark the storage crawl path against the fake WebDAV server.
+
+Runs the app's own indexing code per transport on a synthetic library
+served by scripts/fake_webdav.py, with the network conditions given on the
+command line. Each transport gets a fresh index, metadata mirror and
+outbox in a temporary folder; the storage backend is handed to the code
+under test through storage_manager, as the app does.
+
+- full crawl: BackgroundIndexer._index_cloud_datasets() on an empty index
+  (no catalog manifest yet, so every metadata.yaml is fetched; the crawl
+  then publishes the manifest)
+- incremental sync: BackgroundIndexer._incremental_cloud_sync() with
+  nothing changed, then after changing some datasets on the server
+- manifest crawl: a full crawl by a second client with an empty index,
+  reading the manifest the first crawl published (the datasets changed
+  since are stale in it and fetched)
+- reindex: the `hei-datahub reindex` command (cli/data/reindex.py)
+- download: fetch a whole dataset folder with DatasetDownloader, then
+  again into a new folder, served from the blob cache
+
+The "filesystem" transport runs the same scenarios, without the cached
+download, on the library folder directly (FilesystemStorage, as for a
+locally mounted library) for comparison; it sees no network conditions.
+
+Each line reports wall time and the requests the server saw. No account or
+configuration needed.
+
+Usage:
+    python scripts/bench_storage.py [--datasets 300] [--latency-ms 20] [--bandwidth-kbps 0]
+        [--error-rate 0] [--changed 10] [--transport requests,asyncio,filesystem]
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import shutil
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from fake_webdav import DEFAULT_LIBRARY, DEFAULT_PASSWORD, Faults, build_library, start_fake_webdav  # noqa: E402
+
+from hei_datahub.cli.data.reindex import handle_reindex  # noqa: E402
+from hei_datahub.infra import db  # noqa: E402
+from hei_datahub.services import blob_cache, index_service, metadata_mirror, outbox, storage_manager  # noqa: E402
+from hei_datahub.services.blob_cache import BlobCache  # noqa: E402
+from hei_datahub.services.dataset_download import DatasetDownloader  # noqa: E402
+from hei_datahub.services.filesystem_storage import FilesystemStorage  # noqa: E402
+from hei_datahub.services.indexer import BackgroundIndexer  # noqa: E402
+from hei_datahub.services.request_scheduler import RequestScheduler, ScheduledStorage  # noqa: E402
+from hei_datahub.services.webdav_storage import WebDAVStorage  # noqa: E402
+
+# Listing cache TTL: every listing is expired by the time it is needed again
+LISTING_EXPIRED = 1e-6
+# Module globals replaced to point the app at the benchmark's storage and state
+PATCHED = (
+    (storage_manager, "get_storage_backend"),
+    (index_service, "_index_service"),
+    (metadata_mirror, "_metadata_mirror"),
+    (outbox, "_outbox"),
+    (blob_cache, "_blob_cache"),
+    (db, "DB_PATH"),
+)
+
+
+def parse_list(value: str) -> list[str]:
+    return [v.strip() for v in value.split(",") if v.strip()]
+
+
+def make_storage(transport: str, base_url: str, pool_size: int):
+    """
+    Storage backend for the fake server.
+
+    Sync passes run minutes apart, so cached listings are always expired
+    (and revalidated) and nothing is shared between requests.
+    """
+    options = dict(
+        base_url=base_url,
+        library=DEFAULT_LIBRARY,
+        username="bench",
+        password=DEFAULT_PASSWORD,
+        max_retries=3,
+        pool_size=pool_size,
+        cache_ttl=LISTING_EXPIRED,
+        coalesce_window=0,
+    )
+    if transport == "asyncio":
+        from hei_datahub.services.async_webdav import PooledWebDAVStorage
+
+        return PooledWebDAVStorage(**options)
+    return WebDAVStorage(**options)
+
+
+def install_storage(storage, pool_size: int) -> ScheduledStorage:
+    """Make a backend the app's storage, behind the request scheduler as storage_manager sets it up."""
+    scheduled = ScheduledStorage(storage, RequestScheduler(foreground_limit=pool_size))
+    # The reindex command asks for a fresh backend from the configuration
+    storage_manager.get_storage_backend = lambda force_reload=False: scheduled
+    return scheduled
+
+
+def new_client(state: Path) -> BackgroundIndexer:
+    """An indexer with an empty index, metadata mirror, outbox and blob cache under a state folder."""
+    state.mkdir(parents=True)
+    index_service._index_service = index_service.IndexService(state / "index.db")
+    metadata_mirror._metadata_mirror = metadata_mirror.MetadataMirror(state / "mirror")
+    outbox._outbox = outbox.Outbox(state / "outbox.json")
+    blob_cache._blob_cache = BlobCache(state / "blobs")
+    db.DB_PATH = state / "datasets.db"
+    return BackgroundIndexer()
+
+
+@contextlib.contextmanager
+def restored_globals():
+    """Put back the globals the benchmark replaces (it also runs inside test processes)."""
+    saved = [(module, name, getattr(module, name)) for module, name in PATCHED]
+    try:
+        yield
+    finally:
+        for module, name, value in saved:
+            setattr(module, name, value)
+
+
+def reindex() -> int:
+    """Run the reindex command quietly; returns its exit code."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return handle_reindex(argparse.Namespace())
+
+
+def report(label: str, elapsed: float, requests: Counter, extra: str = "") -> None:
+    """Print one result line."""
+    methods = ", ".join(
+        f"{method} {requests[method]}"
+        for method in ("PROPFIND", "GET", "HEAD", "PUT")
+        if requests[method]
+    )
+    errors = f", {requests['injected_errors']} injected errors" if requests["injected_errors"] else ""
+    print(f"  {label:<26} {elapsed * 1000:9.1f} ms  {methods}{errors}{extra}")
+
+
+def run_crawls(label: str, storage, args: argparse.Namespace, workdir: Path, stats: Counter, reset, change) -> str:
+    """
+    Run the crawl, sync and reindex scenarios with the app's indexing code.
+
+    Returns:
+        Name of a dataset to download
+    """
+    install_storage(storage, args.pool_size)
+    indexer = new_client(workdir / f"client-{label}")
+
+    reset()
+    start = time.perf_counter()
+    changes = asyncio.run(indexer._index_cloud_datasets())
+    datasets = sorted(indexer.index_service.get_all_paths())
+    report("full crawl", time.perf_counter() - start, stats, f"  ({changes} datasets)")
+
+    reset()
+    start = time.perf_counter()
+    changed, _ = asyncio.run(indexer._incremental_cloud_sync())
+    report("sync, nothing changed", time.perf_counter() - start, stats, f"  ({changed} changed)")
+
+    time.sleep(1)  # Folder mtimes have one-second resolution
+    for name in datasets[: args.changed]:
+        change(name, f"id: {name}\ndataset_name: Changed {time.time()}\n".encode())
+    reset()
+    start = time.perf_counter()
+    changed, _ = asyncio.run(indexer._incremental_cloud_sync())
+    report(f"sync, {args.changed} changed", time.perf_counter() - start, stats, f"  ({changed} changed)")
+
+    # A second client: the manifest from the first crawl predates the changes
+    indexer = new_client(workdir / f"client-{label}-2")
+    reset()
+    start = time.perf_counter()
+    changes = asyncio.run(indexer._index_cloud_datasets())
+    report(f"manifest crawl, {args.changed} stale", time.perf_counter() - start, stats, f"  ({changes} datasets)")
+
+    reset()
+    start = time.perf_counter()
+    code = reindex()
+    report("reindex command", time.perf_counter() - start, stats, f"  (exit code {code})")
+    return datasets[-1]
+
+
+def run(transport: str, server, args: argparse.Namespace, workdir: Path) -> None:
+    """Run all scenarios with one transport."""
+    print(f"\nTransport: {transport}")
+    storage = make_storage(transport, server.base_url, args.pool_size)
+    try:
+        dataset = run_crawls(
+            transport, storage, args, workdir, server.stats, server.reset_stats,
+            lambda name, data: server.write(f"{name}/metadata.yaml", data),
+        )
+
+        dest = workdir / "download" / transport
+        cache = BlobCache(workdir / f"blobs-{transport}")
+        downloader = DatasetDownloader(storage, connections=args.connections, cache=cache)
+        for label, target in (("download dataset", dest), ("download again, cached", dest.with_name(f"{transport}-again"))):
+            server.reset_stats()
+            start = time.perf_counter()
+            plan = downloader.plan(dataset, target)
+            stats = downloader.run(plan)
+            elapsed = time.perf_counter() - start
+            rate = stats.bytes_done / elapsed / 1e6 if elapsed else 0
+            report(label, elapsed, server.stats, f"  ({stats.files_done} files, {stats.files_cached} cached, {rate:.1f} MB/s)")
+    finally:
+        close = getattr(storage, "close", None)
+        if close is not None:
+            close()
+
+
+def run_filesystem(root: Path, args: argparse.Namespace, workdir: Path) -> None:
+    """Run the crawl, sync, reindex and download scenarios on a library folder without a server."""
+    print("\nTransport: filesystem")
+    storage = FilesystemStorage(str(root))
+    none = Counter()
+
+    def change(name: str, data: bytes) -> None:
+        new = workdir / "metadata.yaml"
+        new.write_bytes(data)
+        storage.upload(new, f"{name}/metadata.yaml")
+
+    dataset = run_crawls("filesystem", storage, args, workdir, none, none.clear, change)
+
+    downloader = DatasetDownloader(storage, connections=args.connections)
+    start = time.perf_counter()
+    stats = downloader.run(downloader.plan(dataset, workdir / "download" / "filesystem"))
+    elapsed = time.perf_counter() - start
+    rate = stats.bytes_done / elapsed / 1e6 if elapsed else 0
+    report("download dataset", elapsed, none, f"  ({stats.files_done} files, {rate:.1f} MB/s)")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--datasets", type=int, default=300)
+    parser.add_argument("--files", type=int, default=8, help="Data files per dataset")
+    parser.add_argument("--file-kb", type=int, default=1024)
+    parser.add_argument("--latency-ms", type=float, default=20, help="Added to every request")
+    parser.add_argument("--bandwidth-kbps", type=int, default=0, help="Per-request cap in KiB/s (0 = unlimited)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests failing with 503")
+    parser.add_argument("--changed", type=int, default=10, help="Datasets changed before the second sync")
+    parser.add_argument("--transport", type=parse_list, default=["requests", "asyncio", "filesystem"])
+    parser.add_argument("--pool-size", type=int, default=10)
+    parser.add_argument("--connections", type=int, default=6, help="Connection cap for the dataset download")
+    args = parser.parse_args()
+
+    faults = Faults(
+        latency=args.latency_ms / 1000,
+        bandwidth=args.bandwidth_kbps * 1024,
+        error_rate=args.error_rate,
+    )
+    workdir = Path(tempfile.mkdtemp(prefix="hei-bench-storage-"))
+    try:
+        library = workdir / "library"
+        library.mkdir()
+        print(f"Building library: {args.datasets} datasets x {args.files} files of {args.file_kb} KB")
+        build_library(library, args.datasets, args.files, args.file_kb * 1024)
+        print(
+            f"Network: {args.latency_ms:g} ms latency, "
+            f"{f'{args.bandwidth_kbps} KiB/s' if args.bandwidth_kbps else 'unlimited'} per request, "
+            f"{args.error_rate:.0%} errors"
+        )
+        with restored_globals():
+            for transport in args.transport:
+                # Every transport starts from the same library
+                root = workdir / f"library-{transport}"
+                shutil.copytree(library, root)
+                if transport == "filesystem":
+                    run_filesystem(root, args, workdir)
+                    continue
+                server = start_fake_webdav(root, faults=faults)
+                try:
+                    run(transport, server, args, workdir)
+                finally:
+                    server.shutdown()
+                    server.server_close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
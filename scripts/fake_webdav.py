@@ -0,0 +1,485 @@
+#!/usr/bin/env python3
+"""
+In-process fake WebDAV server serving a synthetic Heibox library.
+
+Stands in for SeafDAV so storage code (WebDAVStorage, PooledWebDAVStorage,
+the indexer, `hei-datahub reindex`) can be exercised and benchmarked without
+an account. The library lives in a local folder; the server implements what
+the storage backends use:
+
+- PROPFIND with Depth 0, 1 and infinity (ETags included)
+- GET/HEAD with Range and If-None-Match (304)
+- PUT with If-Match (* or an ETag) / If-None-Match, MKCOL, MOVE, DELETE
+
+Like Seafile, a folder's ETag and Last-Modified change whenever anything
+below it changes. Network conditions are injected per request (Faults):
+added latency, a bandwidth cap on response bodies, and errors (a random
+share of requests, or the next N).
+
+Importable (start_fake_webdav) or runnable on its own; point
+storage.base_url at the printed URL (any username, token "fake-token"):
+
+    python scripts/fake_webdav.py --datasets 500 --latency-ms 30 --port 8081
+"""
+import argparse
+import base64
+import hashlib
+import os
+import random
+import re
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional
+from urllib.parse import quote, unquote, urlparse
+from xml.sax.saxutils import escape
+
+DEFAULT_LIBRARY = "fake-library"
+DEFAULT_PASSWORD = "fake-token"
+# Synthetic files are dated this far back, so changes made during a run get a new mtime
+SYNTHETIC_AGE_SEC = 86400
+# Response bodies are written (and throttled) in pieces of this size
+WRITE_CHUNK_SIZE = 64 * 1024
+
+
+@dataclass
+class Faults:
+    """Network conditions applied to every request (change them while running)."""
+    latency: float = 0.0  # Seconds added before each response
+    bandwidth: int = 0  # Response body bytes per second per request (0 = unlimited)
+    error_rate: float = 0.0  # Share of requests answered with error_status
+    error_status: int = 503
+    fail_next: int = 0  # The next N requests fail with error_status
+
+
+def build_library(root: Path, datasets: int, files_per_dataset: int = 3, file_size: int = 64 * 1024) -> None:
+    """
+    Fill a folder with synthetic datasets (metadata.yaml plus data files).
+
+    Args:
+        root: Library folder (created if missing)
+        datasets: Number of dataset folders
+        files_per_dataset: Data files per dataset, under data/
+        file_size: Size of each data file in bytes
+    """
+    rng = random.Random(42)
+    stamp = time.time() - SYNTHETIC_AGE_SEC
+    payload = rng.randbytes(file_size) if file_size else b""
+    for i in range(datasets):
+        dataset = root / f"dataset-{i:05d}"
+        (dataset / "data").mkdir(parents=True, exist_ok=True)
+        (dataset / "metadata.yaml").write_text(
+            f"id: dataset-{i:05d}\n"
+            f"dataset_name: Synthetic dataset {i}\n"
+            f"description: Generated for storage benchmarks ({files_per_dataset} files)\n"
+            f"keywords: [synthetic, benchmark, group-{i % 10}]\n"
+            f"source: https://example.org/datasets/{i}\n"
+            f"date_created: '2024-01-01'\n",
+            encoding="utf-8",
+        )
+        for j in range(files_per_dataset):
+            (dataset / "data" / f"part-{j:03d}.bin").write_bytes(payload)
+        for path in (*dataset.rglob("*"), dataset):
+            os.utime(path, (stamp, stamp))
+    os.utime(root, (stamp, stamp))
+
+
+class FakeWebDAVServer(ThreadingHTTPServer):
+    """WebDAV server over a local folder, with fault injection and request counters."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        root: Path,
+        library: str = DEFAULT_LIBRARY,
+        password: str = DEFAULT_PASSWORD,
+        faults: Optional[Faults] = None,
+    ):
+        super().__init__(address, _Handler)
+        self.root = Path(root).resolve()
+        self.library = library
+        self.password = password
+        self.faults = faults or Faults()
+        self.prefix = f"/seafdav/{quote(library)}"
+        self.stats: Counter = Counter()
+        self.lock = threading.Lock()
+        self._rng = random.Random()
+
+    @property
+    def base_url(self) -> str:
+        """WebDAV base URL to configure as storage.base_url."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/seafdav"
+
+    def count(self, key: str, amount: int = 1) -> None:
+        """Add to a request counter."""
+        with self.lock:
+            self.stats[key] += amount
+
+    def reset_stats(self) -> None:
+        """Zero all request counters."""
+        with self.lock:
+            self.stats.clear()
+
+    def should_fail(self) -> bool:
+        """Decide whether the current request gets an injected error."""
+        with self.lock:
+            if self.faults.fail_next > 0:
+                self.faults.fail_next -= 1
+                return True
+            return self.faults.error_rate > 0 and self._rng.random() < self.faults.error_rate
+
+    def local_path(self, url_path: str) -> Optional[Path]:
+        """Local path of a request path, or None if it is outside the library."""
+        path = unquote(urlparse(url_path).path)
+        prefix = unquote(self.prefix)
+        if path != prefix and not path.startswith(f"{prefix}/"):
+            return None
+        local = (self.root / path[len(prefix):].strip("/")).resolve()
+        if local != self.root and self.root not in local.parents:
+            return None
+        return local
+
+    def href(self, local: Path) -> str:
+        """Request path of a local path (collections end with a slash)."""
+        relative = local.relative_to(self.root).as_posix()
+        href = self.prefix if relative == "." else f"{self.prefix}/{quote(relative)}"
+        return f"{href}/" if local.is_dir() else href
+
+    def write(self, relative_path: str, data: bytes) -> None:
+        """Change a file behind the clients' back (as another user would)."""
+        path = self.root / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+
+
+def _tree_state(folder: Path) -> tuple[str, float]:
+    """ETag and newest mtime of a folder tree (Seafile folders change with their content)."""
+    digest = hashlib.sha1()
+    newest = folder.stat().st_mtime
+    for dirpath, dirnames, filenames in os.walk(folder):
+        dirnames.sort()
+        for name in dirnames + sorted(filenames):
+            stat = os.stat(os.path.join(dirpath, name))
+            newest = max(newest, stat.st_mtime)
+            digest.update(f"{dirpath}/{name}:{stat.st_size}:{stat.st_mtime_ns}\n".encode("utf-8", "surrogateescape"))
+    return digest.hexdigest(), newest
+
+
+def _props(path: Path) -> tuple[str, float, int]:
+    """ETag, mtime and size of a file or folder."""
+    if path.is_dir():
+        etag, mtime = _tree_state(path)
+        return etag, mtime, 0
+    stat = path.stat()
+    return f"{stat.st_mtime_ns:x}-{stat.st_size:x}", stat.st_mtime, stat.st_size
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: FakeWebDAVServer
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+    def setup(self) -> None:
+        super().setup()
+        # Headers and body go out in separate writes; don't let Nagle hold the body back
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.server.count("connections")
+
+    # Plumbing
+
+    def _begin(self) -> Optional[Path]:
+        """Count, delay and authorize a request; returns its local path or None if answered."""
+        self.server.count(self.command)
+        faults = self.server.faults
+        if faults.latency > 0:
+            time.sleep(faults.latency)
+
+        if self.command in ("PUT", "PROPFIND", "MKCOL"):
+            body = self._read_body()
+        else:
+            body = None
+        self._body = body
+
+        if self.server.should_fail():
+            self.server.count("injected_errors")
+            self._send(faults.error_status, b"Injected failure")
+            return None
+        if not self._authorized():
+            self._send(401, b"Unauthorized", {"WWW-Authenticate": 'Basic realm="fake"'})
+            return None
+
+        local = self.server.local_path(self.path)
+        if local is None:
+            self._send(404, b"Not found")
+        return local
+
+    def _authorized(self) -> bool:
+        header = self.headers.get("Authorization", "")
+        if not header.startswith("Basic "):
+            return False
+        try:
+            _, _, password = base64.b64decode(header[6:]).decode("utf-8").partition(":")
+        except ValueError:
+            return False
+        return password == self.server.password
+
+    def _read_body(self) -> bytes:
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            parts = []
+            while True:
+                size = int(self.rfile.readline().split(b";")[0].strip() or b"0", 16)
+                if size == 0:
+                    self.rfile.readline()
+                    return b"".join(parts)
+                parts.append(self.rfile.read(size))
+                self.rfile.readline()
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _send(self, status: int, body: bytes = b"", headers: Optional[dict] = None) -> None:
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD" and body:
+            self._write(body)
+
+    def _write(self, data: bytes) -> None:
+        """Write response body bytes under the bandwidth cap."""
+        bandwidth = self.server.faults.bandwidth
+        start = time.monotonic()
+        sent = 0
+        for offset in range(0, len(data), WRITE_CHUNK_SIZE):
+            chunk = data[offset:offset + WRITE_CHUNK_SIZE]
+            self.wfile.write(chunk)
+            sent += len(chunk)
+            if bandwidth > 0:
+                ahead = sent / bandwidth - (time.monotonic() - start)
+                if ahead > 0:
+                    time.sleep(ahead)
+        self.server.count("bytes_sent", sent)
+
+    # Methods
+
+    def do_OPTIONS(self) -> None:
+        if self._begin() is not None:
+            self._send(200, headers={"DAV": "1, 2", "Allow": "OPTIONS, GET, HEAD, PUT, DELETE, PROPFIND, MKCOL, MOVE"})
+
+    def do_HEAD(self) -> None:
+        self.do_GET()
+
+    def do_GET(self) -> None:
+        local = self._begin()
+        if local is None:
+            return
+        if not local.exists():
+            return self._send(404, b"Not found")
+        if local.is_dir():
+            return self._send(200, b"", {"Content-Type": "text/html"})
+
+        etag, mtime, size = _props(local)
+        headers = {
+            "Accept-Ranges": "bytes",
+            "ETag": f'"{etag}"',
+            "Last-Modified": formatdate(mtime, usegmt=True),
+            "Content-Type": "application/octet-stream",
+        }
+        if self.headers.get("If-None-Match") == headers["ETag"]:
+            self.server.count("not_modified")
+            return self._send(304, b"", {"ETag": headers["ETag"]})
+        start, end = 0, size - 1
+        status = 200
+        requested = self.headers.get("Range")
+        if requested:
+            match = re.fullmatch(r"bytes=(\d+)-(\d*)", requested.strip())
+            if match is None or int(match.group(1)) >= size:
+                return self._send(416, b"", {"Content-Range": f"bytes */{size}"})
+            start = int(match.group(1))
+            end = min(int(match.group(2)), size - 1) if match.group(2) else size - 1
+            status = 206
+            headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(max(0, end - start + 1)))
+        self.end_headers()
+        if self.command == "HEAD":
+            return
+        with open(local, "rb") as f:
+            f.seek(start)
+            self._write(f.read(end - start + 1))
+
+    def do_PUT(self) -> None:
+        local = self._begin()
+        if local is None:
+            return
+        exists = local.exists()
+        if_match = self.headers.get("If-Match")
+        if if_match == "*" and not exists:
+            return self._send(412, b"Precondition failed")
+        if if_match not in (None, "*") and (not exists or if_match != f'"{_props(local)[0]}"'):
+            return self._send(412, b"Precondition failed")
+        if self.headers.get("If-None-Match") == "*" and exists:
+            return self._send(412, b"Precondition failed")
+        if local.is_dir():
+            return self._send(405, b"Is a collection")
+        if not local.parent.is_dir():
+            return self._send(409, b"Parent collection missing")
+        local.write_bytes(self._body)
+        self._send(204 if exists else 201, headers={"ETag": f'"{_props(local)[0]}"'})
+
+    def do_MKCOL(self) -> None:
+        local = self._begin()
+        if local is None:
+            return
+        if local.exists():
+            return self._send(405, b"Already exists")
+        if not local.parent.is_dir():
+            return self._send(409, b"Parent collection missing")
+        local.mkdir()
+        self._send(201)
+
+    def do_DELETE(self) -> None:
+        local = self._begin()
+        if local is None:
+            return
+        if not local.exists():
+            return self._send(404, b"Not found")
+        if local == self.server.root:
+            return self._send(403, b"Cannot delete the library")
+        if local.is_dir():
+            shutil.rmtree(local)
+        else:
+            local.unlink()
+        self._send(204)
+
+    def do_MOVE(self) -> None:
+        local = self._begin()
+        if local is None:
+            return
+        dest = self.server.local_path(self.headers.get("Destination", ""))
+        if dest is None or dest == self.server.root:
+            return self._send(400, b"Bad destination")
+        if not local.exists():
+            return self._send(404, b"Not found")
+        if not dest.parent.is_dir():
+            return self._send(409, b"Parent collection missing")
+
+        existed = dest.exists()
+        if existed:
+            if self.headers.get("Overwrite", "T").upper() == "F":
+                return self._send(412, b"Destination exists")
+            if dest.is_dir():
+                shutil.rmtree(dest)
+            else:
+                dest.unlink()
+        shutil.move(str(local), str(dest))
+        self._send(204 if existed else 201)
+
+    def do_PROPFIND(self) -> None:
+        local = self._begin()
+        if local is None:
+            return
+        if not local.exists():
+            return self._send(404, b"Not found")
+
+        depth = self.headers.get("Depth", "infinity").lower()
+        paths = [local]
+        if local.is_dir() and depth == "1":
+            paths += sorted(local.iterdir())
+        elif local.is_dir() and depth == "infinity":
+            paths += sorted(local.rglob("*"))
+        self.server.count("propfind_entries", len(paths))
+
+        parts = ['<?xml version="1.0" encoding="utf-8"?>\n<d:multistatus xmlns:d="DAV:">']
+        for path in paths:
+            etag, mtime, size = _props(path)
+            is_dir = path.is_dir()
+            parts.append(
+                f"<d:response><d:href>{escape(self.server.href(path))}</d:href><d:propstat><d:prop>"
+                f"<d:resourcetype>{'<d:collection/>' if is_dir else ''}</d:resourcetype>"
+                + ("" if is_dir else f"<d:getcontentlength>{size}</d:getcontentlength>")
+                + f"<d:getlastmodified>{formatdate(mtime, usegmt=True)}</d:getlastmodified>"
+                f"<d:getcontenttype>{'httpd/unix-directory' if is_dir else 'application/octet-stream'}</d:getcontenttype>"
+                f'<d:getetag>"{etag}"</d:getetag>'
+                "</d:prop><d:status>HTTP/1.1 200 OK</d:status></d:propstat></d:response>"
+            )
+        parts.append("</d:multistatus>")
+        self._send(207, "".join(parts).encode("utf-8"), {"Content-Type": "application/xml; charset=utf-8"})
+
+
+def start_fake_webdav(
+    root: Optional[Path] = None,
+    datasets: int = 100,
+    files_per_dataset: int = 3,
+    file_size: int = 64 * 1024,
+    faults: Optional[Faults] = None,
+    port: int = 0,
+) -> FakeWebDAVServer:
+    """
+    Start a fake WebDAV server in a background thread.
+
+    Args:
+        root: Library folder to serve (None = a new temporary folder with a synthetic library)
+        datasets: Datasets in the synthetic library
+        files_per_dataset: Data files per synthetic dataset
+        file_size: Size of each synthetic data file in bytes
+        faults: Injected network conditions
+        port: Port to listen on (0 = any free port)
+
+    Returns:
+        Running server (call shutdown() to stop it)
+    """
+    if root is None:
+        root = Path(tempfile.mkdtemp(prefix="hei-fake-webdav-"))
+        build_library(root, datasets, files_per_dataset, file_size)
+    server = FakeWebDAVServer(("127.0.0.1", port), root, faults=faults)
+    threading.Thread(target=server.serve_forever, name="fake-webdav", daemon=True).start()
+    return server
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--root", type=Path, help="Serve this folder instead of a synthetic library")
+    parser.add_argument("--datasets", type=int, default=100)
+    parser.add_argument("--files", type=int, default=3, help="Data files per dataset")
+    parser.add_argument("--file-kb", type=int, default=64)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--bandwidth-kbps", type=int, default=0, help="Per-request cap in KiB/s (0 = unlimited)")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--port", type=int, default=8081)
+    args = parser.parse_args()
+
+    faults = Faults(
+        latency=args.latency_ms / 1000,
+        bandwidth=args.bandwidth_kbps * 1024,
+        error_rate=args.error_rate,
+    )
+    server = start_fake_webdav(args.root, args.datasets, args.files, args.file_kb * 1024, faults, args.port)
+    print(f"Fake WebDAV on {server.base_url} (library {server.library}, token {server.password})")
+    print(f"Serving {server.root}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Minimal stand-in for the Seafile REST API, serving a local folder as a library.
+
+Implements the endpoints SeafileAPIStorage reads from:
+
+- GET /api2/auth/ping/                     token check ("pong")
+- GET /api2/repos/                         one library
+- GET /api2/repos/<id>/dir/?p=&oid=&recursive=1
+- GET /api2/repos/<id>/file/?p=&reuse=1    download link
+- GET /seafhttp/files/<token>/<name>       file content (Range supported)
+
+Folder oids are hashes of the folder's tree, so they change whenever
+anything below it changes, as in Seafile. Requests are counted per endpoint
+(StubServer.stats) for benchmarks. There is no WebDAV side: writes need a
+real server.
+
+Usage:
+    python scripts/seafile_stub.py ROOT [--library NAME] [--token TOKEN] [--port 8082]
+
+    Then point storage.base_url at http://127.0.0.1:8082/seafdav.
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+import uuid
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, quote, unquote, urlparse
+
+REPO_ID = "0f6d6b5e-5a0e-4d8e-9c3a-1a2b3c4d5e6f"
+
+
+def _object_id(*parts: object) -> str:
+    """40-character hex id, like Seafile's object ids."""
+    return hashlib.sha1("\0".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+
+
+class StubServer(ThreadingHTTPServer):
+    """HTTP server holding the library root and request counters."""
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], root: Path, library: str, token: str):
+        super().__init__(address, _Handler)
+        self.root = Path(root).resolve()
+        self.library = library
+        self.token = token
+        self.links: dict[str, Path] = {}
+        self.stats: Counter = Counter()
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        """Server URL (http://host:port)."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def resolve(self, repo_path: str) -> Path:
+        """Local path of a repo path, refusing anything outside the root."""
+        path = (self.root / repo_path.strip("/")).resolve()
+        if path != self.root and self.root not in path.parents:
+            raise FileNotFoundError(repo_path)
+        return path
+
+    def dirent(self, path: Path) -> dict:
+        """Seafile dirent for a local file or folder."""
+        stat = path.stat()
+        if path.is_dir():
+            return {"type": "dir", "id": self.tree_id(path), "name": path.name, "mtime": int(stat.st_mtime)}
+        return {
+            "type": "file",
+            "id": _object_id(path.relative_to(self.root), stat.st_size, stat.st_mtime_ns),
+            "name": path.name,
+            "mtime": int(stat.st_mtime),
+            "size": stat.st_size,
+        }
+
+    def tree_id(self, folder: Path) -> str:
+        """Folder oid: changes whenever anything below the folder changes."""
+        digest = hashlib.sha1()
+        for dirpath, dirnames, filenames in os.walk(folder):
+            dirnames.sort()
+            for name in sorted(filenames) + [f"{d}/" for d in dirnames]:
+                path = Path(dirpath) / name.rstrip("/")
+                stat = path.stat()
+                digest.update(f"{path.relative_to(folder)}:{name}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+        return digest.hexdigest()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: StubServer
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+    def _send_json(self, body: object, status: int = 200, headers: dict = None) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(data)
+
+    def _authorized(self) -> bool:
+        if self.headers.get("Authorization") == f"Token {self.server.token}":
+            return True
+        self._send_json({"detail": "Invalid token"}, 401)
+        return False
+
+    def do_HEAD(self) -> None:
+        self.do_GET()
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        path = url.path
+
+        if path.startswith("/seafhttp/files/"):
+            self._count("file-content")
+            return self._file_content(path)
+        if not self._authorized():
+            return
+        if path == "/api2/auth/ping/":
+            self._count("ping")
+            return self._send_json("pong")
+        if path == "/api2/repos/":
+            self._count("repos")
+            return self._send_json([{"id": REPO_ID, "name": self.server.library, "type": "repo", "permission": "rw"}])
+
+        match = re.fullmatch(rf"/api2/repos/{REPO_ID}/(dir|file)/", path)
+        if match is None:
+            return self._send_json({"error_msg": "Not found"}, 404)
+        self._count(match.group(1))
+        try:
+            local = self.server.resolve(query.get("p", "/"))
+            if match.group(1) == "dir":
+                return self._dir(local, query)
+            return self._file_link(local)
+        except FileNotFoundError:
+            return self._send_json({"error_msg": "Not found"}, 404)
+
+    def _count(self, endpoint: str) -> None:
+        with self.server.lock:
+            self.server.stats[endpoint] += 1
+
+    def _dir(self, folder: Path, query: dict) -> None:
+        if not folder.is_dir():
+            raise FileNotFoundError(folder)
+        oid = self.server.tree_id(folder)
+        headers = {"oid": oid}
+        if query.get("oid") == oid:
+            return self._send_json("uptodate", headers=headers)
+
+        if query.get("recursive") == "1":
+            items = []
+            for dirpath, dirnames, filenames in os.walk(folder):
+                dirnames.sort()
+                relative = Path(dirpath).relative_to(self.server.root).as_posix()
+                parent_dir = "/" if relative == "." else f"/{relative}/"
+                for name in dirnames + sorted(filenames):
+                    items.append(dict(self.server.dirent(Path(dirpath) / name), parent_dir=parent_dir))
+        else:
+            items = [self.server.dirent(child) for child in sorted(folder.iterdir())]
+        return self._send_json(items, headers=headers)
+
+    def _file_link(self, path: Path) -> None:
+        if not path.is_file():
+            raise FileNotFoundError(path)
+        token = uuid.uuid4().hex
+        with self.server.lock:
+            self.server.links[token] = path
+        self._send_json(f"{self.server.url}/seafhttp/files/{token}/{quote(path.name)}")
+
+    def _file_content(self, path: str) -> None:
+        token = path.split("/")[3]
+        local = self.server.links.get(token)
+        if local is None or not local.is_file() or unquote(path.rsplit("/", 1)[-1]) != local.name:
+            return self._send_json({"error_msg": "Bad access token"}, 403)
+
+        size = local.stat().st_size
+        start, end = 0, size - 1
+        ranged = re.fullmatch(r"bytes=(\d+)-(\d*)", self.headers.get("Range", ""))
+        if ranged:
+            start = int(ranged.group(1))
+            end = min(int(ranged.group(2)), size - 1) if ranged.group(2) else size - 1
+        length = max(0, end - start + 1)
+
+        self.send_response(206 if ranged else 200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(length))
+        self.send_header("Accept-Ranges", "bytes")
+        if ranged:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        self.end_headers()
+        if self.command == "HEAD":
+            return
+        with open(local, "rb") as f:
+            f.seek(start)
+            remaining = length
+            while remaining > 0:
+                chunk = f.read(min(remaining, 1024 * 1024))
+                if not chunk:
+                    break
+                self.wfile.write(chunk)
+                remaining -= len(chunk)
+
+
+def start_stub(root: Path, library: str = "stub-library", token: str = "stub-token", port: int = 0) -> StubServer:
+    """
+    Start the stub server in a background thread.
+
+    Args:
+        root: Local folder served as the library
+        library: Library name
+        token: Accepted API token
+        port: Port to listen on (0 = any free port)
+
+    Returns:
+        Running server (call shutdown() to stop it)
+    """
+    server = StubServer(("127.0.0.1", port), root, library, token)
+    threading.Thread(target=server.serve_forever, name="seafile-stub", daemon=True).start()
+    return server
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("root", type=Path, help="Folder served as the library")
+    parser.add_argument("--library", default="stub-library")
+    parser.add_argument("--token", default="stub-token")
+    parser.add_argument("--port", type=int, default=8082)
+    args = parser.parse_args()
+
+    if not args.root.is_dir():
+        print(f"Not a folder: {args.root}", file=sys.stderr)
+        return 1
+
+    server = StubServer(("127.0.0.1", args.port), args.root, args.library, args.token)
+    print(f"Seafile API stub for {args.root} on {server.url} (library {args.library}, token {args.token})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,9 +8,42 @@ Rules:
 - All handlers return int exit codes.
 
 Public API:
+- handle_cache_prune(args) -> int
+- handle_cache_stats(args) -> int
+- handle_outbox_discard(args) -> int
+- handle_outbox_list(args) -> int
+- handle_outbox_retry(args) -> int
+- handle_outbox_sync(args) -> int
+- handle_peek(args) -> int
+- handle_pull(args) -> int
+- handle_push(args) -> int
 - handle_reindex(args) -> int
+- handle_sync(args) -> int
 """
 
+from .cache import handle_cache_prune, handle_cache_stats
+from .outbox import (
+    handle_outbox_discard,
+    handle_outbox_list,
+    handle_outbox_retry,
+    handle_outbox_sync,
+)
+from .peek import handle_peek
+from .pull import handle_pull
+from .push import handle_push
 from .reindex import handle_reindex
+from .sync import handle_sync
 
-__all__ = ['handle_reindex']
+__all__ = [
+    'handle_cache_prune',
+    'handle_cache_stats',
+    'handle_outbox_discard',
+    'handle_outbox_list',
+    'handle_outbox_retry',
+    'handle_outbox_sync',
+    'handle_peek',
+    'handle_pull',
+    'handle_push',
+    'handle_reindex',
+    'handle_sync',
+]
@@ -0,0 +1,67 @@
+"""Blob cache commands: the local cache of downloaded files.
+
+Handlers return integer exit codes and avoid terminating the process.
+"""
+
+
+def handle_cache_stats(args) -> int:
+    """Handle the cache stats subcommand - shows size and hit counters of the blob cache.
+
+    Returns:
+        int: 0 on success, 1 if the cache could not be read
+    """
+    import sqlite3
+
+    from hei_datahub.services.blob_cache import get_blob_cache
+    from hei_datahub.services.dataset_download import format_bytes
+
+    cache = get_blob_cache()
+    try:
+        stats = cache.get_stats()
+    except (OSError, sqlite3.Error) as e:
+        print(f"❌ Could not read the blob cache: {e}")
+        return 1
+
+    print(f"Blob cache: {stats['path']}")
+    if not cache.enabled:
+        print("  Disabled (storage.blob_cache_mb is 0)")
+    budget = format_bytes(stats["max_bytes"]) if stats["max_bytes"] else "-"
+    print(f"  Size:        {format_bytes(stats['bytes'])} of {budget}")
+    print(f"  Files:       {stats['objects']} stored for {stats['entries']} remote paths")
+    print(f"  Hits:        {stats['hits']} copied without a request, "
+          f"{stats['revalidated']} confirmed unchanged (304)")
+    print(f"  Downloaded:  {stats['downloaded']} files added")
+    print(f"  Evicted:     {stats['evicted']} files")
+    print(f"  Saved:       {format_bytes(stats['bytes_saved'])} not downloaded again")
+    return 0
+
+
+def handle_cache_prune(args) -> int:
+    """Handle the cache prune subcommand - shrinks or empties the blob cache.
+
+    Flags:
+        --max-mb N: shrink to N MB instead of the configured budget
+        --all: remove every cached file
+
+    Returns:
+        int: 0 on success, 1 if the cache could not be pruned
+    """
+    import sqlite3
+
+    from hei_datahub.services.blob_cache import get_blob_cache
+    from hei_datahub.services.dataset_download import format_bytes
+
+    max_bytes = None
+    if getattr(args, "all", False):
+        max_bytes = 0
+    elif getattr(args, "max_mb", None) is not None:
+        max_bytes = max(0, args.max_mb) * 1024 * 1024
+
+    try:
+        removed, freed = get_blob_cache().prune(max_bytes)
+    except (OSError, sqlite3.Error) as e:
+        print(f"❌ Could not prune the blob cache: {e}")
+        return 1
+
+    print(f"✓ Removed {removed} cached files ({format_bytes(freed)})")
+    return 0
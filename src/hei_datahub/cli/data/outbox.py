@@ -0,0 +1,122 @@
+"""Outbox commands: dataset changes waiting to be sent to cloud storage.
+
+Handlers return integer exit codes and avoid terminating the process.
+"""
+
+
+def _print_ops(ops) -> None:
+    """Print queued operations, one per line."""
+    from datetime import datetime
+
+    for op in ops:
+        queued = datetime.fromtimestamp(op.created).strftime("%Y-%m-%d %H:%M")
+        status = op.status + (" (overwrite)" if op.force else "")
+        print(f"  {op.id}  {op.describe():<40} {status:<20} {op.attempts} tries  queued {queued}")
+        if op.last_error:
+            print(f"            last error: {op.last_error}")
+
+
+def handle_outbox_list(args) -> int:
+    """Handle the outbox list subcommand - shows queued dataset changes.
+
+    Returns:
+        int: 0 if the outbox is empty, 1 if changes are waiting
+    """
+    from hei_datahub.services.outbox import get_outbox
+    from hei_datahub.services.webdav_storage import StorageError
+
+    try:
+        ops = get_outbox().pending()
+    except StorageError as e:
+        print(f"❌ {e}")
+        return 1
+
+    if not ops:
+        print("✓ No pending changes: everything is saved to cloud storage")
+        return 0
+
+    print(f"{len(ops)} pending change(s):")
+    _print_ops(ops)
+    return 1
+
+
+def handle_outbox_sync(args) -> int:
+    """Handle the outbox sync subcommand - sends queued changes now, skipping backoff.
+
+    Returns:
+        int: 0 if the outbox is empty afterwards, 1 otherwise
+    """
+    from hei_datahub.services.outbox import get_outbox
+    from hei_datahub.services.webdav_storage import StorageError
+
+    outbox = get_outbox()
+    try:
+        outbox.retry()
+        counts = outbox.flush()
+    except StorageError as e:
+        print(f"❌ Could not send pending changes: {e}")
+        return 1
+
+    print(f"✓ Sent {counts['applied']} change(s)")
+    if counts["conflict"]:
+        print(f"  ⚠ {counts['conflict']} conflict(s) with changes made on the server")
+    if counts["remaining"]:
+        print(f"  {counts['remaining']} change(s) still pending:")
+        _print_ops(outbox.pending())
+        print("  Resolve conflicts with 'hei-datahub outbox retry --force ID' or 'hei-datahub outbox discard ID'")
+        return 1
+    return 0
+
+
+def handle_outbox_retry(args) -> int:
+    """Handle the outbox retry subcommand - retries one queued change now.
+
+    Flags:
+        --force: overwrite conflicting changes made on the server
+
+    Returns:
+        int: 0 if the change was sent, 1 otherwise
+    """
+    from hei_datahub.services.outbox import get_outbox
+    from hei_datahub.services.webdav_storage import StorageError
+
+    outbox = get_outbox()
+    try:
+        if not outbox.retry(args.op_id, force=getattr(args, "force", False)):
+            print(f"❌ No pending change with id {args.op_id}")
+            return 1
+        outbox.flush()
+        still_pending = [op for op in outbox.pending() if op.id == args.op_id]
+    except StorageError as e:
+        print(f"❌ Could not send change: {e}")
+        return 1
+
+    if still_pending:
+        print(f"❌ Change {args.op_id} is still pending:")
+        _print_ops(still_pending)
+        return 1
+    print(f"✓ Change {args.op_id} sent")
+    return 0
+
+
+def handle_outbox_discard(args) -> int:
+    """Handle the outbox discard subcommand - drops a queued change without sending it.
+
+    Returns:
+        int: 0 if the change was dropped, 1 if there is no such change
+    """
+    from hei_datahub.services.outbox import get_outbox
+    from hei_datahub.services.webdav_storage import StorageError
+
+    try:
+        op = get_outbox().discard(args.op_id)
+    except StorageError as e:
+        print(f"❌ {e}")
+        return 1
+
+    if op is None:
+        print(f"❌ No pending change with id {args.op_id}")
+        return 1
+    print(f"✓ Discarded: {op.describe()}")
+    print("  The next sync brings back the server's version ('hei-datahub sync')")
+    return 0
@@ -0,0 +1,59 @@
+"""Dataset file preview command.
+
+Handlers return integer exit codes and avoid terminating the process.
+"""
+
+
+def handle_peek(args) -> int:
+    """Handle the peek subcommand - previews a file without downloading it.
+
+    Reads only the start of the file (and the footer of Parquet files) with
+    Range requests, through the blob cache, and prints a head-of-table view
+    or the header and variables it finds. Given a dataset folder, lists its
+    files instead.
+
+    Flags:
+        --kb N: KB to read from the start of the file (default: storage.peek_kb)
+        --rows N: table rows or text lines to show
+
+    Returns:
+        int: 0 on success, 1 if the file could not be read
+    """
+    from hei_datahub.services.dataset_download import format_bytes
+    from hei_datahub.services.file_preview import format_preview, list_files, peek_file
+    from hei_datahub.services.storage_manager import get_storage_backend
+    from hei_datahub.services.webdav_storage import RangeNotSupportedError, StorageError
+
+    path = args.path.strip("/")
+    try:
+        storage = get_storage_backend()
+        entry = storage.get_info(path)
+        if entry is None:
+            print(f"❌ '{path}' does not exist")
+            return 1
+
+        if entry.is_dir:
+            files = list_files(storage, path)
+            if not files:
+                print(f"❌ '{path}' has no files to preview")
+                return 1
+            print(f"Files in {path} (run `hei-datahub peek <path>` on one of them):")
+            for file in files:
+                size = format_bytes(file.size) if file.size is not None else "-"
+                print(f"  {size:>10}  {file.path.strip('/')}")
+            return 0
+
+        preview = peek_file(storage, path, head_kb=getattr(args, "kb", None), rows=getattr(args, "rows", 20))
+    except RangeNotSupportedError:
+        print(f"❌ The server does not support partial downloads and '{path}' is too large to preview")
+        return 1
+    except StorageError as e:
+        print(f"❌ Could not read '{path}': {e}")
+        return 1
+
+    size = format_bytes(preview.size) if preview.size is not None else "unknown size"
+    read = "whole file" if preview.complete else f"{format_bytes(preview.bytes_read)} read"
+    print(f"{path} ({size}, {read})")
+    for line in format_preview(preview):
+        print(f"  {line}" if line else "")
+    return 0
@@ -0,0 +1,78 @@
+"""Dataset download command.
+
+Handlers return integer exit codes and avoid terminating the process.
+"""
+
+
+def handle_pull(args) -> int:
+    """Handle the pull subcommand - downloads a whole dataset folder.
+
+    Lists the dataset recursively, skips files whose local copy already has
+    the remote size and mtime, copies unchanged files from the local blob
+    cache, and downloads the rest in parallel. Re-running
+    after an interruption resumes partially downloaded files.
+
+    Returns:
+        int: 0 on success, 1 if the dataset could not be listed or any file failed
+    """
+    import sys
+    from pathlib import Path
+
+    from hei_datahub.services.dataset_download import (
+        create_dataset_downloader,
+        format_bytes,
+        format_progress,
+    )
+    from hei_datahub.services.segmented_download import DownloadCancelledError
+    from hei_datahub.services.webdav_storage import StorageError
+
+    dataset_id = args.dataset_id.strip("/")
+    dest = Path(args.dest).expanduser()
+
+    try:
+        downloader = create_dataset_downloader(connections=getattr(args, "jobs", None))
+        print(f"Listing {dataset_id}...")
+        plan = downloader.plan(dataset_id, dest)
+    except StorageError as e:
+        print(f"❌ Could not list dataset '{dataset_id}': {e}")
+        return 1
+
+    if not plan.transfers and not plan.skipped:
+        print(f"❌ Dataset '{dataset_id}' is empty or does not exist")
+        return 1
+
+    print(f"  {len(plan.transfers)} files to download ({format_bytes(plan.total_bytes)}), "
+          f"{len(plan.skipped)} already up to date")
+    if not plan.transfers:
+        print(f"✓ {dest} is up to date")
+        return 0
+
+    interactive = sys.stdout.isatty()
+
+    def on_progress(stats) -> None:
+        if interactive:
+            print(f"\r  {format_progress(stats)}\033[K", end="", flush=True)
+
+    try:
+        stats = downloader.run(plan, on_progress=on_progress)
+    except KeyboardInterrupt:
+        print("\nDownload interrupted; run the same command again to resume.")
+        return 1
+    except DownloadCancelledError:
+        print("\nDownload cancelled; run the same command again to resume.")
+        return 1
+    if interactive:
+        print()
+
+    for error in stats.errors:
+        print(f"  ⚠ {error}")
+    rate = format_bytes(stats.bytes_done / stats.elapsed_sec) if stats.elapsed_sec > 0 else "-"
+    if stats.files_failed:
+        print(f"❌ {stats.files_failed} of {stats.files_total} files failed "
+              f"(re-run to retry; completed files are skipped)")
+        return 1
+
+    cached = f", {stats.files_cached} from local cache" if stats.files_cached else ""
+    print(f"✓ Downloaded {stats.files_done} files ({format_bytes(stats.bytes_done)}{cached}) "
+          f"to {dest} in {stats.elapsed_sec:.1f}s ({rate}/s)")
+    return 0
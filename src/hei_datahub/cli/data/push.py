@@ -0,0 +1,62 @@
+"""Dataset upload command.
+
+Handlers return integer exit codes and avoid terminating the process.
+"""
+
+
+def handle_push(args) -> int:
+    """Handle the push subcommand - uploads a local folder into a dataset folder.
+
+    Creates the remote folders up front and uploads files in parallel,
+    streaming each file once. Existing remote files are overwritten.
+
+    Returns:
+        int: 0 on success, 1 if the folder is missing or any file failed
+    """
+    import sys
+    from pathlib import Path
+
+    from hei_datahub.services.dataset_download import format_bytes
+    from hei_datahub.services.dataset_upload import DEFAULT_CONNECTIONS, upload_tree
+    from hei_datahub.services.storage_manager import get_storage_backend
+    from hei_datahub.services.webdav_storage import StorageError
+
+    source = Path(args.source).expanduser()
+    dataset_id = args.dataset_id.strip("/")
+    if not source.is_dir():
+        print(f"❌ Not a folder: {source}")
+        return 1
+
+    interactive = sys.stdout.isatty()
+
+    def on_progress(sent: int, total: int) -> None:
+        if interactive:
+            percent = sent * 100 // total if total else 100
+            print(f"\r  {format_bytes(sent)} / {format_bytes(total)} ({percent}%)\033[K", end="", flush=True)
+
+    print(f"Uploading {source} to {dataset_id}...")
+    try:
+        result = upload_tree(
+            get_storage_backend(),
+            source,
+            dataset_id,
+            progress=on_progress,
+            connections=getattr(args, "jobs", None) or DEFAULT_CONNECTIONS,
+        )
+    except StorageError as e:
+        print(f"\n❌ Upload failed: {e}")
+        return 1
+    except KeyboardInterrupt:
+        print("\nUpload interrupted.")
+        return 1
+    if interactive:
+        print()
+
+    for error in result.errors:
+        print(f"  ⚠ {error}")
+    if result.errors:
+        print(f"❌ {len(result.errors)} files failed to upload")
+        return 1
+
+    print(f"✓ Uploaded {result.files_uploaded} files ({format_bytes(result.bytes_uploaded)}) to {dataset_id}")
+    return 0
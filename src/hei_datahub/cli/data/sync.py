@@ -0,0 +1,132 @@
+"""Index sync command.
+
+Handlers return integer exit codes and avoid terminating the process.
+"""
+
+
+def handle_sync(args) -> int:
+    """Handle the sync subcommand - brings the search index up to date now.
+
+    Without flags, runs one incremental sync (or a full crawl if the index
+    is empty), or asks the sync daemon to do it if one is running. The
+    result is persisted in the index, so a running TUI sees the fresh sync
+    time and pushes its own next scheduled sync back instead of repeating it.
+
+    Flags:
+        --daemon: run the headless sync daemon in the foreground
+        --status: show the running daemon's status
+        --stop: stop the running daemon
+
+    Returns:
+        int: 0 on success, 1 if the sync failed
+    """
+    if getattr(args, "daemon", False):
+        return _run_daemon()
+    if getattr(args, "status", False):
+        return _daemon_status()
+    if getattr(args, "stop", False):
+        return _stop_daemon()
+
+    from hei_datahub.services.sync_daemon import send_command
+
+    if send_command("sync") is not None:
+        print("✓ Sync requested from the running sync daemon")
+        return 0
+
+    return _sync_once()
+
+
+def _sync_once() -> int:
+    """Run a single sync pass in this process."""
+    import asyncio
+
+    from hei_datahub.services.index_events import SyncFinished, get_event_bus
+    from hei_datahub.services.indexer import get_indexer
+
+    print("Syncing search index with cloud storage...")
+
+    outcome: list[SyncFinished] = []
+
+    def _on_event(event) -> None:
+        if isinstance(event, SyncFinished):
+            outcome.append(event)
+
+    bus = get_event_bus()
+    bus.subscribe(_on_event)
+    try:
+        status = asyncio.run(get_indexer().sync_once())
+    except KeyboardInterrupt:
+        print("\nSync cancelled.")
+        return 1
+    finally:
+        bus.unsubscribe(_on_event)
+
+    result = outcome[-1] if outcome else None
+    if result is not None and result.error:
+        print(f"❌ Sync failed: {result.error}")
+        return 1
+
+    changed = result.changed if result else 0
+    removed = result.removed if result else 0
+    print(f"✓ Index up to date: {status['total_items']} datasets "
+          f"({changed} updated, {removed} removed)")
+    print(f"  Next background sync in ~{status['scheduler']['interval_sec'] // 60} min")
+    return 0
+
+
+def _run_daemon() -> int:
+    """Run the headless sync daemon until stopped."""
+    from hei_datahub.app.runtime import setup_logging
+    from hei_datahub.services.sync_daemon import PID_FILE, SOCKET_PATH, is_supported, run_daemon
+
+    if not is_supported():
+        print("❌ The sync daemon needs Unix sockets and is not available on this platform.")
+        return 1
+
+    setup_logging()
+    print(f"Starting sync daemon (pid file: {PID_FILE})")
+    print(f"  Status socket: {SOCKET_PATH}")
+    print("  Stop with Ctrl+C or 'hei-datahub sync --stop'")
+
+    try:
+        if not run_daemon():
+            print("❌ A sync daemon is already running ('hei-datahub sync --status' for details)")
+            return 1
+    except OSError as e:
+        print(f"❌ Sync daemon failed: {e}")
+        return 1
+
+    print("✓ Sync daemon stopped")
+    return 0
+
+
+def _daemon_status() -> int:
+    """Print the running daemon's status."""
+    from hei_datahub.services.sync_daemon import send_command
+
+    status = send_command("status")
+    if status is None:
+        print("Sync daemon is not running")
+        return 1
+
+    scheduler = status.get("scheduler", {})
+    print(f"✓ Sync daemon running (pid {status.get('pid')})")
+    print(f"  Datasets indexed: {status.get('total_items')}")
+    print(f"  Synced this session: {'yes' if status.get('synced') else 'not yet'}")
+    print(f"  Sync interval: {scheduler.get('interval_sec', 0) // 60} min, "
+          f"next sync in {scheduler.get('next_sync_in_sec', 0)}s")
+    if scheduler.get("error_count"):
+        print(f"  ⚠ Consecutive sync failures: {scheduler['error_count']}")
+    return 0
+
+
+def _stop_daemon() -> int:
+    """Ask the running daemon to shut down."""
+    from hei_datahub.services.sync_daemon import send_command
+
+    if send_command("stop") is None:
+        print("Sync daemon is not running")
+        return 1
+
+    print("✓ Sync daemon is stopping")
+    return 0
@@ -15,7 +15,19 @@ from hei_datahub.cli.auth import (
 from hei_datahub.cli.config import handle_keymap_export, handle_keymap_import
 
 # Import handlers from organized modules
-from hei_datahub.cli.data import handle_reindex
+from hei_datahub.cli.data import (
+    handle_cache_prune,
+    handle_cache_stats,
+    handle_outbox_discard,
+    handle_outbox_list,
+    handle_outbox_retry,
+    handle_outbox_sync,
+    handle_peek,
+    handle_pull,
+    handle_push,
+    handle_reindex,
+    handle_sync,
+)
 from hei_datahub.cli.desktop import handle_setup_desktop, handle_uninstall
 from hei_datahub.cli.system import handle_doctor, handle_paths, handle_tui
 from hei_datahub.cli.update import handle_update
@@ -66,6 +78,171 @@ def main():
     )
     parser_reindex.set_defaults(func=handle_reindex)
 
+    # Sync command
+    parser_sync = subparsers.add_parser(
+        "sync",
+        help="Sync the search index with cloud storage now"
+    )
+    sync_mode = parser_sync.add_mutually_exclusive_group()
+    sync_mode.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Run headless and keep the index fresh for all open TUIs"
+    )
+    sync_mode.add_argument(
+        "--status",
+        action="store_true",
+        help="Show the status of the running sync daemon"
+    )
+    sync_mode.add_argument(
+        "--stop",
+        action="store_true",
+        help="Stop the running sync daemon"
+    )
+    parser_sync.set_defaults(func=handle_sync)
+
+    # Pull command
+    parser_pull = subparsers.add_parser(
+        "pull",
+        help="Download a whole dataset folder (resumes and skips up-to-date files)"
+    )
+    parser_pull.add_argument(
+        "dataset_id",
+        help="Dataset folder in the library"
+    )
+    parser_pull.add_argument(
+        "dest",
+        help="Local folder to download into"
+    )
+    parser_pull.add_argument(
+        "-j", "--jobs",
+        type=int,
+        metavar="N",
+        help="Maximum parallel connections (default: storage.download_connections)"
+    )
+    parser_pull.set_defaults(func=handle_pull)
+
+    # Peek command
+    parser_peek = subparsers.add_parser(
+        "peek",
+        help="Preview a dataset file from its first bytes, without downloading it"
+    )
+    parser_peek.add_argument(
+        "path",
+        help="File in the library (e.g. my-dataset/data.csv); a dataset folder lists its files"
+    )
+    parser_peek.add_argument(
+        "--kb",
+        type=int,
+        metavar="N",
+        help="KB to read from the start of the file (default: storage.peek_kb)"
+    )
+    parser_peek.add_argument(
+        "--rows",
+        type=int,
+        default=20,
+        metavar="N",
+        help="Table rows or text lines to show (default: 20)"
+    )
+    parser_peek.set_defaults(func=handle_peek)
+
+    # Push command
+    parser_push = subparsers.add_parser(
+        "push",
+        help="Upload a local folder into a dataset folder"
+    )
+    parser_push.add_argument(
+        "source",
+        help="Local folder with the files to upload"
+    )
+    parser_push.add_argument(
+        "dataset_id",
+        help="Dataset folder in the library"
+    )
+    parser_push.add_argument(
+        "-j", "--jobs",
+        type=int,
+        metavar="N",
+        help="Files uploaded in parallel (default: 4)"
+    )
+    parser_push.set_defaults(func=handle_push)
+
+    # Outbox commands
+    parser_outbox = subparsers.add_parser(
+        "outbox",
+        help="Show and send dataset changes waiting for cloud storage"
+    )
+    parser_outbox.set_defaults(func=handle_outbox_list)
+    outbox_subparsers = parser_outbox.add_subparsers(dest="outbox_command")
+
+    parser_outbox_list = outbox_subparsers.add_parser(
+        "list",
+        help="List pending changes (default)"
+    )
+    parser_outbox_list.set_defaults(func=handle_outbox_list)
+
+    parser_outbox_sync = outbox_subparsers.add_parser(
+        "sync",
+        help="Send all pending changes now"
+    )
+    parser_outbox_sync.set_defaults(func=handle_outbox_sync)
+
+    parser_outbox_retry = outbox_subparsers.add_parser(
+        "retry",
+        help="Retry one pending change now"
+    )
+    parser_outbox_retry.add_argument(
+        "op_id",
+        help="Change id (from 'hei-datahub outbox list')"
+    )
+    parser_outbox_retry.add_argument(
+        "--force",
+        action="store_true",
+        help="Overwrite conflicting changes made on the server"
+    )
+    parser_outbox_retry.set_defaults(func=handle_outbox_retry)
+
+    parser_outbox_discard = outbox_subparsers.add_parser(
+        "discard",
+        help="Drop a pending change without sending it"
+    )
+    parser_outbox_discard.add_argument(
+        "op_id",
+        help="Change id (from 'hei-datahub outbox list')"
+    )
+    parser_outbox_discard.set_defaults(func=handle_outbox_discard)
+
+    # Blob cache commands
+    parser_cache = subparsers.add_parser(
+        "cache",
+        help="Show or prune the local cache of downloaded files"
+    )
+    parser_cache.set_defaults(func=handle_cache_stats)
+    cache_subparsers = parser_cache.add_subparsers(dest="cache_command")
+
+    parser_cache_stats = cache_subparsers.add_parser(
+        "stats",
+        help="Show cache size and hit counters (default)"
+    )
+    parser_cache_stats.set_defaults(func=handle_cache_stats)
+
+    parser_cache_prune = cache_subparsers.add_parser(
+        "prune",
+        help="Shrink the cache to its size budget"
+    )
+    parser_cache_prune.add_argument(
+        "--max-mb",
+        type=int,
+        default=None,
+        help="Shrink to this many MB instead of storage.blob_cache_mb"
+    )
+    parser_cache_prune.add_argument(
+        "--all",
+        action="store_true",
+        help="Remove every cached file"
+    )
+    parser_cache_prune.set_defaults(func=handle_cache_prune)
+
     # Doctor diagnostic command
     parser_doctor = subparsers.add_parser(
         "doctor",
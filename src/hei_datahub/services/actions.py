@@ -145,6 +145,22 @@ class ActionRegistry:
             default_keys=["d"]
         ))
 
+        self.register(Action(
+            id="download_all",
+            label="Download Dataset",
+            description="Download all files of the current dataset",
+            contexts=[ActionContext.DETAILS],
+            default_keys=["D"]
+        ))
+
+        self.register(Action(
+            id="preview_files",
+            label="Preview Files",
+            description="Preview dataset files without downloading them",
+            contexts=[ActionContext.DETAILS],
+            default_keys=["p"]
+        ))
+
         self.register(Action(
             id="copy_source",
             label="Copy Source URL",
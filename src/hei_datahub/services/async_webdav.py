@@ -0,0 +1,1134 @@
+"""
+asyncio-native WebDAV client with HTTP/1.1 keep-alive connection pooling.
+
+AsyncWebDAVStorage offers the WebDAVStorage surface (listdir, get_info,
+download, upload, mkdir, move, exists, delete) as coroutines built on
+asyncio streams, so many requests can be in flight over a bounded pool of
+reused connections instead of one thread per call. PooledWebDAVStorage is a
+thin blocking wrapper that runs the client on a private event loop for the
+existing synchronous callers.
+
+Selected with `storage.transport: asyncio`; the pool size comes from
+`storage.pool_size`.
+"""
+import asyncio
+import base64
+import logging
+import ssl
+import threading
+from collections.abc import AsyncIterator, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Optional
+from urllib.parse import quote, urlparse
+
+from hei_datahub.services.single_flight import AsyncSingleFlight
+from hei_datahub.services.webdav_storage import (
+    ETAG_PROPFIND_BODY,
+    PROPFIND_BODY,
+    SHARED_DOWNLOAD_MAX_BYTES,
+    FileEntry,
+    ListingCache,
+    PropfindParser,
+    RangeNotSupportedError,
+    RemoteFileInfo,
+    StorageAuthError,
+    StorageConnectionError,
+    StorageError,
+    StorageNotFoundError,
+    StoragePreconditionError,
+    _listing_order,
+    _mask_auth,
+    collection_paths,
+    parse_collection_etag,
+)
+
+logger = logging.getLogger(__name__)
+
+# Same retry semantics as the requests backend (urllib3 Retry)
+RETRY_STATUSES = frozenset({500, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({"HEAD", "GET", "OPTIONS", "PROPFIND"})
+RETRY_BACKOFF_FACTOR = 0.5
+
+STREAM_CHUNK_SIZE = 64 * 1024
+USER_AGENT = "hei-datahub"
+
+
+class _StaleConnectionError(Exception):
+    """A reused keep-alive connection was closed by the server before replying."""
+
+
+@dataclass
+class _Response:
+    """A fully read HTTP response."""
+    status: int
+    headers: dict[str, str] = field(default_factory=dict)
+    body: bytes = b""
+
+
+class _Connection:
+    """One HTTP/1.1 connection from the pool."""
+
+    __slots__ = ("reader", "writer", "reused")
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.reused = False
+
+    def is_usable(self) -> bool:
+        """Check whether the connection can carry another request."""
+        return not self.writer.is_closing() and not self.reader.at_eof()
+
+    def close(self) -> None:
+        """Close the underlying transport."""
+        self.writer.close()
+
+
+class ConnectionPool:
+    """Keep-alive connections to one origin, at most `size` open at a time."""
+
+    def __init__(self, host: str, port: int, use_ssl: bool, size: int, connect_timeout: float):
+        """
+        Initialize connection pool.
+
+        Args:
+            host: Server host name
+            port: Server port
+            use_ssl: Wrap connections in TLS
+            size: Maximum number of open connections
+            connect_timeout: Timeout for opening a connection in seconds
+        """
+        self.host = host
+        self.port = port
+        self.size = size
+        self.connect_timeout = connect_timeout
+        self._ssl = ssl.create_default_context() if use_ssl else None
+        self._idle: list[_Connection] = []
+        self._slots = asyncio.Semaphore(size)
+        self.opened = 0
+        self.reused = 0
+
+    async def acquire(self) -> _Connection:
+        """Lease an idle connection or open a new one (waits when the pool is full)."""
+        await self._slots.acquire()
+
+        while self._idle:
+            conn = self._idle.pop()
+            if conn.is_usable():
+                conn.reused = True
+                self.reused += 1
+                return conn
+            conn.close()
+
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(
+                    self.host,
+                    self.port,
+                    ssl=self._ssl,
+                    server_hostname=self.host if self._ssl else None,
+                ),
+                timeout=self.connect_timeout,
+            )
+        except BaseException:
+            self._slots.release()
+            raise
+
+        self.opened += 1
+        return _Connection(reader, writer)
+
+    def release(self, conn: _Connection, keep_alive: bool) -> None:
+        """Return a leased connection, keeping it open for reuse if possible."""
+        if keep_alive and conn.is_usable():
+            self._idle.append(conn)
+        else:
+            conn.close()
+        self._slots.release()
+
+    async def close(self) -> None:
+        """Close all idle connections."""
+        idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+            try:
+                await conn.writer.wait_closed()
+            except (OSError, ssl.SSLError):
+                pass
+
+
+class AsyncWebDAVStorage:
+    """asyncio WebDAV storage backend for Seafile/Heibox."""
+
+    def __init__(
+        self,
+        base_url: str,
+        library: str,
+        username: str,
+        password: str,
+        connect_timeout: int = 5,
+        read_timeout: int = 60,
+        max_retries: int = 3,
+        pool_size: int = 10,
+        cache_ttl: float = 30.0,
+        cache_size: int = 256,
+        coalesce_window: float = 1.0,
+    ):
+        """
+        Initialize asyncio WebDAV storage backend.
+
+        Args:
+            base_url: Base WebDAV URL (e.g., https://heibox.uni-heidelberg.de/seafdav)
+            library: Library/folder name (e.g., testing-hei-datahub)
+            username: WebDAV username
+            password: WebDAV password/token
+            connect_timeout: Connection timeout in seconds
+            read_timeout: Timeout for each read/write on a connection in seconds
+            max_retries: Max retry attempts on 5xx and network errors
+            pool_size: Maximum number of keep-alive connections
+            cache_ttl: Seconds a directory listing is reused without revalidation (0 disables)
+            cache_size: Maximum number of cached directory listings
+            coalesce_window: Seconds a finished listing/download is shared with new identical requests
+        """
+        self.base_url = base_url.rstrip("/")
+        self.library = library.strip("/")
+        self.username = username
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_retries = max_retries
+        self.pool_size = pool_size
+        self.listing_cache = ListingCache(ttl=cache_ttl, max_listings=cache_size)
+        self.flights = AsyncSingleFlight(reuse_window=coalesce_window)
+
+        # Build full base path: base_url/library
+        self.root_url = f"{self.base_url}/{self.library}"
+
+        parsed = urlparse(self.root_url)
+        use_ssl = parsed.scheme == "https"
+        port = parsed.port or (443 if use_ssl else 80)
+        self._host_header = parsed.hostname if parsed.port is None else f"{parsed.hostname}:{parsed.port}"
+        self._root_path = parsed.path.rstrip("/")
+        self._origin = f"{parsed.scheme}://{parsed.netloc}"
+        self._pool_args = (parsed.hostname, port, use_ssl, pool_size, connect_timeout)
+        self._pool: Optional[ConnectionPool] = None
+
+        credentials = base64.b64encode(f"{username}:{password}".encode()).decode("ascii")
+        self._auth_header = f"Basic {credentials}"
+
+        logger.info(f"asyncio WebDAV storage initialized: {_mask_auth(self.root_url)} (pool {pool_size})")
+
+    # ------------------------------------------------------------------
+    # HTTP plumbing
+    # ------------------------------------------------------------------
+
+    @property
+    def pool(self) -> ConnectionPool:
+        """Connection pool (created on first use, inside the running loop)."""
+        if self._pool is None:
+            self._pool = ConnectionPool(*self._pool_args)
+        return self._pool
+
+    def _get_url(self, path: str) -> str:
+        """Build full URL for a given path."""
+        return f"{self._origin}{self._get_target(path)}"
+
+    def _get_target(self, path: str) -> str:
+        """Build the request target (absolute path) for a library path."""
+        # Normalize path (remove leading slash)
+        path = path.lstrip("/")
+        # URL-encode path components
+        encoded_path = "/".join(quote(part, safe="") for part in path.split("/"))
+        return f"{self._root_path}/{encoded_path}" if encoded_path else (self._root_path or "/")
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        headers: Optional[dict[str, str]] = None,
+        body: bytes = b"",
+        body_path: Optional[Path] = None,
+        dest_path: Optional[Path] = None,
+        sink: Optional[Callable[[bytes], None]] = None,
+        sink_status: int = 200,
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> _Response:
+        """
+        Send a request with the backend's retry policy.
+
+        5xx responses and network errors are retried with exponential
+        backoff for idempotent methods; a reused connection that turns out
+        to be closed is retried immediately for any method. Both count
+        against max_retries. Once body bytes
+        have been passed to `sink`, network errors are raised instead of
+        retried so the caller can continue from where the data stopped.
+
+        Args:
+            method: HTTP method
+            path: Path relative to the library root
+            headers: Extra request headers
+            body: Request body
+            body_path: Stream the request body from this file instead
+            dest_path: Stream a 2xx response body into this file
+            sink: Pass the response body to this callback instead, if the
+                status is `sink_status` (other 2xx bodies are discarded)
+            sink_status: Status whose body goes to `sink`
+            progress: Called with (bytes_sent, bytes_total) while streaming body_path
+
+        Returns:
+            Response (body is empty when streamed to dest_path or sink)
+        """
+        target = self._get_target(path)
+        retries = 0
+        delivered = 0
+
+        def counting_sink(chunk: bytes) -> None:
+            nonlocal delivered
+            delivered += len(chunk)
+            sink(chunk)
+
+        while True:
+            try:
+                response = await self._send(
+                    method, target, headers or {}, body, body_path, dest_path,
+                    counting_sink if sink is not None else None, sink_status, progress,
+                )
+            except _StaleConnectionError:
+                if retries >= self.max_retries:
+                    raise StorageConnectionError(f"Connection closed by server for {method} {path}")
+                retries += 1
+                logger.debug(f"Keep-alive connection closed by server, resending {method} {target}")
+                continue
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ssl.SSLError) as e:
+                if method not in IDEMPOTENT_METHODS or retries >= self.max_retries or delivered:
+                    if isinstance(e, asyncio.TimeoutError):
+                        raise StorageConnectionError(f"Request timeout for {method} {path}")
+                    raise StorageConnectionError(f"Connection failed: {e}")
+                retries += 1
+                await self._backoff(retries, f"{method} {path} failed: {e}")
+                continue
+
+            if (
+                response.status in RETRY_STATUSES
+                and method in IDEMPOTENT_METHODS
+                and retries < self.max_retries
+            ):
+                retries += 1
+                await self._backoff(retries, f"{method} {path} returned {response.status}")
+                continue
+
+            return response
+
+    async def _backoff(self, retry: int, reason: str) -> None:
+        """Sleep before a retry (urllib3-style exponential backoff)."""
+        delay = RETRY_BACKOFF_FACTOR * (2 ** (retry - 1))
+        logger.debug(f"{reason}; retry {retry}/{self.max_retries} in {delay:.1f}s")
+        await asyncio.sleep(delay)
+
+    async def _send(
+        self,
+        method: str,
+        target: str,
+        headers: dict[str, str],
+        body: bytes,
+        body_path: Optional[Path],
+        dest_path: Optional[Path],
+        sink: Optional[Callable[[bytes], None]] = None,
+        sink_status: int = 200,
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> _Response:
+        """Send one request over a pooled connection and read the response."""
+        conn = await self.pool.acquire()
+        keep_alive = False
+        got_response = False
+
+        try:
+            content_length = body_path.stat().st_size if body_path is not None else len(body)
+            lines = [
+                f"{method} {target} HTTP/1.1",
+                f"Host: {self._host_header}",
+                f"Authorization: {self._auth_header}",
+                f"User-Agent: {USER_AGENT}",
+                f"Content-Length: {content_length}",
+            ]
+            lines.extend(f"{name}: {value}" for name, value in headers.items())
+            conn.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+
+            if body_path is not None:
+                sent = 0
+                with open(body_path, "rb") as f:
+                    while chunk := f.read(STREAM_CHUNK_SIZE):
+                        conn.writer.write(chunk)
+                        await asyncio.wait_for(conn.writer.drain(), timeout=self.read_timeout)
+                        sent += len(chunk)
+                        if progress is not None:
+                            progress(sent, content_length)
+            elif body:
+                conn.writer.write(body)
+            await asyncio.wait_for(conn.writer.drain(), timeout=self.read_timeout)
+
+            status, response_headers = await self._read_head(conn)
+            got_response = True
+
+            response = _Response(status=status, headers=response_headers)
+            has_body = method != "HEAD" and status not in (204, 304)
+            if has_body and sink is not None and 200 <= status < 300:
+                if status != sink_status:
+                    # Unwanted body (e.g. a full file instead of a range): drop the connection
+                    return response
+                async for chunk in self._iter_body(conn, response_headers):
+                    sink(chunk)
+            elif has_body and dest_path is not None and 200 <= status < 300:
+                dest_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(dest_path, "wb") as f:
+                    async for chunk in self._iter_body(conn, response_headers):
+                        f.write(chunk)
+            elif has_body:
+                response.body = b"".join([c async for c in self._iter_body(conn, response_headers)])
+
+            keep_alive = (
+                response_headers.get("connection", "").lower() != "close"
+                and (not has_body or "content-length" in response_headers
+                     or "chunked" in response_headers.get("transfer-encoding", "").lower())
+            )
+            return response
+
+        except (ConnectionError, asyncio.IncompleteReadError) as e:
+            if conn.reused and not got_response:
+                raise _StaleConnectionError() from e
+            raise
+        finally:
+            self.pool.release(conn, keep_alive)
+
+    async def _read_head(self, conn: _Connection) -> tuple[int, dict[str, str]]:
+        """Read the status line and headers, skipping interim 1xx responses."""
+        while True:
+            raw = await asyncio.wait_for(conn.reader.readuntil(b"\r\n\r\n"), timeout=self.read_timeout)
+            lines = raw.decode("latin-1").split("\r\n")
+            parts = lines[0].split(" ", 2)
+            if len(parts) < 2 or not parts[0].startswith("HTTP/"):
+                raise ConnectionError(f"Malformed HTTP status line: {lines[0]!r}")
+            status = int(parts[1])
+
+            headers: dict[str, str] = {}
+            for line in lines[1:]:
+                if ":" in line:
+                    name, value = line.split(":", 1)
+                    headers[name.strip().lower()] = value.strip()
+
+            if 100 <= status < 200:
+                continue
+            return status, headers
+
+    async def _iter_body(self, conn: _Connection, headers: dict[str, str]) -> AsyncIterator[bytes]:
+        """Yield the response body in chunks (chunked, sized, or until close)."""
+        reader = conn.reader
+        timeout = self.read_timeout
+
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            while True:
+                size_line = await asyncio.wait_for(reader.readuntil(b"\r\n"), timeout=timeout)
+                size = int(size_line.split(b";", 1)[0].strip(), 16)
+                if size == 0:
+                    # Skip trailers up to the final blank line
+                    while (await asyncio.wait_for(reader.readuntil(b"\r\n"), timeout=timeout)) != b"\r\n":
+                        pass
+                    return
+                remaining = size
+                while remaining:
+                    chunk = await asyncio.wait_for(
+                        reader.readexactly(min(remaining, STREAM_CHUNK_SIZE)), timeout=timeout
+                    )
+                    remaining -= len(chunk)
+                    yield chunk
+                await asyncio.wait_for(reader.readexactly(2), timeout=timeout)
+
+        elif "content-length" in headers:
+            remaining = int(headers["content-length"])
+            while remaining:
+                chunk = await asyncio.wait_for(
+                    reader.readexactly(min(remaining, STREAM_CHUNK_SIZE)), timeout=timeout
+                )
+                remaining -= len(chunk)
+                yield chunk
+
+        else:
+            # No framing: body ends when the server closes the connection
+            while chunk := await asyncio.wait_for(reader.read(STREAM_CHUNK_SIZE), timeout=timeout):
+                yield chunk
+
+    @staticmethod
+    def _raise_for_status(response: _Response, action: str, path: str) -> None:
+        """Map error statuses to storage exceptions."""
+        if response.status == 401:
+            raise StorageAuthError("Authentication failed. Check HEIBOX_USERNAME and HEIBOX_WEBDAV_TOKEN.")
+        if response.status == 403:
+            raise StorageAuthError("Access forbidden. Check permissions for this library.")
+        if response.status == 404:
+            raise StorageNotFoundError(f"Path not found: {path}")
+        if response.status >= 400:
+            raise StorageError(f"{action} failed for {path}: HTTP {response.status}")
+
+    # ------------------------------------------------------------------
+    # Storage operations
+    # ------------------------------------------------------------------
+
+    async def listdir(self, path: str = "") -> list[FileEntry]:
+        """
+        List directory contents using WebDAV PROPFIND.
+
+        Listings fetched within the cache TTL are reused. Older ones are
+        revalidated with the directory's ETag and only fetched again if it
+        changed.
+
+        Args:
+            path: Path relative to library root
+
+        Returns:
+            Sorted list of FileEntry objects (directories first)
+        """
+        entries = self.listing_cache.get(path)
+        if entries is None:
+            entries, _ = await self.flights.do(("PROPFIND", path.strip("/")), lambda: self._load_listing(path))
+            entries = list(entries)
+        return entries
+
+    async def iter_listdir(self, path: str = "") -> AsyncIterator[FileEntry]:
+        """
+        Yield directory entries while the PROPFIND response is still arriving.
+
+        Entries come in server order (not sorted). A listing that is read to
+        the end is cached like one from listdir().
+
+        Args:
+            path: Path relative to library root
+
+        Yields:
+            FileEntry objects
+        """
+        async for batch in self.iter_listdir_batches(path):
+            for entry in batch:
+                yield entry
+
+    async def iter_listdir_batches(self, path: str = "") -> AsyncIterator[list[FileEntry]]:
+        """Like iter_listdir(), but yields the entries parsed from each received chunk together."""
+        entries = await self._cached_listing(path)
+        if entries is not None:
+            yield entries
+            return
+        async for batch in self._fetch_listing(path):
+            yield batch
+
+    async def _cached_listing(self, path: str) -> Optional[list[FileEntry]]:
+        """Get a listing from the cache, revalidating it by ETag once expired."""
+        entries = self.listing_cache.get(path)
+        if entries is None:
+            entries = await self._revalidated_listing(path)
+        return entries
+
+    async def _load_listing(self, path: str) -> list[FileEntry]:
+        """Revalidate or fetch a listing that is not fresh in the cache."""
+        entries = await self._revalidated_listing(path)
+        if entries is None:
+            entries = []
+            async for batch in self._fetch_listing(path):
+                entries.extend(batch)
+            entries.sort(key=_listing_order)
+        return entries
+
+    async def _revalidated_listing(self, path: str) -> Optional[list[FileEntry]]:
+        """Renew an expired cached listing if the directory's ETag is unchanged."""
+        if self.listing_cache.get_etag(path):
+            response = await self._propfind(path, "0", ETAG_PROPFIND_BODY)
+            if response.status == 207:
+                return self.listing_cache.revalidate(path, parse_collection_etag(response.body.decode("utf-8")))
+        return None
+
+    async def _fetch_listing(self, path: str) -> AsyncIterator[list[FileEntry]]:
+        """Stream and parse a Depth: 1 PROPFIND, caching the listing once complete."""
+        parser = PropfindParser(path, self.library)
+        batches: asyncio.Queue = asyncio.Queue()
+
+        def sink(chunk: bytes) -> None:
+            batch = parser.feed(chunk)
+            if batch:
+                batches.put_nowait(batch)
+
+        request = asyncio.ensure_future(self._propfind(path, "1", PROPFIND_BODY, sink=sink))
+        fetched = []
+        try:
+            # Hand out entries as chunks arrive, until the request finishes
+            while True:
+                getter = asyncio.ensure_future(batches.get())
+                done, _ = await asyncio.wait({getter, request}, return_when=asyncio.FIRST_COMPLETED)
+                if getter not in done:
+                    getter.cancel()
+                    break
+                fetched.extend(getter.result())
+                yield getter.result()
+
+            response = request.result()
+            if response.status != 207:
+                return
+            while not batches.empty():
+                batch = batches.get_nowait()
+                fetched.extend(batch)
+                yield batch
+            batch = parser.close()
+            fetched.extend(batch)
+            yield batch
+        finally:
+            if not request.done():
+                request.cancel()
+
+        fetched.sort(key=_listing_order)
+        self.listing_cache.put(path, fetched, parser.etag)
+
+    async def _propfind(
+        self, path: str, depth: str, body: str, sink: Optional[Callable[[bytes], None]] = None
+    ) -> _Response:
+        """Send a PROPFIND request (a multi-status body goes to `sink` if given)."""
+        response = await self._request(
+            "PROPFIND",
+            path,
+            headers={
+                "Depth": depth,
+                "Content-Type": "application/xml; charset=utf-8",
+            },
+            body=body.encode("utf-8"),
+            sink=sink,
+            sink_status=207,
+        )
+        self._raise_for_status(response, "PROPFIND", path)
+        return response
+
+    async def get_info(self, remote_path: str) -> Optional[FileEntry]:
+        """
+        Get file/directory info from its parent's (possibly cached) listing.
+
+        Args:
+            remote_path: Path to query
+
+        Returns:
+            FileEntry or None
+        """
+        answered, entry = self.listing_cache.lookup(remote_path)
+        if answered:
+            return entry
+
+        try:
+            parent_path = str(Path(remote_path).parent)
+            if parent_path == ".":
+                parent_path = ""
+
+            name = Path(remote_path).name
+            for entry in await self.listdir(parent_path):
+                if entry.name == name:
+                    return entry
+            return None
+        except StorageError:
+            return None
+
+    async def exists(self, remote_path: str) -> bool:
+        """
+        Check if path exists, from the cached parent listing or via HEAD request.
+
+        Args:
+            remote_path: Path to check
+
+        Returns:
+            True if exists
+        """
+        answered, entry = self.listing_cache.lookup(remote_path)
+        if answered:
+            return entry is not None
+
+        try:
+            response = await self._request("HEAD", remote_path)
+            return response.status in (200, 204)
+        except StorageError:
+            return False
+
+    async def download(self, remote_path: str, local_path: str) -> None:
+        """
+        Download file from WebDAV to local filesystem.
+
+        Concurrent downloads of the same small file (up to
+        SHARED_DOWNLOAD_MAX_BYTES) share one GET; each caller still gets its
+        own local copy.
+
+        Args:
+            remote_path: Path in WebDAV library (e.g., "folder/file.txt")
+            local_path: Local filesystem path (string or Path)
+        """
+        local_path_obj = Path(local_path)
+        data, shared = await self.flights.do(
+            ("GET", remote_path.strip("/")), lambda: self._download_shared(remote_path, local_path_obj)
+        )
+        if not shared:
+            return
+
+        if data is None:
+            # Too large to be handed around in memory: fetch our own copy
+            await self._download(remote_path, local_path_obj)
+        else:
+            local_path_obj.parent.mkdir(parents=True, exist_ok=True)
+            local_path_obj.write_bytes(data)
+            logger.debug(f"Served {remote_path} from a concurrent download")
+
+    async def _download_shared(self, remote_path: str, local_path: Path) -> Optional[bytes]:
+        """Download a file; returns its content for other waiters if it is small."""
+        await self._download(remote_path, local_path)
+        if local_path.stat().st_size > SHARED_DOWNLOAD_MAX_BYTES:
+            return None
+        return local_path.read_bytes()
+
+    async def _download(self, remote_path: str, local_path_obj: Path) -> None:
+        """Stream a file into a local path with a single GET."""
+        logger.info(f"Downloading {remote_path} to {local_path_obj}")
+
+        response = await self._request("GET", remote_path, dest_path=local_path_obj)
+        self._raise_for_status(response, "Download", remote_path)
+        logger.info(f"Downloaded {remote_path} to {local_path_obj}")
+
+    async def fetch_if_changed(
+        self,
+        remote_path: str,
+        local_path: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> Optional[RemoteFileInfo]:
+        """
+        Download a file unless the caller's copy is still current.
+
+        Sends a conditional GET (If-None-Match / If-Modified-Since), so an
+        unchanged file costs one 304 response without a body.
+
+        Args:
+            remote_path: Path in WebDAV library
+            local_path: Where the file is written if it changed
+            etag: ETag of the caller's copy
+            last_modified: Last-Modified header of the caller's copy
+
+        Returns:
+            Size and validators of the downloaded file, or None if the
+            caller's copy is current (nothing is written)
+        """
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        local_path_obj = Path(local_path)
+
+        response = await self._request("GET", remote_path, headers=headers, dest_path=local_path_obj)
+        if response.status == 304:
+            logger.debug(f"{remote_path} not modified")
+            return None
+        self._raise_for_status(response, "Download", remote_path)
+
+        return RemoteFileInfo(
+            size=local_path_obj.stat().st_size,
+            accepts_ranges=response.headers.get("accept-ranges", "").lower() == "bytes",
+            etag=response.headers.get("etag"),
+            last_modified=response.headers.get("last-modified"),
+        )
+
+    async def probe(self, remote_path: str) -> RemoteFileInfo:
+        """
+        Get size and range support of a file via HEAD request.
+
+        Args:
+            remote_path: Path in WebDAV library
+
+        Returns:
+            RemoteFileInfo for the file
+        """
+        response = await self._request("HEAD", remote_path)
+        self._raise_for_status(response, "HEAD", remote_path)
+
+        length = response.headers.get("content-length")
+        return RemoteFileInfo(
+            size=int(length) if length and length.isdigit() else None,
+            accepts_ranges=response.headers.get("accept-ranges", "").lower() == "bytes",
+            etag=response.headers.get("etag"),
+            last_modified=response.headers.get("last-modified"),
+        )
+
+    async def read_range(
+        self,
+        remote_path: str,
+        start: int,
+        end: Optional[int],
+        sink: Callable[[bytes], None],
+        chunk_size: int = STREAM_CHUNK_SIZE,
+    ) -> None:
+        """
+        Stream a byte range of a file into a callback.
+
+        Args:
+            remote_path: Path in WebDAV library
+            start: First byte offset
+            end: Last byte offset (inclusive), or None for the rest of the file
+            sink: Called with each chunk, in order
+            chunk_size: Unused; reads follow the connection's buffering
+
+        Raises:
+            RangeNotSupportedError: If the server ignored the Range header
+            StorageConnectionError: If the transfer broke off (bytes already
+                passed to sink stay valid)
+        """
+        ranged = start > 0 or end is not None
+        headers = {"Range": f"bytes={start}-{'' if end is None else end}"} if ranged else {}
+
+        response = await self._request(
+            "GET", remote_path, headers=headers, sink=sink, sink_status=206 if ranged else 200
+        )
+        self._raise_for_status(response, "Download", remote_path)
+        if ranged and response.status != 206:
+            raise RangeNotSupportedError(f"Server ignored Range request for {remote_path}")
+
+    async def upload(
+        self,
+        local_path: Path,
+        remote_path: str,
+        progress: Optional[Callable[[int, int], None]] = None,
+        exists: Optional[bool] = None,
+    ) -> None:
+        """
+        Upload a file via HTTP PUT, streaming the body once from disk.
+
+        Args:
+            local_path: Source local path
+            remote_path: Destination path in storage
+            progress: Called with (bytes_sent, bytes_total) while streaming
+            exists: Whether the remote file exists, if known (skips the HEAD)
+        """
+        local_path = Path(local_path)
+        if not local_path.exists():
+            raise StorageError(f"Local file not found: {local_path}")
+
+        if exists is None:
+            exists = await self.exists(remote_path)
+
+        logger.debug(f"Uploading {local_path} to {remote_path}")
+        try:
+            response = await self._put_file(local_path, remote_path, progress, overwrite=exists)
+            if response.status == 412:
+                # Changed between the check and the PUT (rare): send it once more
+                logger.debug(f"{remote_path} {'vanished' if exists else 'appeared'} during upload, retrying")
+                response = await self._put_file(local_path, remote_path, progress, overwrite=not exists)
+        finally:
+            # Even a failed PUT may have reached the server
+            self._invalidate(remote_path)
+
+        self._raise_for_status(response, "Upload", remote_path)
+        logger.info(f"Uploaded {local_path} to {remote_path}")
+
+    async def _put_file(
+        self,
+        local_path: Path,
+        remote_path: str,
+        progress: Optional[Callable[[int, int], None]],
+        overwrite: bool,
+    ) -> _Response:
+        """Stream a file as a PUT body."""
+        # Allow overwriting existing files; new files go without a precondition
+        headers = {"If-Match": "*"} if overwrite else {}
+        return await self._request("PUT", remote_path, headers=headers, body_path=local_path, progress=progress)
+
+    async def upload_if_match(self, local_path: Path, remote_path: str, etag: Optional[str]) -> Optional[str]:
+        """
+        Upload a file only if the remote file is still the one the caller read.
+
+        Args:
+            local_path: Source local path
+            remote_path: Destination path in storage
+            etag: ETag the remote file had when it was read, or None if it
+                did not exist (then the upload only creates it)
+
+        Returns:
+            ETag of the new file, if the server sent one
+
+        Raises:
+            StoragePreconditionError: If the file changed or appeared meanwhile
+        """
+        headers = {"If-Match": etag} if etag else {"If-None-Match": "*"}
+        try:
+            response = await self._request("PUT", remote_path, headers=headers, body_path=Path(local_path))
+        finally:
+            self._invalidate(remote_path)
+
+        if response.status == 412:
+            raise StoragePreconditionError(f"{remote_path} changed on the server since it was read")
+        self._raise_for_status(response, "Upload", remote_path)
+        logger.info(f"Uploaded {local_path} to {remote_path} (conditional)")
+        return response.headers.get("etag")
+
+    async def mkdir(self, remote_path: str) -> None:
+        """
+        Create a directory via MKCOL (idempotent).
+
+        Args:
+            remote_path: Directory path to create
+        """
+        await self.make_collections([remote_path])
+        logger.info(f"Created directory: {remote_path}")
+
+    async def make_collections(self, paths) -> set[str]:
+        """
+        Create directories and all their parents, one MKCOL per collection.
+
+        Collections at the same depth are created concurrently.
+
+        Args:
+            paths: Directory paths relative to the library root
+
+        Returns:
+            Paths that were newly created (the others already existed)
+        """
+        created = set()
+        by_depth: dict[int, list[str]] = {}
+        for path in collection_paths(paths):
+            by_depth.setdefault(path.count("/"), []).append(path)
+
+        for depth in sorted(by_depth):
+            level = by_depth[depth]
+            responses = await asyncio.gather(*(self._request("MKCOL", path) for path in level))
+            for path, response in zip(level, responses):
+                # 201 = created, 405 = already exists (method not allowed on existing collection)
+                if response.status == 201:
+                    created.add(path)
+                    self._invalidate(path)
+                elif response.status != 405:
+                    self._raise_for_status(response, "MKCOL", path)
+
+        return created
+
+    async def move(self, src_path: str, dest_path: str) -> None:
+        """
+        Move/rename a file or directory via WebDAV MOVE method.
+
+        Args:
+            src_path: Source path
+            dest_path: Destination path
+        """
+        try:
+            response = await self._request(
+                "MOVE",
+                src_path,
+                headers={
+                    "Destination": self._get_url(dest_path),
+                    "Overwrite": "F",  # Don't overwrite existing
+                },
+            )
+        finally:
+            self._invalidate(src_path, recursive=True)
+            self._invalidate(dest_path, recursive=True)
+        if response.status == 412:
+            raise StorageError(f"Destination already exists: {dest_path}")
+        self._raise_for_status(response, "MOVE", src_path)
+        logger.info(f"Moved {src_path} to {dest_path}")
+
+    async def delete(self, remote_path: str) -> None:
+        """
+        Delete a file or directory via WebDAV DELETE.
+
+        Args:
+            remote_path: Path to delete (file or directory)
+
+        Raises:
+            StorageError: If deletion fails
+        """
+        logger.info(f"Deleting {remote_path}")
+        try:
+            response = await self._request("DELETE", remote_path)
+        finally:
+            self._invalidate(remote_path, recursive=True)
+        if response.status == 404:
+            # Already deleted or doesn't exist
+            logger.warning(f"Path not found (404): {remote_path}")
+            return
+        self._raise_for_status(response, "DELETE", remote_path)
+        logger.info(f"Deleted: {remote_path}")
+
+    async def warmup(self) -> None:
+        """Open a keep-alive connection ahead of the first real request."""
+        try:
+            conn = await self.pool.acquire()
+        except (OSError, asyncio.TimeoutError, ssl.SSLError) as e:
+            logger.debug(f"Connection warmup failed: {e}")
+            return
+        self.pool.release(conn, keep_alive=True)
+        logger.debug(f"Warmed up connection to {_mask_auth(self.root_url)}")
+
+    async def close(self) -> None:
+        """Close pooled connections."""
+        if self._pool is not None:
+            await self._pool.close()
+
+    def get_pool_stats(self) -> dict[str, int]:
+        """Get connection pool counters for diagnostics."""
+        if self._pool is None:
+            return {"size": self.pool_size, "opened": 0, "reused": 0}
+        return {"size": self.pool_size, "opened": self._pool.opened, "reused": self._pool.reused}
+
+    def get_cache_stats(self) -> dict[str, int]:
+        """Get listing cache counters for diagnostics."""
+        return self.listing_cache.get_stats()
+
+    def get_coalescing_stats(self) -> dict[str, int]:
+        """Get request coalescing counters for diagnostics."""
+        return self.flights.get_stats()
+
+    def _invalidate(self, path: str, recursive: bool = False) -> None:
+        """Forget cached listings and shared reads a write to `path` affects."""
+        self.listing_cache.invalidate(path, recursive)
+        self.flights.invalidate(path, recursive)
+
+
+class PooledWebDAVStorage:
+    """Blocking facade over AsyncWebDAVStorage for synchronous callers."""
+
+    def __init__(self, **kwargs: Any):
+        """
+        Initialize wrapper and its private event loop thread.
+
+        Args:
+            **kwargs: Arguments for AsyncWebDAVStorage
+        """
+        self.aio = AsyncWebDAVStorage(**kwargs)
+        self.base_url = self.aio.base_url
+        self.library = self.aio.library
+        self.username = self.aio.username
+        self.root_url = self.aio.root_url
+        self.connect_timeout = self.aio.connect_timeout
+        self.read_timeout = self.aio.read_timeout
+        self.max_retries = self.aio.max_retries
+        self.listing_cache = self.aio.listing_cache
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="webdav-asyncio", daemon=True)
+        self._thread.start()
+
+    def _run(self, coro):
+        """Run a coroutine on the private loop and wait for its result."""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    async def run_async(self, method: str, *args: Any) -> Any:
+        """
+        Await a storage operation from another event loop.
+
+        Args:
+            method: Name of an AsyncWebDAVStorage method (e.g., "download")
+            *args: Method arguments
+
+        Returns:
+            The method's result
+        """
+        future = asyncio.run_coroutine_threadsafe(getattr(self.aio, method)(*args), self._loop)
+        return await asyncio.wrap_future(future)
+
+    def listdir(self, path: str = "") -> list[FileEntry]:
+        """List directory contents."""
+        return self._run(self.aio.listdir(path))
+
+    def iter_listdir(self, path: str = "") -> Iterator[FileEntry]:
+        """Yield directory entries while the listing is still arriving (server order)."""
+        batches = self.aio.iter_listdir_batches(path)
+        try:
+            while True:
+                try:
+                    batch = self._run(batches.__anext__())
+                except StopAsyncIteration:
+                    return
+                yield from batch
+        finally:
+            self._run(batches.aclose())
+
+    def get_info(self, remote_path: str) -> Optional[FileEntry]:
+        """Get file/directory info."""
+        return self._run(self.aio.get_info(remote_path))
+
+    def exists(self, remote_path: str) -> bool:
+        """Check if path exists."""
+        return self._run(self.aio.exists(remote_path))
+
+    def download(self, remote_path: str, local_path: str) -> None:
+        """Download file to local filesystem."""
+        self._run(self.aio.download(remote_path, local_path))
+
+    def fetch_if_changed(
+        self,
+        remote_path: str,
+        local_path: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> Optional[RemoteFileInfo]:
+        """Download a file unless the caller's copy is still current (conditional GET)."""
+        return self._run(self.aio.fetch_if_changed(remote_path, local_path, etag, last_modified))
+
+    def probe(self, remote_path: str) -> RemoteFileInfo:
+        """Get size and range support of a file."""
+        return self._run(self.aio.probe(remote_path))
+
+    def read_range(
+        self,
+        remote_path: str,
+        start: int,
+        end: Optional[int],
+        sink: Callable[[bytes], None],
+        chunk_size: int = STREAM_CHUNK_SIZE,
+    ) -> None:
+        """Stream a byte range of a file into a callback (called on the pool's loop thread)."""
+        self._run(self.aio.read_range(remote_path, start, end, sink, chunk_size))
+
+    def upload(
+        self,
+        local_path: Path,
+        remote_path: str,
+        progress: Optional[Callable[[int, int], None]] = None,
+        exists: Optional[bool] = None,
+    ) -> None:
+        """Upload a local file (progress is reported on the pool's loop thread)."""
+        self._run(self.aio.upload(local_path, remote_path, progress, exists))
+
+    def upload_if_match(self, local_path: Path, remote_path: str, etag: Optional[str]) -> Optional[str]:
+        """Upload a file only if the remote file is unchanged since it was read."""
+        return self._run(self.aio.upload_if_match(local_path, remote_path, etag))
+
+    def mkdir(self, remote_path: str) -> None:
+        """Create a directory (and parents)."""
+        self._run(self.aio.mkdir(remote_path))
+
+    def make_collections(self, paths) -> set[str]:
+        """Create directories and all their parents; returns the new ones."""
+        return self._run(self.aio.make_collections(list(paths)))
+
+    def move(self, src_path: str, dest_path: str) -> None:
+        """Move/rename a file or directory."""
+        self._run(self.aio.move(src_path, dest_path))
+
+    def delete(self, remote_path: str) -> None:
+        """Delete a file or directory."""
+        self._run(self.aio.delete(remote_path))
+
+    def warmup(self) -> None:
+        """Open a keep-alive connection ahead of the first real request."""
+        self._run(self.aio.warmup())
+
+    def get_pool_stats(self) -> dict[str, int]:
+        """Get connection pool counters for diagnostics."""
+        return self.aio.get_pool_stats()
+
+    def get_cache_stats(self) -> dict[str, int]:
+        """Get listing cache counters for diagnostics."""
+        return self.aio.get_cache_stats()
+
+    def get_coalescing_stats(self) -> dict[str, int]:
+        """Get request coalescing counters for diagnostics."""
+        return self.aio.get_coalescing_stats()
+
+    def close(self) -> None:
+        """Close pooled connections and stop the private loop."""
+        self._run(self.aio.close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
@@ -0,0 +1,659 @@
+"""
+Local cache of files downloaded from cloud storage.
+
+Downloaded files (dataset files from "Download all" and `hei-datahub pull`,
+the catalog manifest; metadata.yaml has its own mirror, see
+metadata_mirror) are kept under CACHE_DIR/blobs, addressed by content:
+
+- objects/<ab>/<sha256>: file contents, stored once however many remote
+  paths have them; written to tmp/ first and moved into place, so readers
+  never see partial objects
+- blobs.db: maps each remote path to its object together with the
+  validators it was downloaded with (ETag, Last-Modified, listing size
+  and mtime), plus last-use times and hit counters
+
+Reading a cached remote file again costs one conditional GET (304 without
+a body if unchanged). Dataset downloads whose listing size and mtime match
+a cached entry cost no request at all: the file is reflinked where the
+filesystem supports it (btrfs, XFS), hard-linked if
+storage.blob_cache_hardlinks is on, and copied otherwise.
+
+Byte ranges read for file previews are cached as entries of their own
+("<path>#bytes=<start>-<end>"), valid while the file's listing mtime and
+ETag are unchanged, or sliced from a cached copy of the whole file.
+
+The cache holds at most storage.blob_cache_mb; the least recently used
+objects are evicted first. Any cache failure falls back to a plain download.
+"""
+import hashlib
+import logging
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+from hei_datahub.infra.paths import CACHE_DIR
+from hei_datahub.services.index_writer import connect_index_db
+from hei_datahub.services.webdav_storage import StorageOfflineError
+
+logger = logging.getLogger(__name__)
+
+BLOB_CACHE_DIR = CACHE_DIR / "blobs"
+DEFAULT_MAX_MB = 1024
+# Files bigger than this share of the budget are not cached (they would evict everything else)
+MAX_OBJECT_SHARE = 0.25
+HASH_CHUNK_SIZE = 1024 * 1024
+# Leftover temporary files older than this are removed by prune(), in seconds
+STALE_TEMP_SEC = 3600
+# Linux ioctl that makes a file share another file's blocks (reflink)
+FICLONE = 0x40049409
+
+COUNTERS = ("hits", "revalidated", "downloaded", "evicted", "bytes_saved")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS objects (
+    digest TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    remote_path TEXT PRIMARY KEY,
+    digest TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    modified REAL,
+    stored REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_entries_digest ON entries(digest);
+CREATE INDEX IF NOT EXISTS idx_objects_last_used ON objects(last_used);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+@dataclass
+class CachedBlob:
+    """A remote file's cached copy."""
+    remote_path: str
+    digest: str
+    path: Path
+    size: int
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    modified: Optional[float] = None  # Remote mtime from the listing (POSIX timestamp)
+
+
+def hash_file(path: Path) -> str:
+    """SHA-256 of a file's contents (hex)."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def clone_file(src: Path, dest: Path) -> str:
+    """
+    Copy a file, sharing its blocks (reflink) where the filesystem can.
+
+    Returns:
+        "reflink" or "copy"
+    """
+    try:
+        import fcntl
+
+        with open(src, "rb") as source, open(dest, "wb") as target:
+            fcntl.ioctl(target.fileno(), FICLONE, source.fileno())
+        return "reflink"
+    except (ImportError, OSError):
+        pass
+    shutil.copyfile(src, dest)
+    return "copy"
+
+
+def read_range_bytes(storage, remote_path: str, start: int, end: Optional[int]) -> bytes:
+    """Bytes of a file between two offsets (end inclusive, None for the rest) in one request."""
+    chunks: list[bytes] = []
+    storage.read_range(remote_path, start, end, chunks.append)
+    return b"".join(chunks)
+
+
+def _remove_object(path: Path) -> None:
+    """Delete a (read-only) object file."""
+    try:
+        os.chmod(path, 0o644)
+        path.unlink()
+    except FileNotFoundError:
+        pass
+
+
+class BlobCache:
+    """Size-bounded, content-addressed cache of downloaded files."""
+
+    def __init__(self, root: Path = BLOB_CACHE_DIR, max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024, hardlinks: bool = False):
+        """
+        Initialize blob cache.
+
+        Args:
+            root: Cache folder
+            max_bytes: Byte budget for cached objects (0 disables the cache)
+            hardlinks: Hard-link cached files into destinations when reflinks
+                are not supported (the copies are then read-only and share
+                the cache's inode)
+        """
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.tmp_dir = self.root / "tmp"
+        self.db_path = self.root / "blobs.db"
+        self.max_bytes = max(0, max_bytes)
+        self.hardlinks = hardlinks
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    @property
+    def enabled(self) -> bool:
+        """Whether files are cached at all."""
+        return self.max_bytes > 0
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the cache database (created on first use)."""
+        with self._lock:
+            if not self._initialized:
+                self.objects_dir.mkdir(parents=True, exist_ok=True)
+                self.tmp_dir.mkdir(parents=True, exist_ok=True)
+            conn = connect_index_db(self.db_path)
+            if not self._initialized:
+                conn.executescript(SCHEMA)
+                self._initialized = True
+        return conn
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest
+
+    def _temp_path(self) -> Path:
+        """New empty temporary file inside the cache (same filesystem as the objects)."""
+        self.tmp_dir.mkdir(parents=True, exist_ok=True)
+        fd, name = tempfile.mkstemp(dir=self.tmp_dir, suffix=".part")
+        os.close(fd)
+        return Path(name)
+
+    @staticmethod
+    def _bump(conn: sqlite3.Connection, name: str, amount: int = 1) -> None:
+        conn.execute(
+            "INSERT INTO counters (name, value) VALUES (?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+            (name, amount),
+        )
+
+    def _used(self, blob: CachedBlob, counter: str, saved: Optional[int] = None) -> None:
+        """Mark an object as recently used and count the hit (saved: bytes not downloaded, default all)."""
+        try:
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.execute("UPDATE objects SET last_used = ? WHERE digest = ?", (time.time(), blob.digest))
+                    self._bump(conn, counter)
+                    self._bump(conn, "bytes_saved", blob.size if saved is None else saved)
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.debug(f"Could not update blob cache usage: {e}")
+
+    def lookup(self, remote_path: str, size: Optional[int] = None, modified: Optional[float] = None) -> Optional[CachedBlob]:
+        """
+        Find the cached copy of a remote file.
+
+        Args:
+            remote_path: Path in the library
+            size: Size from the listing; the copy must match if given
+            modified: Remote mtime from the listing; the copy must match if given
+
+        Returns:
+            CachedBlob, or None if nothing (matching) is cached
+        """
+        if not self.enabled:
+            return None
+        try:
+            conn = self._connect()
+            try:
+                row = conn.execute(
+                    "SELECT e.digest, o.size, e.etag, e.last_modified, e.modified "
+                    "FROM entries e JOIN objects o ON o.digest = e.digest WHERE e.remote_path = ?",
+                    (remote_path,),
+                ).fetchone()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.debug(f"Blob cache lookup failed for {remote_path}: {e}")
+            return None
+
+        if row is None:
+            return None
+        digest, cached_size, etag, last_modified, cached_modified = row
+        if size is not None and cached_size != size:
+            return None
+        if modified is not None and (cached_modified is None or int(cached_modified) != int(modified)):
+            return None
+        path = self._object_path(digest)
+        if not path.exists():
+            return None
+        return CachedBlob(remote_path, digest, path, cached_size, etag, last_modified, cached_modified)
+
+    def store(
+        self,
+        remote_path: str,
+        source: Path,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        modified: Optional[float] = None,
+    ) -> Optional[CachedBlob]:
+        """
+        Add a downloaded file to the cache (the file itself is left in place).
+
+        Args:
+            remote_path: Path in the library
+            source: Downloaded file
+            etag: ETag the server sent with it
+            last_modified: Last-Modified header the server sent with it
+            modified: Remote mtime from the listing
+
+        Returns:
+            CachedBlob, or None if the file was not cached
+        """
+        return self._store(remote_path, Path(source), etag, last_modified, modified, move=False)
+
+    def _store(
+        self,
+        remote_path: str,
+        source: Path,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        modified: Optional[float],
+        move: bool,
+    ) -> Optional[CachedBlob]:
+        """Add a file; with move=True, source is a temporary file in tmp/ that is taken over."""
+        if not self.enabled:
+            return None
+        try:
+            size = source.stat().st_size
+            if size > self.max_bytes * MAX_OBJECT_SHARE:
+                logger.debug(f"Not caching {remote_path}: {size} bytes is too large for the cache budget")
+                self._forget(remote_path)
+                return None
+
+            digest = hash_file(source)
+            target = self._object_path(digest)
+            if target.exists():
+                if move:
+                    source.unlink()
+            else:
+                target.parent.mkdir(parents=True, exist_ok=True)
+                staged = source if move else self._temp_path()
+                try:
+                    if not move:
+                        clone_file(source, staged)
+                    os.chmod(staged, 0o444)
+                    os.replace(staged, target)
+                except BaseException:
+                    staged.unlink(missing_ok=True)
+                    raise
+
+            now = time.time()
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.execute(
+                        "INSERT INTO objects (digest, size, last_used) VALUES (?, ?, ?) "
+                        "ON CONFLICT(digest) DO UPDATE SET last_used = excluded.last_used",
+                        (digest, size, now),
+                    )
+                    conn.execute(
+                        "INSERT OR REPLACE INTO entries "
+                        "(remote_path, digest, etag, last_modified, modified, stored) VALUES (?, ?, ?, ?, ?, ?)",
+                        (remote_path, digest, etag, last_modified, modified, now),
+                    )
+                    self._evict(conn, self.max_bytes)
+            finally:
+                conn.close()
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Could not cache {remote_path}: {e}")
+            return None
+
+        return CachedBlob(remote_path, digest, target, size, etag, last_modified, modified)
+
+    def _forget(self, remote_path: str) -> None:
+        """Drop a remote path's entry (its object stays until evicted)."""
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM entries WHERE remote_path = ?", (remote_path,))
+        finally:
+            conn.close()
+
+    def _evict(self, conn: sqlite3.Connection, max_bytes: int) -> tuple[int, int]:
+        """
+        Remove least recently used objects until the cache fits a budget.
+
+        Returns:
+            (objects removed, bytes freed)
+        """
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM objects").fetchone()[0]
+        removed = freed = 0
+        if total <= max_bytes:
+            return removed, freed
+
+        for digest, size in conn.execute("SELECT digest, size FROM objects ORDER BY last_used").fetchall():
+            if total - freed <= max_bytes:
+                break
+            conn.execute("DELETE FROM entries WHERE digest = ?", (digest,))
+            conn.execute("DELETE FROM objects WHERE digest = ?", (digest,))
+            _remove_object(self._object_path(digest))
+            removed += 1
+            freed += size
+        self._bump(conn, "evicted", removed)
+        logger.debug(f"Evicted {removed} cached files ({freed} bytes)")
+        return removed, freed
+
+    def materialize(self, blob: CachedBlob, dest: Path, modified: Optional[float] = None) -> str:
+        """
+        Put a cached file at a destination path.
+
+        The file appears atomically (written next to dest, then renamed).
+
+        Args:
+            blob: Result of lookup()
+            dest: Where the file goes
+            modified: mtime to set on the file
+
+        Returns:
+            "reflink", "hardlink", "copy", or "existing" if dest already is the object
+
+        Raises:
+            OSError: If the object is gone (evicted meanwhile) or dest can't be written
+        """
+        method = self._materialize(blob, Path(dest), modified)
+        self._used(blob, "hits")
+        return method
+
+    def _materialize(self, blob: CachedBlob, dest: Path, modified: Optional[float] = None) -> str:
+        """materialize() without counting a hit."""
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            if os.path.samefile(blob.path, dest):
+                return "existing"
+        except OSError:
+            pass
+
+        fd, name = tempfile.mkstemp(dir=dest.parent, prefix=f".{dest.name}.", suffix=".part")
+        os.close(fd)
+        staged = Path(name)
+        try:
+            method = None
+            if self.hardlinks:
+                staged.unlink()
+                try:
+                    os.link(blob.path, staged)
+                    method = "hardlink"
+                except OSError:
+                    pass
+            if method is None:
+                method = clone_file(blob.path, staged)
+            if modified is not None:
+                os.utime(staged, (modified, modified))
+            os.replace(staged, dest)
+        except BaseException:
+            staged.unlink(missing_ok=True)
+            raise
+        return method
+
+    def fetch(self, storage, remote_path: str, dest: Path, allow_stale: bool = False) -> str:
+        """
+        Get a remote file through the cache.
+
+        A cached copy is revalidated with one conditional GET. Files of a
+        local backend (a mounted library) are copied directly, not cached.
+
+        Args:
+            storage: Storage backend
+            remote_path: Path in the library
+            dest: Where the file goes
+            allow_stale: Use the cached copy without revalidating while
+                storage is offline
+
+        Returns:
+            "cached" if the cached copy was used, "downloaded" otherwise
+
+        Raises:
+            StorageError: If the file could not be downloaded (and no cached
+                copy could stand in)
+        """
+        dest = Path(dest)
+        if not self.enabled or getattr(storage, "is_local", False):
+            storage.download(remote_path, str(dest))
+            return "downloaded"
+
+        cached = self.lookup(remote_path)
+        fetch_if_changed = getattr(storage, "fetch_if_changed", None)
+        tmp = self._temp_path()
+        try:
+            if fetch_if_changed is None:
+                storage.download(remote_path, str(tmp))
+                etag = last_modified = None
+            else:
+                try:
+                    info = fetch_if_changed(
+                        remote_path,
+                        str(tmp),
+                        cached.etag if cached else None,
+                        cached.last_modified if cached else None,
+                    )
+                except StorageOfflineError:
+                    if cached is None or not allow_stale:
+                        raise
+                    logger.debug(f"Storage offline, using cached {remote_path}")
+                    self.materialize(cached, dest)
+                    return "cached"
+
+                if info is None:
+                    if cached is None:
+                        # 304 without a copy to match (validators sent by someone else)
+                        storage.download(remote_path, str(tmp))
+                        etag = last_modified = None
+                    else:
+                        self._materialize(cached, dest)
+                        self._used(cached, "revalidated")
+                        return "cached"
+                else:
+                    etag, last_modified = info.etag, info.last_modified
+
+            shutil.copyfile(tmp, dest)
+            blob = self._store(remote_path, tmp, etag, last_modified, None, move=True)
+            if blob is not None:
+                self._count("downloaded")
+            return "downloaded"
+        finally:
+            tmp.unlink(missing_ok=True)
+
+    def fetch_bytes(self, storage, remote_path: str, allow_stale: bool = False) -> bytes:
+        """
+        Read a (small) remote file through the cache, see fetch().
+
+        Returns:
+            File contents
+        """
+        fd, name = tempfile.mkstemp(suffix=Path(remote_path).suffix)
+        os.close(fd)
+        try:
+            self.fetch(storage, remote_path, Path(name), allow_stale=allow_stale)
+            return Path(name).read_bytes()
+        finally:
+            os.unlink(name)
+
+    def fetch_range(
+        self,
+        storage,
+        remote_path: str,
+        start: int,
+        end: int,
+        size: Optional[int] = None,
+        modified: Optional[float] = None,
+        etag: Optional[str] = None,
+    ) -> bytes:
+        """
+        Read a byte range of a remote file through the cache.
+
+        The range is sliced from a cached copy of the whole file if one
+        matches the listing, or taken from an earlier read of the same
+        range. Otherwise it is fetched with a Range request and cached.
+        Without a listing mtime nothing is cached, as a stale range could
+        not be told apart.
+
+        Args:
+            storage: Storage backend
+            remote_path: Path in the library
+            start: First byte offset
+            end: Last byte offset (inclusive)
+            size: Size from the listing (a whole cached copy must match it)
+            modified: Remote mtime from the listing
+            etag: ETag from the listing
+
+        Returns:
+            The bytes (fewer than asked if the file ends before end)
+
+        Raises:
+            RangeNotSupportedError: If the server ignored the Range header
+            StorageError: If the range could not be read
+        """
+        if size is not None:
+            end = min(end, size - 1)
+        if end < start:
+            return b""
+        if not self.enabled or getattr(storage, "is_local", False) or modified is None:
+            return read_range_bytes(storage, remote_path, start, end)
+
+        whole = self.lookup(remote_path, size=size, modified=modified) if size is not None else None
+        if whole is not None:
+            try:
+                with open(whole.path, "rb") as f:
+                    f.seek(start)
+                    data = f.read(end - start + 1)
+                self._used(whole, "hits", saved=len(data))
+                return data
+            except OSError as e:
+                logger.debug(f"Could not read cached {remote_path}: {e}")
+
+        key = f"{remote_path}#bytes={start}-{end}"
+        cached = self.lookup(key, modified=modified)
+        if cached is not None and (etag is None or cached.etag in (None, etag)):
+            try:
+                data = cached.path.read_bytes()
+                self._used(cached, "hits")
+                return data
+            except OSError as e:
+                logger.debug(f"Could not read cached range of {remote_path}: {e}")
+
+        data = read_range_bytes(storage, remote_path, start, end)
+        tmp = self._temp_path()
+        try:
+            tmp.write_bytes(data)
+            if self._store(key, tmp, etag, None, modified, move=True) is not None:
+                self._count("downloaded")
+        except OSError as e:
+            logger.debug(f"Could not cache range of {remote_path}: {e}")
+        finally:
+            tmp.unlink(missing_ok=True)
+        return data
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        try:
+            conn = self._connect()
+            try:
+                with conn:
+                    self._bump(conn, name, amount)
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.debug(f"Could not update blob cache counter: {e}")
+
+    def prune(self, max_bytes: Optional[int] = None) -> tuple[int, int]:
+        """
+        Shrink the cache to a budget and tidy up leftovers.
+
+        Also removes object files the database doesn't know (e.g. after a
+        crash), entries whose object is missing and stale temporary files.
+
+        Args:
+            max_bytes: Budget to shrink to (default: the configured budget; 0 empties the cache)
+
+        Returns:
+            (files removed, bytes freed)
+        """
+        budget = self.max_bytes if max_bytes is None else max(0, max_bytes)
+        conn = self._connect()
+        try:
+            with conn:
+                removed, freed = self._evict(conn, budget)
+
+                known = {digest for (digest,) in conn.execute("SELECT digest FROM objects")}
+                for path in self.objects_dir.glob("*/*"):
+                    if path.name not in known:
+                        freed += path.stat().st_size
+                        _remove_object(path)
+                        removed += 1
+                missing = [digest for digest in known if not self._object_path(digest).exists()]
+                for digest in missing:
+                    conn.execute("DELETE FROM entries WHERE digest = ?", (digest,))
+                    conn.execute("DELETE FROM objects WHERE digest = ?", (digest,))
+        finally:
+            conn.close()
+
+        cutoff = time.time() - STALE_TEMP_SEC
+        for path in self.tmp_dir.glob("*.part"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+            except OSError:
+                pass
+
+        logger.info(f"Pruned blob cache: {removed} files, {freed} bytes")
+        return removed, freed
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get cache size and counters for diagnostics."""
+        stats: dict[str, Any] = {"path": str(self.root), "max_bytes": self.max_bytes}
+        conn = self._connect()
+        try:
+            objects, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM objects").fetchone()
+            entries = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            counters = dict(conn.execute("SELECT name, value FROM counters").fetchall())
+        finally:
+            conn.close()
+        stats.update(objects=objects, entries=entries, bytes=size)
+        for name in COUNTERS:
+            stats[name] = counters.get(name, 0)
+        return stats
+
+
+# Global cache instance
+_blob_cache: Optional[BlobCache] = None
+
+
+def get_blob_cache() -> BlobCache:
+    """Get the blob cache configured from `storage.blob_cache_*` settings."""
+    global _blob_cache
+    if _blob_cache is None:
+        from hei_datahub.services.config import get_config
+
+        config = get_config()
+        _blob_cache = BlobCache(
+            max_bytes=config.get("storage.blob_cache_mb", DEFAULT_MAX_MB) * 1024 * 1024,
+            hardlinks=config.get("storage.blob_cache_hardlinks", False),
+        )
+    return _blob_cache
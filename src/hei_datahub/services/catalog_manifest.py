@@ -0,0 +1,268 @@
+"""
+Shared catalog manifest stored in the library itself.
+
+Without it, every client fetches every dataset's metadata.yaml to build
+its index. The manifest is one compressed file at the library root
+(CATALOG_PATH, gzipped JSON lines) holding everybody's metadata:
+
+    {"format": 1, "updated": 1760000000.0, "datasets": 2}
+    {"id": "dataset-a", "mtime": 1759990000, "metadata": {...}}
+    {"id": "dataset-b", "mtime": 1759995000, "metadata": {...}}
+
+`mtime` is the dataset folder's mtime when its metadata was read or
+written. Readers trust an entry only while the folder's mtime in the
+listing still equals it; datasets changed since (by older clients or the
+Heibox web interface) or missing from the manifest are fetched one by one,
+and no manifest at all means a full crawl.
+
+Writers (the outbox after adding, editing or deleting datasets, and the
+indexer after a crawl that had to fetch datasets) update it with optimistic
+concurrency: read it with its ETag, apply their changes, upload with
+If-Match, and start over if someone else wrote it in between (412).
+Failing to update the manifest never fails the change itself; readers fall
+back to fetching the datasets involved.
+"""
+import gzip
+import json
+import logging
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from hei_datahub.services.webdav_storage import (
+    StorageAuthError,
+    StorageError,
+    StorageNotFoundError,
+    StoragePreconditionError,
+    utc_timestamp,
+)
+
+logger = logging.getLogger(__name__)
+
+# Well-known location in the library (a file, so the indexer never takes it for a dataset)
+CATALOG_PATH = "_catalog.jsonl.gz"
+CATALOG_FORMAT = 1
+# Read-modify-write rounds before giving up on a busy manifest
+MAX_UPDATE_ATTEMPTS = 5
+UPDATE_BACKOFF_SEC = 0.2
+
+
+class ManifestFormatError(ValueError):
+    """The manifest was written by a newer version (left alone)."""
+    pass
+
+
+def encode_manifest(datasets: dict[str, dict[str, Any]]) -> bytes:
+    """
+    Serialize manifest entries.
+
+    Args:
+        datasets: Entries ({"mtime": ..., "metadata": {...}}) by dataset id
+
+    Returns:
+        Gzipped JSON lines
+    """
+    lines = [json.dumps({"format": CATALOG_FORMAT, "updated": time.time(), "datasets": len(datasets)})]
+    for dataset_id in sorted(datasets):
+        entry = datasets[dataset_id]
+        lines.append(json.dumps(
+            {"id": dataset_id, "mtime": entry.get("mtime"), "metadata": entry.get("metadata") or {}},
+            ensure_ascii=False,
+            default=str,
+        ))
+    return gzip.compress(("\n".join(lines) + "\n").encode("utf-8"))
+
+
+def decode_manifest(data: bytes) -> dict[str, dict[str, Any]]:
+    """
+    Parse a manifest.
+
+    Returns:
+        Entries by dataset id
+
+    Raises:
+        ValueError: If the data is not a manifest this version understands
+    """
+    try:
+        lines = gzip.decompress(data).decode("utf-8").splitlines()
+        header = json.loads(lines[0]) if lines else {}
+    except (OSError, EOFError, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError(f"Unreadable catalog manifest: {e}")
+    if header.get("format") != CATALOG_FORMAT:
+        raise ManifestFormatError(f"Unsupported catalog manifest format: {header.get('format')}")
+
+    datasets: dict[str, dict[str, Any]] = {}
+    for line in lines[1:]:
+        if not line.strip():
+            continue
+        try:
+            entry = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Unreadable catalog manifest entry: {e}")
+        if isinstance(entry, dict) and entry.get("id") and isinstance(entry.get("metadata"), dict):
+            datasets[entry["id"]] = {"mtime": entry.get("mtime"), "metadata": entry["metadata"]}
+    return datasets
+
+
+def read_manifest(storage) -> Optional[dict[str, dict[str, Any]]]:
+    """
+    Fetch the manifest through the blob cache (one 304 if it is unchanged).
+
+    Args:
+        storage: Storage backend
+
+    Returns:
+        Entries by dataset id, or None if there is no usable manifest
+
+    Raises:
+        StorageConnectionError, StorageAuthError: If the server can't be reached
+    """
+    from hei_datahub.services.blob_cache import get_blob_cache
+
+    try:
+        data = get_blob_cache().fetch_bytes(storage, CATALOG_PATH)
+    except StorageNotFoundError:
+        return None
+    try:
+        return decode_manifest(data)
+    except ValueError as e:
+        logger.warning(f"Ignoring catalog manifest: {e}")
+        return None
+
+
+def fresh_entries(datasets: dict[str, dict[str, Any]], entries) -> dict[str, dict[str, Any]]:
+    """
+    Metadata of the datasets whose manifest entry is still current.
+
+    Args:
+        datasets: Result of read_manifest()
+        entries: Library root listing
+
+    Returns:
+        Metadata by dataset id, for folders whose mtime equals the entry's
+    """
+    fresh = {}
+    for entry in entries:
+        if not entry.is_dir or entry.modified is None:
+            continue
+        manifest_entry = datasets.get(entry.name)
+        if manifest_entry is not None and manifest_entry.get("mtime") == int(utc_timestamp(entry.modified)):
+            fresh[entry.name] = manifest_entry["metadata"]
+    return fresh
+
+
+def update_manifest(
+    storage,
+    upserts: Optional[dict[str, dict[str, Any]]] = None,
+    deletes: Optional[set[str]] = None,
+    keep: Optional[set[str]] = None,
+    create: bool = False,
+) -> bool:
+    """
+    Apply changes to the manifest under optimistic concurrency.
+
+    An upsert never replaces an entry with a newer folder mtime, so a slow
+    writer can't undo a faster one's change.
+
+    Args:
+        storage: Storage backend
+        upserts: New entries ({"mtime": ..., "metadata": {...}}) by dataset id
+        deletes: Dataset ids to drop
+        keep: If given, drop every entry not in it (datasets gone from the library)
+        create: Create the manifest if the library has none
+
+    Returns:
+        True if the manifest was written
+    """
+    upserts = upserts or {}
+    deletes = deletes or set()
+
+    for attempt in range(MAX_UPDATE_ATTEMPTS):
+        fd, name = tempfile.mkstemp(suffix=".jsonl.gz")
+        os.close(fd)
+        tmp_path = Path(name)
+        try:
+            try:
+                info = storage.fetch_if_changed(CATALOG_PATH, str(tmp_path))
+            except StorageNotFoundError:
+                if not create:
+                    logger.debug("No catalog manifest in the library, nothing to update")
+                    return False
+                datasets, etag = {}, None
+            else:
+                etag = info.etag if info is not None else None
+                if etag is None:
+                    logger.warning("Server sent no ETag for the catalog manifest, not updating it")
+                    return False
+                try:
+                    datasets = decode_manifest(tmp_path.read_bytes())
+                except ManifestFormatError as e:
+                    logger.warning(f"Not updating catalog manifest: {e}")
+                    return False
+                except ValueError as e:
+                    if not create:
+                        # Replaced by the next crawl that may create one
+                        logger.warning(f"Not updating unreadable catalog manifest: {e}")
+                        return False
+                    logger.warning(f"Replacing unreadable catalog manifest: {e}")
+                    datasets = {}
+
+            for dataset_id, entry in upserts.items():
+                current = datasets.get(dataset_id)
+                if current is None or (current.get("mtime") or 0) <= (entry.get("mtime") or 0):
+                    datasets[dataset_id] = entry
+            for dataset_id in deletes:
+                datasets.pop(dataset_id, None)
+            if keep is not None:
+                datasets = {dataset_id: entry for dataset_id, entry in datasets.items() if dataset_id in keep}
+
+            tmp_path.write_bytes(encode_manifest(datasets))
+            storage.upload_if_match(tmp_path, CATALOG_PATH, etag)
+            logger.info(
+                f"Updated catalog manifest ({len(upserts)} changed, {len(deletes)} removed, "
+                f"{len(datasets)} datasets)"
+            )
+            return True
+
+        except StoragePreconditionError:
+            delay = UPDATE_BACKOFF_SEC * (2 ** attempt) * (0.5 + random.random())
+            logger.debug(f"Catalog manifest changed while updating it, retrying in {delay:.2f}s")
+            time.sleep(delay)
+        except StorageAuthError as e:
+            # Read-only access to the library: others keep the manifest up to date
+            logger.debug(f"Not allowed to update the catalog manifest: {e}")
+            return False
+        except (StorageError, OSError) as e:
+            logger.warning(f"Could not update the catalog manifest: {e}")
+            return False
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+    logger.warning(f"Gave up updating the catalog manifest after {MAX_UPDATE_ATTEMPTS} conflicting writes")
+    return False
+
+
+def folder_mtimes(storage, dataset_ids) -> dict[str, Optional[int]]:
+    """
+    Current folder mtimes of datasets (one listing of the library root).
+
+    Args:
+        storage: Storage backend
+        dataset_ids: Datasets to look up
+
+    Returns:
+        mtime by dataset id (None if the folder is missing or has no date)
+    """
+    wanted = set(dataset_ids)
+    mtimes: dict[str, Optional[int]] = dict.fromkeys(wanted)
+    cache = getattr(storage, "listing_cache", None)
+    if cache is not None:
+        # Writes inside a dataset folder moved its mtime in the root listing
+        cache.invalidate("")
+    for entry in storage.listdir(""):
+        if entry.is_dir and entry.name in wanted and entry.modified is not None:
+            mtimes[entry.name] = int(utc_timestamp(entry.modified))
+    return mtimes
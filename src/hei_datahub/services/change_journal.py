@@ -0,0 +1,315 @@
+"""
+Append-only change journal in the library.
+
+Reading the catalog manifest after every change means downloading all of
+it again. Clients that add, edit or delete datasets therefore append a
+small record to a journal instead, and readers fetch only the bytes they
+haven't seen.
+
+Each client writes only its own segment, JOURNAL_FOLDER/<client id>.jsonl,
+so concurrent clients never write the same file. WebDAV has no append: a
+client appends by uploading its segment again with If-Match on the ETag it
+read, and starts over on 412 (e.g. two processes of the same client). One
+JSON line per change:
+
+    {"gen": "<generation>", "op": "put", "id": "<dataset>", "mtime": 1760000000, "ts": ..., "metadata": {...}}
+    {"gen": "<generation>", "op": "delete", "id": "<dataset>", "ts": ...}
+
+Readers keep a generation and byte offset per segment (in index_meta) and
+fetch new bytes with `Range: bytes=<offset>-`. As with manifest entries, a
+put record is only used while the dataset folder's mtime in the listing
+still equals the record's mtime, so a lost or skipped record only means
+fetching that dataset's metadata.yaml.
+
+Compaction: once a segment grows beyond COMPACT_BYTES, its owner folds the
+latest records into the catalog manifest and starts a new generation (an
+empty segment; if the manifest can't be updated, the latest put per dataset
+is kept). Readers that find another generation at their offset, or a
+segment shorter than it, read it again from the start. Segments nobody
+wrote for STALE_SEGMENT_DAYS are removed during compaction.
+"""
+import json
+import logging
+import os
+import random
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Optional
+
+from hei_datahub.infra.paths import STATE_DIR
+from hei_datahub.services.webdav_storage import (
+    RangeNotSupportedError,
+    StorageAuthError,
+    StorageError,
+    StorageNotFoundError,
+    StoragePreconditionError,
+    utc_timestamp,
+)
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_FOLDER = "_CHANGE_JOURNAL"
+CLIENT_ID_FILE = STATE_DIR / "client-id"
+SEGMENT_SUFFIX = ".jsonl"
+# Segment size that triggers compaction, in bytes
+COMPACT_BYTES = 64 * 1024
+STALE_SEGMENT_DAYS = 90
+# Read-modify-write rounds before giving up on an append
+MAX_APPEND_ATTEMPTS = 5
+APPEND_BACKOFF_SEC = 0.2
+
+PUT = "put"
+DELETE = "delete"
+
+
+def get_client_id() -> str:
+    """Stable id of this installation (names its journal segment)."""
+    try:
+        client_id = CLIENT_ID_FILE.read_text(encoding="utf-8").strip()
+        if client_id:
+            return client_id
+    except OSError:
+        pass
+    client_id = uuid.uuid4().hex[:16]
+    try:
+        CLIENT_ID_FILE.parent.mkdir(parents=True, exist_ok=True)
+        CLIENT_ID_FILE.write_text(client_id + "\n", encoding="utf-8")
+    except OSError as e:
+        logger.warning(f"Could not save client id: {e}")
+    return client_id
+
+
+def segment_path(client_id: str) -> str:
+    """Library path of a client's journal segment."""
+    return f"{JOURNAL_FOLDER}/{client_id}{SEGMENT_SUFFIX}"
+
+
+def put_record(dataset_id: str, mtime: int, metadata: dict[str, Any]) -> dict[str, Any]:
+    """Record of a dataset's metadata as written, with its folder mtime afterwards."""
+    return {"op": PUT, "id": dataset_id, "mtime": mtime, "metadata": metadata}
+
+
+def delete_record(dataset_id: str) -> dict[str, Any]:
+    """Record of a deleted dataset."""
+    return {"op": DELETE, "id": dataset_id}
+
+
+def encode_records(records: list[dict[str, Any]]) -> bytes:
+    """Serialize records as JSON lines."""
+    return b"".join(
+        (json.dumps(record, ensure_ascii=False, default=str) + "\n").encode("utf-8") for record in records
+    )
+
+
+def parse_records(data: bytes) -> tuple[list[dict[str, Any]], int, bool]:
+    """
+    Parse complete JSON lines.
+
+    Returns:
+        Tuple of (records, bytes consumed up to the last complete line,
+        whether every line parsed)
+    """
+    end = data.rfind(b"\n") + 1
+    records = []
+    clean = True
+    for line in data[:end].splitlines():
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            clean = False
+            continue
+        if isinstance(record, dict) and record.get("id"):
+            records.append(record)
+        else:
+            clean = False
+    return records, end, clean
+
+
+def latest_puts(records: list[dict[str, Any]]) -> dict[str, dict[str, Any]]:
+    """
+    Newest put per dataset, in catalog manifest entry form.
+
+    Returns:
+        {"mtime": ..., "metadata": {...}} by dataset id
+    """
+    latest: dict[str, dict[str, Any]] = {}
+    for record in records:
+        if record.get("op") != PUT or not isinstance(record.get("metadata"), dict):
+            continue
+        current = latest.get(record["id"])
+        if current is None or (current["mtime"] or 0) <= (record.get("mtime") or 0):
+            latest[record["id"]] = {"mtime": record.get("mtime"), "metadata": record["metadata"]}
+    return latest
+
+
+def append_records(storage, records: list[dict[str, Any]], client_id: Optional[str] = None) -> bool:
+    """
+    Append records to this client's segment, compacting it when it is large.
+
+    Args:
+        storage: Storage backend
+        records: Records from put_record() / delete_record()
+        client_id: Segment owner (default: this installation)
+
+    Returns:
+        True if the records were written
+    """
+    if not records:
+        return True
+    client_id = client_id or get_client_id()
+    path = segment_path(client_id)
+
+    for attempt in range(MAX_APPEND_ATTEMPTS):
+        fd, name = tempfile.mkstemp(suffix=SEGMENT_SUFFIX)
+        os.close(fd)
+        tmp_path = Path(name)
+        try:
+            try:
+                info = storage.fetch_if_changed(path, str(tmp_path))
+                existing = tmp_path.read_bytes()
+                etag = info.etag if info is not None else None
+                if etag is None:
+                    logger.warning("Server sent no ETag for the journal segment, not appending")
+                    return False
+            except StorageNotFoundError:
+                storage.make_collections([JOURNAL_FOLDER])
+                existing, etag = b"", None
+
+            current, consumed, _ = parse_records(existing)
+            existing = existing[:consumed]
+            generation = current[0].get("gen") if current else uuid.uuid4().hex[:12]
+            now = time.time()
+            added = encode_records([dict(record, gen=generation, ts=now) for record in records])
+
+            if len(existing) + len(added) > COMPACT_BYTES:
+                data = _compact(storage, current + [dict(r, gen=generation, ts=now) for r in records], client_id)
+            else:
+                data = existing + added
+
+            tmp_path.write_bytes(data)
+            storage.upload_if_match(tmp_path, path, etag)
+            logger.debug(f"Appended {len(records)} records to change journal {path}")
+            return True
+
+        except StoragePreconditionError:
+            delay = APPEND_BACKOFF_SEC * (2 ** attempt) * (0.5 + random.random())
+            logger.debug(f"Journal segment changed while appending, retrying in {delay:.2f}s")
+            time.sleep(delay)
+        except StorageAuthError as e:
+            logger.debug(f"Not allowed to write the change journal: {e}")
+            return False
+        except (StorageError, OSError) as e:
+            logger.warning(f"Could not append to the change journal: {e}")
+            return False
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+    logger.warning(f"Gave up appending to the change journal after {MAX_APPEND_ATTEMPTS} conflicting writes")
+    return False
+
+
+def _compact(storage, records: list[dict[str, Any]], client_id: str) -> bytes:
+    """
+    Fold a segment's records into the catalog manifest and start a new generation.
+
+    Returns:
+        Contents of the new segment
+    """
+    from hei_datahub.services.catalog_manifest import update_manifest
+
+    latest = latest_puts(records)
+    deletes = {
+        record["id"] for record in records
+        if record.get("op") == DELETE and record["id"] not in latest
+    }
+    generation = uuid.uuid4().hex[:12]
+    now = time.time()
+
+    if update_manifest(storage, upserts=latest, deletes=deletes):
+        logger.info(f"Compacted change journal: {len(records)} records folded into the catalog manifest")
+        kept: list[dict[str, Any]] = []
+    else:
+        # No manifest to fold into: keep what readers still need
+        logger.info(f"Compacted change journal: kept the latest of {len(records)} records")
+        kept = [put_record(dataset_id, entry["mtime"], entry["metadata"]) for dataset_id, entry in latest.items()]
+
+    _remove_stale_segments(storage, client_id)
+    return encode_records([dict(record, gen=generation, ts=now) for record in kept])
+
+
+def _remove_stale_segments(storage, client_id: str) -> None:
+    """Delete segments of clients that haven't written for STALE_SEGMENT_DAYS."""
+    cutoff = time.time() - STALE_SEGMENT_DAYS * 24 * 3600
+    try:
+        for entry in storage.listdir(JOURNAL_FOLDER):
+            if entry.is_dir or entry.name == f"{client_id}{SEGMENT_SUFFIX}" or entry.modified is None:
+                continue
+            if utc_timestamp(entry.modified) < cutoff:
+                storage.delete(entry.path)
+                logger.info(f"Removed stale change journal segment {entry.name}")
+    except StorageError as e:
+        logger.debug(f"Could not clean up stale journal segments: {e}")
+
+
+def read_new_records(
+    storage, offsets: dict[str, dict[str, Any]]
+) -> tuple[list[dict[str, Any]], dict[str, dict[str, Any]]]:
+    """
+    Fetch the records appended since the last read.
+
+    Args:
+        storage: Storage backend
+        offsets: Generation and byte offset per segment from the previous read
+
+    Returns:
+        Tuple of (new records, offsets to store for the next read)
+    """
+    records: list[dict[str, Any]] = []
+    new_offsets: dict[str, dict[str, Any]] = {}
+
+    for entry in storage.listdir(JOURNAL_FOLDER):
+        if entry.is_dir or not entry.name.endswith(SEGMENT_SUFFIX):
+            continue
+        state = offsets.get(entry.name) or {}
+        generation, offset = state.get("gen"), int(state.get("offset") or 0)
+        if entry.size is not None and entry.size < offset:
+            # Compacted since the last read
+            generation, offset = None, 0
+        if entry.size is not None and entry.size == offset:
+            new_offsets[entry.name] = {"gen": generation, "offset": offset}
+            continue
+
+        data = _read_from(storage, entry.path, offset)
+        found, consumed, clean = parse_records(data)
+        if offset and (not clean or (found and found[0].get("gen") != generation)):
+            # Another generation now: everything in it is new to us
+            logger.debug(f"Journal segment {entry.name} was compacted, reading it again")
+            offset = 0
+            data = _read_from(storage, entry.path, 0)
+            found, consumed, clean = parse_records(data)
+
+        records.extend(found)
+        new_offsets[entry.name] = {
+            "gen": found[-1].get("gen") if found else generation,
+            "offset": offset + consumed,
+        }
+
+    logger.debug(f"Read {len(records)} new change journal records from {len(new_offsets)} segments")
+    return records, new_offsets
+
+
+def _read_from(storage, remote_path: str, offset: int) -> bytes:
+    """Bytes of a file from an offset (a Range request)."""
+    chunks: list[bytes] = []
+    try:
+        storage.read_range(remote_path, offset, None, chunks.append)
+    except RangeNotSupportedError:
+        chunks = []
+        storage.read_range(remote_path, 0, None, chunks.append)
+        return b"".join(chunks)[offset:]
+    return b"".join(chunks)
+
@@ -0,0 +1,251 @@
+"""
+Circuit breaker for storage requests (offline mode).
+
+When Heibox can't be reached, every request waits out connect_timeout and
+its retries. The breaker counts consecutive connection failures (timeouts,
+refused connections, DNS errors) and opens after a few of them. While it is
+open, storage calls fail at once with StorageOfflineError, so callers fall
+back to the index and cached listings and the UI shows an offline
+indicator instead of a frozen screen.
+
+After a cool-down the breaker lets a single request through as a probe
+(half-open): success closes it, failure re-opens it with a doubled
+cool-down. A background thread does the probing with a plain TCP connect,
+so reconnecting doesn't depend on the user trying again.
+
+Answers from the server (including 401/404/5xx) count as "reachable"; only
+connection failures trip the breaker.
+"""
+import logging
+import socket
+import threading
+import time
+from typing import Any, Callable, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"  # Requests go through
+OPEN = "open"  # Offline: requests are rejected without being sent
+HALF_OPEN = "half_open"  # One probe request is in flight
+
+DEFAULT_FAILURE_THRESHOLD = 2
+DEFAULT_RESET_TIMEOUT = 10.0
+# Cool-downs double after failed probes up to this, in seconds
+MAX_RESET_TIMEOUT = 120.0
+# Timeout of the background TCP probe, in seconds
+PROBE_TIMEOUT = 3.0
+
+StateListener = Callable[[str], None]
+
+
+def tcp_probe(url: str, timeout: float = PROBE_TIMEOUT) -> Callable[[], None]:
+    """
+    Build a probe that opens (and closes) a TCP connection to a URL's host.
+
+    Args:
+        url: Server URL (e.g., the WebDAV base URL)
+        timeout: Connect timeout in seconds
+
+    Returns:
+        Callable raising OSError while the host is unreachable
+    """
+    parsed = urlparse(url)
+    host = parsed.hostname or "localhost"
+    port = parsed.port or (443 if parsed.scheme == "https" else 80)
+
+    def probe() -> None:
+        with socket.create_connection((host, port), timeout=timeout):
+            pass
+
+    return probe
+
+
+class CircuitBreaker:
+    """Tracks storage reachability shared by all users of a backend."""
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        reset_timeout: float = DEFAULT_RESET_TIMEOUT,
+        probe: Optional[Callable[[], None]] = None,
+    ):
+        """
+        Initialize circuit breaker.
+
+        Args:
+            failure_threshold: Consecutive connection failures that open the breaker
+            reset_timeout: Seconds until the first probe after opening
+            probe: Checks reachability in the background while open (raises if unreachable)
+        """
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.probe = probe
+        self._state = CLOSED
+        self._failures = 0
+        self._cooldown = reset_timeout
+        self._retry_at = 0.0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._prober: Optional[threading.Thread] = None
+        self._listeners: list[StateListener] = []
+        self.opened = 0
+        self.rejected = 0
+        self.last_error: Optional[str] = None
+
+    @property
+    def state(self) -> str:
+        """CLOSED, OPEN or HALF_OPEN."""
+        return self._state
+
+    @property
+    def is_offline(self) -> bool:
+        """Whether requests are currently being rejected."""
+        return self._state != CLOSED
+
+    def subscribe(self, listener: StateListener) -> None:
+        """
+        Call a function with the new state whenever it changes.
+
+        Listeners run on the thread that caused the change and must hand UI
+        work over to their own event loop.
+        """
+        with self._lock:
+            if listener not in self._listeners:
+                self._listeners.append(listener)
+
+    def unsubscribe(self, listener: StateListener) -> None:
+        """Stop calling a listener."""
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def allow(self) -> bool:
+        """
+        Check whether a request may be sent.
+
+        Returns:
+            True if the request should go ahead (the caller must then report
+            its outcome); False if storage is offline
+        """
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN and time.monotonic() >= self._retry_at:
+                # This caller is the probe
+                self._state = HALF_OPEN
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self) -> None:
+        """Report that the server answered."""
+        with self._lock:
+            self._failures = 0
+            self._cooldown = self.reset_timeout
+            changed = self._state != CLOSED
+            self._state = CLOSED
+        if changed:
+            logger.info("Storage reachable again, leaving offline mode")
+            self._wake.set()
+            self._notify(CLOSED)
+
+    def record_failure(self, error: Optional[BaseException] = None) -> None:
+        """Report a connection failure."""
+        with self._lock:
+            self._failures += 1
+            if error is not None:
+                self.last_error = str(error)
+            went_offline = self._state == CLOSED
+            if self._state == HALF_OPEN:
+                self._cooldown = min(self._cooldown * 2, MAX_RESET_TIMEOUT)
+            elif self._state != CLOSED or self._failures < self.failure_threshold:
+                return
+            else:
+                self.opened += 1
+            self._state = OPEN
+            self._retry_at = time.monotonic() + self._cooldown
+            cooldown = self._cooldown
+        if went_offline:
+            logger.warning(f"Storage unreachable, offline mode (next probe in {cooldown:g}s): {error}")
+            self._start_prober()
+            self._notify(OPEN)
+        else:
+            logger.debug(f"Storage still unreachable, next probe in {cooldown:g}s: {error}")
+
+    def release(self) -> None:
+        """Report that a request ended without an outcome (e.g. it was cancelled)."""
+        with self._lock:
+            if self._state == HALF_OPEN:
+                # Let the next caller probe instead
+                self._state = OPEN
+                self._retry_at = 0.0
+
+    def reset(self) -> None:
+        """Forget all failures (e.g. after the configuration changed)."""
+        self.record_success()
+
+    def _notify(self, state: str) -> None:
+        with self._lock:
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(state)
+            except Exception as e:
+                logger.debug(f"Breaker listener failed: {e}")
+
+    def _start_prober(self) -> None:
+        """Probe in the background until the breaker closes."""
+        if self.probe is None:
+            return
+        with self._lock:
+            if self._prober is not None and self._prober.is_alive():
+                return
+            self._wake.clear()
+            self._prober = threading.Thread(target=self._probe_loop, name="storage-probe", daemon=True)
+            self._prober.start()
+
+    def _probe_loop(self) -> None:
+        while self._state != CLOSED:
+            wait = self._retry_at - time.monotonic()
+            if wait > 0 and self._wake.wait(wait):
+                break
+            if not self.allow():
+                # Another request is probing; check back shortly
+                self._wake.wait(1.0)
+                continue
+            try:
+                self.probe()
+            except Exception as e:
+                self.record_failure(e)
+            else:
+                self.record_success()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get breaker counters for diagnostics."""
+        with self._lock:
+            return {
+                "state": self._state,
+                "consecutive_failures": self._failures,
+                "times_opened": self.opened,
+                "rejected": self.rejected,
+                "cooldown_sec": round(self._cooldown, 1),
+                "last_error": self.last_error or "-",
+            }
+
+
+# Global breaker for the storage backend
+_breaker: Optional[CircuitBreaker] = None
+
+
+def get_circuit_breaker() -> CircuitBreaker:
+    """Get the storage circuit breaker (created closed, without a probe, on first use)."""
+    global _breaker
+    if _breaker is None:
+        _breaker = CircuitBreaker()
+    return _breaker
+
+
+def is_offline() -> bool:
+    """Whether storage is currently treated as unreachable."""
+    return _breaker is not None and _breaker.is_offline
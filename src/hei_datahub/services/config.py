@@ -80,8 +80,9 @@ class UIConfig(BaseModel):
 
 
 class StorageConfig(BaseModel):
-    """Storage backend configuration for cloud/remote access (WebDAV-only)."""
-    backend: str = Field(default="webdav")  # Cloud storage via WebDAV
+    """Storage backend configuration for cloud/remote access (WebDAV or a local mount)."""
+    backend: str = Field(default="webdav")  # webdav (cloud) or filesystem (locally mounted library)
+    mount_path: Optional[str] = None  # Library mount point for the filesystem backend (davfs2, Seafile Drive)
     base_url: Optional[str] = None  # WebDAV base URL (e.g., https://heibox.uni-heidelberg.de/seafdav)
     library: Optional[str] = None  # Library/folder name (e.g., testing-hei-datahub)
     username: Optional[str] = None  # WebDAV username (empty = use env)
@@ -89,14 +90,50 @@ class StorageConfig(BaseModel):
     connect_timeout: int = Field(default=5, ge=1, le=30)  # Connection timeout in seconds
     read_timeout: int = Field(default=60, ge=10, le=300)  # Read timeout in seconds
     max_retries: int = Field(default=3, ge=0, le=10)  # Max retry attempts on 5xx errors
+    transport: str = Field(default="requests")  # HTTP client: requests (threads) or asyncio (pooled)
+    pool_size: int = Field(default=10, ge=1, le=64)  # Keep-alive connections per host
+    download_segments: int = Field(default=4, ge=1, le=16)  # Parallel byte ranges per large file
+    download_chunk_kb: int = Field(default=1024, ge=16, le=16384)  # Read/write size for downloads
+    download_connections: int = Field(default=6, ge=1, le=64)  # Connection cap for "download all"/pull
+    listing_cache_ttl: int = Field(default=30, ge=0, le=3600)  # Seconds a listing is reused (0 = no cache)
+    listing_cache_size: int = Field(default=256, ge=1, le=10000)  # Max cached directory listings
+    coalesce_window_ms: int = Field(default=1000, ge=0, le=10000)  # Reuse of finished identical reads
+    background_connections: int = Field(default=2, ge=1, le=64)  # Concurrent indexer requests
+    background_kbps: int = Field(default=0, ge=0)  # Indexer bandwidth limit in KiB/s (0 = unlimited)
+    seafile_api: str = Field(default="auto")  # Seafile REST API for listings/downloads: auto or off
+    offline_after_failures: int = Field(default=2, ge=1, le=10)  # Connection failures before offline mode
+    offline_retry_sec: int = Field(default=10, ge=1, le=600)  # First reconnect probe after going offline
+    blob_cache_mb: int = Field(default=1024, ge=0)  # Local cache of downloaded files in MB (0 = off)
+    blob_cache_hardlinks: bool = Field(default=False)  # Hard-link cached files into downloads (shared inode)
+    peek_kb: int = Field(default=64, ge=1, le=16384)  # Bytes read from the start of a file for previews, in KB
+
+    @field_validator("seafile_api")
+    @classmethod
+    def validate_seafile_api(cls, v: str) -> str:
+        """Validate Seafile REST API mode."""
+        allowed = {"auto", "off"}
+        if v not in allowed:
+            logger.warning(f"Unknown seafile_api mode '{v}', falling back to 'auto'.")
+            return "auto"
+        return v
+
+    @field_validator("transport")
+    @classmethod
+    def validate_transport(cls, v: str) -> str:
+        """Validate WebDAV HTTP transport."""
+        allowed = {"requests", "asyncio"}
+        if v not in allowed:
+            logger.warning(f"Unknown storage transport '{v}', falling back to 'requests'.")
+            return "requests"
+        return v
 
     @field_validator("backend")
     @classmethod
     def validate_backend(cls, v: str) -> str:
-        """Validate storage backend type (WebDAV only)."""
-        allowed = {"webdav"}
+        """Validate storage backend type."""
+        allowed = {"webdav", "filesystem"}
         if v not in allowed:
-            logger.warning(f"Unknown storage backend '{v}', falling back to 'webdav'. Only WebDAV is supported.")
+            logger.warning(f"Unknown storage backend '{v}', falling back to 'webdav'. Available: {', '.join(sorted(allowed))}")
             return "webdav"
         return v
 
@@ -224,6 +261,7 @@ class ConfigManager:
             if "storage" not in data:
                 data["storage"] = {
                     "backend": "webdav",
+                    "mount_path": None,
                     "base_url": None,
                     "library": None,
                     "username": None,
@@ -231,6 +269,22 @@ class ConfigManager:
                     "connect_timeout": 5,
                     "read_timeout": 60,
                     "max_retries": 3,
+                    "transport": "requests",
+                    "pool_size": 10,
+                    "download_segments": 4,
+                    "download_chunk_kb": 1024,
+                    "download_connections": 6,
+                    "listing_cache_ttl": 30,
+                    "listing_cache_size": 256,
+                    "coalesce_window_ms": 1000,
+                    "background_connections": 2,
+                    "background_kbps": 0,
+                    "seafile_api": "auto",
+                    "offline_after_failures": 2,
+                    "offline_retry_sec": 10,
+                    "blob_cache_mb": 1024,
+                    "blob_cache_hardlinks": False,
+                    "peek_kb": 64,
                 }
 
             # Update version if it was v1
@@ -350,9 +404,10 @@ class ConfigManager:
                 f.write("\n")
 
                 # Write storage section
-                f.write("# Storage backend (WebDAV cloud storage only)\n")
+                f.write("# Storage backend (WebDAV cloud storage or a locally mounted library)\n")
                 f.write("storage:\n")
-                f.write(f"  backend: {data['storage']['backend']}  # webdav (cloud storage)\n")
+                f.write(f"  backend: {data['storage']['backend']}  # webdav (cloud storage) or filesystem (local mount)\n")
+                f.write(f"  mount_path: {data['storage'].get('mount_path') or 'null'}  # library mount point for the filesystem backend\n")
                 f.write(f"  base_url: {data['storage'].get('base_url') or 'null'}  # WebDAV URL (e.g., https://heibox.uni-heidelberg.de/seafdav)\n")
                 f.write(f"  library: {data['storage'].get('library') or 'null'}  # Library/folder name\n")
                 f.write(f"  username: {data['storage'].get('username') or 'null'}  # WebDAV username (empty = use env)\n")
@@ -360,6 +415,22 @@ class ConfigManager:
                 f.write(f"  connect_timeout: {data['storage']['connect_timeout']}  # seconds\n")
                 f.write(f"  read_timeout: {data['storage']['read_timeout']}  # seconds\n")
                 f.write(f"  max_retries: {data['storage']['max_retries']}  # retry attempts\n")
+                f.write(f"  transport: {data['storage'].get('transport', 'requests')}  # requests or asyncio (pooled keep-alive)\n")
+                f.write(f"  pool_size: {data['storage'].get('pool_size', 10)}  # keep-alive connections per host\n")
+                f.write(f"  download_segments: {data['storage'].get('download_segments', 4)}  # parallel ranges per large file\n")
+                f.write(f"  download_chunk_kb: {data['storage'].get('download_chunk_kb', 1024)}  # download read/write size\n")
+                f.write(f"  download_connections: {data['storage'].get('download_connections', 6)}  # connection cap for dataset downloads\n")
+                f.write(f"  listing_cache_ttl: {data['storage'].get('listing_cache_ttl', 30)}  # seconds a directory listing is reused (0 = off)\n")
+                f.write(f"  listing_cache_size: {data['storage'].get('listing_cache_size', 256)}  # max cached directory listings\n")
+                f.write(f"  coalesce_window_ms: {data['storage'].get('coalesce_window_ms', 1000)}  # identical reads share results this long\n")
+                f.write(f"  background_connections: {data['storage'].get('background_connections', 2)}  # concurrent indexer requests\n")
+                f.write(f"  background_kbps: {data['storage'].get('background_kbps', 0)}  # indexer bandwidth limit in KiB/s (0 = unlimited)\n")
+                f.write(f"  seafile_api: {data['storage'].get('seafile_api', 'auto')}  # auto (REST API when the token allows) or off (WebDAV only)\n")
+                f.write(f"  offline_after_failures: {data['storage'].get('offline_after_failures', 2)}  # connection failures before offline mode\n")
+                f.write(f"  offline_retry_sec: {data['storage'].get('offline_retry_sec', 10)}  # first reconnect probe while offline\n")
+                f.write(f"  blob_cache_mb: {data['storage'].get('blob_cache_mb', 1024)}  # local cache of downloaded files in MB (0 = off)\n")
+                f.write(f"  blob_cache_hardlinks: {str(data['storage'].get('blob_cache_hardlinks', False)).lower()}  # hard-link cached files into downloads\n")
+                f.write(f"  peek_kb: {data['storage'].get('peek_kb', 64)}  # KB read from the start of a file for previews\n")
                 f.write("\n")
 
                 # Write telemetry section
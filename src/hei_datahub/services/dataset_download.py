@@ -0,0 +1,476 @@
+"""
+Recursive parallel download of a whole dataset folder.
+
+The folder tree is listed first (subfolders in parallel) to plan the
+transfer: files whose local copy already has the remote size and mtime are
+skipped, files the blob cache holds with that size and mtime are copied
+from it (see blob_cache), the rest are downloaded concurrently with
+SegmentedDownloader and added to the cache.
+Every HTTP request of the run holds one slot of a shared connection cap
+(`storage.download_connections`), so many small files and a few segmented
+large ones never open more connections than that between them.
+
+Used by the dataset details screen ("Download all") and `hei-datahub pull`.
+"""
+import logging
+import os
+import threading
+import time
+from collections.abc import Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Optional
+
+from hei_datahub.services.segmented_download import (
+    MIN_SEGMENT_SIZE,
+    DownloadCancelledError,
+    SegmentedDownloader,
+)
+from hei_datahub.services.webdav_storage import (
+    FileEntry,
+    RemoteFileInfo,
+    StorageError,
+    utc_timestamp,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONNECTIONS = 6
+# Where the details screen puts downloaded datasets (one folder per dataset)
+DEFAULT_DOWNLOAD_DIR = Path.home() / "Downloads" / "hei-datahub"
+# Progress callbacks are throttled to this interval
+PROGRESS_INTERVAL_SEC = 0.25
+# Throughput is averaged over roughly this window for the ETA
+RATE_WINDOW_SEC = 5.0
+
+
+@dataclass
+class FileTransfer:
+    """One remote file and where it goes."""
+    remote_path: str
+    local_path: Path
+    size: Optional[int]
+    modified: Optional[float]  # Remote mtime (POSIX timestamp)
+
+
+@dataclass
+class DownloadPlan:
+    """Files to fetch and files already up to date."""
+    dataset_id: str
+    dest: Path
+    transfers: list[FileTransfer] = field(default_factory=list)
+    skipped: list[FileTransfer] = field(default_factory=list)
+
+    @property
+    def total_bytes(self) -> int:
+        """Bytes to download (files of unknown size count as 0)."""
+        return sum(t.size or 0 for t in self.transfers)
+
+
+@dataclass
+class DownloadStats:
+    """Aggregate progress of a dataset download."""
+    files_total: int
+    bytes_total: int
+    files_done: int = 0
+    files_skipped: int = 0
+    files_cached: int = 0  # Copied from the local blob cache instead of downloaded
+    files_failed: int = 0
+    bytes_done: int = 0
+    started: float = field(default_factory=time.monotonic)
+    rate: float = 0.0  # Bytes per second (recent average)
+    errors: list[str] = field(default_factory=list)
+
+    @property
+    def eta_sec(self) -> Optional[float]:
+        """Estimated seconds left, or None while the rate is unknown."""
+        if self.rate <= 0:
+            return None
+        return max(0, self.bytes_total - self.bytes_done) / self.rate
+
+    @property
+    def elapsed_sec(self) -> float:
+        """Seconds since the download started."""
+        return time.monotonic() - self.started
+
+
+def format_bytes(size: float) -> str:
+    """Format a byte count for progress lines."""
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
+
+
+def format_progress(stats: DownloadStats) -> str:
+    """One-line summary: files, bytes, throughput and ETA."""
+    line = (
+        f"{stats.files_done + stats.files_failed}/{stats.files_total} files, "
+        f"{format_bytes(stats.bytes_done)} / {format_bytes(stats.bytes_total)}"
+    )
+    if stats.rate > 0:
+        line += f" at {format_bytes(stats.rate)}/s"
+    eta = stats.eta_sec
+    if eta is not None and stats.bytes_done < stats.bytes_total:
+        minutes, seconds = divmod(int(eta), 60)
+        line += f", ETA {minutes}:{seconds:02d}"
+    if stats.files_failed:
+        line += f" ({stats.files_failed} failed)"
+    return line
+
+
+class _CappedStorage:
+    """Storage proxy that holds a connection slot for every request."""
+
+    def __init__(self, storage, slots: threading.Semaphore):
+        """Wrap a storage backend with a shared connection cap."""
+        self._storage = storage
+        self._slots = slots
+
+    def probe(self, remote_path: str) -> RemoteFileInfo:
+        """Get size and range support of a file."""
+        with self._slots:
+            return self._storage.probe(remote_path)
+
+    def read_range(self, remote_path, start, end, sink, chunk_size) -> None:
+        """Stream a byte range of a file into a callback."""
+        with self._slots:
+            self._storage.read_range(remote_path, start, end, sink, chunk_size)
+
+    def listdir(self, path: str = "") -> list[FileEntry]:
+        """List directory contents."""
+        with self._slots:
+            return self._storage.listdir(path)
+
+    def iter_listdir(self, path: str = "") -> Iterator[FileEntry]:
+        """Yield directory entries as they arrive (the listing's connection keeps its slot)."""
+        with self._slots:
+            yield from self._storage.iter_listdir(path)
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._storage, name)
+        if name == "list_recursive":
+            def capped(*args, **kwargs):
+                with self._slots:
+                    return attr(*args, **kwargs)
+            return capped
+        return attr
+
+
+class DatasetDownloader:
+    """Plans and runs the download of a dataset folder."""
+
+    def __init__(
+        self,
+        storage,
+        connections: int = DEFAULT_CONNECTIONS,
+        segments: int = 4,
+        chunk_size: int = 1024 * 1024,
+        max_retries: int = 3,
+        cache=None,
+    ):
+        """
+        Initialize dataset downloader.
+
+        Args:
+            storage: Storage backend
+            connections: Most HTTP requests in flight at once for this download
+            segments: Parallel ranges per large file
+            chunk_size: Read/write size in bytes
+            max_retries: Attempts per file segment after a broken transfer
+            cache: BlobCache to copy unchanged files from and add downloads to
+        """
+        self.connections = max(1, connections)
+        self.cache = cache
+        self.storage = _CappedStorage(storage, threading.BoundedSemaphore(self.connections))
+        self.files = SegmentedDownloader(
+            self.storage, segments=segments, chunk_size=chunk_size, max_retries=max_retries
+        )
+
+    def plan(self, dataset_id: str, dest: Path) -> DownloadPlan:
+        """
+        List the dataset folder recursively and decide what to fetch.
+
+        Args:
+            dataset_id: Dataset folder in the library
+            dest: Local folder that receives the dataset's contents
+
+        Returns:
+            DownloadPlan
+        """
+        dest = Path(dest)
+        plan = DownloadPlan(dataset_id=dataset_id, dest=dest)
+
+        for entry in self._walk(dataset_id.strip("/")):
+            relative = entry.path[len(dataset_id.strip("/")):].strip("/")
+            if not relative or any(part in ("", ".", "..") for part in relative.split("/")):
+                logger.warning(f"Skipping unsafe remote path: {entry.path}")
+                continue
+            transfer = FileTransfer(
+                remote_path=entry.path,
+                local_path=dest.joinpath(*relative.split("/")),
+                size=entry.size,
+                modified=utc_timestamp(entry.modified) if entry.modified else None,
+            )
+            if self._is_current(transfer):
+                plan.skipped.append(transfer)
+            else:
+                plan.transfers.append(transfer)
+
+        # Large files first, so they overlap with the long tail of small ones
+        plan.transfers.sort(key=lambda t: t.size or 0, reverse=True)
+        logger.info(
+            f"Planned download of {dataset_id}: {len(plan.transfers)} files "
+            f"({plan.total_bytes} bytes), {len(plan.skipped)} up to date"
+        )
+        return plan
+
+    def run(
+        self,
+        plan: DownloadPlan,
+        on_progress: Optional[Callable[[DownloadStats], None]] = None,
+        cancel: Optional[threading.Event] = None,
+    ) -> DownloadStats:
+        """
+        Download all planned files concurrently.
+
+        Failed files are reported in the stats; the others still complete.
+
+        Args:
+            plan: Result of plan()
+            on_progress: Called (from worker threads, throttled) with current stats
+            cancel: Set to stop; partial files are kept for resuming
+
+        Returns:
+            Final DownloadStats
+
+        Raises:
+            DownloadCancelledError: If cancel was set
+        """
+        cancel = cancel or threading.Event()
+        stats = DownloadStats(
+            files_total=len(plan.transfers), bytes_total=plan.total_bytes, files_skipped=len(plan.skipped)
+        )
+        reporter = _ProgressReporter(stats, on_progress)
+
+        if plan.transfers:
+            with ThreadPoolExecutor(max_workers=self.connections, thread_name_prefix="dataset-download") as pool:
+                futures = {
+                    pool.submit(self._download_file, transfer, reporter, cancel): transfer
+                    for transfer in plan.transfers
+                }
+                try:
+                    for future in as_completed(futures):
+                        transfer = futures[future]
+                        try:
+                            if future.result():
+                                stats.files_cached += 1
+                            reporter.file_finished(failed=False)
+                        except DownloadCancelledError:
+                            cancel.set()
+                        except (StorageError, OSError) as e:
+                            logger.warning(f"Failed to download {transfer.remote_path}: {e}")
+                            reporter.file_finished(failed=True, error=f"{transfer.remote_path}: {e}")
+                except KeyboardInterrupt:
+                    # Let the workers stop at their next chunk instead of finishing
+                    cancel.set()
+                    raise
+
+        reporter.flush()
+        if cancel.is_set():
+            raise DownloadCancelledError(f"Download of {plan.dataset_id} cancelled")
+        return stats
+
+    def _download_file(self, transfer: FileTransfer, reporter: "_ProgressReporter", cancel: threading.Event) -> bool:
+        """
+        Fetch one file and stamp it with the remote mtime.
+
+        Returns:
+            True if the file came from the blob cache
+        """
+        if cancel.is_set():
+            raise DownloadCancelledError("Download stopped")
+
+        if self._copy_from_cache(transfer):
+            reporter.add_bytes(transfer.size or 0)
+            return True
+
+        if getattr(self.storage, "is_local", False):
+            # Mounted library: one kernel-side copy, no ranges or retries
+            self.storage.download(transfer.remote_path, str(transfer.local_path))
+            reporter.add_bytes(transfer.size or 0)
+            if transfer.modified is not None:
+                os.utime(transfer.local_path, (transfer.modified, transfer.modified))
+            return False
+
+        # Sizes come from the listing, so no HEAD probe is needed. Small files
+        # go in one stream; large ones try ranges and fall back if ignored.
+        info = RemoteFileInfo(
+            size=transfer.size,
+            accepts_ranges=(transfer.size or 0) >= 2 * MIN_SEGMENT_SIZE,
+            last_modified=str(transfer.modified) if transfer.modified else None,
+        )
+        last = 0
+
+        def progress(done: int, total: Optional[int]) -> None:
+            nonlocal last
+            reporter.add_bytes(done - last)
+            last = done
+
+        try:
+            self.files.download(transfer.remote_path, transfer.local_path, progress=progress, info=info, cancel=cancel)
+        except BaseException:
+            # Partial bytes don't count; a retry reports them again
+            reporter.add_bytes(-last)
+            raise
+
+        if transfer.modified is not None:
+            os.utime(transfer.local_path, (transfer.modified, transfer.modified))
+        if self.cache is not None:
+            self.cache.store(transfer.remote_path, transfer.local_path, modified=transfer.modified)
+        return False
+
+    def _copy_from_cache(self, transfer: FileTransfer) -> bool:
+        """Materialize a file from the blob cache if it holds the listed size and mtime."""
+        if self.cache is None or transfer.size is None or transfer.modified is None:
+            return False
+        blob = self.cache.lookup(transfer.remote_path, size=transfer.size, modified=transfer.modified)
+        if blob is None:
+            return False
+        try:
+            self.cache.materialize(blob, transfer.local_path, modified=transfer.modified)
+        except OSError as e:
+            # Evicted meanwhile or not writable that way; download instead
+            logger.debug(f"Could not copy {transfer.remote_path} from the blob cache: {e}")
+            return False
+        return True
+
+    def _walk(self, root: str) -> list[FileEntry]:
+        """List all files below a folder, listing each subfolder as soon as its entry arrives."""
+        list_recursive = getattr(self.storage, "list_recursive", None)
+        if list_recursive is not None:
+            # One request for the whole tree (Seafile API backend)
+            return [entry for entry in list_recursive(root) if not entry.is_dir]
+
+        files: list[FileEntry] = []
+        pending: set[Future] = set()
+        lock = threading.Lock()
+
+        def scan(folder: str) -> list[FileEntry]:
+            found = []
+            for entry in self.storage.iter_listdir(folder):
+                if entry.is_dir:
+                    # Start on subfolders while the rest of this listing is still arriving
+                    future = pool.submit(scan, entry.path)
+                    with lock:
+                        pending.add(future)
+                else:
+                    found.append(entry)
+            return found
+
+        with ThreadPoolExecutor(max_workers=self.connections, thread_name_prefix="dataset-list") as pool:
+            pending.add(pool.submit(scan, root))
+            while True:
+                with lock:
+                    running = set(pending)
+                if not running:
+                    break
+                # A folder's subfolders are submitted before its own scan finishes
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                with lock:
+                    pending.difference_update(done)
+                for future in done:
+                    files.extend(future.result())
+        return files
+
+    @staticmethod
+    def _is_current(transfer: FileTransfer) -> bool:
+        """Check whether the local file matches the remote size and mtime."""
+        try:
+            stat = transfer.local_path.stat()
+        except OSError:
+            return False
+        if transfer.size is None or transfer.modified is None:
+            return False
+        return stat.st_size == transfer.size and int(stat.st_mtime) == int(transfer.modified)
+
+
+class _ProgressReporter:
+    """Thread-safe stats updates with throttled callbacks."""
+
+    def __init__(self, stats: DownloadStats, callback: Optional[Callable[[DownloadStats], None]]):
+        """Initialize reporter for a stats object."""
+        self.stats = stats
+        self.callback = callback
+        self._lock = threading.Lock()
+        self._last_report = 0.0
+        self._window: list[tuple[float, int]] = [(time.monotonic(), 0)]
+
+    def add_bytes(self, amount: int) -> None:
+        """Count received bytes."""
+        with self._lock:
+            self.stats.bytes_done += amount
+        self._maybe_report()
+
+    def file_finished(self, failed: bool, error: Optional[str] = None) -> None:
+        """Count a completed or failed file."""
+        with self._lock:
+            if failed:
+                self.stats.files_failed += 1
+                self.stats.errors.append(error or "")
+            else:
+                self.stats.files_done += 1
+        self._maybe_report(force=True)
+
+    def flush(self) -> None:
+        """Report final stats."""
+        self._maybe_report(force=True)
+
+    def _maybe_report(self, force: bool = False) -> None:
+        """Update the rate and call back at most every PROGRESS_INTERVAL_SEC."""
+        now = time.monotonic()
+        with self._lock:
+            if not force and now - self._last_report < PROGRESS_INTERVAL_SEC:
+                return
+            self._last_report = now
+
+            # Rate over a sliding window, so the ETA follows the current speed
+            self._window.append((now, self.stats.bytes_done))
+            while len(self._window) > 2 and now - self._window[1][0] > RATE_WINDOW_SEC:
+                self._window.pop(0)
+            start_time, start_bytes = self._window[0]
+            if now > start_time:
+                self.stats.rate = max(0.0, (self.stats.bytes_done - start_bytes) / (now - start_time))
+
+        if self.callback is not None:
+            self.callback(self.stats)
+
+
+def create_dataset_downloader(storage=None, connections: Optional[int] = None) -> DatasetDownloader:
+    """
+    Create a dataset downloader configured from `storage.*` settings.
+
+    Args:
+        storage: Storage backend (default: the configured backend)
+        connections: Override for storage.download_connections
+
+    Returns:
+        DatasetDownloader
+    """
+    from hei_datahub.services.blob_cache import get_blob_cache
+    from hei_datahub.services.config import get_config
+    from hei_datahub.services.storage_manager import get_storage_backend
+
+    config = get_config()
+    storage = storage or get_storage_backend()
+    return DatasetDownloader(
+        storage,
+        connections=connections or config.get("storage.download_connections", DEFAULT_CONNECTIONS),
+        segments=config.get("storage.download_segments", 4),
+        chunk_size=config.get("storage.download_chunk_kb", 1024) * 1024,
+        max_retries=config.get("storage.max_retries", 3),
+        # A mounted library's files are local already
+        cache=None if getattr(storage, "is_local", False) else get_blob_cache(),
+    )
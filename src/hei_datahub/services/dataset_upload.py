@@ -0,0 +1,123 @@
+"""
+Concurrent upload of a local folder into a dataset folder.
+
+All collections the files need are created up front (one MKCOL each, parents
+first) instead of per file and path component. Files then stream in
+parallel, each in a single pass: files in a collection that was just
+created are known to be new, so only the others need an existence check
+before their PUT.
+
+Used by `hei-datahub push` to put data files next to a dataset's
+metadata.yaml.
+"""
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+from typing import Callable, Optional
+
+from hei_datahub.services.webdav_storage import StorageError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONNECTIONS = 4
+# Local files that never belong in a dataset folder
+SKIP_NAMES = {".DS_Store", "Thumbs.db", "desktop.ini"}
+
+
+@dataclass
+class UploadResult:
+    """Outcome of a folder upload."""
+    files_uploaded: int = 0
+    bytes_uploaded: int = 0
+    collections_created: int = 0
+    errors: list[str] = field(default_factory=list)
+
+
+def upload_tree(
+    storage,
+    local_dir: Path,
+    remote_dir: str,
+    progress: Optional[Callable[[int, int], None]] = None,
+    connections: int = DEFAULT_CONNECTIONS,
+) -> UploadResult:
+    """
+    Upload all files below a local folder into a remote folder.
+
+    Failed files are reported in the result; the others still complete.
+
+    Args:
+        storage: Storage backend
+        local_dir: Folder to upload
+        remote_dir: Destination folder relative to the library root
+        progress: Called with (bytes_sent, bytes_total) across all files
+        connections: Files uploaded at once
+
+    Returns:
+        UploadResult
+
+    Raises:
+        StorageError: If the remote folders could not be created
+    """
+    local_dir = Path(local_dir)
+    remote_dir = remote_dir.strip("/")
+
+    files: list[tuple[Path, str]] = []
+    for dirpath, dirnames, filenames in os.walk(local_dir):
+        # Hidden folders (.git, .ipynb_checkpoints, ...) are not dataset content
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+        relative_dir = PurePosixPath(Path(dirpath).relative_to(local_dir).as_posix())
+        for name in sorted(filenames):
+            if name in SKIP_NAMES or name.startswith("."):
+                continue
+            remote_path = str(PurePosixPath(remote_dir) / relative_dir / name)
+            files.append((Path(dirpath) / name, remote_path))
+
+    result = UploadResult()
+    if not files:
+        return result
+
+    remote_dirs = {str(PurePosixPath(remote_path).parent) for _, remote_path in files}
+    created = storage.make_collections(remote_dirs)
+    result.collections_created = len(created)
+
+    total = sum(path.stat().st_size for path, _ in files)
+    sent_by_file: dict[str, int] = {}
+    lock = threading.Lock()
+
+    def report(remote_path: str, sent: int) -> None:
+        with lock:
+            sent_by_file[remote_path] = sent
+            done = sum(sent_by_file.values())
+        if progress is not None:
+            progress(done, total)
+
+    def upload_one(local_path: Path, remote_path: str) -> int:
+        parent = str(PurePosixPath(remote_path).parent)
+        storage.upload(
+            local_path,
+            remote_path,
+            progress=lambda sent, _total: report(remote_path, sent),
+            # Nothing can exist yet inside a collection we just created
+            exists=False if parent in created else None,
+        )
+        return local_path.stat().st_size
+
+    with ThreadPoolExecutor(max_workers=max(1, connections), thread_name_prefix="dataset-upload") as pool:
+        futures = {pool.submit(upload_one, local, remote): remote for local, remote in files}
+        for future in as_completed(futures):
+            remote_path = futures[future]
+            try:
+                result.bytes_uploaded += future.result()
+                result.files_uploaded += 1
+            except (StorageError, OSError) as e:
+                logger.warning(f"Failed to upload {remote_path}: {e}")
+                report(remote_path, 0)
+                result.errors.append(f"{remote_path}: {e}")
+
+    logger.info(
+        f"Uploaded {result.files_uploaded}/{len(files)} files ({result.bytes_uploaded} bytes) to {remote_dir}"
+    )
+    return result
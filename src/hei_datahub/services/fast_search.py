@@ -243,3 +243,45 @@ def get_all_indexed(limit: int = 200) -> list[dict[str, Any]]:
         })
 
     return formatted_results
+
+
+def get_indexed_by_paths(paths: list[str]) -> list[dict[str, Any]]:
+    """
+    Get specific indexed items, formatted like get_all_indexed().
+
+    Used to apply incremental index events without reloading everything.
+
+    Args:
+        paths: Item paths (dataset folder names)
+
+    Returns:
+        List of items that still exist in the index
+    """
+    index_service = get_index_service()
+    results = index_service.get_items(list(paths))
+
+    formatted_results = []
+    for item in results:
+        formatted_results.append({
+            "id": item["path"],
+            "name": item["name"],
+            "metadata": {
+                "dataset_name": item["name"],
+                "description": item.get("description"),
+                "project": item.get("project"),
+                "tags": item.get("tags", "").split() if item.get("tags") else [],
+                "format": item.get("format"),
+                "file_format": item.get("format"),
+                "source": item.get("source"),
+                "size": item.get("size"),
+                "category": item.get("category"),
+                "spatial_coverage": item.get("spatial_coverage"),
+                "temporal_coverage": item.get("temporal_coverage"),
+                "spatial_resolution": item.get("spatial_resolution"),
+                "temporal_resolution": item.get("temporal_resolution"),
+                "access_method": item.get("access_method"),
+                "is_remote": item.get("is_remote", False),
+            },
+        })
+
+    return formatted_results
@@ -0,0 +1,769 @@
+"""
+Previews ("peeks") of dataset files without downloading them.
+
+Only the first storage.peek_kb KB of a file are fetched, with a Range
+request, plus the last PEEK_TAIL_KB for formats indexed from the end
+(Parquet). Ranges go through the blob cache: peeking at an unchanged file
+again costs no request, and a file that was downloaded whole is previewed
+from its cached copy.
+
+What a preview shows depends on the format:
+
+- CSV/TSV: header and first rows (delimiter sniffed for .csv)
+- JSON lines: first records as a table
+- Parquet: row count, row groups and schema, from the footer
+- NetCDF classic: dimensions, variables and global attributes, from the header
+- HDF5 / NetCDF-4: the format only (its object tree is spread across the file)
+- other text: first lines; binary: a hex dump of the first bytes
+
+Gzipped files are inflated as far as the fetched bytes go.
+"""
+import csv
+import io
+import json
+import logging
+import struct
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+from hei_datahub.services.dataset_download import format_bytes
+from hei_datahub.services.webdav_storage import (
+    FileEntry,
+    RangeNotSupportedError,
+    StorageNotFoundError,
+    utc_timestamp,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PEEK_KB = 64
+PEEK_TAIL_KB = 64
+DEFAULT_ROWS = 20
+# Parquet footers larger than this (very wide schemas) are not fetched, in bytes
+MAX_FOOTER_BYTES = 8 * 1024 * 1024
+# Files up to this size are downloaded whole if the server ignores Range, in bytes
+MAX_FULL_DOWNLOAD = 4 * 1024 * 1024
+# Inflated bytes looked at for gzipped files
+MAX_INFLATED_BYTES = 1024 * 1024
+CELL_WIDTH = 24
+TEXT_WIDTH = 200
+HEX_BYTES = 64
+
+TABLE_DELIMITERS = {".csv": ",", ".tsv": "\t", ".tab": "\t"}
+JSON_LINES_EXTS = {".jsonl", ".ndjson"}
+PARQUET_EXTS = {".parquet", ".pq"}
+NETCDF_EXTS = {".nc", ".nc4", ".cdf", ".netcdf"}
+
+GZIP_MAGIC = b"\x1f\x8b"
+PARQUET_MAGIC = b"PAR1"
+NETCDF_MAGIC = b"CDF"
+HDF5_SIGNATURE = b"\x89HDF\r\n\x1a\n"
+
+# NetCDF classic header tags and types: (name, size, struct code)
+NC_DIMENSION = 0x0A
+NC_VARIABLE = 0x0B
+NC_ATTRIBUTE = 0x0C
+NC_TYPES = {
+    1: ("byte", 1, "b"),
+    2: ("char", 1, None),
+    3: ("short", 2, "h"),
+    4: ("int", 4, "i"),
+    5: ("float", 4, "f"),
+    6: ("double", 8, "d"),
+    7: ("ubyte", 1, "B"),
+    8: ("ushort", 2, "H"),
+    9: ("uint", 4, "I"),
+    10: ("int64", 8, "q"),
+    11: ("uint64", 8, "Q"),
+}
+
+# Parquet schema enums (parquet.thrift)
+PARQUET_TYPES = ["BOOLEAN", "INT32", "INT64", "INT96", "FLOAT", "DOUBLE", "BYTE_ARRAY", "FIXED_LEN_BYTE_ARRAY"]
+PARQUET_CONVERTED_TYPES = {
+    0: "UTF8", 1: "MAP", 3: "LIST", 4: "ENUM", 5: "DECIMAL", 6: "DATE", 7: "TIME_MILLIS",
+    8: "TIME_MICROS", 9: "TIMESTAMP_MILLIS", 10: "TIMESTAMP_MICROS", 19: "JSON", 20: "BSON",
+}
+PARQUET_LOGICAL_TYPES = {
+    1: "STRING", 2: "MAP", 3: "LIST", 4: "ENUM", 5: "DECIMAL", 6: "DATE", 7: "TIME", 8: "TIMESTAMP",
+    10: "INTEGER", 11: "NULL", 12: "JSON", 13: "BSON", 14: "UUID", 15: "FLOAT16",
+}
+PARQUET_REPETITION = {0: "required", 1: "optional", 2: "repeated"}
+
+
+@dataclass
+class FilePreview:
+    """What a peek at a file found."""
+    path: str
+    size: Optional[int]
+    format: str = "binary"  # "CSV", "Parquet", "NetCDF", ...
+    summary: str = ""  # One line, e.g. "NetCDF classic: 3 dimensions, 4 variables"
+    columns: list[str] = field(default_factory=list)  # Table header (tabular formats)
+    rows: list[list[str]] = field(default_factory=list)
+    details: list[str] = field(default_factory=list)  # Other lines (schema, variables, text)
+    bytes_read: int = 0  # Bytes of the file looked at
+    complete: bool = False  # Whether that was the whole file
+
+
+class _RangeReader:
+    """Reads byte ranges of one remote file through the blob cache."""
+
+    def __init__(self, storage, entry: FileEntry, cache):
+        self.storage = storage
+        self.entry = entry
+        self.cache = cache
+        self.size = entry.size
+        self.modified = utc_timestamp(entry.modified) if entry.modified is not None else None
+        self.bytes_read = 0
+        self._whole: Optional[bytes] = None  # Whole file, if the server ignored Range
+
+    def read(self, start: int, end: int) -> bytes:
+        """Bytes from start to end (inclusive)."""
+        if self._whole is None:
+            try:
+                data = self.cache.fetch_range(
+                    self.storage, self.entry.path, start, end,
+                    size=self.size, modified=self.modified, etag=self.entry.etag,
+                )
+                self.bytes_read += len(data)
+                return data
+            except RangeNotSupportedError:
+                if self.size is None or self.size > MAX_FULL_DOWNLOAD:
+                    raise
+                logger.debug(f"Server ignored Range for {self.entry.path}, fetching all {self.size} bytes")
+                self._whole = self.cache.fetch_bytes(self.storage, self.entry.path)
+        data = self._whole[start:end + 1]
+        self.bytes_read += len(data)
+        return data
+
+    def tail(self, length: int) -> bytes:
+        """The last length bytes (size must be known)."""
+        return self.read(max(0, self.size - length), self.size - 1)
+
+
+def peek_file(
+    storage,
+    remote_path: str,
+    head_kb: Optional[int] = None,
+    rows: int = DEFAULT_ROWS,
+    cache=None,
+) -> FilePreview:
+    """
+    Preview a remote file from its first (and for Parquet, last) bytes.
+
+    Args:
+        storage: Storage backend
+        remote_path: Path of the file in the library
+        head_kb: KB to read from the start (default: storage.peek_kb)
+        rows: Table rows or text lines to show
+        cache: Blob cache (default: the global cache)
+
+    Returns:
+        FilePreview
+
+    Raises:
+        StorageNotFoundError: If the file doesn't exist
+        RangeNotSupportedError: If the server ignores Range and the file is
+            too large to download for a preview
+        StorageError: If the file could not be read
+        ValueError: If the path is a folder
+    """
+    if head_kb is None:
+        from hei_datahub.services.config import get_config
+
+        head_kb = get_config().get("storage.peek_kb", DEFAULT_PEEK_KB)
+    if cache is None:
+        from hei_datahub.services.blob_cache import get_blob_cache
+
+        cache = get_blob_cache()
+    remote_path = remote_path.strip("/")
+
+    entry = storage.get_info(remote_path)
+    if entry is None:
+        raise StorageNotFoundError(f"Path not found: {remote_path}")
+    if entry.is_dir:
+        raise ValueError(f"{remote_path} is a folder")
+
+    reader = _RangeReader(storage, entry, cache)
+    preview = FilePreview(path=remote_path, size=entry.size)
+    name = entry.name.lower()
+    limit = max(1, head_kb) * 1024
+
+    if Path(name).suffix in PARQUET_EXTS:
+        # Everything worth showing is in the footer
+        _decode_parquet(reader, preview)
+    else:
+        head = reader.read(0, limit - 1)
+        complete = len(head) >= entry.size if entry.size is not None else len(head) < limit
+        if head.startswith(PARQUET_MAGIC):
+            _decode_parquet(reader, preview)
+        elif head.startswith(GZIP_MAGIC):
+            _decode_gzip(head, name, complete, rows, preview)
+        elif head.startswith(NETCDF_MAGIC) and len(head) > 3 and head[3] in (1, 2, 5):
+            _decode_netcdf(head, complete, preview)
+        elif _hdf5_offset(head) is not None:
+            _decode_hdf5(head, name, preview)
+        else:
+            _decode_text(head, Path(name).suffix, complete, rows, preview)
+        preview.complete = preview.complete or complete
+
+    preview.bytes_read = reader.bytes_read
+    if entry.size is not None and reader.bytes_read >= entry.size:
+        preview.complete = True
+    logger.debug(f"Peeked at {remote_path}: {preview.format}, {reader.bytes_read} bytes")
+    return preview
+
+
+def list_files(storage, folder: str) -> list[FileEntry]:
+    """
+    All files below a folder, except the dataset's metadata.yaml.
+
+    Args:
+        storage: Storage backend
+        folder: Dataset folder in the library
+
+    Returns:
+        FileEntry list sorted by path
+    """
+    folder = folder.strip("/")
+    list_recursive = getattr(storage, "list_recursive", None)
+    if list_recursive is not None:
+        entries = [entry for entry in list_recursive(folder) if not entry.is_dir]
+    else:
+        entries, pending = [], [folder]
+        while pending:
+            for entry in storage.listdir(pending.pop()):
+                if entry.is_dir:
+                    pending.append(entry.path)
+                else:
+                    entries.append(entry)
+    metadata_path = f"{folder}/metadata.yaml"
+    return sorted((entry for entry in entries if entry.path.strip("/") != metadata_path), key=lambda e: e.path)
+
+
+def format_preview(preview: FilePreview) -> list[str]:
+    """
+    Render a preview as text lines (a table for tabular formats).
+
+    Returns:
+        Lines without trailing newlines
+    """
+    lines = [preview.summary]
+    if preview.columns:
+        table = [preview.columns] + preview.rows
+        count = max(len(row) for row in table)
+        cells = [[_clip(row[i]) if i < len(row) else "" for i in range(count)] for row in table]
+        widths = [max(len(row[i]) for row in cells) for i in range(count)]
+        lines.append("")
+        for index, row in enumerate(cells):
+            lines.append("  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip())
+            if index == 0:
+                lines.append("  ".join("─" * width for width in widths))
+    if preview.details:
+        lines.append("")
+        lines.extend(preview.details)
+    return lines
+
+
+def _clip(text: Any, width: int = CELL_WIDTH) -> str:
+    """One line of at most width characters."""
+    text = " ".join(str(text).splitlines()).replace("\t", " ")
+    return text if len(text) <= width else text[:width - 1] + "…"
+
+
+def _complete_lines(data: bytes, complete: bool) -> bytes:
+    """Data up to its last newline, unless it is the whole file."""
+    return data if complete else data[:data.rfind(b"\n") + 1]
+
+
+def _to_text(data: bytes) -> str:
+    try:
+        return data.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        return data.decode("latin-1")
+
+
+def _read_so_far(data: bytes, complete: bool) -> str:
+    """Suffix saying how much of the file a count covers."""
+    return "" if complete else f" in the first {format_bytes(len(data))}"
+
+
+# =============================================================================
+# Text formats
+# =============================================================================
+
+def _decode_gzip(head: bytes, name: str, complete: bool, rows: int, preview: FilePreview) -> None:
+    inflater = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    try:
+        data = inflater.decompress(head, MAX_INFLATED_BYTES)
+    except zlib.error as e:
+        logger.debug(f"Could not inflate {preview.path}: {e}")
+        _decode_binary(head, preview)
+        return
+    inner = name[:-3] if name.endswith(".gz") else name
+    _decode_text(data, Path(inner).suffix, complete and inflater.eof, rows, preview)
+    preview.summary = preview.summary.replace(preview.format, f"{preview.format} (gzip)", 1).replace(
+        _read_so_far(data, False), f"{_read_so_far(data, False)} uncompressed"
+    )
+    preview.format += " (gzip)"
+
+
+def _decode_text(data: bytes, suffix: str, complete: bool, rows: int, preview: FilePreview) -> None:
+    if b"\0" in data[:1024]:
+        _decode_binary(data, preview)
+    elif suffix in TABLE_DELIMITERS:
+        _decode_table(data, TABLE_DELIMITERS[suffix], complete, rows, preview)
+    elif suffix in JSON_LINES_EXTS:
+        _decode_json_lines(data, complete, rows, preview)
+    else:
+        lines = _to_text(data).splitlines()
+        if not complete and lines:
+            lines.pop()  # Cut off mid-line
+        preview.format = "text"
+        preview.summary = f"Text: first {min(rows, len(lines))} of {len(lines)} lines{_read_so_far(data, complete)}"
+        preview.details = [_clip(line, TEXT_WIDTH) for line in lines[:rows]]
+
+
+def _decode_table(data: bytes, delimiter: str, complete: bool, rows: int, preview: FilePreview) -> None:
+    text = _to_text(_complete_lines(data, complete))
+    if delimiter == ",":
+        # Plenty of CSV files use semicolons (decimal commas)
+        try:
+            delimiter = csv.Sniffer().sniff(text[:8192], delimiters=",;\t|").delimiter
+        except csv.Error:
+            pass
+    records = []
+    try:
+        for record in csv.reader(io.StringIO(text), delimiter=delimiter):
+            if record:
+                records.append(record)
+    except csv.Error as e:
+        # A quoted field running past the bytes read
+        logger.debug(f"Stopped reading {preview.path} at: {e}")
+
+    preview.format = "TSV" if delimiter == "\t" else "CSV"
+    if not records:
+        preview.summary = f"{preview.format}: no complete line{_read_so_far(data, complete)}"
+        return
+    preview.columns = records[0]
+    preview.rows = records[1:rows + 1]
+    preview.summary = (
+        f"{preview.format}: {len(records[0])} columns, {len(records) - 1} rows"
+        f"{_read_so_far(data, complete)}"
+    )
+
+
+def _decode_json_lines(data: bytes, complete: bool, rows: int, preview: FilePreview) -> None:
+    records, invalid = [], 0
+    for line in _to_text(_complete_lines(data, complete)).splitlines():
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            invalid += 1
+            continue
+        records.append(record if isinstance(record, dict) else {"value": record})
+
+    columns: dict[str, None] = {}
+    for record in records[:rows]:
+        columns.update(dict.fromkeys(record))
+    preview.format = "JSON lines"
+    preview.columns = list(columns)
+    preview.rows = [[_cell(record.get(column)) for column in columns] for record in records[:rows]]
+    preview.summary = f"JSON lines: {len(records)} records{_read_so_far(data, complete)}"
+    if invalid:
+        preview.summary += f" ({invalid} lines not JSON)"
+
+
+def _cell(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value
+    return json.dumps(value, default=str)
+
+
+def _decode_binary(data: bytes, preview: FilePreview) -> None:
+    preview.format = "binary"
+    preview.summary = "Binary file, first bytes:"
+    for offset in range(0, min(len(data), HEX_BYTES), 16):
+        chunk = data[offset:offset + 16]
+        text = "".join(chr(byte) if 32 <= byte < 127 else "." for byte in chunk)
+        preview.details.append(f"{offset:08x}  {chunk.hex(' '):<47}  {text}")
+
+
+# =============================================================================
+# NetCDF / HDF5
+# =============================================================================
+
+class _TruncatedError(Exception):
+    """The header continues beyond the bytes read."""
+    pass
+
+
+class _NetCDFReader:
+    """Big-endian reader over a NetCDF classic header."""
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.pos = 4
+        self.version = data[3]
+        self.wide = self.version == 5  # CDF-5 counts are 64-bit
+
+    def take(self, n: int) -> bytes:
+        if self.pos + n > len(self.data):
+            raise _TruncatedError()
+        chunk = self.data[self.pos:self.pos + n]
+        self.pos += n
+        return chunk
+
+    def u32(self) -> int:
+        return struct.unpack(">I", self.take(4))[0]
+
+    def count(self) -> int:
+        return struct.unpack(">Q", self.take(8))[0] if self.wide else self.u32()
+
+    def offset(self) -> int:
+        return struct.unpack(">Q", self.take(8))[0] if self.version in (2, 5) else self.u32()
+
+    def name(self) -> str:
+        length = self.count()
+        raw = self.take(length)
+        self.take(-length % 4)
+        return raw.decode("utf-8", "replace")
+
+    def list_length(self, tag: int) -> int:
+        found, length = self.u32(), self.count()
+        if found == 0:
+            return 0
+        if found != tag:
+            raise ValueError(f"Unexpected NetCDF header tag {found:#x}")
+        return length
+
+    def values(self) -> Any:
+        nc_type, length = self.u32(), self.count()
+        if nc_type not in NC_TYPES:
+            raise ValueError(f"Unknown NetCDF type {nc_type}")
+        _, width, code = NC_TYPES[nc_type]
+        raw = self.take(length * width)
+        self.take(-(length * width) % 4)
+        if code is None:
+            return raw.rstrip(b"\0").decode("utf-8", "replace")
+        values = struct.unpack(f">{length}{code}", raw)
+        return values[0] if length == 1 else list(values)
+
+    def attributes(self, into: dict[str, Any]) -> None:
+        for _ in range(self.list_length(NC_ATTRIBUTE)):
+            name = self.name()
+            into[name] = self.values()
+
+
+def parse_netcdf_header(data: bytes) -> dict[str, Any]:
+    """
+    Parse the header of a NetCDF classic, 64-bit offset or CDF-5 file.
+
+    Args:
+        data: The file's first bytes
+
+    Returns:
+        {"version", "records", "dimensions": [(name, length)], "attributes",
+        "variables": [{"name", "type", "dimensions", "attributes"}],
+        "truncated"}; truncated means the header continues beyond data and
+        the lists hold what was read
+
+    Raises:
+        ValueError: If the data is not a NetCDF classic header
+    """
+    if len(data) < 4 or not data.startswith(NETCDF_MAGIC):
+        raise ValueError("Not a NetCDF classic file")
+    reader = _NetCDFReader(data)
+    header: dict[str, Any] = {
+        "version": reader.version,
+        "records": None,
+        "dimensions": [],
+        "attributes": {},
+        "variables": [],
+        "truncated": False,
+    }
+    try:
+        header["records"] = reader.count()
+        for _ in range(reader.list_length(NC_DIMENSION)):
+            header["dimensions"].append((reader.name(), reader.count()))
+        reader.attributes(header["attributes"])
+        dimensions = [name for name, _ in header["dimensions"]]
+        for _ in range(reader.list_length(NC_VARIABLE)):
+            name = reader.name()
+            ids = [reader.count() for _ in range(reader.count())]
+            attributes: dict[str, Any] = {}
+            reader.attributes(attributes)
+            nc_type = reader.u32()
+            reader.count()  # vsize
+            reader.offset()  # begin
+            header["variables"].append({
+                "name": name,
+                "type": NC_TYPES.get(nc_type, (f"type {nc_type}",))[0],
+                "dimensions": [dimensions[i] if i < len(dimensions) else f"#{i}" for i in ids],
+                "attributes": attributes,
+            })
+    except _TruncatedError:
+        header["truncated"] = True
+    return header
+
+
+def _decode_netcdf(head: bytes, complete: bool, preview: FilePreview) -> None:
+    try:
+        header = parse_netcdf_header(head)
+    except (ValueError, struct.error) as e:
+        logger.debug(f"Could not parse NetCDF header of {preview.path}: {e}")
+        _decode_binary(head, preview)
+        return
+
+    kind = {1: "classic", 2: "64-bit offset", 5: "CDF-5"}[header["version"]]
+    preview.format = "NetCDF"
+    preview.summary = (
+        f"NetCDF {kind}: {len(header['dimensions'])} dimensions, {len(header['variables'])} variables"
+    )
+    if header["truncated"] and not complete:
+        preview.summary += " (header read in part)"
+
+    details = preview.details
+    if header["dimensions"]:
+        details.append("Dimensions:")
+        for name, length in header["dimensions"]:
+            if length == 0:
+                records = header["records"]
+                # All bits set: written by a streaming writer, count unknown
+                current = "" if records is None or records >= 0xFFFFFFFF else f" ({records} currently)"
+                details.append(f"  {name} = UNLIMITED{current}")
+            else:
+                details.append(f"  {name} = {length}")
+    if header["variables"]:
+        details.append("Variables:")
+        for variable in header["variables"]:
+            attributes = variable["attributes"]
+            line = f"  {variable['type']} {variable['name']}({', '.join(variable['dimensions'])})"
+            if attributes.get("units"):
+                line += f"  [{attributes['units']}]"
+            description = attributes.get("long_name") or attributes.get("standard_name")
+            if description:
+                line += f"  {description}"
+            details.append(_clip(line, TEXT_WIDTH))
+    if header["attributes"]:
+        details.append("Global attributes:")
+        for name, value in header["attributes"].items():
+            details.append(_clip(f"  {name}: {value}", TEXT_WIDTH))
+    if header["truncated"] and not complete:
+        details.append(f"… the header continues beyond the first {format_bytes(len(head))}")
+
+
+def _hdf5_offset(head: bytes) -> Optional[int]:
+    """Offset of the HDF5 signature (0, or after a user block of 512, 1024, ... bytes)."""
+    offset = 0
+    while offset + len(HDF5_SIGNATURE) <= len(head):
+        if head[offset:offset + len(HDF5_SIGNATURE)] == HDF5_SIGNATURE:
+            return offset
+        offset = 512 if offset == 0 else offset * 2
+    return None
+
+
+def _decode_hdf5(head: bytes, name: str, preview: FilePreview) -> None:
+    offset = _hdf5_offset(head)
+    netcdf4 = Path(name).suffix in NETCDF_EXTS
+    preview.format = "NetCDF-4" if netcdf4 else "HDF5"
+    preview.summary = f"{'NetCDF-4 (HDF5)' if netcdf4 else 'HDF5'} file"
+    version_at = offset + len(HDF5_SIGNATURE)
+    if version_at < len(head):
+        preview.summary += f", superblock version {head[version_at]}"
+    if offset:
+        preview.details.append(f"User block of {offset} bytes before the HDF5 data")
+    preview.details.append("Variables are not listed: HDF5 keeps its object tree throughout the file.")
+
+
+# =============================================================================
+# Parquet
+# =============================================================================
+
+class _CompactReader:
+    """Minimal Thrift compact protocol decoder (enough for Parquet footers)."""
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.pos = 0
+
+    def byte(self) -> int:
+        if self.pos >= len(self.data):
+            raise ValueError("Truncated Parquet footer")
+        value = self.data[self.pos]
+        self.pos += 1
+        return value
+
+    def varint(self) -> int:
+        shift = result = 0
+        while True:
+            value = self.byte()
+            result |= (value & 0x7F) << shift
+            if not value & 0x80:
+                return result
+            shift += 7
+
+    def zigzag(self) -> int:
+        value = self.varint()
+        return (value >> 1) ^ -(value & 1)
+
+    def binary(self) -> bytes:
+        length = self.varint()
+        if self.pos + length > len(self.data):
+            raise ValueError("Truncated Parquet footer")
+        value = self.data[self.pos:self.pos + length]
+        self.pos += length
+        return value
+
+    def value(self, ttype: int) -> Any:
+        if ttype in (1, 2):
+            return ttype == 1
+        if ttype == 3:
+            value = self.byte()
+            return value - 256 if value > 127 else value
+        if ttype in (4, 5, 6):
+            return self.zigzag()
+        if ttype == 7:
+            if self.pos + 8 > len(self.data):
+                raise ValueError("Truncated Parquet footer")
+            self.pos += 8
+            return struct.unpack("<d", self.data[self.pos - 8:self.pos])[0]
+        if ttype == 8:
+            return self.binary()
+        if ttype in (9, 10):
+            header = self.byte()
+            length = header >> 4
+            if length == 15:
+                length = self.varint()
+            return [self.element(header & 0x0F) for _ in range(length)]
+        if ttype == 11:
+            length = self.varint()
+            if not length:
+                return {}
+            types = self.byte()
+            return {self.element(types >> 4): self.element(types & 0x0F) for _ in range(length)}
+        if ttype == 12:
+            return self.struct()
+        raise ValueError(f"Unknown Thrift type {ttype}")
+
+    def element(self, ttype: int) -> Any:
+        if ttype in (1, 2):
+            # Booleans in collections take a byte each
+            return self.byte() == 1
+        return self.value(ttype)
+
+    def struct(self) -> dict[int, Any]:
+        fields: dict[int, Any] = {}
+        last = 0
+        while True:
+            header = self.byte()
+            if header == 0:
+                return fields
+            delta, ttype = header >> 4, header & 0x0F
+            last = last + delta if delta else self.zigzag()
+            fields[last] = self.value(ttype)
+
+
+def parse_parquet_footer(footer: bytes) -> dict[str, Any]:
+    """
+    Parse Parquet file metadata (the Thrift struct before the final length and magic).
+
+    Returns:
+        {"rows", "row_groups", "created_by", "columns": [(depth, name, type)]}
+
+    Raises:
+        ValueError: If the footer can't be decoded
+    """
+    try:
+        metadata = _CompactReader(footer).struct()
+    except RecursionError:
+        raise ValueError("Parquet footer nests too deeply")
+    schema = metadata.get(2) or []
+    if not isinstance(schema, list) or not all(isinstance(element, dict) for element in schema):
+        raise ValueError("Parquet footer has no readable schema")
+
+    columns = []
+    remaining = [schema[0].get(5) or 0] if schema else []
+    for element in schema[1:]:
+        depth = len(remaining)
+        name = element.get(4)
+        name = name.decode("utf-8", "replace") if isinstance(name, bytes) else "?"
+        repetition = PARQUET_REPETITION.get(element.get(3), "")
+        children = element.get(5) or 0
+        if children:
+            kind = "group"
+        else:
+            physical = element.get(1)
+            kind = PARQUET_TYPES[physical] if isinstance(physical, int) and 0 <= physical < len(PARQUET_TYPES) else "?"
+            logical = element.get(10)
+            annotation = None
+            if isinstance(logical, dict) and logical:
+                annotation = PARQUET_LOGICAL_TYPES.get(next(iter(logical)))
+            elif element.get(6) is not None:
+                annotation = PARQUET_CONVERTED_TYPES.get(element.get(6))
+            if annotation:
+                kind += f" ({annotation})"
+        if repetition and repetition != "required":
+            kind += f", {repetition}"
+        columns.append((depth, name, kind))
+
+        if remaining:
+            remaining[-1] -= 1
+        if children:
+            remaining.append(children)
+        while remaining and remaining[-1] <= 0:
+            remaining.pop()
+
+    created_by = metadata.get(6)
+    row_groups = metadata.get(4)
+    return {
+        "rows": metadata.get(3),
+        "row_groups": len(row_groups) if isinstance(row_groups, list) else 0,
+        "created_by": created_by.decode("utf-8", "replace") if isinstance(created_by, bytes) else None,
+        "columns": columns,
+    }
+
+
+def _decode_parquet(reader: _RangeReader, preview: FilePreview) -> None:
+    preview.format = "Parquet"
+    size = reader.size
+    if size is None or size < 12:
+        preview.summary = "Parquet: file size unknown or too small, footer not read"
+        return
+
+    tail = reader.tail(PEEK_TAIL_KB * 1024)
+    if tail[-4:] != PARQUET_MAGIC:
+        preview.summary = "Parquet: no footer (file incomplete or not Parquet)"
+        return
+    length = int.from_bytes(tail[-8:-4], "little")
+    if length + 12 > size:
+        preview.summary = "Parquet: footer length is invalid"
+        return
+    if length + 8 <= len(tail):
+        footer = tail[len(tail) - 8 - length:-8]
+    elif length <= MAX_FOOTER_BYTES:
+        footer = reader.read(size - 8 - length, size - 9)
+    else:
+        preview.summary = f"Parquet: footer of {format_bytes(length)} is too large to preview"
+        return
+
+    try:
+        metadata = parse_parquet_footer(footer)
+    except ValueError as e:
+        logger.debug(f"Could not parse Parquet footer of {preview.path}: {e}")
+        preview.summary = f"Parquet: unreadable footer ({e})"
+        return
+
+    leaves = sum(1 for _, _, kind in metadata["columns"] if not kind.startswith("group"))
+    rows = f"{metadata['rows']:,} rows" if isinstance(metadata["rows"], int) else "unknown rows"
+    preview.summary = f"Parquet: {rows} in {metadata['row_groups']} row groups, {leaves} columns"
+    if metadata["created_by"]:
+        preview.details.append(f"Created by: {metadata['created_by']}")
+    preview.details.append("Schema:")
+    for depth, name, kind in metadata["columns"]:
+        preview.details.append(_clip(f"{'  ' * depth}{name}: {kind}", TEXT_WIDTH))
@@ -0,0 +1,483 @@
+"""
+Filesystem storage backend for locally mounted libraries.
+
+Many users have the library mounted already (davfs2, Seafile Drive).
+FilesystemStorage offers the WebDAVStorage interface on top of such a
+mount, so listings are os.scandir() calls, change detection uses stat()
+mtimes and file data is copied by the kernel (reflink where the filesystem
+can, sendfile otherwise) instead of going over HTTPS in Python.
+
+Files are written to a hidden temporary file next to the destination and
+renamed into place. This also moves the folder's mtime, which is what the
+indexer watches for changes. ETags are derived from mtime and size, so
+conditional reads and writes (fetch_if_changed, upload_if_match) work as
+with WebDAV. Their check-and-replace is atomic within this process only;
+across machines the mount's own semantics apply.
+
+Hidden entries (dot files, including our temporary files) and the
+`lost+found` folder davfs2 creates are left out of listings.
+"""
+import errno
+import logging
+import os
+import shutil
+import stat
+import tempfile
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from email.utils import formatdate
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from hei_datahub.services.webdav_storage import (
+    FileEntry,
+    RemoteFileInfo,
+    StorageAuthError,
+    StorageConnectionError,
+    StorageError,
+    StorageNotFoundError,
+    StoragePreconditionError,
+    _listing_order,
+    collection_paths,
+)
+
+logger = logging.getLogger(__name__)
+
+# Names that are never library content
+IGNORED_NAMES = frozenset({"lost+found"})
+
+# Errors a mount reports when its server is gone (treated like a failed connection)
+CONNECTION_ERRNOS = frozenset(
+    code for code in (
+        getattr(errno, name, None)
+        for name in ("ENOTCONN", "EHOSTDOWN", "EHOSTUNREACH", "ETIMEDOUT", "ESTALE", "EIO")
+    )
+    if code is not None
+)
+
+
+def _file_etag(st: os.stat_result) -> str:
+    """ETag of a file version (changes with its mtime or size)."""
+    return f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+
+
+def _modified(st: os.stat_result) -> datetime:
+    """Naive UTC mtime, like the dates WebDAV listings carry."""
+    return datetime.fromtimestamp(st.st_mtime, timezone.utc).replace(tzinfo=None)
+
+
+@contextmanager
+def _storage_errors(action: str, path: str) -> Iterator[None]:
+    """Translate OSError into the storage exceptions callers handle."""
+    try:
+        yield
+    except FileNotFoundError:
+        raise StorageNotFoundError(f"Path not found: {path}")
+    except PermissionError as e:
+        raise StorageAuthError(f"Access denied for {path}: {e}")
+    except OSError as e:
+        if e.errno in CONNECTION_ERRNOS:
+            raise StorageConnectionError(f"Mount not reachable ({action} {path}): {e}")
+        raise StorageError(f"{action} failed for {path}: {e}")
+
+
+class FilesystemStorage:
+    """Storage backend for a library mounted into the local filesystem."""
+
+    # Callers skip caches that would only duplicate local files
+    is_local = True
+
+    def __init__(self, root: str):
+        """
+        Initialize filesystem storage backend.
+
+        Args:
+            root: Mount point of the library (or any folder laid out like one)
+
+        Raises:
+            StorageError: If root is not an existing directory
+        """
+        self.root = Path(root).expanduser().resolve()
+        if not self.root.is_dir():
+            raise StorageError(f"Library mount not found: {self.root}")
+        self.library = str(self.root)
+        # No listing cache: stat() is cheaper than keeping one consistent
+        self.listing_cache = None
+        # Serializes conditional writes of this process
+        self._write_lock = threading.Lock()
+
+        logger.info(f"Filesystem storage initialized: {self.root}")
+
+    def warmup(self) -> None:
+        """Nothing to prepare for a local mount."""
+
+    def get_pool_stats(self) -> dict[str, Any]:
+        """No connection pool (local filesystem)."""
+        return {}
+
+    def get_cache_stats(self) -> dict[str, int]:
+        """No listing cache (local filesystem)."""
+        return {}
+
+    def get_coalescing_stats(self) -> dict[str, int]:
+        """No request coalescing (local filesystem)."""
+        return {}
+
+    def _local(self, path: str) -> Path:
+        """Local path of a library path, refusing paths outside the library."""
+        # Lexical check: resolving symlinks would stat every component on the mount
+        local = Path(os.path.normpath(self.root / path.strip("/")))
+        if local != self.root and self.root not in local.parents:
+            raise StorageError(f"Path outside the library: {path}")
+        return local
+
+    def _entry(self, dir_entry: os.DirEntry, parent: str) -> FileEntry:
+        """FileEntry for a scandir() result."""
+        st = dir_entry.stat()
+        is_dir = dir_entry.is_dir()
+        return FileEntry(
+            name=dir_entry.name,
+            path=f"{parent}/{dir_entry.name}" if parent else dir_entry.name,
+            is_dir=is_dir,
+            size=None if is_dir else st.st_size,
+            modified=_modified(st),
+            etag=None if is_dir else _file_etag(st),
+        )
+
+    def listdir(self, path: str = "") -> list[FileEntry]:
+        """
+        List directory contents.
+
+        Args:
+            path: Path relative to library root
+
+        Returns:
+            Sorted list of FileEntry objects (directories first)
+        """
+        return sorted(self.iter_listdir(path), key=_listing_order)
+
+    def iter_listdir(self, path: str = "") -> Iterator[FileEntry]:
+        """
+        Yield directory entries in scandir() order.
+
+        Args:
+            path: Path relative to library root
+
+        Yields:
+            FileEntry objects
+        """
+        parent = path.strip("/")
+        with _storage_errors("Listing", parent or "/"):
+            with os.scandir(self._local(parent)) as it:
+                for dir_entry in it:
+                    if dir_entry.name.startswith(".") or dir_entry.name in IGNORED_NAMES:
+                        continue
+                    try:
+                        yield self._entry(dir_entry, parent)
+                    except FileNotFoundError:
+                        # Removed while listing
+                        continue
+
+    def list_recursive(self, path: str = "") -> list[FileEntry]:
+        """
+        List every file and folder below a folder.
+
+        Args:
+            path: Folder relative to library root
+
+        Returns:
+            FileEntry objects with paths relative to the library root, parents before children
+        """
+        entries = []
+        pending = [path.strip("/")]
+        while pending:
+            folder = pending.pop()
+            for entry in self.iter_listdir(folder):
+                entries.append(entry)
+                if entry.is_dir:
+                    pending.append(entry.path)
+        entries.sort(key=lambda entry: (entry.path.count("/"), entry.path))
+        return entries
+
+    def download(self, remote_path: str, local_path: str) -> None:
+        """
+        Copy a file out of the library.
+
+        Args:
+            remote_path: Path in the library (e.g., "folder/file.txt")
+            local_path: Local filesystem path (string or Path)
+        """
+        from hei_datahub.services.blob_cache import clone_file
+
+        local_path_obj = Path(local_path)
+        with _storage_errors("Download", remote_path):
+            local_path_obj.parent.mkdir(parents=True, exist_ok=True)
+            clone_file(self._local(remote_path), local_path_obj)
+        logger.debug(f"Copied {remote_path} to {local_path_obj}")
+
+    def fetch_if_changed(
+        self,
+        remote_path: str,
+        local_path: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> Optional[RemoteFileInfo]:
+        """
+        Copy a file unless the caller's copy is still current.
+
+        Args:
+            remote_path: Path in the library
+            local_path: Where the file is written if it changed
+            etag: ETag of the caller's copy
+            last_modified: Last-Modified of the caller's copy (ignored; the ETag covers it)
+
+        Returns:
+            Size and validators of the copied file, or None if the caller's
+            copy is current (nothing is written)
+        """
+        with _storage_errors("Download", remote_path):
+            st = os.stat(self._local(remote_path))
+        current = _file_etag(st)
+        if etag == current:
+            logger.debug(f"{remote_path} not modified")
+            return None
+
+        self.download(remote_path, local_path)
+        return RemoteFileInfo(
+            size=st.st_size,
+            accepts_ranges=True,
+            etag=current,
+            last_modified=formatdate(st.st_mtime, usegmt=True),
+        )
+
+    def probe(self, remote_path: str) -> RemoteFileInfo:
+        """
+        Get size and validators of a file.
+
+        Args:
+            remote_path: Path in the library
+
+        Returns:
+            RemoteFileInfo for the file
+        """
+        with _storage_errors("Stat", remote_path):
+            st = os.stat(self._local(remote_path))
+        return RemoteFileInfo(
+            size=st.st_size,
+            accepts_ranges=True,
+            etag=_file_etag(st),
+            last_modified=formatdate(st.st_mtime, usegmt=True),
+        )
+
+    def read_range(
+        self,
+        remote_path: str,
+        start: int,
+        end: Optional[int],
+        sink: Callable[[bytes], None],
+        chunk_size: int = 1024 * 1024,
+    ) -> None:
+        """
+        Stream a byte range of a file into a callback.
+
+        Args:
+            remote_path: Path in the library
+            start: First byte offset
+            end: Last byte offset (inclusive), or None for the rest of the file
+            sink: Called with each chunk, in order
+            chunk_size: Read size in bytes
+        """
+        with _storage_errors("Download", remote_path):
+            with open(self._local(remote_path), "rb") as f:
+                f.seek(start)
+                remaining = None if end is None else end - start + 1
+                while remaining is None or remaining > 0:
+                    chunk = f.read(chunk_size if remaining is None else min(chunk_size, remaining))
+                    if not chunk:
+                        break
+                    if remaining is not None:
+                        remaining -= len(chunk)
+                    sink(chunk)
+
+    def upload(
+        self,
+        local_path: Path,
+        remote_path: str,
+        progress: Optional[Callable[[int, int], None]] = None,
+        exists: Optional[bool] = None,
+    ) -> None:
+        """
+        Copy a file into the library (replaced atomically).
+
+        Args:
+            local_path: Source local path
+            remote_path: Destination path in storage
+            progress: Called with (bytes_sent, bytes_total) once the copy is done
+            exists: Ignored (kept for interface compatibility)
+        """
+        local_path = Path(local_path)
+        if not local_path.exists():
+            raise StorageError(f"Local file not found: {local_path}")
+
+        self._replace(local_path, remote_path)
+        if progress is not None:
+            size = local_path.stat().st_size
+            progress(size, size)
+        logger.info(f"Uploaded {local_path} to {remote_path}")
+
+    def upload_if_match(self, local_path: Path, remote_path: str, etag: Optional[str]) -> Optional[str]:
+        """
+        Copy a file into the library only if the file there is still the one the caller read.
+
+        Args:
+            local_path: Source local path
+            remote_path: Destination path in storage
+            etag: ETag the file had when it was read, or None if it did not
+                exist (then the upload only creates it)
+
+        Returns:
+            ETag of the new file
+
+        Raises:
+            StoragePreconditionError: If the file changed or appeared meanwhile
+        """
+        target = self._local(remote_path)
+        with self._write_lock:
+            with _storage_errors("Upload", remote_path):
+                try:
+                    current = _file_etag(os.stat(target))
+                except FileNotFoundError:
+                    current = None
+            if current != etag:
+                raise StoragePreconditionError(f"{remote_path} changed in the library since it was read")
+            self._replace(Path(local_path), remote_path)
+            with _storage_errors("Upload", remote_path):
+                new_etag = _file_etag(os.stat(target))
+        logger.info(f"Uploaded {local_path} to {remote_path} (conditional)")
+        return new_etag
+
+    def _replace(self, local_path: Path, remote_path: str) -> None:
+        """Copy a file next to its destination and rename it into place."""
+        from hei_datahub.services.blob_cache import clone_file
+
+        target = self._local(remote_path)
+        with _storage_errors("Upload", remote_path):
+            fd, name = tempfile.mkstemp(prefix=f".{target.name}.", suffix=".tmp", dir=target.parent)
+            os.close(fd)
+            try:
+                clone_file(local_path, Path(name))
+                os.replace(name, target)
+            except BaseException:
+                Path(name).unlink(missing_ok=True)
+                raise
+
+    def mkdir(self, remote_path: str) -> None:
+        """
+        Create a directory (idempotent).
+
+        Args:
+            remote_path: Directory path to create
+        """
+        self.make_collections([remote_path])
+        logger.info(f"Created directory: {remote_path}")
+
+    def make_collections(self, paths) -> set[str]:
+        """
+        Create directories and all their parents.
+
+        Args:
+            paths: Directory paths relative to the library root
+
+        Returns:
+            Paths that were newly created (the others already existed)
+        """
+        created = set()
+        for partial_path in collection_paths(paths):
+            with _storage_errors("Mkdir", partial_path):
+                try:
+                    os.mkdir(self._local(partial_path))
+                    created.add(partial_path)
+                except FileExistsError:
+                    continue
+        return created
+
+    def move(self, src_path: str, dest_path: str) -> None:
+        """
+        Move/rename a file or directory (never overwrites).
+
+        Args:
+            src_path: Source path
+            dest_path: Destination path
+        """
+        src, dest = self._local(src_path), self._local(dest_path)
+        if dest.exists():
+            raise StorageError(f"Destination already exists: {dest_path}")
+        with _storage_errors("Move", src_path):
+            os.rename(src, dest)
+        logger.info(f"Moved {src_path} to {dest_path}")
+
+    def exists(self, remote_path: str) -> bool:
+        """
+        Check if path exists.
+
+        Args:
+            remote_path: Path to check
+
+        Returns:
+            True if exists
+        """
+        try:
+            return self._local(remote_path).exists()
+        except (OSError, StorageError):
+            return False
+
+    def get_info(self, remote_path: str) -> Optional[FileEntry]:
+        """
+        Get file/directory info.
+
+        Args:
+            remote_path: Path to query
+
+        Returns:
+            FileEntry or None
+        """
+        path = remote_path.strip("/")
+        try:
+            st = os.stat(self._local(path))
+        except (OSError, StorageError):
+            return None
+        is_dir = stat.S_ISDIR(st.st_mode)
+        return FileEntry(
+            name=Path(path).name,
+            path=path,
+            is_dir=is_dir,
+            size=None if is_dir else st.st_size,
+            modified=_modified(st),
+            etag=None if is_dir else _file_etag(st),
+        )
+
+    def delete(self, remote_path: str) -> None:
+        """
+        Delete a file or directory.
+
+        Args:
+            remote_path: Path to delete (file or directory)
+
+        Raises:
+            StorageError: If deletion fails
+        """
+        target = self._local(remote_path)
+        if target == self.root:
+            raise StorageError("Refusing to delete the library root")
+        try:
+            with _storage_errors("Delete", remote_path):
+                if target.is_dir() and not target.is_symlink():
+                    shutil.rmtree(target)
+                else:
+                    target.unlink()
+        except StorageNotFoundError:
+            logger.warning(f"Path not found: {remote_path}")
+            return
+        logger.info(f"Deleted: {remote_path}")
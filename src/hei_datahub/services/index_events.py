@@ -0,0 +1,120 @@
+"""
+In-process event bus for search index changes.
+
+The background indexer publishes typed events as it writes to the index,
+so screens can apply exactly the rows that changed instead of polling the
+whole table. Subscribers are called synchronously on the publishing thread
+and must hand work over to their own event loop if needed.
+"""
+import logging
+import threading
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class IndexEvent:
+    """Base class for all index events."""
+
+
+@dataclass(frozen=True)
+class ItemsIndexed(IndexEvent):
+    """A batch of items was inserted or updated in the index."""
+    paths: tuple[str, ...]  # Item paths (also the DataTable row keys)
+
+
+@dataclass(frozen=True)
+class ItemsRemoved(IndexEvent):
+    """Items were deleted from the index."""
+    paths: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class IndexProgress(IndexEvent):
+    """Progress of a running crawl or sync."""
+    done: int
+    total: int
+
+
+@dataclass(frozen=True)
+class SyncFinished(IndexEvent):
+    """A crawl or sync pass completed."""
+    total_items: int
+    changed: int = 0
+    removed: int = 0
+    error: Optional[str] = field(default=None)
+
+
+Subscriber = Callable[[IndexEvent], None]
+
+# Event types that can cross process boundaries (sync daemon -> TUI)
+_EVENT_TYPES = {cls.__name__: cls for cls in (ItemsIndexed, ItemsRemoved, IndexProgress, SyncFinished)}
+
+
+def event_to_dict(event: IndexEvent) -> dict[str, Any]:
+    """Serialize an event to a JSON-compatible dict."""
+    return {"type": type(event).__name__, **asdict(event)}
+
+
+def event_from_dict(data: dict[str, Any]) -> Optional[IndexEvent]:
+    """
+    Rebuild an event serialized by event_to_dict().
+
+    Returns:
+        The event, or None for unknown event types
+    """
+    cls = _EVENT_TYPES.get(data.get("type", ""))
+    if cls is None:
+        return None
+    fields = {k: v for k, v in data.items() if k != "type"}
+    if "paths" in fields:
+        fields["paths"] = tuple(fields["paths"])
+    return cls(**fields)
+
+
+class IndexEventBus:
+    """Thread-safe publish/subscribe bus for index events."""
+
+    def __init__(self):
+        """Initialize event bus."""
+        self._lock = threading.Lock()
+        self._subscribers: list[Subscriber] = []
+
+    def subscribe(self, callback: Subscriber) -> None:
+        """Register a callback for all index events."""
+        with self._lock:
+            if callback not in self._subscribers:
+                self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Subscriber) -> None:
+        """Remove a previously registered callback."""
+        with self._lock:
+            try:
+                self._subscribers.remove(callback)
+            except ValueError:
+                pass
+
+    def publish(self, event: IndexEvent) -> None:
+        """Deliver an event to every subscriber."""
+        with self._lock:
+            subscribers = list(self._subscribers)
+
+        for callback in subscribers:
+            try:
+                callback(event)
+            except Exception as e:
+                logger.warning(f"Index event subscriber failed on {type(event).__name__}: {e}")
+
+
+# Global instance
+_event_bus: Optional[IndexEventBus] = None
+
+
+def get_event_bus() -> IndexEventBus:
+    """Get or create the global index event bus."""
+    global _event_bus
+    if _event_bus is None:
+        _event_bus = IndexEventBus()
+    return _event_bus
@@ -13,6 +13,7 @@ from pathlib import Path
 from typing import Any, Optional
 
 from hei_datahub.infra.paths import CACHE_DIR
+from hei_datahub.services.index_writer import bulk_write_lock, connect_index_db, enable_wal
 
 logger = logging.getLogger(__name__)
 
@@ -39,10 +40,13 @@ class IndexService:
 
     def _init_database(self) -> None:
         """Initialize the index database schema."""
-        conn = sqlite3.connect(self.db_path)
+        conn = connect_index_db(self.db_path)
         conn.row_factory = sqlite3.Row
 
         try:
+            # WAL lets readers (search, other processes) run alongside a writer
+            enable_wal(conn)
+
             # Create items table
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS items (
@@ -160,8 +164,8 @@ class IndexService:
             conn.close()
 
     def get_connection(self) -> sqlite3.Connection:
-        """Get a connection to the index database."""
-        conn = sqlite3.connect(self.db_path)
+        """Get a connection to the index database (with the shared busy timeout)."""
+        conn = connect_index_db(self.db_path)
         conn.row_factory = sqlite3.Row
         return conn
 
@@ -505,6 +509,11 @@ class IndexService:
         if not items:
             return 0
 
+        with bulk_write_lock(self.db_path):
+            return self._bulk_upsert_locked(items)
+
+    def _bulk_upsert_locked(self, items: list[dict[str, Any]]) -> int:
+        """Write items in one transaction (caller holds the bulk write lock)."""
         conn = self.get_connection()
         try:
             count = 0
@@ -583,20 +592,95 @@ class IndexService:
         finally:
             conn.close()
 
-    def clear_remote_items(self) -> None:
-        """Clear all remote items from index (useful before re-syncing)."""
+    def delete_items(self, paths: list[str]) -> int:
+        """
+        Delete several items from the index in one transaction.
+
+        Args:
+            paths: Item paths to delete
+
+        Returns:
+            Number of items deleted
+        """
+        if not paths:
+            return 0
+
+        with bulk_write_lock(self.db_path):
+            conn = self.get_connection()
+            try:
+                cursor = conn.executemany("DELETE FROM items WHERE path = ?", [(p,) for p in paths])
+                conn.commit()
+
+                # Invalidate cache
+                self._query_cache.clear()
+                self._cache_timestamps.clear()
+                return cursor.rowcount
+            finally:
+                conn.close()
+
+    def get_items(self, paths: list[str]) -> list[dict[str, Any]]:
+        """
+        Get indexed items by path (order follows the index, not the input).
+
+        Args:
+            paths: Item paths to fetch
+
+        Returns:
+            List of items with the same keys as search() results
+        """
+        if not paths:
+            return []
+
         conn = self.get_connection()
         try:
-            conn.execute("DELETE FROM items WHERE is_remote = 1")
-            conn.commit()
-            logger.info("Cleared all remote items from index")
+            results = []
+            # Stay well below SQLite's bound-parameter limit
+            for start in range(0, len(paths), 500):
+                chunk = paths[start:start + 500]
+                placeholders = ", ".join("?" for _ in chunk)
+                cursor = conn.execute(f"""
+                    SELECT
+                        id, name, path, project, size, mtime, is_remote,
+                        description, format, source, tags, category,
+                        spatial_coverage, temporal_coverage,
+                        access_method, storage_location, reference,
+                        spatial_resolution, temporal_resolution
+                    FROM items
+                    WHERE path IN ({placeholders})
+                    ORDER BY mtime DESC
+                """, chunk)
+                for row in cursor.fetchall():
+                    item = dict(row)
+                    item["is_remote"] = bool(item["is_remote"])
+                    results.append(item)
+            return results
+        finally:
+            conn.close()
 
-            # Invalidate cache
-            self._query_cache.clear()
-            self._cache_timestamps.clear()
+    def get_all_paths(self) -> set[str]:
+        """Get the paths of every item in the index."""
+        conn = self.get_connection()
+        try:
+            cursor = conn.execute("SELECT path FROM items")
+            return {row["path"] for row in cursor.fetchall()}
         finally:
             conn.close()
 
+    def clear_remote_items(self) -> None:
+        """Clear all remote items from index (useful before re-syncing)."""
+        with bulk_write_lock(self.db_path):
+            conn = self.get_connection()
+            try:
+                conn.execute("DELETE FROM items WHERE is_remote = 1")
+                conn.commit()
+                logger.info("Cleared all remote items from index")
+
+                # Invalidate cache
+                self._query_cache.clear()
+                self._cache_timestamps.clear()
+            finally:
+                conn.close()
+
     def get_item_count(self) -> int:
         """Get count of items in index (all are cloud datasets)."""
         conn = self.get_connection()
@@ -622,6 +706,15 @@ class IndexService:
         finally:
             conn.close()
 
+    def delete_meta(self, *keys: str) -> None:
+        """Delete metadata keys (missing keys are ignored)."""
+        conn = self.get_connection()
+        try:
+            conn.executemany("DELETE FROM index_meta WHERE key = ?", [(k,) for k in keys])
+            conn.commit()
+        finally:
+            conn.close()
+
     def get_meta(self, key: str) -> Optional[str]:
         """Get metadata value by key."""
         conn = self.get_connection()
@@ -0,0 +1,260 @@
+"""
+Write coordination for the shared index database.
+
+Several processes write index.db: the TUI's background indexer, the sync
+daemon, `hei-datahub reindex` and usage tracking for suggestions. To keep
+them from failing with "database is locked":
+
+- connections use WAL journaling and a busy timeout (connect_index_db)
+- bulk writers take an advisory lock file first (bulk_write_lock)
+- small fire-and-forget writes go through a per-database queue that groups
+  them into one transaction (get_write_queue)
+
+Time spent waiting for write access is recorded in the metrics registry.
+"""
+import atexit
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Optional
+
+from hei_datahub.services.metrics import get_metrics
+
+try:
+    import fcntl
+except ImportError:  # Windows: WAL and busy timeout still apply
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Configuration from environment
+DB_BUSY_TIMEOUT_MS = int(os.environ.get("HEI_DATAHUB_DB_BUSY_TIMEOUT_MS", "5000"))
+
+# Queued writes are grouped until either limit is reached
+WRITE_QUEUE_MAX_BATCH = 100
+WRITE_QUEUE_MAX_DELAY_SEC = 0.25
+# A batch that finds the database busy is retried this often, with backoff
+WRITE_BUSY_RETRIES = 3
+WRITE_BUSY_BACKOFF_SEC = 0.5
+# Waits longer than this are worth a log line, not just a metric
+LOCK_WAIT_LOG_MS = 1000
+
+
+def connect_index_db(db_path: Path) -> sqlite3.Connection:
+    """
+    Open a connection with the shared busy-timeout policy.
+
+    Args:
+        db_path: Database file
+
+    Returns:
+        Connection that waits up to DB_BUSY_TIMEOUT_MS for locks
+    """
+    conn = sqlite3.connect(db_path, timeout=DB_BUSY_TIMEOUT_MS / 1000)
+    conn.execute(f"PRAGMA busy_timeout = {DB_BUSY_TIMEOUT_MS}")
+    # Safe with WAL: only the last transactions can be lost on power failure
+    conn.execute("PRAGMA synchronous = NORMAL")
+    return conn
+
+
+def enable_wal(conn: sqlite3.Connection) -> None:
+    """Switch the database to WAL mode (persistent, so once per init is enough)."""
+    mode = conn.execute("PRAGMA journal_mode = WAL").fetchone()[0]
+    if str(mode).lower() != "wal":
+        logger.warning(f"Could not enable WAL for the index database (journal_mode={mode})")
+
+
+# Serializes bulk writers within this process; flock does the same across processes
+_bulk_thread_lock = threading.Lock()
+
+
+@contextmanager
+def bulk_write_lock(db_path: Path) -> Iterator[None]:
+    """
+    Hold the advisory write lock of a database for a bulk write.
+
+    Args:
+        db_path: Database file (the lock file sits next to it)
+    """
+    lock_path = db_path.with_name(db_path.name + ".lock")
+    start = time.monotonic()
+
+    with _bulk_thread_lock:
+        with open(lock_path, "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+
+            waited_ms = (time.monotonic() - start) * 1000
+            get_metrics().observe("index.lock_wait_ms", waited_ms)
+            if waited_ms > LOCK_WAIT_LOG_MS:
+                logger.info(f"Waited {waited_ms:.0f} ms for the index write lock")
+
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+class IndexWriteQueue:
+    """Background writer that groups small writes into shared transactions."""
+
+    def __init__(
+        self,
+        db_path: Path,
+        max_batch: int = WRITE_QUEUE_MAX_BATCH,
+        max_delay: float = WRITE_QUEUE_MAX_DELAY_SEC,
+    ):
+        """
+        Initialize write queue.
+
+        Args:
+            db_path: Database file to write to
+            max_batch: Most statements per transaction
+            max_delay: Longest a write waits for others to join its batch
+        """
+        self.db_path = db_path
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    def submit(self, sql: str, params: tuple[Any, ...] = ()) -> None:
+        """Queue a write statement; it is committed shortly with others."""
+        self._ensure_thread()
+        self._queue.put((sql, params))
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """
+        Wait until everything submitted so far is committed.
+
+        Returns:
+            True if the queue drained within the timeout
+        """
+        if self._thread is None:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def _ensure_thread(self) -> None:
+        """Start the writer thread on first use."""
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._run, name=f"index-writer-{self.db_path.name}", daemon=True
+            )
+            self._thread.start()
+            atexit.register(self.flush)
+
+    def _run(self) -> None:
+        """Collect queued writes and commit them in batches."""
+        while True:
+            batch: list[tuple[str, tuple[Any, ...]]] = []
+            waiters: list[threading.Event] = []
+
+            item = self._queue.get()
+            deadline = time.monotonic() + self.max_delay
+            while True:
+                if isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    batch.append(item)
+                if len(batch) >= self.max_batch:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+
+            if batch:
+                self._write(batch)
+            for waiter in waiters:
+                waiter.set()
+
+    def _write(self, batch: list[tuple[str, tuple[Any, ...]]]) -> None:
+        """
+        Commit one batch of statements in a single transaction.
+
+        A busy database is retried with backoff. If a statement fails, the
+        batch is written again one statement at a time, so only the failing
+        write is lost.
+        """
+        for attempt in range(WRITE_BUSY_RETRIES + 1):
+            try:
+                self._commit(batch)
+                return
+            except sqlite3.Error as e:
+                if _is_busy(e) and attempt < WRITE_BUSY_RETRIES:
+                    delay = WRITE_BUSY_BACKOFF_SEC * (2 ** attempt)
+                    logger.debug(f"Index database busy, retrying {len(batch)} queued writes in {delay:.1f}s")
+                    time.sleep(delay)
+                    continue
+                if _is_busy(e) or len(batch) == 1:
+                    sql = " ".join(batch[0][0].split())[:80] if len(batch) == 1 else f"{len(batch)} statements"
+                    logger.warning(f"Dropped queued index write ({sql}): {e}")
+                    get_metrics().incr("index.write_queue.dropped", len(batch))
+                    return
+                logger.warning(f"Queued index writes failed ({e}), writing {len(batch)} statements one by one")
+                for item in batch:
+                    self._write([item])
+                return
+
+    def _commit(self, batch: list[tuple[str, tuple[Any, ...]]]) -> None:
+        """Run statements in one transaction (rolled back and raised on error)."""
+        metrics = get_metrics()
+        conn = connect_index_db(self.db_path)
+        try:
+            start = time.monotonic()
+            # Take the write lock up front so the wait is measured in one place
+            conn.execute("BEGIN IMMEDIATE")
+            metrics.observe("index.write_wait_ms", (time.monotonic() - start) * 1000)
+
+            for sql, params in batch:
+                conn.execute(sql, params)
+            conn.commit()
+
+            metrics.incr("index.write_queue.batches")
+            metrics.incr("index.write_queue.writes", len(batch))
+        except sqlite3.Error:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+
+def _is_busy(error: sqlite3.Error) -> bool:
+    """Whether an error means another connection holds the lock (worth retrying)."""
+    name = getattr(error, "sqlite_errorname", "") or ""
+    if name.startswith(("SQLITE_BUSY", "SQLITE_LOCKED")):
+        return True
+    message = str(error).lower()
+    return isinstance(error, sqlite3.OperationalError) and ("locked" in message or "busy" in message)
+
+
+# Global instances, one per database file
+_write_queues: dict[Path, IndexWriteQueue] = {}
+_write_queues_lock = threading.Lock()
+
+
+def get_write_queue(db_path: Path) -> IndexWriteQueue:
+    """Get or create the write queue for a database."""
+    key = Path(db_path).resolve()
+    with _write_queues_lock:
+        write_queue = _write_queues.get(key)
+        if write_queue is None:
+            write_queue = IndexWriteQueue(key)
+            _write_queues[key] = write_queue
+        return write_queue
@@ -3,21 +3,54 @@ Background indexer service for building and maintaining the search index.
 Runs asynchronously without blocking the UI.
 
 Cloud-only implementation - indexes datasets from WebDAV storage.
+
+Metadata comes from what other clients published where it is current:
+new records of the library's change journal (Range reads of the bytes not
+seen yet), then the shared catalog manifest (one conditional GET). Each
+dataset's metadata.yaml is fetched otherwise (see change_journal and
+catalog_manifest). Either way, the full document is kept in the local
+metadata mirror for the detail screens (see metadata_mirror).
 """
 import asyncio
+import json
 import logging
-import os
 import time
 from typing import Any, Optional
 
-import yaml
-
-from hei_datahub.services.index_service import SYNC_INTERVAL_SEC, get_index_service
+from hei_datahub.services.catalog_manifest import (
+    CATALOG_PATH,
+    fresh_entries,
+    read_manifest,
+    update_manifest,
+)
+from hei_datahub.services.change_journal import JOURNAL_FOLDER, latest_puts, read_new_records
+from hei_datahub.services.index_events import (
+    IndexProgress,
+    ItemsIndexed,
+    ItemsRemoved,
+    SyncFinished,
+    get_event_bus,
+)
+from hei_datahub.services.index_service import get_index_service
+from hei_datahub.services.metadata_mirror import get_metadata_mirror
+from hei_datahub.services.request_scheduler import BACKGROUND, request_priority
+from hei_datahub.services.sync_scheduler import SyncScheduler
+from hei_datahub.services.webdav_storage import (
+    StorageAuthError,
+    StorageConnectionError,
+    StorageError,
+    StorageOfflineError,
+    utc_timestamp,
+)
 
 logger = logging.getLogger(__name__)
 
 # Folders to exclude from indexing (internal/system folders)
-SKIP_FOLDERS = frozenset({"_DELETED_DATASETS"})
+SKIP_FOLDERS = frozenset({"_DELETED_DATASETS", JOURNAL_FOLDER})
+
+# Crawl writes are grouped so the UI gets one event per batch, not per dataset
+INDEX_BATCH_SIZE = 25
+INDEX_BATCH_MAX_DELAY_SEC = 0.5
 
 
 class BackgroundIndexer:
@@ -26,9 +59,13 @@ class BackgroundIndexer:
     def __init__(self):
         """Initialize background indexer."""
         self.index_service = get_index_service()
+        self._events = get_event_bus()
+        self.scheduler = SyncScheduler(self.index_service)
         self._sync_task: Optional[asyncio.Task] = None
         self._running = False
         self._indexed = False
+        self._synced = False
+        self._following_daemon = False
 
     async def start(self) -> None:
         """Start background indexing."""
@@ -39,10 +76,7 @@ class BackgroundIndexer:
         self._running = True
         logger.info("Starting background indexer")
 
-        # Start initial index build (non-blocking)
-        asyncio.create_task(self._initial_index())
-
-        # Start periodic sync task
+        # Initial index, then scheduled syncs, in one task so passes never overlap
         self._sync_task = asyncio.create_task(self._sync_loop())
 
     async def stop(self) -> None:
@@ -56,8 +90,13 @@ class BackgroundIndexer:
                 pass
         logger.info("Background indexer stopped")
 
-    async def _initial_index(self) -> None:
-        """Perform initial index build from cloud storage."""
+    async def _initial_index(self, force: bool = False) -> None:
+        """
+        Bring the index up to date at startup.
+
+        Args:
+            force: Sync even if the scheduler says the index is still fresh
+        """
         try:
             # Check if we need full cloud indexing
             last_index = self.index_service.get_meta("last_full_index")
@@ -67,27 +106,44 @@ class BackgroundIndexer:
             # 1. Never indexed before, OR
             # 2. No items in index, OR
             # 3. Last full index was >7 days ago
+            # 4. A previous full crawl was interrupted (resume it)
             should_full_index = (
                 not last_index or
                 total == 0 or
-                self._should_reindex()
+                self._should_reindex() or
+                self.index_service.get_meta("crawl_snapshot") is not None
             )
 
             if should_full_index:
                 logger.info("Performing full cloud index")
-                await self._index_cloud_datasets()
-                self.index_service.set_meta("last_full_index", str(int(time.time())))
-            else:
+                changes = await self._index_cloud_datasets()
+                self.scheduler.record_success(changes)
+                self._indexed = True
+                self._publish_finished(changed=changes)
+            elif force or self.scheduler.is_due():
                 # Do incremental sync (faster, but less thorough)
                 logger.info("Performing incremental cloud sync")
-                await self._incremental_cloud_sync()
+                self._indexed = True
+                await self._run_sync()
+            else:
+                # Index is fresh from a previous session; the scheduler picks up from here
+                logger.info(
+                    f"Index is fresh, next sync in {self.scheduler.seconds_until_due():.0f}s"
+                )
+                self._indexed = True
+                self._publish_finished()
 
-            self._indexed = True
             total = self.index_service.get_item_count()
             logger.info(f"Index ready: {total} cloud datasets")
 
+        except StorageOfflineError as e:
+            logger.info("Storage offline, serving the existing index until it is reachable")
+            self.scheduler.record_failure(e)
+            self._publish_finished(error=str(e))
         except Exception as e:
             logger.error(f"Initial indexing failed: {e}", exc_info=True)
+            self.scheduler.record_failure(e)
+            self._publish_finished(error=str(e))
 
     def _should_reindex(self) -> bool:
         """Check if full reindex is needed."""
@@ -99,248 +155,504 @@ class BackgroundIndexer:
         last_time = int(last_index)
         return (time.time() - last_time) > (7 * 24 * 3600)
 
-    async def _index_cloud_datasets(self) -> None:
-        """Index cloud datasets from WebDAV (shallow listing)."""
+    async def _index_cloud_datasets(self) -> int:
+        """
+        Index cloud datasets from WebDAV (shallow listing), resumably.
+
+        The listing snapshot and a cursor are checkpointed in index_meta
+        after every flushed batch, so an interrupted crawl resumes from the
+        first unprocessed dataset. The crawl is only marked complete (and
+        the checkpoint dropped) after a reconciliation pass has picked up
+        datasets that changed while it was running.
+
+        Returns:
+            Number of datasets indexed or changed
+        """
         try:
-            from hei_datahub.services.storage_manager import get_storage_backend
+            from hei_datahub.services.storage_manager import get_storage_backend, run_storage_call
 
-            logger.info("Indexing cloud datasets from WebDAV")
             storage = get_storage_backend()
+            snapshot, cursor = self._load_crawl_checkpoint()
+
+            if snapshot is None:
+                logger.info("Indexing cloud datasets from WebDAV")
+                # List top-level directories (datasets)
+                entries = await run_storage_call(storage, "listdir", "", priority=BACKGROUND)
+                snapshot = [e.name for e in entries if e.is_dir and e.name not in SKIP_FOLDERS]
+                entries_by_name = {e.name: e for e in entries}
+                cursor = 0
+                self.index_service.set_meta("crawl_snapshot", json.dumps(snapshot))
+                self.index_service.set_meta("crawl_cursor", "0")
+            else:
+                logger.info(f"Resuming interrupted cloud crawl at {cursor}/{len(snapshot)}")
+                entries = await run_storage_call(storage, "listdir", "", priority=BACKGROUND)
+                entries_by_name = {e.name: e for e in entries}
+
+            total = len(snapshot)
+            self._events.publish(IndexProgress(done=cursor, total=total))
+
+            resumed = cursor > 0
+            catalog = await self._load_catalog(storage, entries, set(snapshot[cursor:]))
+            # Metadata fetched one by one, to add to the manifest afterwards
+            fetched: dict[str, dict[str, Any]] = {}
+            # Metadata taken from the journal or manifest, to mirror afterwards
+            published: dict[str, dict[str, Any]] = {}
+            held = self._held_datasets()
+            count = cursor
+            batch: list[dict[str, Any]] = []
+            last_flush = time.monotonic()
+            try:
+                for name in snapshot[cursor:]:
+                    entry = entries_by_name.get(name)
+                    if entry is not None and name not in held and name in catalog:
+                        batch.append(self._build_item(entry, catalog[name]))
+                        published[name] = catalog[name]
+                    elif entry is not None and name not in held:
+                        try:
+                            # Get metadata.yaml if it exists
+                            metadata = await self._fetch_metadata(storage, entry.name)
+                            batch.append(self._build_item(entry, metadata))
+                            if metadata and entry.modified is not None:
+                                fetched[name] = {"mtime": int(utc_timestamp(entry.modified)), "metadata": metadata}
+                        except (StorageConnectionError, StorageAuthError):
+                            # Stop here; the checkpoint keeps this dataset unprocessed
+                            raise
+                        except Exception as e:
+                            logger.warning(f"Failed to index cloud dataset {entry.name}: {e}")
+                            # Index with basic info
+                            batch.append(self._build_item(entry, None))
+                    # Datasets gone since the snapshot are accounted for by reconciliation
 
-            # List top-level directories (datasets)
-            entries = await asyncio.to_thread(storage.listdir, "")
-            datasets = [e for e in entries if e.is_dir and e.name not in SKIP_FOLDERS]
-
-            count = 0
-            for entry in datasets:
-                try:
-                    # Get metadata.yaml if it exists
-                    metadata_path = f"{entry.name}/metadata.yaml"
-                    metadata = await self._fetch_metadata(storage, metadata_path)
-
-                    if metadata:
-                        name = metadata.get("name", entry.name)
-                        description = metadata.get("description", "")
-                        # Support both 'tags' and 'keywords' for backwards compatibility
-                        tags_list = metadata.get("tags") or metadata.get("keywords", [])
-                        tags = " ".join(tags_list) if isinstance(tags_list, list) else str(tags_list)
-                        # Extract project from used_in_projects list (first one if exists)
-                        used_in_projects = metadata.get("used_in_projects", [])
-                        project = used_in_projects[0] if used_in_projects else None
-                        # Use correct field name: file_format not format
-                        file_format = metadata.get("file_format")
-                        source = metadata.get("source")
-                        category = metadata.get("category")
-                        spatial_coverage = metadata.get("spatial_coverage")
-                        temporal_coverage = metadata.get("temporal_coverage")
-                        access_method = metadata.get("access_method")
-                        storage_location = metadata.get("storage_location")
-                        reference = metadata.get("reference")
-                        spatial_resolution = metadata.get("spatial_resolution")
-                        temporal_resolution = metadata.get("temporal_resolution")
-                        size = metadata.get("size")
-                    else:
-                        name = entry.name
-                        description = ""
-                        tags = ""
-                        project = None
-                        file_format = None
-                        source = None
-                        category = None
-                        spatial_coverage = None
-                        temporal_coverage = None
-                        access_method = None
-                        storage_location = None
-                        reference = None
-                        spatial_resolution = None
-                        temporal_resolution = None
-                        size = None
-
-                    # Insert immediately so it shows up in UI right away
-                    # Note: is_remote is always True in cloud-only mode
-                    self.index_service.upsert_item(
-                        path=entry.name,
-                        name=name,
-                        project=project,
-                        tags=tags,
-                        description=description,
-                        format=file_format,
-                        source=source,
-                        category=category,
-                        spatial_coverage=spatial_coverage,
-                        temporal_coverage=temporal_coverage,
-                        access_method=access_method,
-                        storage_location=storage_location,
-                        reference=reference,
-                        spatial_resolution=spatial_resolution,
-                        temporal_resolution=temporal_resolution,
-                        is_remote=True,
-                        size=entry.size or 0,
-                        mtime=int(entry.modified.timestamp()) if entry.modified else None,
-                    )
                     count += 1
-                    logger.info(f"Indexed dataset {count}/{len(datasets)}: {name}")
-
-                except Exception as e:
-                    logger.warning(f"Failed to index cloud dataset {entry.name}: {e}")
-                    # Index with basic info
-                    try:
-                        self.index_service.upsert_item(
-                            path=entry.name,
-                            name=entry.name,
-                            is_remote=True,
-                            size=entry.size or 0,
-                            mtime=int(entry.modified.timestamp()) if entry.modified else None,
-                        )
-                        count += 1
-                    except Exception:
-                        pass
-
-            logger.info(f"Indexed {count} cloud datasets")
+                    logger.info(f"Indexed dataset {count}/{total}: {name}")
+
+                    # Flush in small batches so rows show up in the UI quickly
+                    # without paying one transaction per dataset
+                    if len(batch) >= INDEX_BATCH_SIZE or time.monotonic() - last_flush >= INDEX_BATCH_MAX_DELAY_SEC:
+                        self._flush_batch(batch)
+                        self.index_service.set_meta("crawl_cursor", str(count))
+                        self._events.publish(IndexProgress(done=count, total=total))
+                        batch = []
+                        last_flush = time.monotonic()
+            finally:
+                # Keep finished work even when the crawl is interrupted
+                if batch:
+                    self._flush_batch(batch)
+                    self.index_service.set_meta("crawl_cursor", str(count))
+                    self._events.publish(IndexProgress(done=count, total=total))
+
+            await self._mirror_published(published, entries_by_name)
+
+            indexed = count - cursor
+            logger.info(f"Indexed {indexed} cloud datasets, reconciling changes made during the crawl")
+
+            # Reconcile: datasets added, changed or removed since the snapshot
+            changed, removed = await self._incremental_cloud_sync()
+
+            # Every snapshot entry is accounted for: mark the crawl complete
+            self.index_service.set_meta("last_full_index", str(int(time.time())))
+            self.index_service.delete_meta("crawl_snapshot", "crawl_cursor")
+            await asyncio.to_thread(get_metadata_mirror().prune, self.index_service.get_all_paths())
+
+            if fetched:
+                # Share what this crawl had to fetch; only a complete crawl may create the manifest
+                with request_priority(BACKGROUND):
+                    await asyncio.to_thread(
+                        update_manifest,
+                        storage,
+                        upserts=fetched,
+                        keep={e.name for e in entries if e.is_dir and e.name not in SKIP_FOLDERS},
+                        create=not resumed,
+                    )
+            logger.info(f"Full cloud crawl complete ({changed} changed, {removed} removed while crawling)")
+            return indexed + changed + removed
 
+        except StorageOfflineError:
+            raise
         except Exception as e:
             logger.error(f"Cloud indexing failed: {e}", exc_info=True)
+            raise
 
-    async def _fetch_metadata(self, storage, metadata_path: str) -> Optional[dict[str, Any]]:
-        """Fetch and parse metadata.yaml from cloud storage."""
-        try:
-            import tempfile
+    def _load_crawl_checkpoint(self) -> tuple[Optional[list[str]], int]:
+        """
+        Load the checkpoint of an interrupted full crawl.
 
-            with tempfile.NamedTemporaryFile(mode='wb', delete=False, suffix='.yaml') as tmp:
-                tmp_path = tmp.name
+        Returns:
+            Tuple of (snapshot dataset names, cursor), or (None, 0) if there
+            is no usable checkpoint
+        """
+        raw_snapshot = self.index_service.get_meta("crawl_snapshot")
+        if raw_snapshot is None:
+            return None, 0
 
-            try:
-                await asyncio.to_thread(storage.download, metadata_path, tmp_path)
+        try:
+            snapshot = json.loads(raw_snapshot)
+            cursor = int(self.index_service.get_meta("crawl_cursor") or 0)
+        except (ValueError, TypeError) as e:
+            logger.warning(f"Discarding unreadable crawl checkpoint: {e}")
+            self.index_service.delete_meta("crawl_snapshot", "crawl_cursor")
+            return None, 0
+
+        return snapshot, min(max(cursor, 0), len(snapshot))
+
+    def _build_item(self, entry, metadata: Optional[dict[str, Any]]) -> dict[str, Any]:
+        """Build an index row from a listing entry and its (optional) metadata."""
+        # is_remote is always True in cloud-only mode
+        item: dict[str, Any] = {
+            "path": entry.name,
+            "name": entry.name,
+            "is_remote": True,
+            "size": entry.size or 0,
+            "mtime": int(utc_timestamp(entry.modified)) if entry.modified else None,
+        }
+        if not metadata:
+            return item
+
+        # Support both 'tags' and 'keywords' for backwards compatibility
+        tags_list = metadata.get("tags") or metadata.get("keywords", [])
+        # Extract project from used_in_projects list (first one if exists)
+        used_in_projects = metadata.get("used_in_projects", [])
+
+        item.update({
+            "name": metadata.get("name", entry.name),
+            "description": metadata.get("description", ""),
+            "tags": " ".join(tags_list) if isinstance(tags_list, list) else str(tags_list),
+            "project": used_in_projects[0] if used_in_projects else None,
+            # Use correct field name: file_format not format
+            "format": metadata.get("file_format"),
+            "source": metadata.get("source"),
+            "category": metadata.get("category"),
+            "spatial_coverage": metadata.get("spatial_coverage"),
+            "temporal_coverage": metadata.get("temporal_coverage"),
+            "access_method": metadata.get("access_method"),
+            "storage_location": metadata.get("storage_location"),
+            "reference": metadata.get("reference"),
+            "spatial_resolution": metadata.get("spatial_resolution"),
+            "temporal_resolution": metadata.get("temporal_resolution"),
+        })
+        return item
+
+    def _flush_batch(self, batch: list[dict[str, Any]]) -> None:
+        """Write a batch of items to the index and announce it."""
+        if not batch:
+            return
+        self.index_service.bulk_upsert(batch)
+        self._events.publish(ItemsIndexed(paths=tuple(item["path"] for item in batch)))
 
-                with open(tmp_path, encoding='utf-8') as f:
-                    metadata = yaml.safe_load(f)
+    async def _fetch_metadata(self, storage, dataset_id: str) -> Optional[dict[str, Any]]:
+        """
+        Fetch and parse a dataset's metadata.yaml from cloud storage.
 
-                return metadata
-            finally:
-                try:
-                    os.unlink(tmp_path)
-                except Exception:
-                    pass
+        Goes through the metadata mirror: an unchanged document costs one
+        304, a changed one is mirrored.
 
-        except Exception as e:
-            logger.debug(f"Could not fetch metadata from {metadata_path}: {e}")
-            return None
+        Returns:
+            Parsed metadata, or None if it is missing or unreadable
 
-    async def _incremental_cloud_sync(self) -> None:
-        """Perform incremental sync of cloud datasets (fetches metadata for all)."""
+        Raises:
+            StorageConnectionError, StorageAuthError: If the server can't be
+                reached, so callers don't index the dataset without metadata
+        """
         try:
-            from hei_datahub.services.storage_manager import get_storage_backend
+            with request_priority(BACKGROUND):
+                metadata, _ = await asyncio.to_thread(get_metadata_mirror().fetch, storage, dataset_id)
+            return metadata
 
-            logger.info("Performing incremental cloud sync (with metadata)")
-            storage = get_storage_backend()
+        except (StorageConnectionError, StorageAuthError):
+            raise
+        except Exception as e:
+            logger.debug(f"Could not fetch metadata of {dataset_id}: {e}")
+            return None
 
-            # Get current cloud entries
-            entries = await asyncio.to_thread(storage.listdir, "")
-            datasets = [e for e in entries if e.is_dir and e.name not in SKIP_FOLDERS]
+    @staticmethod
+    async def _mirror_published(published: dict[str, dict[str, Any]], entries_by_name: dict) -> None:
+        """Mirror metadata taken from the change journal or catalog manifest."""
+        if not published:
+            return
 
-            # Fetch metadata for each dataset (same as full index)
-            items = []
-            for entry in datasets:
+        def store() -> None:
+            mirror = get_metadata_mirror()
+            for dataset_id, metadata in published.items():
+                entry = entries_by_name.get(dataset_id)
+                mtime = int(utc_timestamp(entry.modified)) if entry is not None and entry.modified else None
                 try:
-                    # Get metadata.yaml if it exists
-                    metadata_path = f"{entry.name}/metadata.yaml"
-                    metadata = await self._fetch_metadata(storage, metadata_path)
-
-                    if metadata:
-                        name = metadata.get("name", entry.name)
-                        description = metadata.get("description", "")
-                        # Support both 'tags' and 'keywords' for backwards compatibility
-                        tags_list = metadata.get("tags") or metadata.get("keywords", [])
-                        tags = " ".join(tags_list) if isinstance(tags_list, list) else str(tags_list)
-                        # Extract project from used_in_projects list (first one if exists)
-                        used_in_projects = metadata.get("used_in_projects", [])
-                        project = used_in_projects[0] if used_in_projects else None
-                        file_format = metadata.get("file_format")
-                        source = metadata.get("source")
-                        category = metadata.get("category")
-                        spatial_coverage = metadata.get("spatial_coverage")
-                        temporal_coverage = metadata.get("temporal_coverage")
-                        access_method = metadata.get("access_method")
-                        storage_location = metadata.get("storage_location")
-                        reference = metadata.get("reference")
-                        spatial_resolution = metadata.get("spatial_resolution")
-                        temporal_resolution = metadata.get("temporal_resolution")
-                        size = metadata.get("size")
-                    else:
-                        name = entry.name
-                        description = ""
-                        tags = ""
-                        project = None
-                        file_format = None
-                        source = None
-                        category = None
-                        spatial_coverage = None
-                        temporal_coverage = None
-                        access_method = None
-                        storage_location = None
-                        reference = None
-                        spatial_resolution = None
-                        temporal_resolution = None
-                        size = None
-
-                    # is_remote is always True in cloud-only mode
-                    items.append({
-                        "path": entry.name,
-                        "name": name,
-                        "is_remote": True,
-                        "size": entry.size or 0,
-                        "mtime": int(entry.modified.timestamp()) if entry.modified else None,
-                        "project": project,
-                        "tags": tags,
-                        "description": description,
-                        "format": file_format,
-                        "source": source,
-                        "category": category,
-                        "spatial_coverage": spatial_coverage,
-                        "temporal_coverage": temporal_coverage,
-                        "access_method": access_method,
-                        "storage_location": storage_location,
-                        "reference": reference,
-                        "spatial_resolution": spatial_resolution,
-                        "temporal_resolution": temporal_resolution,
-                    })
-
-                except Exception as e:
-                    logger.warning(f"Failed to sync cloud dataset {entry.name}: {e}")
-                    # Index with basic info
-                    items.append({
-                        "path": entry.name,
-                        "name": entry.name,
-                        "is_remote": True,
-                        "size": entry.size or 0,
-                        "mtime": int(entry.modified.timestamp()) if entry.modified else None,
-                    })
-
-            if items:
-                count = self.index_service.bulk_upsert(items)
-                logger.info(f"Incrementally synced {count} cloud datasets")
+                    mirror.store_metadata(dataset_id, metadata, mtime)
+                except ValueError as e:
+                    logger.debug(f"Not mirroring metadata of {dataset_id}: {e}")
+
+        await asyncio.to_thread(store)
+
+    async def _incremental_cloud_sync(self) -> tuple[int, int]:
+        """
+        Perform a delta sync of cloud datasets.
+
+        Metadata is only fetched for new datasets or those whose folder
+        mtime differs from the index, and only items whose indexed fields
+        actually changed are written.
+
+        Returns:
+            Tuple of (changed, removed) item counts
+
+        Raises:
+            Exception: If the listing fails (the scheduler backs off)
+        """
+        from hei_datahub.services.storage_manager import get_storage_backend, run_storage_call
+
+        logger.info("Performing incremental cloud sync (with metadata)")
+        storage = get_storage_backend()
+
+        # Get current cloud entries
+        entries = await run_storage_call(storage, "listdir", "", priority=BACKGROUND)
+        datasets = [e for e in entries if e.is_dir and e.name not in SKIP_FOLDERS]
+        self._events.publish(IndexProgress(done=0, total=len(datasets)))
+        # Queued local changes win until the outbox has written them
+        held = self._held_datasets()
+
+        # Delta: only datasets that are new or whose folder mtime moved need
+        # their metadata fetched (the weekly full index re-reads everything)
+        indexed_mtimes = {
+            row["path"]: row["mtime"]
+            for row in self.index_service.get_items([e.name for e in datasets])
+        }
+        to_fetch = [
+            e for e in datasets
+            if e.name not in held and (
+                e.name not in indexed_mtimes
+                or e.modified is None
+                or indexed_mtimes[e.name] != int(utc_timestamp(e.modified))
+            )
+        ]
+        logger.info(f"Delta sync: {len(to_fetch)} of {len(datasets)} datasets changed since last sync")
+
+        catalog = await self._load_catalog(storage, entries, {e.name for e in to_fetch}) if to_fetch else {}
+        await self._mirror_published(
+            {e.name: catalog[e.name] for e in to_fetch if e.name in catalog}, {e.name: e for e in to_fetch}
+        )
+        items = []
+        for entry in to_fetch:
+            if entry.name in catalog:
+                items.append(self._build_item(entry, catalog[entry.name]))
+                continue
+            try:
+                # Get metadata.yaml if it exists
+                metadata = await self._fetch_metadata(storage, entry.name)
+                items.append(self._build_item(entry, metadata))
+            except (StorageConnectionError, StorageAuthError):
+                raise
+            except Exception as e:
+                logger.warning(f"Failed to sync cloud dataset {entry.name}: {e}")
+                # Index with basic info
+                items.append(self._build_item(entry, None))
+
+        changed = self._changed_items(items)
+        if changed:
+            self.index_service.bulk_upsert(changed)
+            self._events.publish(ItemsIndexed(paths=tuple(item["path"] for item in changed)))
+            logger.info(f"Incrementally synced {len(changed)} changed cloud datasets")
+
+        # Drop datasets that were deleted or moved away on the server
+        removed = sorted(self.index_service.get_all_paths() - {e.name for e in datasets} - held)
+        if removed:
+            self.index_service.delete_items(removed)
+            mirror = get_metadata_mirror()
+            for dataset_id in removed:
+                mirror.remove(dataset_id)
+            self._events.publish(ItemsRemoved(paths=tuple(removed)))
+            logger.info(f"Removed {len(removed)} datasets no longer in the cloud")
+
+        self._events.publish(IndexProgress(done=len(datasets), total=len(datasets)))
+        return len(changed), len(removed)
+
+    async def _load_catalog(self, storage, entries, wanted: set[str]) -> dict[str, dict[str, Any]]:
+        """
+        Collect metadata other clients published, instead of fetching each metadata.yaml.
+
+        New change journal records are read first; the catalog manifest
+        only if the journal doesn't cover all wanted datasets.
+
+        Args:
+            storage: Storage backend
+            entries: Library root listing
+            wanted: Datasets whose metadata is needed
+
+        Returns:
+            Metadata by dataset id for datasets whose published entry is
+            current (folder mtime unchanged since)
+
+        Raises:
+            StorageConnectionError, StorageAuthError: If the server can't be reached
+        """
+        published: dict[str, dict[str, Any]] = {}
+        if any(e.is_dir and e.name == JOURNAL_FOLDER for e in entries):
+            published = fresh_entries(await self._read_journal(storage), entries)
+
+        if wanted - published.keys() and any(not e.is_dir and e.name == CATALOG_PATH for e in entries):
+            try:
+                with request_priority(BACKGROUND):
+                    datasets = await asyncio.to_thread(read_manifest, storage)
+            except (StorageConnectionError, StorageAuthError):
+                raise
+            except StorageError as e:
+                logger.warning(f"Could not read the catalog manifest, fetching metadata per dataset: {e}")
+                datasets = None
+            if datasets:
+                # Journal records are newer than the manifest
+                published = {**fresh_entries(datasets, entries), **published}
+
+        covered = len(wanted & published.keys())
+        if covered:
+            logger.info(f"Published metadata is current for {covered} of {len(wanted)} datasets")
+        return published
+
+    async def _read_journal(self, storage) -> dict[str, dict[str, Any]]:
+        """
+        Read change journal records appended since the last read.
+
+        The new offsets are stored right away: skipped records only mean
+        fetching those datasets' metadata.yaml.
+
+        Returns:
+            Latest published metadata per dataset, in manifest entry form
+        """
+        try:
+            offsets = json.loads(self.index_service.get_meta("journal_offsets") or "{}")
+        except ValueError:
+            offsets = {}
+        try:
+            with request_priority(BACKGROUND):
+                records, offsets = await asyncio.to_thread(read_new_records, storage, offsets)
+        except (StorageConnectionError, StorageAuthError):
+            raise
+        except StorageError as e:
+            logger.warning(f"Could not read the change journal: {e}")
+            return {}
+        self.index_service.set_meta("journal_offsets", json.dumps(offsets))
+        return latest_puts(records)
+
+    @staticmethod
+    def _held_datasets() -> set[str]:
+        """Datasets with changes queued in the outbox: their index rows are ahead of the server."""
+        try:
+            from hei_datahub.services.outbox import get_outbox
 
+            return get_outbox().pending_datasets()
+        except Exception as e:
+            logger.warning(f"Could not read the outbox: {e}")
+            return set()
+
+    def _changed_items(self, items: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Filter items down to those that are new or differ from the index."""
+        existing = {
+            row["path"]: row
+            for row in self.index_service.get_items([item["path"] for item in items])
+        }
+        changed = []
+        for item in items:
+            row = existing.get(item["path"])
+            if row is None or any(
+                row.get(key) != item.get(key) for key in row if key != "id"
+            ):
+                changed.append(item)
+        return changed
+
+    async def _run_sync(self) -> None:
+        """Run one incremental sync and report the outcome to the scheduler."""
+        try:
+            if self.index_service.get_meta("crawl_snapshot") is not None:
+                # Finish an interrupted full crawl before going incremental
+                changed, removed = await self._index_cloud_datasets(), 0
+            else:
+                changed, removed = await self._incremental_cloud_sync()
+        except StorageOfflineError as e:
+            logger.info("Skipping sync, storage offline")
+            self.scheduler.record_failure(e)
+            self._publish_finished(error=str(e))
+            return
         except Exception as e:
             logger.error(f"Incremental sync failed: {e}", exc_info=True)
+            self.scheduler.record_failure(e)
+            self._publish_finished(error=str(e))
+            return
+
+        self.scheduler.record_success(changed + removed)
+        self._publish_finished(changed=changed, removed=removed)
 
     async def _sync_loop(self) -> None:
-        """Periodic sync loop."""
+        """Initial index followed by adaptively scheduled syncs."""
+        await self._initial_index()
+
         while self._running:
             try:
-                await asyncio.sleep(SYNC_INTERVAL_SEC)
+                reason = await self.scheduler.wait_until_due()
 
                 if not self._running:
                     break
 
-                logger.debug("Running periodic index sync")
-                await self._incremental_cloud_sync()
-                self.index_service.set_meta("last_sync", str(int(time.time())))
+                logger.debug(f"Running index sync ({reason})")
+                await self._run_sync()
 
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 logger.error(f"Sync loop error: {e}", exc_info=True)
 
+    def request_sync(self) -> None:
+        """Request an immediate sync ("sync now"); concurrent requests are coalesced."""
+        if self._following_daemon:
+            from hei_datahub.services.sync_daemon import send_command
+            send_command("sync")
+            return
+        self.scheduler.request_sync()
+
+    def follow_daemon(self, following: bool = True) -> None:
+        """
+        Let the sync daemon own indexing for this process.
+
+        While following, sync requests are forwarded to the daemon and the
+        readiness flags mirror the daemon's (see mirror_status()).
+        """
+        self._following_daemon = following
+
+    def is_following_daemon(self) -> bool:
+        """Check if indexing is delegated to the sync daemon."""
+        return self._following_daemon
+
+    def mirror_status(self, status: dict[str, Any]) -> None:
+        """Adopt readiness flags reported by the sync daemon."""
+        self._indexed = bool(status.get("indexed", self._indexed))
+        self._synced = bool(status.get("synced", self._synced))
+
+    async def sync_once(self) -> dict[str, Any]:
+        """
+        Run a single sync pass without the background loop (CLI use).
+
+        Returns:
+            Indexer status after the pass
+        """
+        await self._initial_index(force=True)
+        return self.get_status()
+
+    def _publish_finished(
+        self, changed: int = 0, removed: int = 0, error: Optional[str] = None
+    ) -> None:
+        """Announce the end of a crawl or sync pass."""
+        if error is None:
+            self._synced = True
+        self._events.publish(SyncFinished(
+            total_items=self.index_service.get_item_count(),
+            changed=changed,
+            removed=removed,
+            error=error,
+        ))
+
+    def is_running(self) -> bool:
+        """Check if the background sync loop is active."""
+        return self._running
+
+    def is_synced(self) -> bool:
+        """Check if the index has been confirmed against the cloud this session."""
+        return self._synced
+
     def is_ready(self) -> bool:
         """Check if initial indexing is complete."""
         return self._indexed
@@ -351,8 +663,10 @@ class BackgroundIndexer:
         return {
             "running": self._running,
             "indexed": self._indexed,
+            "synced": self._synced,
             "total_items": total,
             "last_sync": self.index_service.get_meta("last_sync"),
+            "scheduler": self.scheduler.get_status(),
         }
 
 
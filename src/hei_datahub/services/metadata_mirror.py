@@ -0,0 +1,308 @@
+"""
+Local mirror of every dataset's metadata.yaml.
+
+The search index only keeps the columns it searches, so a detail view
+rebuilt from it lacks fields such as date_created or schema_fields. The
+mirror keeps the full original document of each dataset under DATA_DIR,
+so details open instantly and offline:
+
+    <MIRROR_DIR>/<dataset id>.yaml   the document, byte for byte
+    <MIRROR_DIR>/<dataset id>.json   {"sha256", "etag", "last_modified", "mtime", "synced"}
+
+The indexer writes it whenever it reads metadata (from the server, the
+change journal or the catalog manifest). fetch() revalidates an entry with
+a conditional GET on its ETag, so an unchanged document costs one 304.
+Both files are replaced atomically; the sidecar's sha256 ties them
+together, and an entry whose files don't match is treated as missing.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+import yaml
+
+from hei_datahub.infra.paths import DATA_DIR
+from hei_datahub.services.webdav_storage import StorageNotFoundError, StorageOfflineError
+
+logger = logging.getLogger(__name__)
+
+# Hidden, so local dataset listings of DATA_DIR never take it for a dataset
+MIRROR_DIR = DATA_DIR / ".mirror"
+METADATA_FILE = "metadata.yaml"
+
+# Dataset ids are folder names in the library root
+_VALID_ID = re.compile(r"^[^/\\]+$")
+
+
+@dataclass
+class MirroredMetadata:
+    """A dataset's mirrored metadata.yaml."""
+    metadata: dict[str, Any]
+    etag: Optional[str]  # Validators of the server copy (None if it came from a manifest or journal)
+    last_modified: Optional[str]
+    mtime: Optional[int]  # Dataset folder mtime the document was current for, if known
+    synced: float  # When the server copy was last read or confirmed
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """Replace a file so readers see either the old or the new content."""
+    fd, name = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(name, path)
+    except BaseException:
+        Path(name).unlink(missing_ok=True)
+        raise
+
+
+def parse_metadata(data: bytes) -> dict[str, Any]:
+    """
+    Parse a metadata.yaml document.
+
+    Raises:
+        ValueError: If it is not YAML or not a mapping
+    """
+    try:
+        metadata = yaml.safe_load(data)
+    except yaml.YAMLError as e:
+        raise ValueError(f"Invalid metadata.yaml: {e}")
+    if not isinstance(metadata, dict):
+        raise ValueError("metadata.yaml is not a mapping")
+    return metadata
+
+
+def _comparable(metadata: dict[str, Any]) -> Any:
+    """Metadata as JSON would carry it (dates become strings)."""
+    return json.loads(json.dumps(metadata, default=str))
+
+
+class MetadataMirror:
+    """Atomically written local copies of the library's metadata.yaml files."""
+
+    def __init__(self, root: Path = MIRROR_DIR):
+        """
+        Initialize mirror.
+
+        Args:
+            root: Directory holding the mirrored documents
+        """
+        self.root = Path(root)
+
+    def _paths(self, dataset_id: str) -> tuple[Path, Path]:
+        if not _VALID_ID.match(dataset_id) or dataset_id.startswith("."):
+            raise ValueError(f"Invalid dataset id: {dataset_id!r}")
+        return self.root / f"{dataset_id}.yaml", self.root / f"{dataset_id}.json"
+
+    def _read_state(self, state_path: Path) -> Optional[dict[str, Any]]:
+        try:
+            state = json.loads(state_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        return state if isinstance(state, dict) else None
+
+    def get(self, dataset_id: str) -> Optional[MirroredMetadata]:
+        """
+        Get a dataset's mirrored metadata.
+
+        Returns:
+            MirroredMetadata, or None if it isn't mirrored (or the entry is damaged)
+        """
+        doc_path, state_path = self._paths(dataset_id)
+        state = self._read_state(state_path)
+        if state is None:
+            return None
+        try:
+            data = doc_path.read_bytes()
+        except OSError:
+            return None
+        if hashlib.sha256(data).hexdigest() != state.get("sha256"):
+            # Written concurrently or damaged: fetch it again
+            logger.debug(f"Mirrored metadata of {dataset_id} doesn't match its state, ignoring it")
+            return None
+        try:
+            metadata = parse_metadata(data)
+        except ValueError:
+            return None
+        return MirroredMetadata(
+            metadata=metadata,
+            etag=state.get("etag"),
+            last_modified=state.get("last_modified"),
+            mtime=state.get("mtime"),
+            synced=state.get("synced") or 0.0,
+        )
+
+    def store(
+        self,
+        dataset_id: str,
+        data: bytes,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        mtime: Optional[int] = None,
+    ) -> dict[str, Any]:
+        """
+        Mirror a metadata.yaml document as read from the server.
+
+        The document is only rewritten if its content hash changed.
+
+        Args:
+            dataset_id: Dataset folder name
+            data: Document bytes
+            etag: ETag of the server copy
+            last_modified: Last-Modified of the server copy
+            mtime: Dataset folder mtime the document is current for
+
+        Returns:
+            Parsed metadata
+
+        Raises:
+            ValueError: If the document is not a metadata mapping (nothing is stored)
+        """
+        metadata = parse_metadata(data)
+        doc_path, state_path = self._paths(dataset_id)
+        digest = hashlib.sha256(data).hexdigest()
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            previous = self._read_state(state_path)
+            if previous is None or previous.get("sha256") != digest or not doc_path.exists():
+                _write_atomic(doc_path, data)
+            state = {
+                "sha256": digest,
+                "etag": etag,
+                "last_modified": last_modified,
+                "mtime": mtime,
+                "synced": time.time(),
+            }
+            _write_atomic(state_path, json.dumps(state).encode("utf-8"))
+        except OSError as e:
+            logger.warning(f"Could not mirror metadata of {dataset_id}: {e}")
+        return metadata
+
+    def store_metadata(self, dataset_id: str, metadata: dict[str, Any], mtime: Optional[int] = None) -> None:
+        """
+        Mirror metadata published without the original document (manifest,
+        change journal, own writes).
+
+        Keeps an existing entry with the same content (dates compared as
+        the manifest stores them, as strings), with its validators.
+
+        Args:
+            dataset_id: Dataset folder name
+            metadata: Parsed metadata
+            mtime: Dataset folder mtime the metadata is current for
+        """
+        current = self.get(dataset_id)
+        if current is not None and _comparable(current.metadata) == _comparable(metadata):
+            return
+        data = yaml.safe_dump(metadata, default_flow_style=False, sort_keys=False, allow_unicode=True)
+        self.store(dataset_id, data.encode("utf-8"), mtime=mtime)
+
+    def fetch(self, storage, dataset_id: str, allow_stale: bool = False) -> tuple[dict[str, Any], bool]:
+        """
+        Get a dataset's metadata from the server, revalidating the mirrored copy.
+
+        Args:
+            storage: Storage backend
+            dataset_id: Dataset folder name
+            allow_stale: Return the mirrored copy while storage is offline
+
+        Returns:
+            Tuple of (metadata, whether it differs from the mirrored copy)
+
+        Raises:
+            StorageError: If the document could not be fetched (and no
+                mirrored copy could stand in)
+            ValueError: If the server's document is not a metadata mapping
+        """
+        remote_path = f"{dataset_id}/{METADATA_FILE}"
+        mirrored = self.get(dataset_id)
+        self.root.mkdir(parents=True, exist_ok=True)
+        fd, name = tempfile.mkstemp(prefix=".fetch-", suffix=".yaml", dir=self.root)
+        os.close(fd)
+        tmp = Path(name)
+        try:
+            try:
+                info = storage.fetch_if_changed(
+                    remote_path,
+                    str(tmp),
+                    mirrored.etag if mirrored else None,
+                    mirrored.last_modified if mirrored else None,
+                )
+            except StorageOfflineError:
+                if mirrored is None or not allow_stale:
+                    raise
+                logger.debug(f"Storage offline, using mirrored metadata of {dataset_id}")
+                return mirrored.metadata, False
+            except StorageNotFoundError:
+                self.remove(dataset_id)
+                raise
+
+            if info is None and mirrored is not None:
+                logger.debug(f"Mirrored metadata of {dataset_id} is current")
+                return mirrored.metadata, False
+            if info is None:
+                # 304 without a copy to match
+                storage.download(remote_path, str(tmp))
+                etag = last_modified = None
+            else:
+                etag, last_modified = info.etag, info.last_modified
+
+            metadata = self.store(dataset_id, tmp.read_bytes(), etag, last_modified)
+            return metadata, mirrored is None or mirrored.metadata != metadata
+        finally:
+            tmp.unlink(missing_ok=True)
+
+    def remove(self, dataset_id: str) -> None:
+        """Forget a dataset's mirrored metadata."""
+        try:
+            paths = self._paths(dataset_id)
+        except ValueError:
+            return
+        for path in paths:
+            try:
+                path.unlink(missing_ok=True)
+            except OSError as e:
+                logger.debug(f"Could not remove {path}: {e}")
+
+    def dataset_ids(self) -> set[str]:
+        """Ids of all mirrored datasets."""
+        try:
+            return {path.stem for path in self.root.glob("*.json") if not path.name.startswith(".")}
+        except OSError:
+            return set()
+
+    def prune(self, keep: set[str]) -> int:
+        """
+        Remove datasets that are no longer in the library.
+
+        Args:
+            keep: Ids of the datasets that still exist
+
+        Returns:
+            Number of datasets removed
+        """
+        gone = self.dataset_ids() - set(keep)
+        for dataset_id in gone:
+            self.remove(dataset_id)
+        if gone:
+            logger.info(f"Removed mirrored metadata of {len(gone)} datasets no longer in the library")
+        return len(gone)
+
+
+# Global mirror instance
+_metadata_mirror: Optional[MetadataMirror] = None
+
+
+def get_metadata_mirror() -> MetadataMirror:
+    """Get the global metadata mirror."""
+    global _metadata_mirror
+    if _metadata_mirror is None:
+        _metadata_mirror = MetadataMirror()
+    return _metadata_mirror
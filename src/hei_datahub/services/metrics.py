@@ -0,0 +1,89 @@
+"""
+Lightweight in-process metrics for performance diagnostics.
+
+Counters and timings are kept in memory only; they are logged where useful
+and shown by the debug console's `metrics` command.
+"""
+import logging
+import threading
+import time
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class Metrics:
+    """Thread-safe registry of counters, timings and time marks."""
+
+    def __init__(self):
+        """Initialize metrics registry."""
+        self._lock = threading.Lock()
+        self._counters: dict[str, int] = {}
+        self._timings: dict[str, dict[str, float]] = {}
+        self._marks: dict[str, float] = {}
+
+    def incr(self, name: str, amount: int = 1) -> None:
+        """Increase a counter."""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def observe(self, name: str, value: float) -> None:
+        """
+        Record one timing or size sample.
+
+        Args:
+            name: Metric name (suffix with the unit, e.g. "_ms")
+            value: Sample value
+        """
+        with self._lock:
+            stats = self._timings.get(name)
+            if stats is None:
+                stats = {"count": 0, "total": 0.0, "max": value, "last": value}
+                self._timings[name] = stats
+            stats["count"] += 1
+            stats["total"] += value
+            stats["max"] = max(stats["max"], value)
+            stats["last"] = value
+
+    def mark(self, name: str) -> None:
+        """Remember the current time under a name (e.g. "startup")."""
+        with self._lock:
+            self._marks[name] = time.monotonic()
+
+    def since(self, name: str, clear: bool = False) -> Optional[float]:
+        """
+        Milliseconds elapsed since a mark.
+
+        Args:
+            name: Mark name
+            clear: Forget the mark afterwards (for one-shot measurements)
+
+        Returns:
+            Elapsed milliseconds, or None if the mark is not set
+        """
+        with self._lock:
+            start = self._marks.pop(name, None) if clear else self._marks.get(name)
+        if start is None:
+            return None
+        return (time.monotonic() - start) * 1000
+
+    def snapshot(self) -> dict[str, Any]:
+        """Get a copy of all counters and timings."""
+        with self._lock:
+            timings = {
+                name: {**stats, "avg": stats["total"] / stats["count"]}
+                for name, stats in self._timings.items()
+            }
+            return {"counters": dict(self._counters), "timings": timings}
+
+
+# Global instance
+_metrics: Optional[Metrics] = None
+
+
+def get_metrics() -> Metrics:
+    """Get or create the global metrics registry."""
+    global _metrics
+    if _metrics is None:
+        _metrics = Metrics()
+    return _metrics
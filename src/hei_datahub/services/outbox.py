@@ -0,0 +1,699 @@
+"""
+Durable outbox for dataset changes (add, edit, delete).
+
+Saving a dataset used to block on the network and fail outright when
+Heibox was slow or unreachable. Changes now go through an outbox instead:
+
+- the screen updates the search index at once (optimistically) and records
+  the intended change in a journal in STATE_DIR (outbox.json, rewritten
+  atomically and fsynced), which takes milliseconds
+- a background thread replays the journal to WebDAV in order: right after
+  a change is queued, on startup, and whenever the storage circuit breaker
+  reports that the server is reachable again
+- failed operations are retried with exponential backoff; after
+  MAX_ATTEMPTS they stay in the outbox as "failed" until retried by hand
+
+Edits are checked for conflicts before they are written. The queued
+operation keeps the metadata the edit started from (base); at replay time
+the current metadata.yaml is downloaded and merged field by field: fields
+only the user changed are applied on top of the server's version, and a
+field changed differently on both sides stops the operation as a conflict
+(`hei-datahub outbox retry --force ID` overwrites, `discard` drops it).
+
+Operations on the same dataset are applied strictly in order; an operation
+that is waiting or stuck holds back later ones for its dataset only.
+
+The outbox is shared by all processes (TUI, CLI) through a lock file next
+to the journal. After a replay, the changes are also announced to other
+clients in the library's change journal (see change_journal), or in the
+catalog manifest if the journal can't be written.
+"""
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, fields
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import yaml
+
+from hei_datahub.infra.paths import STATE_DIR
+from hei_datahub.services.webdav_storage import (
+    StorageAuthError,
+    StorageConnectionError,
+    StorageError,
+    StorageNotFoundError,
+)
+
+try:
+    import fcntl
+except ImportError:  # Windows: the thread lock still serializes this process
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_FILE = STATE_DIR / "outbox.json"
+OUTBOX_VERSION = 1
+
+# Operation kinds
+PUT_METADATA = "put_metadata"  # Write a dataset's metadata.yaml (creating the folder if new)
+DELETE_DATASET = "delete_dataset"  # Move a dataset folder to the backup folder
+
+# Operation states
+PENDING = "pending"  # Waiting to be applied (possibly after a backoff)
+CONFLICT = "conflict"  # The server changed the same fields; needs a decision
+FAILED = "failed"  # Gave up after MAX_ATTEMPTS; needs a manual retry
+
+# Deleted datasets are moved here, so they can be restored from Heibox
+DELETED_FOLDER = "_DELETED_DATASETS"
+
+MAX_ATTEMPTS = 8
+RETRY_BASE_SEC = 5.0
+RETRY_MAX_SEC = 300.0
+
+Listener = Callable[["OutboxOp", str], None]
+
+
+class OutboxConflictError(StorageError):
+    """The server copy changed in a way that conflicts with a queued change."""
+    pass
+
+
+@dataclass
+class OutboxOp:
+    """One queued change."""
+    id: str
+    kind: str
+    dataset_id: str
+    created: float
+    metadata: Optional[dict[str, Any]] = None  # put: the new metadata.yaml content
+    base: Optional[dict[str, Any]] = None  # put: metadata the edit started from (None = new dataset)
+    backup_path: Optional[str] = None  # delete: where the folder goes
+    status: str = PENDING
+    attempts: int = 0
+    last_error: Optional[str] = None
+    next_attempt: float = 0.0  # Unix time of the next retry
+    force: bool = False  # Overwrite conflicting server changes
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "OutboxOp":
+        """Build an operation from its journal record (unknown keys are ignored)."""
+        known = {f.name for f in fields(cls)}
+        return cls(**{key: value for key, value in data.items() if key in known})
+
+    def describe(self) -> str:
+        """Short human-readable description."""
+        if self.kind == DELETE_DATASET:
+            return f"delete {self.dataset_id}"
+        if self.base is None:
+            return f"add {self.dataset_id}"
+        return f"edit {self.dataset_id}"
+
+
+def cloud_metadata(metadata: dict[str, Any]) -> dict[str, Any]:
+    """
+    Convert form metadata into the metadata.yaml layout.
+
+    The form's dataset_name is stored as name, and id is implicit from the
+    folder name.
+
+    Args:
+        metadata: Metadata as edited in the add/edit forms
+
+    Returns:
+        Metadata as written to metadata.yaml
+    """
+    result = {}
+    for key, value in metadata.items():
+        if key == "dataset_name":
+            result["name"] = value
+        elif key != "id":
+            result[key] = value
+    return result
+
+
+def merge_metadata(
+    base: dict[str, Any], ours: dict[str, Any], theirs: dict[str, Any]
+) -> tuple[dict[str, Any], list[str]]:
+    """
+    Three-way merge of a metadata edit into the server's current version.
+
+    Args:
+        base: Metadata the edit started from
+        ours: Metadata after the edit
+        theirs: Metadata currently on the server
+
+    Returns:
+        Tuple of (merged metadata, fields changed differently on both sides);
+        conflicting fields take our value in the merged metadata
+    """
+    merged = dict(theirs)
+    conflicts = []
+    for key in list(ours) + [key for key in base if key not in ours]:
+        mine, old = ours.get(key), base.get(key)
+        if mine == old:
+            continue
+        if theirs.get(key) not in (old, mine):
+            conflicts.append(key)
+        if key in ours:
+            merged[key] = mine
+        else:
+            merged.pop(key, None)
+    return merged, conflicts
+
+
+def _retry_delay(attempts: int) -> float:
+    """Backoff before the next attempt, in seconds."""
+    return min(RETRY_BASE_SEC * 2 ** max(attempts - 1, 0), RETRY_MAX_SEC)
+
+
+class Outbox:
+    """Journal of dataset changes waiting to be written to storage."""
+
+    def __init__(self, path: Path = OUTBOX_FILE):
+        """
+        Initialize outbox.
+
+        Args:
+            path: Journal file (the lock file sits next to it)
+        """
+        self.path = Path(path)
+        self._lock_path = self.path.with_name(self.path.name + ".lock")
+        self._flush_lock_path = self.path.with_name(self.path.name + ".flush.lock")
+        self._thread_lock = threading.RLock()
+        self._flush_lock = threading.Lock()
+        self._flusher: Optional[threading.Thread] = None
+        self._flush_again = False
+        self._timer: Optional[threading.Timer] = None
+        self._listeners: list[Listener] = []
+
+    # -- Journal --------------------------------------------------------
+
+    def _read(self) -> list[OutboxOp]:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return []
+        except (OSError, ValueError) as e:
+            # Never silently drop queued changes: keep the file for inspection
+            logger.error(f"Outbox journal {self.path} is unreadable: {e}")
+            raise StorageError(f"Outbox journal is unreadable: {e}")
+        return [OutboxOp.from_dict(op) for op in data.get("ops", [])]
+
+    def _write(self, ops: list[OutboxOp]) -> None:
+        """Replace the journal atomically (and durably)."""
+        if not ops:
+            self.path.unlink(missing_ok=True)
+            return
+        data = {"version": OUTBOX_VERSION, "ops": [asdict(op) for op in ops]}
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=1)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    @contextmanager
+    def _locked(self) -> Iterator[list[OutboxOp]]:
+        """Load the journal under the lock, and save the (modified) list on exit."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._thread_lock, open(self._lock_path, "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                ops = self._read()
+                before = [asdict(op) for op in ops]
+                yield ops
+                if [asdict(op) for op in ops] != before:
+                    self._write(ops)
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    # -- Queries --------------------------------------------------------
+
+    def pending(self) -> list[OutboxOp]:
+        """All queued operations, oldest first (including conflicts and failures)."""
+        with self._thread_lock:
+            return self._read()
+
+    def pending_datasets(self) -> set[str]:
+        """Datasets with queued changes (the index sync leaves them alone)."""
+        return {op.dataset_id for op in self.pending()}
+
+    def pending_metadata(self, dataset_id: str) -> Optional[dict[str, Any]]:
+        """
+        Metadata of a dataset as it will be after the queued changes.
+
+        Args:
+            dataset_id: Dataset folder
+
+        Returns:
+            Metadata of the latest queued write, or None if there is none
+            (or the dataset is queued for deletion)
+        """
+        metadata = None
+        for op in self.pending():
+            if op.dataset_id == dataset_id:
+                metadata = op.metadata if op.kind == PUT_METADATA else None
+        return metadata
+
+    # -- Changes --------------------------------------------------------
+
+    def enqueue_put(
+        self, dataset_id: str, metadata: dict[str, Any], base: Optional[dict[str, Any]] = None
+    ) -> OutboxOp:
+        """
+        Queue writing a dataset's metadata.yaml.
+
+        Args:
+            dataset_id: Dataset folder
+            metadata: New metadata.yaml content
+            base: Metadata the edit started from, or None for a new dataset
+
+        Returns:
+            The queued operation
+        """
+        op = OutboxOp(
+            id=uuid.uuid4().hex[:8],
+            kind=PUT_METADATA,
+            dataset_id=dataset_id,
+            created=time.time(),
+            metadata=metadata,
+            base=base,
+        )
+        with self._locked() as ops:
+            ops.append(op)
+        logger.info(f"Queued {op.describe()} ({op.id})")
+        self._notify(op, "queued")
+        return op
+
+    def enqueue_delete(self, dataset_id: str) -> Optional[OutboxOp]:
+        """
+        Queue moving a dataset folder to the backup folder.
+
+        A dataset whose creation is still queued never reached the server:
+        its queued operations are dropped instead.
+
+        Args:
+            dataset_id: Dataset folder
+
+        Returns:
+            The queued operation, or None if nothing needs to be sent
+        """
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        op = OutboxOp(
+            id=uuid.uuid4().hex[:8],
+            kind=DELETE_DATASET,
+            dataset_id=dataset_id,
+            created=time.time(),
+            backup_path=f"{DELETED_FOLDER}/{dataset_id}_{timestamp}",
+        )
+        with self._locked() as ops:
+            own = [queued for queued in ops if queued.dataset_id == dataset_id]
+            if own and own[0].kind == PUT_METADATA and own[0].base is None:
+                ops[:] = [queued for queued in ops if queued.dataset_id != dataset_id]
+                logger.info(f"Dropped {len(own)} queued operations of unsent dataset {dataset_id}")
+                return None
+            ops.append(op)
+        logger.info(f"Queued {op.describe()} ({op.id})")
+        self._notify(op, "queued")
+        return op
+
+    def retry(self, op_id: Optional[str] = None, force: bool = False) -> int:
+        """
+        Put failed or conflicting operations back in line, without backoff.
+
+        Args:
+            op_id: Operation to retry (None = all)
+            force: Overwrite conflicting server changes
+
+        Returns:
+            Number of operations affected
+        """
+        count = 0
+        with self._locked() as ops:
+            for op in ops:
+                if op_id is not None and op.id != op_id:
+                    continue
+                op.status = PENDING
+                op.next_attempt = 0.0
+                op.force = op.force or force
+                if op_id is not None or force:
+                    op.attempts = 0
+                count += 1
+        return count
+
+    def discard(self, op_id: str) -> Optional[OutboxOp]:
+        """
+        Drop a queued operation without applying it.
+
+        The search index keeps the optimistic change until the next sync
+        brings back the server's version.
+
+        Args:
+            op_id: Operation id
+
+        Returns:
+            The dropped operation, or None if there is no such operation
+        """
+        with self._locked() as ops:
+            for i, op in enumerate(ops):
+                if op.id == op_id:
+                    del ops[i]
+                    logger.info(f"Discarded {op.describe()} ({op.id})")
+                    return op
+        return None
+
+    # -- Replay ---------------------------------------------------------
+
+    def subscribe(self, listener: Listener) -> None:
+        """
+        Call a function with (operation, outcome) as operations are queued
+        ("queued") and replayed ("applied", "conflict", "failed", "retry").
+
+        Listeners run on the replaying thread.
+        """
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Listener) -> None:
+        """Stop calling a listener."""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _notify(self, op: OutboxOp, outcome: str) -> None:
+        for listener in list(self._listeners):
+            try:
+                listener(op, outcome)
+            except Exception as e:
+                logger.debug(f"Outbox listener failed: {e}")
+
+    def _next_op(self, skip: set[str]) -> Optional[OutboxOp]:
+        """First operation that is due, keeping per-dataset order."""
+        now = time.time()
+        blocked = set()
+        for op in self.pending():
+            if op.id in skip or op.dataset_id in blocked:
+                blocked.add(op.dataset_id)
+                continue
+            if op.status == PENDING and op.next_attempt <= now:
+                return op
+            blocked.add(op.dataset_id)
+        return None
+
+    def flush(self, storage: Any = None) -> dict[str, int]:
+        """
+        Apply due operations to storage, in order.
+
+        Stops at the first connection failure (the rest waits for the server
+        to come back). Only one flush runs at a time, across all processes
+        sharing the journal (TUI, CLI, sync daemon).
+
+        Args:
+            storage: Storage backend (default: the configured backend)
+
+        Returns:
+            Counts of applied, conflicting, failed (retrying or given up)
+            and remaining operations
+        """
+        counts = {"applied": 0, "conflict": 0, "failed": 0, "remaining": 0}
+        with self._flushing() as flushing:
+            if flushing and self.path.exists():
+                self._replay(storage, counts)
+
+        remaining = self.pending()
+        counts["remaining"] = len(remaining)
+        # Also when another process was replaying: pick up what it leaves
+        self._schedule_retry(remaining)
+        return counts
+
+    @contextmanager
+    def _flushing(self) -> Iterator[bool]:
+        """
+        Try to become the only replaying thread, across processes.
+
+        Uses a lock file of its own: the journal lock is only held briefly,
+        so changes can be queued while a replay waits on the network.
+
+        Yields:
+            False if another thread or process (e.g. the sync daemon) is replaying
+        """
+        if not self._flush_lock.acquire(blocking=False):
+            yield False
+            return
+        try:
+            if fcntl is None:
+                yield True
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self._flush_lock_path, "a") as lock_file:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except OSError:
+                    yield False
+                    return
+                try:
+                    yield True
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+        finally:
+            self._flush_lock.release()
+
+    def _replay(self, storage: Any, counts: dict[str, int]) -> None:
+        """Apply due operations in order, counting outcomes (flush lock held)."""
+        if storage is None:
+            from hei_datahub.services.storage_manager import get_storage_backend
+
+            storage = get_storage_backend()
+
+        done: set[str] = set()
+        written: dict[str, Optional[dict[str, Any]]] = {}
+        while (op := self._next_op(done)) is not None:
+            done.add(op.id)
+            try:
+                metadata = self._apply(storage, op)
+            except OutboxConflictError as e:
+                self._record(op, CONFLICT, str(e))
+                counts["conflict"] += 1
+            except (StorageConnectionError, StorageAuthError) as e:
+                # Affects every operation: try again later
+                self._record(op, PENDING, str(e))
+                counts["failed"] += 1
+                break
+            except Exception as e:
+                self._record(op, PENDING, str(e))
+                counts["failed"] += 1
+            else:
+                self._record(op, None)
+                counts["applied"] += 1
+                written[op.dataset_id] = metadata
+        if written:
+            self._mirror_changes(written)
+            self._share_changes(storage, written)
+
+
+    def _record(self, op: OutboxOp, status: Optional[str], error: Optional[str] = None) -> None:
+        """Store the outcome of an attempt (status None = applied, drop it)."""
+        outcome = "applied"
+        with self._locked() as ops:
+            for i, queued in enumerate(ops):
+                if queued.id != op.id:
+                    continue
+                if status is None:
+                    del ops[i]
+                    break
+                queued.attempts += 1
+                queued.last_error = error
+                queued.status = status
+                if status == PENDING and queued.attempts >= MAX_ATTEMPTS:
+                    queued.status = FAILED
+                if queued.status == PENDING:
+                    queued.next_attempt = time.time() + _retry_delay(queued.attempts)
+                outcome = {PENDING: "retry"}.get(queued.status, queued.status)
+                op = queued
+                break
+            else:
+                # Discarded while it was being applied
+                return
+
+        if status is None:
+            logger.info(f"Applied {op.describe()} ({op.id})")
+        else:
+            logger.warning(f"{op.describe()} ({op.id}) {outcome}: {error}")
+        self._notify(op, outcome)
+
+    def _schedule_retry(self, ops: list[OutboxOp]) -> None:
+        """Wake up for the earliest backoff still pending."""
+        due = [op.next_attempt for op in ops if op.status == PENDING]
+        if not due:
+            return
+        delay = max(min(due) - time.time(), 0.5)
+        with self._thread_lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(delay, self.flush_in_background)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush_in_background(self) -> None:
+        """Start replaying in a background thread (or once more, if one is running)."""
+        from hei_datahub.services.circuit_breaker import is_offline
+
+        if not self.path.exists():
+            return
+        if is_offline():
+            # The breaker's "closed" notification starts the replay
+            return
+        with self._thread_lock:
+            if self._flusher is not None and self._flusher.is_alive():
+                self._flush_again = True
+                return
+            self._flush_again = False
+            self._flusher = threading.Thread(target=self._flush_loop, name="outbox-flush", daemon=True)
+            self._flusher.start()
+
+    def _flush_loop(self) -> None:
+        while True:
+            try:
+                self.flush()
+            except Exception as e:
+                logger.warning(f"Outbox replay failed: {e}")
+            with self._thread_lock:
+                if not self._flush_again:
+                    self._flusher = None
+                    return
+                self._flush_again = False
+
+    # -- Applying -------------------------------------------------------
+
+    def _apply(self, storage: Any, op: OutboxOp) -> Optional[dict[str, Any]]:
+        """Apply one operation; returns the dataset's metadata now on the server (None once deleted)."""
+        if op.kind == PUT_METADATA:
+            return self._apply_put(storage, op)
+        elif op.kind == DELETE_DATASET:
+            self._apply_delete(storage, op)
+            return None
+        else:
+            raise StorageError(f"Unknown outbox operation: {op.kind}")
+
+    @staticmethod
+    def _mirror_changes(written: dict[str, Optional[dict[str, Any]]]) -> None:
+        """Keep the local metadata mirror in step with what was written."""
+        from hei_datahub.services.metadata_mirror import get_metadata_mirror
+
+        mirror = get_metadata_mirror()
+        for dataset_id, metadata in written.items():
+            try:
+                if metadata is None:
+                    mirror.remove(dataset_id)
+                else:
+                    mirror.store_metadata(dataset_id, metadata)
+            except ValueError as e:
+                logger.debug(f"Not mirroring metadata of {dataset_id}: {e}")
+
+    @staticmethod
+    def _share_changes(storage: Any, written: dict[str, Optional[dict[str, Any]]]) -> None:
+        """Announce applied changes to other clients (best effort)."""
+        from hei_datahub.services.catalog_manifest import folder_mtimes, update_manifest
+        from hei_datahub.services.change_journal import append_records, delete_record, put_record
+
+        deletes = {dataset_id for dataset_id, metadata in written.items() if metadata is None}
+        try:
+            mtimes = folder_mtimes(storage, set(written) - deletes)
+        except StorageError as e:
+            logger.warning(f"Could not announce changes to other clients: {e}")
+            return
+        upserts = {
+            dataset_id: {"mtime": mtimes[dataset_id], "metadata": metadata}
+            for dataset_id, metadata in written.items()
+            if metadata is not None and mtimes.get(dataset_id) is not None
+        }
+
+        records = [put_record(dataset_id, entry["mtime"], entry["metadata"]) for dataset_id, entry in upserts.items()]
+        records += [delete_record(dataset_id) for dataset_id in sorted(deletes)]
+        if not append_records(storage, records):
+            update_manifest(storage, upserts=upserts, deletes=deletes)
+
+    @staticmethod
+    def _read_metadata(storage: Any, remote_path: str) -> Optional[dict[str, Any]]:
+        """Current metadata.yaml on the server, or None if there is none."""
+        chunks: list[bytes] = []
+        try:
+            storage.read_range(remote_path, 0, None, chunks.append)
+        except StorageNotFoundError:
+            return None
+        metadata = yaml.safe_load(b"".join(chunks).decode("utf-8"))
+        return metadata if isinstance(metadata, dict) else {}
+
+    @staticmethod
+    def _upload_metadata(storage: Any, remote_path: str, metadata: dict[str, Any], exists: Optional[bool]) -> None:
+        fd, tmp_path = tempfile.mkstemp(suffix=".yaml")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as tmp:
+                yaml.dump(metadata, tmp, sort_keys=False, allow_unicode=True)
+            storage.upload(Path(tmp_path), remote_path, exists=exists)
+        finally:
+            os.unlink(tmp_path)
+
+    def _apply_put(self, storage: Any, op: OutboxOp) -> dict[str, Any]:
+        remote_path = f"{op.dataset_id}/metadata.yaml"
+        theirs = self._read_metadata(storage, remote_path)
+        ours = op.metadata or {}
+
+        if theirs is not None and theirs == ours:
+            return theirs  # Already there (e.g. applied before a crash)
+
+        if op.base is None or theirs is None:
+            if theirs is not None and not op.force:
+                raise OutboxConflictError(f"A dataset named {op.dataset_id} already exists on the server")
+            if op.base is not None and not op.force:
+                raise OutboxConflictError(f"{op.dataset_id} was deleted on the server")
+            created = storage.make_collections([op.dataset_id])
+            self._upload_metadata(storage, remote_path, ours, False if op.dataset_id in created else None)
+            return ours
+
+        merged, conflicts = merge_metadata(op.base, ours, theirs)
+        if conflicts and not op.force:
+            raise OutboxConflictError(f"Changed on the server too: {', '.join(conflicts)}")
+        if merged != theirs:
+            self._upload_metadata(storage, remote_path, merged, True)
+        return merged
+
+    @staticmethod
+    def _apply_delete(storage: Any, op: OutboxOp) -> None:
+        storage.make_collections([DELETED_FOLDER])
+        try:
+            storage.move(op.dataset_id, op.backup_path)
+        except StorageNotFoundError:
+            logger.info(f"{op.dataset_id} is already gone from the server")
+
+
+# Global outbox instance
+_outbox: Optional[Outbox] = None
+
+
+def _on_breaker_state(state: str) -> None:
+    from hei_datahub.services.circuit_breaker import CLOSED
+
+    if state == CLOSED and _outbox is not None and _outbox.path.exists():
+        _outbox.flush_in_background()
+
+
+def get_outbox() -> Outbox:
+    """Get the global outbox (replays on its own when storage comes back online)."""
+    global _outbox
+    if _outbox is None:
+        from hei_datahub.services.circuit_breaker import get_circuit_breaker
+
+        _outbox = Outbox()
+        get_circuit_breaker().subscribe(_on_breaker_state)
+    return _outbox
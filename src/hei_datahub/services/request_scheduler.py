@@ -0,0 +1,511 @@
+"""
+Priority lanes for storage traffic.
+
+Requests run in one of two classes:
+
+- foreground: anything a user is waiting for (screens, CLI commands). This
+  is the default.
+- background: the indexer's crawls and syncs (see run_storage_call).
+
+Each class has its own concurrency cap. Background requests are also held
+back while foreground requests are waiting, so a full crawl can't queue
+ahead of "open details" or "save". An optional bandwidth limit
+(storage.background_kbps) throttles background transfers.
+
+The class is carried in a context variable, so it follows a call into
+worker threads started with asyncio.to_thread.
+"""
+import asyncio
+import contextvars
+import logging
+import os
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from hei_datahub.services.webdav_storage import StorageConnectionError, StorageOfflineError
+
+logger = logging.getLogger(__name__)
+
+FOREGROUND = "foreground"
+BACKGROUND = "background"
+PRIORITIES = (FOREGROUND, BACKGROUND)
+
+DEFAULT_BACKGROUND_CONNECTIONS = 2
+
+# Server requests only some backends have (e.g. the Seafile API's recursive
+# listing); proxied through a slot only if the backend provides them
+OPTIONAL_REQUEST_METHODS = frozenset({"list_recursive"})
+
+# How often async callers re-check for a free slot, in seconds
+ASYNC_POLL_INTERVAL = 0.05
+
+_priority: contextvars.ContextVar[str] = contextvars.ContextVar("storage_priority", default=FOREGROUND)
+
+
+def current_priority() -> str:
+    """Priority class of storage calls made from the current context."""
+    return _priority.get()
+
+
+@contextmanager
+def request_priority(priority: str) -> Iterator[None]:
+    """
+    Run storage calls in a block with the given priority class.
+
+    Args:
+        priority: FOREGROUND or BACKGROUND
+    """
+    if priority not in PRIORITIES:
+        raise ValueError(f"Unknown request priority: {priority}")
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class _TokenBucket:
+    """Byte budget refilled at a fixed rate; transfers may run it into debt."""
+
+    def __init__(self, rate: float):
+        """
+        Initialize bucket.
+
+        Args:
+            rate: Bytes per second (burst allowance is one second's worth)
+        """
+        self.rate = rate
+        self._tokens = rate
+        self._stamp = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.rate, self._tokens + (now - self._stamp) * self.rate)
+        self._stamp = now
+
+    def charge(self, nbytes: int) -> None:
+        """Spend budget on a transfer."""
+        self._refill()
+        self._tokens -= nbytes
+
+    def delay(self) -> float:
+        """Seconds until the budget is positive again."""
+        self._refill()
+        return 0.0 if self._tokens > 0 else -self._tokens / self.rate
+
+
+class RequestScheduler:
+    """Admission control for foreground and background storage requests."""
+
+    def __init__(
+        self,
+        foreground_limit: int = 10,
+        background_limit: int = DEFAULT_BACKGROUND_CONNECTIONS,
+        background_kbps: int = 0,
+    ):
+        """
+        Initialize scheduler.
+
+        Args:
+            foreground_limit: Concurrent foreground requests
+            background_limit: Concurrent background requests
+            background_kbps: Background bandwidth limit in KiB/s (0 = unlimited)
+        """
+        self.limits = {FOREGROUND: max(1, foreground_limit), BACKGROUND: max(1, background_limit)}
+        self._bucket = _TokenBucket(background_kbps * 1024) if background_kbps > 0 else None
+        self._cond = threading.Condition()
+        self._active = {FOREGROUND: 0, BACKGROUND: 0}
+        self._waiting = {FOREGROUND: 0, BACKGROUND: 0}
+        self._completed = {FOREGROUND: 0, BACKGROUND: 0}
+        self._waited_sec = {FOREGROUND: 0.0, BACKGROUND: 0.0}
+
+    def _blocked_for(self, priority: str) -> Optional[float]:
+        """None if a request can start now, else how long to wait before re-checking (0 = until notified)."""
+        if self._active[priority] >= self.limits[priority]:
+            return 0.0
+        if priority == BACKGROUND:
+            if self._waiting[FOREGROUND]:
+                return 0.0
+            if self._bucket is not None:
+                delay = self._bucket.delay()
+                if delay > 0:
+                    return delay
+        return None
+
+    def try_acquire(self, priority: str) -> bool:
+        """
+        Start a request if its class has room.
+
+        Args:
+            priority: FOREGROUND or BACKGROUND
+
+        Returns:
+            True if a slot was taken (call release() when done)
+        """
+        with self._cond:
+            if self._blocked_for(priority) is not None:
+                return False
+            self._active[priority] += 1
+            return True
+
+    def acquire(self, priority: str) -> None:
+        """
+        Wait until a request of this class may start.
+
+        Args:
+            priority: FOREGROUND or BACKGROUND
+        """
+        start = time.monotonic()
+        with self._cond:
+            self._waiting[priority] += 1
+            try:
+                while True:
+                    wait = self._blocked_for(priority)
+                    if wait is None:
+                        break
+                    self._cond.wait(timeout=wait or None)
+            finally:
+                self._waiting[priority] -= 1
+            self._active[priority] += 1
+            self._waited_sec[priority] += time.monotonic() - start
+
+    async def acquire_async(self, priority: str) -> None:
+        """Wait for a slot without blocking the event loop."""
+        start = time.monotonic()
+        with self._cond:
+            self._waiting[priority] += 1
+        try:
+            while not self.try_acquire(priority):
+                await asyncio.sleep(ASYNC_POLL_INTERVAL)
+        finally:
+            with self._cond:
+                self._waiting[priority] -= 1
+                self._waited_sec[priority] += time.monotonic() - start
+                self._cond.notify_all()
+
+    def release(self, priority: str) -> None:
+        """Finish a request started with acquire() or try_acquire()."""
+        with self._cond:
+            self._active[priority] -= 1
+            self._completed[priority] += 1
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, priority: str) -> Iterator[None]:
+        """Hold a request slot for the duration of a block."""
+        self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release(priority)
+
+    def throttle(self, priority: str, nbytes: int) -> None:
+        """
+        Account for transferred bytes against the background bandwidth limit.
+
+        Blocks the calling thread while over budget, except on an event loop
+        thread, where the debt only delays the next background request.
+
+        Args:
+            priority: Class of the transfer (foreground is never throttled)
+            nbytes: Bytes just transferred
+        """
+        if priority != BACKGROUND or self._bucket is None or nbytes <= 0:
+            return
+        with self._cond:
+            self._bucket.charge(nbytes)
+            delay = self._bucket.delay()
+        if delay <= 0:
+            return
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            time.sleep(delay)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get per-class counters for diagnostics."""
+        with self._cond:
+            stats: dict[str, Any] = {}
+            for priority in PRIORITIES:
+                stats[f"{priority}_limit"] = self.limits[priority]
+                stats[f"{priority}_active"] = self._active[priority]
+                stats[f"{priority}_waiting"] = self._waiting[priority]
+                stats[f"{priority}_completed"] = self._completed[priority]
+                stats[f"{priority}_wait_sec"] = round(self._waited_sec[priority], 2)
+            stats["background_kbps"] = int(self._bucket.rate / 1024) if self._bucket else 0
+            return stats
+
+
+class ScheduledStorage:
+    """
+    Storage backend proxy that runs every request through a RequestScheduler.
+
+    With a circuit breaker, requests fail fast with StorageOfflineError while
+    the server is unreachable; listings and stats are then answered from
+    cached listings where possible.
+
+    Attributes and methods that don't talk to the server (configuration,
+    stats, caches) are passed through unchanged.
+    """
+
+    def __init__(self, backend: Any, scheduler: RequestScheduler, breaker: Any = None):
+        """
+        Initialize proxy.
+
+        Args:
+            backend: WebDAV storage backend
+            scheduler: Scheduler shared by all users of the backend
+            breaker: CircuitBreaker tracking reachability (None = always try)
+        """
+        self.backend = backend
+        self.scheduler = scheduler
+        self.breaker = breaker
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self.backend, name)
+        if name in OPTIONAL_REQUEST_METHODS:
+            return lambda *args, **kwargs: self._call(name, *args, **kwargs)
+        return attr
+
+    @contextmanager
+    def _guarded(self, reports_errors: bool = True) -> Iterator[None]:
+        """
+        Reject a request while offline, and report its outcome to the breaker.
+
+        Args:
+            reports_errors: False for backend methods that swallow connection
+                errors, whose success therefore proves nothing
+        """
+        if self.breaker is None:
+            yield
+            return
+        if not self.breaker.allow():
+            raise StorageOfflineError("Storage is unreachable (offline mode)")
+        try:
+            yield
+        except StorageConnectionError as e:
+            self.breaker.record_failure(e)
+            raise
+        except Exception:
+            # The server answered, just not with success
+            self.breaker.record_success()
+            raise
+        except BaseException:
+            self.breaker.release()
+            raise
+        else:
+            if reports_errors:
+                self.breaker.record_success()
+            else:
+                self.breaker.release()
+
+    def _call(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        """Run a backend method in a slot of the current priority class."""
+        # exists() and get_info() answer False/None on connection errors
+        with self._guarded(method not in ("exists", "get_info")), self.scheduler.slot(current_priority()):
+            return getattr(self.backend, method)(*args, **kwargs)
+
+    def run_guarded(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Run a request the backend doesn't send itself like a backend call.
+
+        It takes a slot of the current priority class, is rejected while
+        offline, and its outcome is reported to the breaker.
+
+        Args:
+            func: Function sending the request (raises StorageConnectionError
+                if the server can't be reached)
+            *args: Function arguments
+            **kwargs: Function keyword arguments
+
+        Returns:
+            The function's result
+
+        Raises:
+            StorageOfflineError: If the breaker is open
+        """
+        with self._guarded(), self.scheduler.slot(current_priority()):
+            return func(*args, **kwargs)
+
+    def _stale_lookup(self, remote_path: str) -> tuple[bool, Any]:
+        """Answer a stat from a cached listing of any age (offline mode)."""
+        cache = getattr(self.backend, "listing_cache", None)
+        if cache is None:
+            return False, None
+        return cache.lookup(remote_path, stale=True)
+
+    def listdir(self, path: str = "") -> list:
+        """List directory contents (a cached listing of any age while offline)."""
+        try:
+            return self._call("listdir", path)
+        except StorageOfflineError:
+            cache = getattr(self.backend, "listing_cache", None)
+            entries = cache.get_stale(path) if cache is not None else None
+            if entries is None:
+                raise
+            return entries
+
+    def iter_listdir(self, path: str = "") -> Iterator:
+        """
+        Yield directory entries as they arrive (a cached listing of any age while offline).
+
+        A slot is held only while the next entry is read, never while the
+        caller works on one, so a consumer that starts other requests per
+        entry can't starve its own class.
+        """
+        priority = current_priority()
+        started = False
+        try:
+            with self._guarded():
+                entries = self.backend.iter_listdir(path)
+                try:
+                    while True:
+                        with self.scheduler.slot(priority):
+                            entry = next(entries, None)
+                        if entry is None:
+                            return
+                        started = True
+                        yield entry
+                finally:
+                    # Ends the backend's request if the caller stopped early
+                    entries.close()
+        except StorageOfflineError:
+            cache = getattr(self.backend, "listing_cache", None)
+            if started or cache is None:
+                raise
+            stale = cache.get_stale(path)
+            if stale is None:
+                raise
+            yield from stale
+
+    def get_info(self, remote_path: str) -> Any:
+        """Get file/directory info."""
+        try:
+            return self._call("get_info", remote_path)
+        except StorageOfflineError:
+            return self._stale_lookup(remote_path)[1]
+
+    def exists(self, remote_path: str) -> bool:
+        """Check if path exists."""
+        try:
+            return self._call("exists", remote_path)
+        except StorageOfflineError:
+            return self._stale_lookup(remote_path)[1] is not None
+
+    def download(self, remote_path: str, local_path: str) -> None:
+        """Download file to local filesystem."""
+        priority = current_priority()
+        self._call("download", remote_path, local_path)
+        self.scheduler.throttle(priority, _file_size(local_path))
+
+    def fetch_if_changed(self, remote_path: str, local_path: str, *args: Any, **kwargs: Any) -> Any:
+        """Download a file unless the caller's copy is still current (conditional GET)."""
+        priority = current_priority()
+        info = self._call("fetch_if_changed", remote_path, local_path, *args, **kwargs)
+        if info is not None:
+            self.scheduler.throttle(priority, _file_size(local_path))
+        return info
+
+    def probe(self, remote_path: str) -> Any:
+        """Get size and range support of a file."""
+        return self._call("probe", remote_path)
+
+    def read_range(
+        self,
+        remote_path: str,
+        start: int,
+        end: Optional[int],
+        sink: Callable[[bytes], None],
+        *args: Any,
+        **kwargs: Any,
+    ) -> None:
+        """Stream a byte range of a file into a callback."""
+        priority = current_priority()
+        received = 0
+
+        def counting_sink(chunk: bytes) -> None:
+            nonlocal received
+            received += len(chunk)
+            sink(chunk)
+
+        try:
+            self._call("read_range", remote_path, start, end, counting_sink, *args, **kwargs)
+        finally:
+            # Throttled once the slot is released; the sink may stop the read early
+            self.scheduler.throttle(priority, received)
+
+    def upload(self, local_path: Path, remote_path: str, *args: Any, **kwargs: Any) -> None:
+        """Upload a local file."""
+        priority = current_priority()
+        self._call("upload", local_path, remote_path, *args, **kwargs)
+        self.scheduler.throttle(priority, _file_size(local_path))
+
+    def upload_if_match(self, local_path: Path, remote_path: str, etag: Any) -> Any:
+        """Upload a file only if the remote file is unchanged since it was read."""
+        priority = current_priority()
+        new_etag = self._call("upload_if_match", local_path, remote_path, etag)
+        self.scheduler.throttle(priority, _file_size(local_path))
+        return new_etag
+
+    def mkdir(self, remote_path: str) -> None:
+        """Create a directory (and parents)."""
+        self._call("mkdir", remote_path)
+
+    def make_collections(self, paths) -> set:
+        """Create directories and all their parents; returns the new ones."""
+        return self._call("make_collections", paths)
+
+    def move(self, src_path: str, dest_path: str) -> None:
+        """Move/rename a file or directory."""
+        self._call("move", src_path, dest_path)
+
+    def delete(self, remote_path: str) -> None:
+        """Delete a file or directory."""
+        self._call("delete", remote_path)
+
+    async def run_async(self, method: str, *args: Any) -> Any:
+        """
+        Await a storage operation from async code, in the current priority class.
+
+        Args:
+            method: Backend method name (e.g., "download")
+            *args: Method arguments
+
+        Returns:
+            The method's result
+        """
+        priority = current_priority()
+        with self._guarded():
+            await self.scheduler.acquire_async(priority)
+            try:
+                backend_run_async = getattr(self.backend, "run_async", None)
+                if backend_run_async is not None:
+                    result = await backend_run_async(method, *args)
+                else:
+                    result = await asyncio.to_thread(getattr(self.backend, method), *args)
+            finally:
+                self.scheduler.release(priority)
+
+        if method == "download" and len(args) >= 2:
+            self.scheduler.throttle(priority, _file_size(args[1]))
+        return result
+
+    def get_scheduler_stats(self) -> dict[str, Any]:
+        """Get scheduler counters for diagnostics."""
+        return self.scheduler.get_stats()
+
+    def get_breaker_stats(self) -> dict[str, Any]:
+        """Get circuit breaker state for diagnostics."""
+        return self.breaker.get_stats() if self.breaker is not None else {}
+
+
+def _file_size(path: Any) -> int:
+    """Size of a local file, 0 if it can't be read."""
+    try:
+        return os.path.getsize(path)
+    except (OSError, TypeError):
+        return 0
@@ -0,0 +1,402 @@
+"""
+Seafile REST API fast path for listings and downloads.
+
+SeafDAV answers one directory level per PROPFIND and has no cheap way to
+tell whether a folder changed. Seafile's own REST API (/api2) can:
+
+- list a whole folder tree in one request (dir/?recursive=1),
+- answer "uptodate" when a folder's object id (oid) is unchanged, so an
+  expired cached listing is revalidated without sending it again,
+- hand out download links served directly by the file server.
+
+SeafileAPIStorage uses the REST API for those reads and inherits everything
+else (uploads, MKCOL, MOVE, DELETE) from WebDAVStorage, including the
+listing cache and request coalescing. get_storage_backend() starts on plain
+WebDAV and switches to it in the background (SeafileAPIUpgrade) once the
+configured token is accepted by the API (storage.seafile_api: "auto").
+"""
+import logging
+import threading
+import time
+from collections.abc import Iterator
+from datetime import datetime, timezone
+from typing import Any, Callable, Optional
+
+import requests
+
+from hei_datahub.services.webdav_storage import (
+    FileEntry,
+    StorageAuthError,
+    StorageConnectionError,
+    StorageError,
+    StorageNotFoundError,
+    StorageOfflineError,
+    WebDAVStorage,
+    _listing_order,
+    _mask_auth,
+)
+
+logger = logging.getLogger(__name__)
+
+# Download links are requested with reuse=1 and kept this long, in seconds
+DOWNLOAD_LINK_TTL_SEC = 60.0
+
+
+class _TokenAuth(requests.auth.AuthBase):
+    """Seafile API token authentication (replaces the session's basic auth)."""
+
+    def __init__(self, token: str):
+        self.token = token
+
+    def __call__(self, request: requests.PreparedRequest) -> requests.PreparedRequest:
+        request.headers["Authorization"] = f"Token {self.token}"
+        return request
+
+
+def server_url_from_webdav(base_url: str) -> Optional[str]:
+    """
+    Get the Seafile server URL for a SeafDAV base URL.
+
+    Args:
+        base_url: WebDAV base URL (e.g., https://heibox.uni-heidelberg.de/seafdav)
+
+    Returns:
+        Server URL, or None if the URL is not a SeafDAV endpoint
+    """
+    base_url = base_url.rstrip("/")
+    if not base_url.endswith("/seafdav"):
+        return None
+    return base_url[: -len("/seafdav")]
+
+
+def detect_seafile_api(base_url: str, library: str, token: str, timeout: float = 5.0) -> Optional[tuple[str, str]]:
+    """
+    Check whether the Seafile REST API accepts the token and can see the library.
+
+    Args:
+        base_url: WebDAV base URL
+        library: Library name, optionally followed by a folder (library/folder)
+        token: WebDAV password/token
+        timeout: Timeout per request in seconds
+
+    Returns:
+        (server_url, repo_id), or None if the API can't be used
+
+    Raises:
+        StorageConnectionError: If the server can't be reached (no verdict yet)
+    """
+    server_url = server_url_from_webdav(base_url)
+    if server_url is None:
+        return None
+
+    repo_name = library.strip("/").partition("/")[0]
+    auth = _TokenAuth(token)
+    try:
+        ping = requests.get(f"{server_url}/api2/auth/ping/", auth=auth, timeout=timeout)
+        if ping.status_code != 200:
+            logger.info(f"Seafile API rejected the token (HTTP {ping.status_code}), using WebDAV")
+            return None
+
+        response = requests.get(f"{server_url}/api2/repos/", auth=auth, timeout=timeout)
+        response.raise_for_status()
+        for repo in response.json():
+            if repo.get("name") == repo_name:
+                return server_url, repo["id"]
+    except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+        raise StorageConnectionError(f"Seafile API unreachable: {e}") from e
+    except (requests.exceptions.RequestException, ValueError, KeyError, AttributeError) as e:
+        logger.info(f"Seafile API not available ({e}), using WebDAV")
+        return None
+
+    logger.info(f"Library {repo_name} not visible through the Seafile API, using WebDAV")
+    return None
+
+
+class SeafileAPIUpgrade:
+    """
+    Switch a scheduled WebDAV backend to SeafileAPIStorage once the API is known to work.
+
+    Detection runs in a background thread as a background-priority request
+    of the storage (see ScheduledStorage.run_guarded), so first use never
+    waits for it and it is not sent while storage is offline. Without a
+    verdict (server unreachable), it runs again when the circuit breaker
+    closes: a session started offline is not pinned to WebDAV.
+    """
+
+    def __init__(self, storage: Any, options: dict[str, Any]):
+        """
+        Initialize upgrade.
+
+        Args:
+            storage: ScheduledStorage whose backend is replaced
+            options: WebDAVStorage arguments of the backend (base_url, library, password, ...)
+        """
+        self.storage = storage
+        self.options = options
+        self.done = threading.Event()  # Set once detection reached a verdict
+        self._lock = threading.Lock()
+        self._running = False
+        self._again = False
+
+    def start(self) -> None:
+        """Detect in the background now, and again whenever storage comes back online."""
+        if self.storage.breaker is not None:
+            self.storage.breaker.subscribe(self._on_breaker_state)
+        self._detect_in_background()
+
+    def _on_breaker_state(self, state: str) -> None:
+        from hei_datahub.services.circuit_breaker import CLOSED
+
+        if state == CLOSED:
+            self._detect_in_background()
+
+    def _detect_in_background(self) -> None:
+        with self._lock:
+            if self.done.is_set():
+                return
+            if self._running:
+                # Storage came back while a failing attempt was finishing
+                self._again = True
+                return
+            self._running = True
+        threading.Thread(target=self._detect_loop, name="seafile-api-detect", daemon=True).start()
+
+    def _detect_loop(self) -> None:
+        while True:
+            self.detect()
+            with self._lock:
+                if self.done.is_set() or not self._again:
+                    self._running = False
+                    return
+                self._again = False
+
+    def detect(self) -> bool:
+        """
+        Detect the Seafile API once and switch the backend if it can be used.
+
+        Returns:
+            True if detection reached a verdict (API used or not), False if
+            storage was unreachable
+        """
+        from hei_datahub.services.request_scheduler import BACKGROUND, request_priority
+
+        try:
+            with request_priority(BACKGROUND):
+                detected = self.storage.run_guarded(
+                    detect_seafile_api,
+                    self.options["base_url"],
+                    self.options["library"],
+                    self.options["password"],
+                    timeout=self.options.get("connect_timeout", 5),
+                )
+        except (StorageOfflineError, StorageConnectionError) as e:
+            logger.debug(f"Seafile API detection postponed until storage is reachable: {e}")
+            return False
+
+        if self.storage.breaker is not None:
+            self.storage.breaker.unsubscribe(self._on_breaker_state)
+        if detected is not None:
+            server_url, repo_id = detected
+            # Requests in flight finish on the WebDAV backend
+            self.storage.backend = SeafileAPIStorage(server_url=server_url, repo_id=repo_id, **self.options)
+            logger.info("Seafile API available, using it for listings and downloads")
+        self.done.set()
+        return True
+
+
+def _response_json(response: requests.Response) -> Any:
+    """Decode a JSON response body (Seafile sends a few answers as bare strings)."""
+    try:
+        return response.json()
+    except ValueError:
+        return response.text.strip().strip('"')
+
+
+class SeafileAPIStorage(WebDAVStorage):
+    """Seafile storage: REST API for listings and downloads, WebDAV for writes."""
+
+    def __init__(self, server_url: str, repo_id: str, **kwargs: Any):
+        """
+        Initialize Seafile API storage backend.
+
+        Args:
+            server_url: Seafile server URL (e.g., https://heibox.uni-heidelberg.de)
+            repo_id: Id of the library (from detect_seafile_api)
+            **kwargs: WebDAVStorage arguments (base_url, library, username, password, ...)
+        """
+        super().__init__(**kwargs)
+        self.server_url = server_url.rstrip("/")
+        self.repo_id = repo_id
+        self.repo_url = f"{self.server_url}/api2/repos/{repo_id}"
+        self._api_auth = _TokenAuth(self.password)
+        # A library setting like "library/folder" puts the root below the repo root
+        self._root = self.library.partition("/")[2]
+        self._links: dict[str, tuple[float, str]] = {}
+        self._links_lock = threading.Lock()
+
+        logger.info(f"Seafile API fast path enabled: {_mask_auth(self.repo_url)}")
+
+    def _api_path(self, path: str) -> str:
+        """Repo path (leading slash) of a path relative to the library root."""
+        return "/" + "/".join(part for part in (self._root, path.strip("/")) if part)
+
+    def _library_path(self, api_path: str) -> str:
+        """Path relative to the library root of a repo path."""
+        path = api_path.strip("/")
+        if self._root and (path == self._root or path.startswith(f"{self._root}/")):
+            path = path[len(self._root):].lstrip("/")
+        return path
+
+    def _api_get(self, endpoint: str, params: dict[str, str], path: str) -> requests.Response:
+        """
+        Send a GET request to the library's REST API.
+
+        Args:
+            endpoint: Endpoint below the repo URL (e.g., "dir/")
+            params: Query parameters
+            path: Library path the request is about (for error messages)
+
+        Returns:
+            Successful response
+        """
+        url = f"{self.repo_url}/{endpoint}"
+        try:
+            logger.debug(f"GET {_mask_auth(url)} {params}")
+            response = self.session.get(
+                url, params=params, auth=self._api_auth, timeout=(self.connect_timeout, self.read_timeout)
+            )
+        except requests.exceptions.Timeout:
+            raise StorageConnectionError(f"Request timeout for {path or '/'}")
+        except requests.exceptions.ConnectionError as e:
+            raise StorageConnectionError(f"Connection failed: {str(e)}")
+
+        if response.status_code in (401, 403):
+            raise StorageAuthError(f"Seafile API access denied for {path or '/'} ({response.status_code})")
+        elif response.status_code == 404:
+            raise StorageNotFoundError(f"Path not found: {path}")
+        elif response.status_code >= 400:
+            raise StorageError(f"Seafile API request failed for {path or '/'}: HTTP {response.status_code}")
+        return response
+
+    def _entry(self, item: dict, parent: str) -> FileEntry:
+        """Convert a dirent from the REST API into a FileEntry."""
+        name = item["name"]
+        is_dir = item.get("type") == "dir"
+        mtime = item.get("mtime")
+        return FileEntry(
+            name=name,
+            path=f"{parent}/{name}" if parent else name,
+            is_dir=is_dir,
+            size=None if is_dir else item.get("size"),
+            modified=datetime.fromtimestamp(mtime, timezone.utc).replace(tzinfo=None) if mtime else None,
+            etag=item.get("id"),
+        )
+
+    def _listing(self, path: str, items: Any) -> list[FileEntry]:
+        """Build a sorted listing from a dir/ response body."""
+        if not isinstance(items, list):
+            raise StorageError(f"Unexpected listing for {path or '/'}: {items!r}")
+        parent = path.strip("/")
+        return sorted((self._entry(item, parent) for item in items), key=_listing_order)
+
+    def _revalidated_listing(self, path: str) -> Optional[list[FileEntry]]:
+        """Renew an expired cached listing; a changed folder comes back in the same response."""
+        oid = self.listing_cache.get_etag(path)
+        if not oid:
+            return None
+
+        response = self._api_get("dir/", {"p": self._api_path(path), "oid": oid}, path)
+        body = _response_json(response)
+        if body == "uptodate":
+            return self.listing_cache.revalidate(path, oid)
+
+        entries = self._listing(path, body)
+        self.listing_cache.put(path, entries, response.headers.get("oid"))
+        return entries
+
+    def _fetch_listing(self, path: str) -> Iterator[FileEntry]:
+        """Fetch a folder listing with one REST request and cache it with the folder's oid."""
+        response = self._api_get("dir/", {"p": self._api_path(path)}, path)
+        entries = self._listing(path, _response_json(response))
+        self.listing_cache.put(path, entries, response.headers.get("oid"))
+        yield from entries
+
+    def list_recursive(self, path: str = "") -> list[FileEntry]:
+        """
+        List every file and folder below a folder with a single request.
+
+        Args:
+            path: Folder relative to library root
+
+        Returns:
+            FileEntry objects with paths relative to the library root, parents before children
+        """
+        response = self._api_get("dir/", {"p": self._api_path(path), "recursive": "1"}, path)
+        items = _response_json(response)
+        if not isinstance(items, list):
+            raise StorageError(f"Unexpected listing for {path or '/'}: {items!r}")
+
+        entries = [self._entry(item, self._library_path(item.get("parent_dir", "/"))) for item in items]
+        entries.sort(key=lambda entry: (entry.path.count("/"), entry.path))
+        logger.debug(f"Recursive listing of {path or '/'}: {len(entries)} entries")
+        return entries
+
+    def _download_link(self, remote_path: str) -> str:
+        """Get a (briefly cached) file server link for a file."""
+        key = remote_path.strip("/")
+        with self._links_lock:
+            cached = self._links.get(key)
+            if cached is not None and cached[0] > time.monotonic():
+                return cached[1]
+
+        response = self._api_get("file/", {"p": self._api_path(key), "reuse": "1"}, key)
+        link = _response_json(response)
+        if not isinstance(link, str) or not link.startswith(("http://", "https://")):
+            raise StorageError(f"Unexpected download link for {remote_path}: {link!r}")
+
+        with self._links_lock:
+            self._links[key] = (time.monotonic() + DOWNLOAD_LINK_TTL_SEC, link)
+        return link
+
+    def _range_url(self, remote_path: str) -> str:
+        """Byte ranges are read from the file server, bypassing SeafDAV."""
+        return self._download_link(remote_path)
+
+    def read_range(
+        self,
+        remote_path: str,
+        start: int,
+        end: Optional[int],
+        sink: Callable[[bytes], None],
+        chunk_size: int = 1024 * 1024,
+    ) -> None:
+        """
+        Stream a byte range of a file into a callback, via a download link.
+
+        A link the file server no longer accepts is requested again once.
+
+        Args:
+            remote_path: Path relative to library root
+            start: First byte offset
+            end: Last byte offset (inclusive), or None for the rest of the file
+            sink: Called with each chunk, in order
+            chunk_size: Read size in bytes
+        """
+        try:
+            super().read_range(remote_path, start, end, sink, chunk_size)
+        except (StorageAuthError, StorageNotFoundError):
+            # Nothing reached the sink: the file server rejected the link before the body
+            with self._links_lock:
+                stale = self._links.pop(remote_path.strip("/"), None)
+            if stale is None:
+                raise
+            super().read_range(remote_path, start, end, sink, chunk_size)
+
+    def _invalidate(self, path: str, recursive: bool = False) -> None:
+        """Also forget download links of written paths."""
+        super()._invalidate(path, recursive)
+        path = path.strip("/")
+        with self._links_lock:
+            for key in list(self._links):
+                if key == path or (recursive and (not path or key.startswith(f"{path}/"))):
+                    del self._links[key]
@@ -0,0 +1,452 @@
+"""
+Segmented parallel downloads with HTTP Range requests.
+
+Large files are split into byte-range segments that are fetched in parallel
+over the storage backend's connection pool and written in place (pwrite)
+into a preallocated `<file>.part`. Progress is journaled next to it in
+`<file>.part.json`, so an interrupted download continues where it stopped,
+and the file only gets its final name once its size has been verified.
+
+Segment count and chunk size come from `storage.download_segments` and
+`storage.download_chunk_kb`; `scripts/bench_download.py` measures which
+values work best for a given server and link.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+from hei_datahub.services.metrics import get_metrics
+from hei_datahub.services.webdav_storage import (
+    RangeNotSupportedError,
+    RemoteFileInfo,
+    StorageConnectionError,
+    StorageError,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SEGMENTS = 4
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+# Files smaller than two of these are fetched as a single (still resumable) range
+MIN_SEGMENT_SIZE = 8 * 1024 * 1024
+# How often the resume journal is rewritten while data arrives
+JOURNAL_INTERVAL_SEC = 2.0
+RETRY_BACKOFF_FACTOR = 0.5
+
+PART_SUFFIX = ".part"
+JOURNAL_SUFFIX = ".part.json"
+JOURNAL_VERSION = 1
+
+# Called with (bytes_done, bytes_total); total is None if the size is unknown
+ProgressCallback = Callable[[int, Optional[int]], None]
+
+
+class DownloadCancelledError(StorageError):
+    """Download was cancelled by the caller (partial data is kept for resuming)."""
+    pass
+
+
+@dataclass
+class Segment:
+    """Byte range [start, end) of a file and how much of it is on disk."""
+    start: int
+    end: int
+    done: int = 0
+
+    @property
+    def offset(self) -> int:
+        """Next byte offset to fetch."""
+        return self.start + self.done
+
+    @property
+    def remaining(self) -> int:
+        """Bytes still to fetch."""
+        return self.end - self.offset
+
+
+def plan_segments(size: int, segments: int, min_segment_size: int = MIN_SEGMENT_SIZE) -> list[Segment]:
+    """
+    Split a file into contiguous byte ranges.
+
+    Args:
+        size: File size in bytes
+        segments: Maximum number of segments
+        min_segment_size: Smallest segment worth its own request
+
+    Returns:
+        Segments covering [0, size)
+    """
+    count = max(1, min(segments, size // max(1, min_segment_size)))
+    step = -(-size // count)  # ceil division
+    return [Segment(start, min(start + step, size)) for start in range(0, size, step)] or [Segment(0, 0)]
+
+
+def _pwrite(fd: int, data: bytes, offset: int, lock: threading.Lock) -> None:
+    """Write at an offset without moving a shared file position."""
+    if hasattr(os, "pwrite"):
+        while data:
+            written = os.pwrite(fd, data, offset)
+            data = data[written:]
+            offset += written
+        return
+
+    # Windows has no pwrite: serialize seek + write
+    with lock:
+        os.lseek(fd, offset, os.SEEK_SET)
+        while data:
+            written = os.write(fd, data)
+            data = data[written:]
+
+
+class SegmentedDownloader:
+    """Downloads files in parallel byte ranges with a resume journal."""
+
+    def __init__(
+        self,
+        storage,
+        segments: int = DEFAULT_SEGMENTS,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        min_segment_size: int = MIN_SEGMENT_SIZE,
+        max_retries: int = 3,
+    ):
+        """
+        Initialize downloader.
+
+        Args:
+            storage: Storage backend with probe() and read_range()
+            segments: Parallel ranges per file
+            chunk_size: Read/write size in bytes
+            min_segment_size: Smallest range worth a separate request
+            max_retries: Attempts per segment after a broken transfer
+        """
+        self.storage = storage
+        self.segments = max(1, segments)
+        self.chunk_size = chunk_size
+        self.min_segment_size = min_segment_size
+        self.max_retries = max_retries
+
+    def download(
+        self,
+        remote_path: str,
+        local_path: Path,
+        progress: Optional[ProgressCallback] = None,
+        info: Optional[RemoteFileInfo] = None,
+        cancel: Optional[threading.Event] = None,
+    ) -> int:
+        """
+        Download a file, resuming a previous partial download if possible.
+
+        Args:
+            remote_path: Path in the storage library
+            local_path: Destination file
+            progress: Called as bytes arrive
+            info: Size/range support if already known (skips the HEAD probe)
+            cancel: Set to stop the download; partial data is kept
+
+        Returns:
+            Number of bytes in the downloaded file
+
+        Raises:
+            DownloadCancelledError: If cancel was set
+            StorageError: If the download failed or the size doesn't match
+        """
+        local_path = Path(local_path)
+        part_path = local_path.with_name(local_path.name + PART_SUFFIX)
+        journal_path = local_path.with_name(local_path.name + JOURNAL_SUFFIX)
+        local_path.parent.mkdir(parents=True, exist_ok=True)
+        cancel = cancel or threading.Event()
+
+        if info is None:
+            info = self.storage.probe(remote_path)
+
+        start = time.monotonic()
+        if info.size is None or not info.accepts_ranges:
+            size = self._download_whole(remote_path, part_path, info, progress, cancel)
+        else:
+            try:
+                size = self._download_segmented(remote_path, part_path, journal_path, info, progress, cancel)
+            except RangeNotSupportedError:
+                logger.info(f"Server ignored Range for {remote_path}, downloading in one stream")
+                journal_path.unlink(missing_ok=True)
+                size = self._download_whole(remote_path, part_path, info, progress, cancel)
+
+        os.replace(part_path, local_path)
+        journal_path.unlink(missing_ok=True)
+
+        elapsed = time.monotonic() - start
+        metrics = get_metrics()
+        metrics.incr("download.bytes", size)
+        if elapsed > 0 and size:
+            metrics.observe("download.mb_per_s", size / elapsed / 1e6)
+        logger.info(f"Downloaded {remote_path} ({size} bytes) in {elapsed:.1f}s")
+        return size
+
+    def _download_segmented(
+        self,
+        remote_path: str,
+        part_path: Path,
+        journal_path: Path,
+        info: RemoteFileInfo,
+        progress: Optional[ProgressCallback],
+        cancel: threading.Event,
+    ) -> int:
+        """Fetch all pending segments in parallel into the preallocated part file."""
+        size = info.size
+        segments = self._load_journal(journal_path, part_path, info)
+        resumed = segments is not None
+        if segments is None:
+            segments = plan_segments(size, self.segments, self.min_segment_size)
+        else:
+            logger.info(f"Resuming {remote_path} at {sum(s.done for s in segments)}/{size} bytes")
+
+        fd = os.open(part_path, os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o644)
+        try:
+            if not resumed:
+                os.ftruncate(fd, size)
+                if hasattr(os, "posix_fallocate") and size:
+                    try:
+                        os.posix_fallocate(fd, 0, size)
+                    except OSError:
+                        pass  # Not supported by this filesystem; ftruncate is enough
+
+            state = _TransferState(fd, journal_path, info, segments, progress, cancel)
+            state.report()
+
+            pending = [s for s in segments if s.remaining > 0]
+            errors: list[BaseException] = []
+            if pending:
+                with ThreadPoolExecutor(
+                    max_workers=len(pending), thread_name_prefix="download-segment"
+                ) as pool:
+                    futures = [pool.submit(self._fetch_segment, remote_path, seg, state) for seg in pending]
+                    for future in as_completed(futures):
+                        try:
+                            future.result()
+                        except BaseException as e:
+                            if not errors:
+                                # Stop the other segments; their progress is journaled
+                                state.abort.set()
+                            errors.append(e)
+
+            if errors:
+                state.save_journal()
+                if cancel.is_set():
+                    raise DownloadCancelledError(f"Download of {remote_path} cancelled")
+                raise errors[0]
+
+            written = os.fstat(fd).st_size
+            if state.done != size or written != size:
+                state.save_journal()
+                raise StorageError(
+                    f"Size mismatch for {remote_path}: expected {size} bytes, got {state.done}"
+                )
+            os.fsync(fd)
+            return size
+        finally:
+            os.close(fd)
+
+    def _fetch_segment(self, remote_path: str, segment: Segment, state: "_TransferState") -> None:
+        """Fetch one segment, retrying broken transfers from the last byte received."""
+        attempt = 0
+        while segment.remaining > 0:
+            before = segment.done
+            try:
+                self.storage.read_range(
+                    remote_path,
+                    segment.offset,
+                    segment.end - 1,
+                    lambda chunk: state.write(segment, chunk),
+                    self.chunk_size,
+                )
+                if segment.remaining > 0:
+                    raise StorageConnectionError(
+                        f"Transfer of {remote_path} ended early at byte {segment.offset}"
+                    )
+            except StorageConnectionError as e:
+                if segment.done > before:
+                    attempt = 0  # Made progress; only count consecutive failures
+                attempt += 1
+                if attempt > self.max_retries or state.abort.is_set():
+                    raise
+                delay = RETRY_BACKOFF_FACTOR * (2 ** (attempt - 1))
+                logger.debug(f"{e}; retrying segment at {segment.offset} in {delay:.1f}s")
+                if state.abort.wait(delay):
+                    raise
+
+    def _download_whole(
+        self,
+        remote_path: str,
+        part_path: Path,
+        info: RemoteFileInfo,
+        progress: Optional[ProgressCallback],
+        cancel: threading.Event,
+    ) -> int:
+        """Fetch a file in one stream (no range support); retries start over."""
+        attempt = 0
+        while True:
+            done = 0
+            try:
+                with open(part_path, "wb") as f:
+                    def sink(chunk: bytes) -> None:
+                        nonlocal done
+                        if cancel.is_set():
+                            raise DownloadCancelledError(f"Download of {remote_path} cancelled")
+                        f.write(chunk)
+                        done += len(chunk)
+                        if progress is not None:
+                            progress(done, info.size)
+
+                    self.storage.read_range(remote_path, 0, None, sink, self.chunk_size)
+                    f.flush()
+                    os.fsync(f.fileno())
+            except StorageConnectionError as e:
+                attempt += 1
+                if attempt > self.max_retries:
+                    raise
+                delay = RETRY_BACKOFF_FACTOR * (2 ** (attempt - 1))
+                logger.debug(f"{e}; restarting download in {delay:.1f}s")
+                if cancel.wait(delay):
+                    raise DownloadCancelledError(f"Download of {remote_path} cancelled")
+                continue
+
+            if info.size is not None and done != info.size:
+                raise StorageError(
+                    f"Size mismatch for {remote_path}: expected {info.size} bytes, got {done}"
+                )
+            return done
+
+    @staticmethod
+    def _load_journal(
+        journal_path: Path, part_path: Path, info: RemoteFileInfo
+    ) -> Optional[list[Segment]]:
+        """
+        Load segment progress of an earlier attempt.
+
+        Returns:
+            Segments, or None if there is nothing valid to resume (the remote
+            file changed, or the part file is missing)
+        """
+        if not journal_path.exists():
+            return None
+
+        try:
+            with open(journal_path, encoding="utf-8") as f:
+                journal = json.load(f)
+            if (
+                journal.get("version") == JOURNAL_VERSION
+                and journal.get("size") == info.size
+                and journal.get("etag") == info.etag
+                and journal.get("last_modified") == info.last_modified
+                and part_path.exists()
+                and part_path.stat().st_size == info.size
+            ):
+                return [Segment(start, end, done) for start, end, done in journal["segments"]]
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.debug(f"Ignoring unreadable download journal {journal_path}: {e}")
+
+        logger.info(f"Remote file changed or partial data is missing; restarting {part_path.name}")
+        journal_path.unlink(missing_ok=True)
+        return None
+
+
+class _TransferState:
+    """Shared progress of one segmented download."""
+
+    def __init__(
+        self,
+        fd: int,
+        journal_path: Path,
+        info: RemoteFileInfo,
+        segments: list[Segment],
+        progress: Optional[ProgressCallback],
+        cancel: threading.Event,
+    ):
+        """Initialize transfer state for an open part file."""
+        self.fd = fd
+        self.journal_path = journal_path
+        self.info = info
+        self.segments = segments
+        self.progress = progress
+        self.cancel = cancel
+        self.abort = threading.Event()
+        self.done = sum(s.done for s in segments)
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._journal_lock = threading.Lock()
+        self._last_journal = time.monotonic()
+
+    def write(self, segment: Segment, chunk: bytes) -> None:
+        """Write a received chunk at its segment's offset and record progress."""
+        if self.cancel.is_set():
+            self.abort.set()
+        if self.abort.is_set():
+            raise DownloadCancelledError("Download stopped")
+
+        chunk = chunk[: segment.remaining]
+        _pwrite(self.fd, chunk, segment.offset, self._write_lock)
+
+        with self._lock:
+            segment.done += len(chunk)
+            self.done += len(chunk)
+            done = self.done
+            journal_due = time.monotonic() - self._last_journal >= JOURNAL_INTERVAL_SEC
+            if journal_due:
+                self._last_journal = time.monotonic()
+
+        if self.progress is not None:
+            self.progress(done, self.info.size)
+        if journal_due:
+            self.save_journal()
+
+    def report(self) -> None:
+        """Report the starting point (non-zero when resuming)."""
+        if self.progress is not None:
+            self.progress(self.done, self.info.size)
+
+    def save_journal(self) -> None:
+        """Persist segment progress (after flushing the data it describes)."""
+        with self._journal_lock:
+            with self._lock:
+                segments = [[s.start, s.end, s.done] for s in self.segments]
+            # Data first, so the journal never claims bytes that aren't on disk
+            os.fsync(self.fd)
+
+            journal = {
+                "version": JOURNAL_VERSION,
+                "size": self.info.size,
+                "etag": self.info.etag,
+                "last_modified": self.info.last_modified,
+                "segments": segments,
+            }
+            tmp_path = self.journal_path.with_name(self.journal_path.name + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(journal, f)
+            os.replace(tmp_path, self.journal_path)
+
+
+def create_downloader(storage=None) -> SegmentedDownloader:
+    """
+    Create a downloader configured from `storage.*` settings.
+
+    Args:
+        storage: Storage backend (default: the configured backend)
+
+    Returns:
+        SegmentedDownloader
+    """
+    from hei_datahub.services.config import get_config
+    from hei_datahub.services.storage_manager import get_storage_backend
+
+    config = get_config()
+    return SegmentedDownloader(
+        storage or get_storage_backend(),
+        segments=config.get("storage.download_segments", DEFAULT_SEGMENTS),
+        chunk_size=config.get("storage.download_chunk_kb", DEFAULT_CHUNK_SIZE // 1024) * 1024,
+        max_retries=config.get("storage.max_retries", 3),
+    )
@@ -0,0 +1,233 @@
+"""
+Request coalescing ("single-flight") for storage reads.
+
+When the same read (a directory listing, a metadata.yaml download) is
+requested again while it is already in flight, the later callers wait for
+the first one and get its result instead of sending their own request.
+Results also stay available for a short reuse window after completion, which
+absorbs bursts such as a detail screen opened right after the indexer read
+the same file.
+
+Writes invalidate matching keys so that a read started after a write never
+gets a result from before it.
+"""
+import asyncio
+import logging
+import threading
+import time
+from collections.abc import Awaitable, Hashable
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Default time a completed result is handed to new callers, in seconds
+DEFAULT_REUSE_WINDOW = 1.0
+
+
+def _key_path(key: Hashable) -> Optional[str]:
+    """Library path of a (method, path) key."""
+    if isinstance(key, tuple) and len(key) == 2 and isinstance(key[1], str):
+        return key[1]
+    return None
+
+
+def _affected(key: Hashable, path: str, recursive: bool) -> bool:
+    """Whether a write to `path` can change the result of `key`."""
+    key_path = _key_path(key)
+    if key_path is None:
+        return False
+    parent = path.rpartition("/")[0]
+    if key_path in (path, parent):
+        return True
+    if recursive:
+        return not path or key_path.startswith(f"{path}/")
+    return False
+
+
+class _Flight:
+    """One in-flight call that other threads can wait for."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Thread-based single-flight group (requests backend)."""
+
+    def __init__(self, reuse_window: float = DEFAULT_REUSE_WINDOW):
+        """
+        Initialize single-flight group.
+
+        Args:
+            reuse_window: Seconds a completed result is reused (0 = only merge concurrent calls)
+        """
+        self.reuse_window = reuse_window
+        self._lock = threading.Lock()
+        self._flights: dict[Hashable, _Flight] = {}
+        self._recent: dict[Hashable, tuple[float, Any]] = {}
+        self.calls = 0
+        self.coalesced = 0
+        self.reused = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> tuple[Any, bool]:
+        """
+        Run `fn` unless an identical call is in flight or just finished.
+
+        Args:
+            key: Identity of the call, e.g. ("GET", path)
+            fn: Performs the call
+
+        Returns:
+            (result, shared): shared is True if the result came from another caller
+
+        Raises:
+            Whatever the call that produced the result raised
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._recent = {k: v for k, v in self._recent.items() if v[0] > now}
+            if key in self._recent:
+                self.reused += 1
+                return self._recent[key][1], True
+
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+                self.calls += 1
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+
+        if not leader:
+            logger.debug(f"Joining in-flight request {key}")
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value, True
+
+        try:
+            flight.value = fn()
+            return flight.value, False
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+                    if flight.error is None and self.reuse_window > 0:
+                        self._recent[key] = (time.monotonic() + self.reuse_window, flight.value)
+            flight.done.set()
+
+    def invalidate(self, path: str, recursive: bool = False) -> None:
+        """
+        Stop sharing results a write to `path` may have changed.
+
+        Calls already in flight finish for their current waiters, but new
+        callers start a fresh request.
+
+        Args:
+            path: Path that was written, relative to the library root
+            recursive: Also drop everything below it (moves and deletes)
+        """
+        path = path.strip("/")
+        with self._lock:
+            for key in [k for k in self._recent if _affected(k, path, recursive)]:
+                del self._recent[key]
+            for key in [k for k in self._flights if _affected(k, path, recursive)]:
+                del self._flights[key]
+
+    def get_stats(self) -> dict[str, int]:
+        """Get coalescing counters for diagnostics."""
+        with self._lock:
+            return {
+                "requests": self.calls,
+                "coalesced": self.coalesced,
+                "reused": self.reused,
+                "in_flight": len(self._flights),
+            }
+
+
+class AsyncSingleFlight:
+    """asyncio single-flight group (asyncio backend; used from one event loop)."""
+
+    def __init__(self, reuse_window: float = DEFAULT_REUSE_WINDOW):
+        """
+        Initialize single-flight group.
+
+        Args:
+            reuse_window: Seconds a completed result is reused (0 = only merge concurrent calls)
+        """
+        self.reuse_window = reuse_window
+        self._flights: dict[Hashable, asyncio.Future] = {}
+        self._recent: dict[Hashable, tuple[float, Any]] = {}
+        self.calls = 0
+        self.coalesced = 0
+        self.reused = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> tuple[Any, bool]:
+        """
+        Await `fn()` unless an identical call is in flight or just finished.
+
+        Args:
+            key: Identity of the call, e.g. ("GET", path)
+            fn: Returns the awaitable performing the call
+
+        Returns:
+            (result, shared): shared is True if the result came from another caller
+        """
+        now = time.monotonic()
+        self._recent = {k: v for k, v in self._recent.items() if v[0] > now}
+        if key in self._recent:
+            self.reused += 1
+            return self._recent[key][1], True
+
+        flight = self._flights.get(key)
+        if flight is not None:
+            self.coalesced += 1
+            logger.debug(f"Joining in-flight request {key}")
+            shared = True
+        else:
+            # The call runs as its own task, so a caller that is cancelled
+            # only stops waiting; the others still get the result
+            flight = self._flights[key] = asyncio.ensure_future(fn())
+            flight.add_done_callback(lambda task: self._finished(key, task))
+            self.calls += 1
+            shared = False
+        return await asyncio.shield(flight), shared
+
+    def _finished(self, key: Hashable, flight: asyncio.Future) -> None:
+        """Forget a completed call, keeping its result for the reuse window."""
+        # Retrieve the error even if nobody waits for it anymore
+        failed = flight.cancelled() or flight.exception() is not None
+        if self._flights.get(key) is not flight:
+            return  # Invalidated while in flight
+        del self._flights[key]
+        if not failed and self.reuse_window > 0:
+            self._recent[key] = (time.monotonic() + self.reuse_window, flight.result())
+
+    def invalidate(self, path: str, recursive: bool = False) -> None:
+        """
+        Stop sharing results a write to `path` may have changed.
+
+        Args:
+            path: Path that was written, relative to the library root
+            recursive: Also drop everything below it (moves and deletes)
+        """
+        path = path.strip("/")
+        for key in [k for k in self._recent if _affected(k, path, recursive)]:
+            del self._recent[key]
+        for key in [k for k in self._flights if _affected(k, path, recursive)]:
+            del self._flights[key]
+
+    def get_stats(self) -> dict[str, int]:
+        """Get coalescing counters for diagnostics."""
+        return {
+            "requests": self.calls,
+            "coalesced": self.coalesced,
+            "reused": self.reused,
+            "in_flight": len(self._flights),
+        }
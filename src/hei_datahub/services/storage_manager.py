@@ -1,34 +1,49 @@
 """
-Storage manager: Creates WebDAV storage instances (cloud-only).
+Storage manager: Creates storage instances.
 
-Simplified for WebDAV-only usage (no filesystem backend).
+WebDAV (cloud) by default; `storage.backend: filesystem` reads a library
+mounted locally (davfs2, Seafile Drive) at `storage.mount_path` instead.
 """
+import asyncio
 import logging
 import os
-from typing import Optional
+from typing import Any, Optional
 
+from hei_datahub.services.circuit_breaker import get_circuit_breaker, tcp_probe
 from hei_datahub.services.config import get_config
+from hei_datahub.services.filesystem_storage import FilesystemStorage
+from hei_datahub.services.request_scheduler import (
+    DEFAULT_BACKGROUND_CONNECTIONS,
+    FOREGROUND,
+    RequestScheduler,
+    ScheduledStorage,
+    request_priority,
+)
 from hei_datahub.services.webdav_storage import StorageError, WebDAVStorage
 
 logger = logging.getLogger(__name__)
 
 # Cached storage instance
-_storage_instance: Optional[WebDAVStorage] = None
+_storage_instance: Optional[ScheduledStorage] = None
 
 
-def get_storage_backend(force_reload: bool = False) -> WebDAVStorage:
+def get_storage_backend(force_reload: bool = False) -> ScheduledStorage:
     """
-    Get the WebDAV storage instance (cached).
+    Get the storage instance (cached).
 
     Reads configuration and creates WebDAV backend with credentials from:
     - base_url, library, username from config
     - token from environment variable or keyring
 
+    With `storage.backend: filesystem`, the library mount at
+    `storage.mount_path` is used instead.
+
     Args:
         force_reload: Force recreation of storage backend (default: False)
 
     Returns:
-        WebDAVStorage instance
+        Storage backend, behind the foreground/background request
+        scheduler and (for WebDAV) the offline circuit breaker
 
     Raises:
         StorageError: If configuration is invalid or backend cannot be created
@@ -40,14 +55,56 @@ def get_storage_backend(force_reload: bool = False) -> WebDAVStorage:
 
     config = get_config()
 
-    # Always create WebDAV storage (cloud-only)
-    _storage_instance = _create_webdav_backend(config)
+    scheduler = RequestScheduler(
+        foreground_limit=config.get("storage.pool_size", 10),
+        background_limit=config.get("storage.background_connections", DEFAULT_BACKGROUND_CONNECTIONS),
+        background_kbps=config.get("storage.background_kbps", 0),
+    )
+
+    if config.get("storage.backend", "webdav") == "filesystem":
+        # A mount has no server to probe; its errors surface per call
+        _storage_instance = ScheduledStorage(_create_filesystem_backend(config), scheduler)
+        return _storage_instance
+
+    backend, seafile_options = _create_webdav_backend(config)
+
+    # Shared with the UI's offline indicator; a new backend starts online
+    breaker = get_circuit_breaker()
+    breaker.failure_threshold = config.get("storage.offline_after_failures", 2)
+    breaker.reset_timeout = config.get("storage.offline_retry_sec", 10)
+    breaker.probe = tcp_probe(backend.base_url, timeout=config.get("storage.connect_timeout", 5))
+    breaker.reset()
+
+    _storage_instance = ScheduledStorage(backend, scheduler, breaker)
+
+    if seafile_options is not None:
+        from hei_datahub.services.seafile_api import SeafileAPIUpgrade
+
+        # Probed in the background, through the breaker: first use never waits for it
+        SeafileAPIUpgrade(_storage_instance, seafile_options).start()
 
     return _storage_instance
 
 
-def _create_webdav_backend(config) -> WebDAVStorage:
-    """Create WebDAV storage backend from config."""
+def _create_filesystem_backend(config) -> FilesystemStorage:
+    """Create filesystem storage backend for a mounted library from config."""
+    mount_path = config.get("storage.mount_path")
+    if not mount_path:
+        raise StorageError(
+            "Filesystem backend requires storage.mount_path in config.yaml\n"
+            "(the folder where the library is mounted, e.g. with davfs2 or Seafile Drive)"
+        )
+    return FilesystemStorage(mount_path)
+
+
+def _create_webdav_backend(config) -> tuple[WebDAVStorage, Optional[dict[str, Any]]]:
+    """
+    Create WebDAV storage backend from config.
+
+    Returns:
+        Tuple of (backend, its arguments if it may be switched to the
+        Seafile API once detected, else None)
+    """
     base_url = config.get("storage.base_url")
     library = config.get("storage.library")
     username = config.get("storage.username")
@@ -135,9 +192,32 @@ def _create_webdav_backend(config) -> WebDAVStorage:
     connect_timeout = config.get("storage.connect_timeout", 5)
     read_timeout = config.get("storage.read_timeout", 60)
     max_retries = config.get("storage.max_retries", 3)
+    transport = config.get("storage.transport", "requests")
+    pool_size = config.get("storage.pool_size", 10)
+    cache_ttl = config.get("storage.listing_cache_ttl", 30)
+    cache_size = config.get("storage.listing_cache_size", 256)
+    coalesce_window = config.get("storage.coalesce_window_ms", 1000) / 1000
 
     try:
-        return WebDAVStorage(
+        if transport == "asyncio":
+            from hei_datahub.services.async_webdav import PooledWebDAVStorage
+
+            backend = PooledWebDAVStorage(
+                base_url=base_url,
+                library=library,
+                username=username,
+                password=password,
+                connect_timeout=connect_timeout,
+                read_timeout=read_timeout,
+                max_retries=max_retries,
+                pool_size=pool_size,
+                cache_ttl=cache_ttl,
+                cache_size=cache_size,
+                coalesce_window=coalesce_window,
+            )
+            return backend, None
+
+        options = dict(
             base_url=base_url,
             library=library,
             username=username,
@@ -145,7 +225,14 @@ def _create_webdav_backend(config) -> WebDAVStorage:
             connect_timeout=connect_timeout,
             read_timeout=read_timeout,
             max_retries=max_retries,
+            pool_size=pool_size,
+            cache_ttl=cache_ttl,
+            cache_size=cache_size,
+            coalesce_window=coalesce_window,
         )
+
+        detect = config.get("storage.seafile_api", "auto") == "auto"
+        return WebDAVStorage(**options), options if detect else None
     except Exception as e:
         raise StorageError(f"Failed to create WebDAV backend: {e}")
 
@@ -166,6 +253,106 @@ def validate_storage_config() -> tuple[bool, Optional[str]]:
         return False, f"Unexpected error: {str(e)}"
 
 
+async def run_storage_call(
+    storage: WebDAVStorage, method: str, *args: Any, priority: str = FOREGROUND
+) -> Any:
+    """
+    Await a blocking storage method from async code.
+
+    The asyncio transport runs the call on its own pooled event loop; the
+    requests transport runs it in a worker thread.
+
+    Args:
+        storage: Storage backend
+        method: Method name (e.g., "listdir", "download")
+        *args: Method arguments
+        priority: Request class (BACKGROUND for indexer traffic)
+
+    Returns:
+        The method's result
+    """
+    with request_priority(priority):
+        run_async = getattr(storage, "run_async", None)
+        if run_async is not None:
+            return await run_async(method, *args)
+        return await asyncio.to_thread(getattr(storage, method), *args)
+
+
+def warmup_storage_backend() -> None:
+    """
+    Create the storage backend and pre-open a connection to the server.
+
+    Meant to run in a background thread while the first screen renders.
+    Does nothing if storage is not configured.
+    """
+    try:
+        storage = get_storage_backend()
+    except StorageError as e:
+        logger.debug(f"Skipping connection warmup: {e}")
+        return
+    storage.warmup()
+
+
+def get_pool_stats() -> Optional[dict[str, Any]]:
+    """
+    Get connection pool counters of the cached backend.
+
+    Returns:
+        Counters, or None if no backend has been created yet
+    """
+    if _storage_instance is None:
+        return None
+    return _storage_instance.get_pool_stats()
+
+
+def get_listing_cache_stats() -> Optional[dict[str, int]]:
+    """
+    Get directory listing cache counters of the cached backend.
+
+    Returns:
+        Counters, or None if no backend has been created yet
+    """
+    if _storage_instance is None:
+        return None
+    return _storage_instance.get_cache_stats()
+
+
+def get_coalescing_stats() -> Optional[dict[str, int]]:
+    """
+    Get request coalescing counters of the cached backend.
+
+    Returns:
+        Counters, or None if no backend has been created yet
+    """
+    if _storage_instance is None:
+        return None
+    return _storage_instance.get_coalescing_stats()
+
+
+def get_scheduler_stats() -> Optional[dict[str, Any]]:
+    """
+    Get foreground/background request counters of the cached backend.
+
+    Returns:
+        Counters, or None if no backend has been created yet
+    """
+    if _storage_instance is None:
+        return None
+    return _storage_instance.get_scheduler_stats()
+
+
+def get_breaker_stats() -> Optional[dict[str, Any]]:
+    """
+    Get offline circuit breaker state of the cached backend.
+
+    Returns:
+        State and counters, or None if no backend has been created yet
+    """
+    if _storage_instance is None:
+        return None
+    return _storage_instance.get_breaker_stats()
+
+
 def clear_storage_cache() -> None:
     """Clear cached storage backend (forces reload on next access)."""
     global _storage_instance
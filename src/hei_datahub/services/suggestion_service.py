@@ -8,13 +8,13 @@ Provides context-aware search suggestions from indexed metadata:
 """
 
 import logging
-import sqlite3
 import time
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
 
 from hei_datahub.services.index_service import INDEX_DB_PATH
+from hei_datahub.services.index_writer import connect_index_db, get_write_queue
 
 logger = logging.getLogger(__name__)
 
@@ -70,7 +70,7 @@ class SuggestionService:
 
     def _init_usage_table(self) -> None:
         """Initialize the suggestion_usage table."""
-        conn = sqlite3.connect(self.db_path)
+        conn = connect_index_db(self.db_path)
         try:
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS suggestion_usage (
@@ -116,7 +116,7 @@ class SuggestionService:
 
     def _get_distinct_values(self, field: str) -> list[str]:
         """Get distinct non-null values for a field."""
-        conn = sqlite3.connect(self.db_path)
+        conn = connect_index_db(self.db_path)
         try:
             cursor = conn.execute(
                 f"SELECT DISTINCT {field} FROM items WHERE {field} IS NOT NULL AND {field} != '' ORDER BY {field}"
@@ -127,7 +127,7 @@ class SuggestionService:
 
     def _get_distinct_tags(self) -> list[str]:
         """Get distinct tags (tags are stored as comma-separated)."""
-        conn = sqlite3.connect(self.db_path)
+        conn = connect_index_db(self.db_path)
         try:
             cursor = conn.execute("SELECT DISTINCT tags FROM items WHERE tags IS NOT NULL AND tags != ''")
             tags_set: set[str] = set()
@@ -152,7 +152,7 @@ class SuggestionService:
 
     def _get_size_distribution(self) -> dict[str, int]:
         """Get count of datasets in each size bucket."""
-        conn = sqlite3.connect(self.db_path)
+        conn = connect_index_db(self.db_path)
         try:
             cursor = conn.execute("SELECT size FROM items WHERE size IS NOT NULL")
             distribution = {bucket: 0 for bucket in self.SIZE_BUCKETS.keys()}
@@ -174,7 +174,7 @@ class SuggestionService:
         Returns:
             (count, last_used_at) tuple
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = connect_index_db(self.db_path)
         try:
             cursor = conn.execute(
                 "SELECT count, last_used_at FROM suggestion_usage WHERE key = ? AND value = ?",
@@ -195,20 +195,16 @@ class SuggestionService:
             key: Filter key (e.g., "project", "source")
             value: Filter value (e.g., "ML-Research")
         """
-        conn = sqlite3.connect(self.db_path)
-        try:
-            now = int(time.time())
-            conn.execute("""
-                INSERT INTO suggestion_usage (key, value, count, last_used_at)
-                VALUES (?, ?, 1, ?)
-                ON CONFLICT(key, value) DO UPDATE SET
-                    count = count + 1,
-                    last_used_at = ?
-            """, (key, value, now, now))
-            conn.commit()
-            logger.debug(f"Tracked usage: {key}:{value}")
-        finally:
-            conn.close()
+        # Queued: typing in the search box must never wait on the indexer's writes
+        now = int(time.time())
+        get_write_queue(self.db_path).submit("""
+            INSERT INTO suggestion_usage (key, value, count, last_used_at)
+            VALUES (?, ?, 1, ?)
+            ON CONFLICT(key, value) DO UPDATE SET
+                count = count + 1,
+                last_used_at = ?
+        """, (key, value, now, now))
+        logger.debug(f"Tracked usage: {key}:{value}")
 
     def _calculate_score(
         self,
@@ -0,0 +1,356 @@
+"""
+Headless sync daemon that keeps the search index warm for all clients.
+
+`hei-datahub sync --daemon` runs the BackgroundIndexer loop outside Textual.
+The daemon holds an exclusive lock on a PID file in STATE_DIR and answers
+newline-delimited JSON requests on a Unix socket next to it:
+
+- {"cmd": "status"}  -> indexer status
+- {"cmd": "sync"}    -> request an immediate sync
+- {"cmd": "stop"}    -> shut the daemon down
+- {"cmd": "watch"}   -> status, then a stream of index events
+
+TUI instances that find a live daemon skip their own indexer and follow the
+daemon's events instead, so only one process crawls the library.
+"""
+import asyncio
+import json
+import logging
+import os
+import signal
+import socket
+import threading
+from typing import Any, Callable, Optional
+
+from hei_datahub.infra.paths import STATE_DIR
+from hei_datahub.services.index_events import (
+    IndexEvent,
+    SyncFinished,
+    event_from_dict,
+    event_to_dict,
+    get_event_bus,
+)
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+PID_FILE = STATE_DIR / "sync-daemon.pid"
+SOCKET_PATH = STATE_DIR / "sync-daemon.sock"
+
+# Requests are tiny and local; anything slower means the daemon is stuck
+CLIENT_TIMEOUT_SEC = 2.0
+# Events buffered per watcher before a slow client is dropped
+WATCH_QUEUE_SIZE = 1000
+# Delay before a follower reconnects after losing the daemon connection
+RELAY_RECONNECT_SEC = 2.0
+
+
+def is_supported() -> bool:
+    """Check whether this platform supports the daemon (needs flock and Unix sockets)."""
+    return fcntl is not None and hasattr(socket, "AF_UNIX")
+
+
+def is_daemon_running() -> bool:
+    """Check for a live daemon by probing the lock on its PID file."""
+    if not is_supported() or not PID_FILE.exists():
+        return False
+
+    try:
+        with open(PID_FILE) as f:
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return True
+            fcntl.flock(f, fcntl.LOCK_UN)
+            return False
+    except OSError:
+        return False
+
+
+def send_command(cmd: str, timeout: float = CLIENT_TIMEOUT_SEC) -> Optional[dict[str, Any]]:
+    """
+    Send one request to the running daemon.
+
+    Args:
+        cmd: Command name ("status", "sync" or "stop")
+        timeout: Socket timeout in seconds
+
+    Returns:
+        Daemon reply, or None if no daemon answered
+    """
+    if not is_supported() or not SOCKET_PATH.exists():
+        return None
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(str(SOCKET_PATH))
+            sock.sendall(json.dumps({"cmd": cmd}).encode("utf-8") + b"\n")
+            with sock.makefile("r", encoding="utf-8") as reader:
+                line = reader.readline()
+        return json.loads(line) if line else None
+    except (OSError, ValueError) as e:
+        logger.debug(f"Sync daemon did not answer '{cmd}': {e}")
+        return None
+
+
+class SyncDaemon:
+    """Runs the background indexer headless and serves its status."""
+
+    def __init__(self):
+        """Initialize sync daemon."""
+        self._lock_file = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stop: Optional[asyncio.Event] = None
+        self._watchers: set[asyncio.Queue] = set()
+
+    def acquire_lock(self) -> bool:
+        """
+        Take the PID file lock.
+
+        Returns:
+            True if acquired, False if another daemon holds it
+        """
+        STATE_DIR.mkdir(parents=True, exist_ok=True)
+        lock_file = open(PID_FILE, "a+")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            return False
+
+        lock_file.seek(0)
+        lock_file.truncate()
+        lock_file.write(f"{os.getpid()}\n")
+        lock_file.flush()
+        self._lock_file = lock_file
+        return True
+
+    def release_lock(self) -> None:
+        """Release the PID file lock and remove the file."""
+        if self._lock_file is None:
+            return
+        try:
+            PID_FILE.unlink(missing_ok=True)
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+        finally:
+            self._lock_file.close()
+            self._lock_file = None
+
+    async def run(self) -> None:
+        """Serve clients and run the indexer until stopped."""
+        from hei_datahub.services.indexer import get_indexer
+
+        self._loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            self._loop.add_signal_handler(sig, self._stop.set)
+
+        indexer = get_indexer()
+        # No terminal here, so never pause for user inactivity
+        indexer.scheduler.idle_pause = 0
+
+        # We hold the lock, so any socket file left behind is from a crashed daemon
+        SOCKET_PATH.unlink(missing_ok=True)
+        server = await asyncio.start_unix_server(self._handle_client, path=str(SOCKET_PATH))
+        os.chmod(SOCKET_PATH, 0o600)
+
+        bus = get_event_bus()
+        bus.subscribe(self._on_event)
+        logger.info(f"Sync daemon listening on {SOCKET_PATH} (pid {os.getpid()})")
+
+        try:
+            await indexer.start()
+            await self._stop.wait()
+        finally:
+            logger.info("Sync daemon shutting down")
+            bus.unsubscribe(self._on_event)
+            for queue in list(self._watchers):
+                queue.put_nowait(None)
+            server.close()
+            await server.wait_closed()
+            await indexer.stop()
+            SOCKET_PATH.unlink(missing_ok=True)
+
+    def _on_event(self, event: IndexEvent) -> None:
+        """Forward an index event to every watching client."""
+        data = event_to_dict(event)
+        try:
+            self._loop.call_soon_threadsafe(self._broadcast, data)
+        except RuntimeError:
+            # Loop already closed
+            pass
+
+    def _broadcast(self, data: dict[str, Any]) -> None:
+        """Queue an event for all watchers, dropping ones that fall behind."""
+        for queue in list(self._watchers):
+            try:
+                queue.put_nowait(data)
+            except asyncio.QueueFull:
+                logger.warning("Dropping sync daemon watcher that stopped reading")
+                self._watchers.discard(queue)
+                # Replace the backlog with the end-of-stream marker
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+
+    def _status(self) -> dict[str, Any]:
+        """Build the status reply."""
+        from hei_datahub.services.indexer import get_indexer
+
+        return {"ok": True, "pid": os.getpid(), **get_indexer().get_status()}
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Answer a single client request."""
+        from hei_datahub.services.indexer import get_indexer
+
+        try:
+            line = await asyncio.wait_for(reader.readline(), timeout=CLIENT_TIMEOUT_SEC)
+            cmd = json.loads(line or b"{}").get("cmd")
+
+            if cmd == "status":
+                await self._reply(writer, self._status())
+            elif cmd == "sync":
+                get_indexer().request_sync()
+                await self._reply(writer, {"ok": True})
+            elif cmd == "stop":
+                await self._reply(writer, {"ok": True})
+                self._stop.set()
+            elif cmd == "watch":
+                await self._reply(writer, self._status())
+                await self._stream_events(writer)
+            else:
+                await self._reply(writer, {"ok": False, "error": f"Unknown command: {cmd}"})
+
+        except (asyncio.TimeoutError, ValueError, AttributeError) as e:
+            logger.debug(f"Bad sync daemon request: {e}")
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _stream_events(self, writer: asyncio.StreamWriter) -> None:
+        """Send index events to a watcher until it disconnects or the daemon stops."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=WATCH_QUEUE_SIZE)
+        self._watchers.add(queue)
+        try:
+            while True:
+                data = await queue.get()
+                if data is None:
+                    break
+                await self._reply(writer, data)
+        finally:
+            self._watchers.discard(queue)
+
+    @staticmethod
+    async def _reply(writer: asyncio.StreamWriter, data: dict[str, Any]) -> None:
+        """Write one JSON line."""
+        writer.write(json.dumps(data).encode("utf-8") + b"\n")
+        await writer.drain()
+
+
+def run_daemon() -> bool:
+    """
+    Run the sync daemon in the foreground until SIGTERM/SIGINT or a stop request.
+
+    Returns:
+        False if another daemon is already running, True after a clean shutdown
+    """
+    daemon = SyncDaemon()
+    if not daemon.acquire_lock():
+        return False
+
+    try:
+        asyncio.run(daemon.run())
+    finally:
+        daemon.release_lock()
+    return True
+
+
+class DaemonEventRelay:
+    """Follows a running daemon and republishes its events on the local bus."""
+
+    def __init__(self, on_lost: Optional[Callable[[], None]] = None):
+        """
+        Initialize relay.
+
+        Args:
+            on_lost: Called (on the relay thread) once the daemon has gone away
+        """
+        self._on_lost = on_lost
+        self._stopped = threading.Event()
+        self._sock: Optional[socket.socket] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start following the daemon in a background thread."""
+        self._thread = threading.Thread(target=self._run, name="sync-daemon-relay", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop following the daemon."""
+        self._stopped.set()
+        sock = self._sock
+        if sock is not None:
+            try:
+                sock.close()
+            except OSError:
+                pass
+
+    def _run(self) -> None:
+        """Relay events, reconnecting while the daemon is alive."""
+        while not self._stopped.is_set():
+            try:
+                self._follow()
+            except (OSError, ValueError) as e:
+                logger.debug(f"Lost connection to sync daemon: {e}")
+
+            if self._stopped.wait(RELAY_RECONNECT_SEC):
+                return
+            if not is_daemon_running():
+                logger.info("Sync daemon is gone")
+                if self._on_lost is not None:
+                    self._on_lost()
+                return
+
+    def _follow(self) -> None:
+        """Watch the daemon until the connection closes."""
+        from hei_datahub.services.indexer import get_indexer
+
+        bus = get_event_bus()
+        indexer = get_indexer()
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            self._sock = sock
+            sock.settimeout(CLIENT_TIMEOUT_SEC)
+            sock.connect(str(SOCKET_PATH))
+            sock.sendall(json.dumps({"cmd": "watch"}).encode("utf-8") + b"\n")
+
+            with sock.makefile("r", encoding="utf-8") as reader:
+                status_line = reader.readline()
+                if not status_line:
+                    return
+                # Events can be minutes apart; only the handshake is time-limited
+                sock.settimeout(None)
+
+                status = json.loads(status_line)
+                indexer.mirror_status(status)
+                if status.get("synced"):
+                    bus.publish(SyncFinished(total_items=status.get("total_items", 0)))
+                logger.info(f"Following sync daemon (pid {status.get('pid')})")
+
+                for line in reader:
+                    event = event_from_dict(json.loads(line))
+                    if event is None:
+                        continue
+                    if isinstance(event, SyncFinished):
+                        indexer.mirror_status({
+                            "indexed": True,
+                            "synced": indexer.is_synced() or event.error is None,
+                        })
+                    bus.publish(event)
+        self._sock = None
@@ -0,0 +1,288 @@
+"""
+Adaptive scheduler for background index syncs.
+
+Decides when the BackgroundIndexer should run its next incremental sync:
+- the interval shrinks while the library is changing and grows while it is quiet
+- failures back off exponentially with jitter
+- syncing pauses while the terminal is idle or the app is suspended
+- manual "sync now" requests are coalesced into a single pass
+
+State is persisted in the index database (index_meta) so a restart picks up
+where the previous session left off instead of forcing a fresh crawl.
+"""
+import asyncio
+import logging
+import os
+import random
+import threading
+import time
+from typing import Optional
+
+from hei_datahub.services.index_service import SYNC_INTERVAL_SEC, IndexService
+
+logger = logging.getLogger(__name__)
+
+# Configuration from environment
+SYNC_MIN_INTERVAL_SEC = int(os.environ.get("HEI_DATAHUB_SYNC_MIN_INTERVAL_SEC", "120"))
+SYNC_MAX_INTERVAL_SEC = int(os.environ.get("HEI_DATAHUB_SYNC_MAX_INTERVAL_SEC", "3600"))
+SYNC_IDLE_PAUSE_SEC = int(os.environ.get("HEI_DATAHUB_SYNC_IDLE_PAUSE_SEC", "1800"))
+
+# Error backoff starts here and doubles per consecutive failure
+SYNC_ERROR_BACKOFF_SEC = 30
+# Manual triggers this soon after a finished sync are folded into it
+MANUAL_SYNC_MIN_GAP_SEC = 5
+# How often a waiting scheduler re-checks idle state and other processes' syncs
+SCHEDULER_POLL_SEC = 5.0
+
+
+class SyncScheduler:
+    """Adaptive, pausable timer for incremental index syncs."""
+
+    def __init__(
+        self,
+        index_service: IndexService,
+        base_interval: float = SYNC_INTERVAL_SEC,
+        min_interval: float = SYNC_MIN_INTERVAL_SEC,
+        max_interval: float = SYNC_MAX_INTERVAL_SEC,
+        idle_pause: float = SYNC_IDLE_PAUSE_SEC,
+    ):
+        """
+        Initialize scheduler and restore persisted state.
+
+        Args:
+            index_service: Index whose index_meta table holds scheduler state
+            base_interval: Interval used when there is no history
+            min_interval: Lower bound while the library changes often
+            max_interval: Upper bound while the library is quiet (and for backoff)
+            idle_pause: Pause syncing after this many seconds without user
+                activity (0 disables idle detection, e.g. for headless use)
+        """
+        self.index_service = index_service
+        self.base_interval = base_interval
+        self.min_interval = min(min_interval, base_interval)
+        self.max_interval = max(max_interval, base_interval)
+        self.idle_pause = idle_pause
+
+        self._interval = float(base_interval)
+        self._error_count = 0
+        self._last_sync: Optional[float] = None  # wall clock, shared across processes
+        self._last_failure: Optional[float] = None  # wall clock; backoff is measured from here
+        self._last_activity = time.monotonic()
+
+        self._lock = threading.Lock()
+        self._pause_reasons: set[str] = set()
+        self._manual_requested = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+        self._load_state()
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _load_state(self) -> None:
+        """Restore interval, error count, last sync and failure times from index_meta."""
+        try:
+            interval = self.index_service.get_meta("sync_interval")
+            errors = self.index_service.get_meta("sync_error_count")
+            last_failure = self.index_service.get_meta("sync_last_failure")
+            self._last_sync = self._read_last_sync()
+            if interval:
+                self._interval = min(max(float(interval), self.min_interval), self.max_interval)
+            if errors:
+                self._error_count = int(errors)
+            if last_failure:
+                self._last_failure = float(last_failure)
+        except Exception as e:
+            logger.debug(f"Could not restore sync scheduler state: {e}")
+
+    def _read_last_sync(self) -> Optional[float]:
+        """Read the last successful sync time (may have been written by another process)."""
+        value = self.index_service.get_meta("last_sync")
+        return float(value) if value else None
+
+    def _save_state(self) -> None:
+        """Persist scheduler state to index_meta."""
+        try:
+            self.index_service.set_meta("sync_interval", str(int(self._interval)))
+            self.index_service.set_meta("sync_error_count", str(self._error_count))
+            if self._last_failure is not None:
+                self.index_service.set_meta("sync_last_failure", str(int(self._last_failure)))
+            if self._last_sync is not None:
+                self.index_service.set_meta("last_sync", str(int(self._last_sync)))
+        except Exception as e:
+            logger.warning(f"Could not persist sync scheduler state: {e}")
+
+    # ------------------------------------------------------------------
+    # Outcome reporting (called by the indexer)
+    # ------------------------------------------------------------------
+
+    def record_success(self, changes: int) -> None:
+        """
+        Record a finished sync and adapt the interval to the change rate.
+
+        Args:
+            changes: Number of items added, updated or removed by the sync
+        """
+        with self._lock:
+            if changes > 0:
+                # Library is active: check back sooner
+                self._interval = max(self.min_interval, self._interval / 2)
+            else:
+                # Nothing changed: back off gradually
+                self._interval = min(self.max_interval, self._interval * 1.5)
+            self._error_count = 0
+            self._last_sync = time.time()
+
+        logger.debug(f"Sync succeeded ({changes} changes); next interval {self._interval:.0f}s")
+        self._save_state()
+
+    def record_failure(self, error: Exception) -> None:
+        """Record a failed sync; the next attempt is delayed with backoff."""
+        with self._lock:
+            self._error_count += 1
+            self._last_failure = time.time()
+
+        logger.warning(
+            f"Sync failed ({self._error_count} in a row), retrying in "
+            f"~{self._backoff_delay(jitter=False):.0f}s: {error}"
+        )
+        self._save_state()
+
+    # ------------------------------------------------------------------
+    # Control (safe to call from any thread)
+    # ------------------------------------------------------------------
+
+    def request_sync(self) -> None:
+        """Ask for a sync as soon as possible (coalesced with pending requests)."""
+        with self._lock:
+            self._manual_requested = True
+        self._wake()
+
+    def note_activity(self) -> None:
+        """Record user activity (resumes syncing after an idle pause)."""
+        was_idle = self.is_idle()
+        self._last_activity = time.monotonic()
+        if was_idle:
+            logger.debug("User active again, resuming index sync")
+            self._wake()
+
+    def pause(self, reason: str) -> None:
+        """Pause scheduled syncs until resume() is called with the same reason."""
+        with self._lock:
+            self._pause_reasons.add(reason)
+        logger.debug(f"Index sync paused ({reason})")
+
+    def resume(self, reason: str) -> None:
+        """Lift a pause set by pause()."""
+        with self._lock:
+            self._pause_reasons.discard(reason)
+        logger.debug(f"Index sync resumed ({reason})")
+        self._wake()
+
+    def _wake(self) -> None:
+        """Wake a waiting wait_until_due() from any thread."""
+        loop, wakeup = self._loop, self._wakeup
+        if loop is None or wakeup is None:
+            return
+        try:
+            loop.call_soon_threadsafe(wakeup.set)
+        except RuntimeError:
+            # Loop already closed
+            pass
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+
+    def is_idle(self) -> bool:
+        """Check whether the user has been inactive long enough to pause."""
+        if not self.idle_pause:
+            return False
+        return time.monotonic() - self._last_activity > self.idle_pause
+
+    def is_paused(self) -> bool:
+        """Check whether scheduled syncs are currently held back."""
+        with self._lock:
+            paused = bool(self._pause_reasons)
+        return paused or self.is_idle()
+
+    def _backoff_delay(self, jitter: bool = True) -> float:
+        """Delay before retrying after consecutive failures."""
+        delay = min(self.max_interval, SYNC_ERROR_BACKOFF_SEC * (2 ** (self._error_count - 1)))
+        if jitter:
+            # Equal jitter: keep half the delay, randomize the rest
+            delay = delay / 2 + random.uniform(0, delay / 2)
+        return delay
+
+    def seconds_until_due(self) -> float:
+        """Seconds until the next scheduled sync (0 if overdue)."""
+        failing = self._error_count and self._last_failure is not None
+        if failing and (self._last_sync is None or self._last_failure > self._last_sync):
+            # Back off from the latest failure (unless another process synced since)
+            return max(0.0, self._last_failure + self._backoff_delay() - time.time())
+        if self._last_sync is None:
+            return 0.0
+        return max(0.0, self._last_sync + self._interval - time.time())
+
+    def is_due(self) -> bool:
+        """Check whether a sync is due now (used at startup to skip fresh indexes)."""
+        return self.seconds_until_due() <= 0
+
+    async def wait_until_due(self) -> str:
+        """
+        Wait until the next sync should run.
+
+        Returns:
+            "manual" for a requested sync, "scheduled" otherwise
+        """
+        self._loop = asyncio.get_running_loop()
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+
+        # Backoff delay is drawn once per wait so jitter doesn't keep moving it
+        deadline = time.monotonic() + self.seconds_until_due()
+
+        while True:
+            with self._lock:
+                manual = self._manual_requested
+                self._manual_requested = False
+
+            if manual:
+                if self._last_sync and time.time() - self._last_sync < MANUAL_SYNC_MIN_GAP_SEC:
+                    logger.debug("Manual sync request coalesced with the sync that just finished")
+                else:
+                    return "manual"
+
+            # Another process (CLI, second TUI) may have synced meanwhile
+            try:
+                shared_last_sync = self._read_last_sync()
+            except Exception:
+                shared_last_sync = None
+            if shared_last_sync and (self._last_sync is None or shared_last_sync > self._last_sync):
+                self._last_sync = shared_last_sync
+                deadline = time.monotonic() + self.seconds_until_due()
+
+            if not self.is_paused() and time.monotonic() >= deadline:
+                return "scheduled"
+
+            timeout = SCHEDULER_POLL_SEC
+            if not self.is_paused():
+                timeout = min(timeout, max(0.0, deadline - time.monotonic()))
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def get_status(self) -> dict:
+        """Get scheduler state for diagnostics."""
+        return {
+            "interval_sec": int(self._interval),
+            "error_count": self._error_count,
+            "paused": self.is_paused(),
+            "idle": self.is_idle(),
+            "next_sync_in_sec": int(self.seconds_until_due()),
+        }
@@ -6,17 +6,23 @@ Credentials are read from environment variables for security.
 """
 import logging
 import os
+import threading
+import time
 import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from collections.abc import Iterator
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
-from urllib.parse import quote, urlparse
+from typing import Any, Callable, Optional
+from urllib.parse import quote, unquote, urlparse
 
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+from hei_datahub.services.single_flight import SingleFlight
+
 logger = logging.getLogger(__name__)
 
 
@@ -24,15 +30,65 @@ logger = logging.getLogger(__name__)
 # Data Classes and Exceptions
 # =============================================================================
 
-@dataclass
 class FileEntry:
-    """Represents a file or directory entry in storage."""
-    name: str
-    path: str  # Full path relative to storage root
-    is_dir: bool
-    size: Optional[int] = None  # Size in bytes (None for directories)
-    modified: Optional[datetime] = None  # Last modified timestamp
-    content_type: Optional[str] = None  # MIME type (optional)
+    """
+    Represents a file or directory entry in storage.
+
+    Listings can hold tens of thousands of entries, so entries are slotted
+    and the Last-Modified date is only parsed when `modified` is read.
+    """
+
+    __slots__ = ("name", "path", "is_dir", "size", "content_type", "etag", "_modified", "_modified_raw")
+
+    def __init__(
+        self,
+        name: str,
+        path: str,  # Full path relative to storage root
+        is_dir: bool,
+        size: Optional[int] = None,  # Size in bytes (None for directories)
+        modified: Optional[datetime] = None,  # Last modified timestamp
+        content_type: Optional[str] = None,  # MIME type (optional)
+        modified_raw: Optional[str] = None,  # Unparsed Last-Modified value (parsed on first access)
+        etag: Optional[str] = None,  # Server's content version (Seafile object id); changes with the content
+    ):
+        self.name = name
+        self.path = path
+        self.is_dir = is_dir
+        self.size = size
+        self.content_type = content_type
+        self.etag = etag
+        self._modified = modified
+        self._modified_raw = modified_raw
+
+    @property
+    def modified(self) -> Optional[datetime]:
+        """Last modified timestamp."""
+        if self._modified_raw is not None:
+            self._modified = _parse_http_date(self._modified_raw)
+            self._modified_raw = None
+        return self._modified
+
+    @modified.setter
+    def modified(self, value: Optional[datetime]) -> None:
+        self._modified = value
+        self._modified_raw = None
+
+    def _fields(self) -> tuple:
+        return (self.name, self.path, self.is_dir, self.size, self.modified, self.content_type, self.etag)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, FileEntry):
+            return NotImplemented
+        return self._fields() == other._fields()
+
+    __hash__ = None  # Mutable, like the dataclass it replaces
+
+    def __repr__(self) -> str:
+        return (
+            f"FileEntry(name={self.name!r}, path={self.path!r}, is_dir={self.is_dir!r}, "
+            f"size={self.size!r}, modified={self.modified!r}, content_type={self.content_type!r}, "
+            f"etag={self.etag!r})"
+        )
 
     def __str__(self) -> str:
         """Human-readable representation."""
@@ -58,6 +114,15 @@ class FileEntry:
         return f"{size:.1f} {units[unit_idx]}"
 
 
+@dataclass
+class RemoteFileInfo:
+    """Size and validators of a remote file, as reported by a HEAD request."""
+    size: Optional[int]  # Content-Length (None if the server didn't send one)
+    accepts_ranges: bool  # Server advertised byte-range support
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None  # Raw Last-Modified header
+
+
 class StorageError(Exception):
     """Base exception for storage operations."""
     pass
@@ -78,10 +143,516 @@ class StorageConnectionError(StorageError):
     pass
 
 
+class StorageOfflineError(StorageConnectionError):
+    """Storage is known to be unreachable; the request was not sent (offline mode)."""
+    pass
+
+
+class StoragePreconditionError(StorageError):
+    """The remote file changed since it was read; a conditional write was refused (412)."""
+    pass
+
+
+class RangeNotSupportedError(StorageError):
+    """Server answered a byte-range request with the full body."""
+    pass
+
+
+# =============================================================================
+# PROPFIND parsing
+# =============================================================================
+
+# WebDAV XML namespaces
+WEBDAV_NS = {
+    "d": "DAV:",
+    "s": "http://sabredav.org/ns",
+}
+
+# PROPFIND body requesting only the properties FileEntry needs
+PROPFIND_BODY = """<?xml version="1.0" encoding="utf-8"?>
+<d:propfind xmlns:d="DAV:">
+  <d:prop>
+    <d:resourcetype/>
+    <d:getcontentlength/>
+    <d:getlastmodified/>
+    <d:getcontenttype/>
+    <d:getetag/>
+  </d:prop>
+</d:propfind>"""
+
+# Depth: 0 PROPFIND body asking only for a collection's ETag (listing revalidation)
+ETAG_PROPFIND_BODY = """<?xml version="1.0" encoding="utf-8"?>
+<d:propfind xmlns:d="DAV:">
+  <d:prop>
+    <d:getetag/>
+  </d:prop>
+</d:propfind>"""
+
+
+_DAV = "{DAV:}"
+_RESPONSE_TAG = f"{_DAV}response"
+
+# Read size for streamed PROPFIND bodies
+LISTING_CHUNK_SIZE = 64 * 1024
+
+# Largest download whose content is shared with concurrent identical downloads
+SHARED_DOWNLOAD_MAX_BYTES = 1024 * 1024
+
+
+def _parse_http_date(value: str) -> Optional[datetime]:
+    """Parse an RFC 2822 date (getlastmodified); None if malformed."""
+    try:
+        return datetime.strptime(value, "%a, %d %b %Y %H:%M:%S %Z")
+    except (ValueError, AttributeError):
+        return None
+
+
+def utc_timestamp(modified: datetime) -> float:
+    """
+    POSIX timestamp of a listing date.
+
+    Listing dates are naive UTC (WebDAV dates are GMT); calling .timestamp()
+    on them directly would read them as local time. Every mtime that is
+    stored or compared across clients goes through here.
+    """
+    if modified.tzinfo is None:
+        modified = modified.replace(tzinfo=timezone.utc)
+    return modified.timestamp()
+
+
+def _listing_order(entry: FileEntry) -> tuple[bool, str]:
+    """Sort key for listings: directories first, then alphabetically."""
+    return (not entry.is_dir, entry.name.lower())
+
+
+class PropfindParser:
+    """
+    Incremental parser for WebDAV PROPFIND (Depth: 1) multi-status responses.
+
+    Feed it the response body chunk by chunk as it arrives; each call returns
+    the entries completed so far. Parsed <response> elements are emptied
+    right away, so the document is never held in memory as a whole.
+    Shared by the requests and asyncio WebDAV clients.
+    """
+
+    def __init__(self, request_path: str, library: str):
+        """
+        Initialize parser.
+
+        Args:
+            request_path: Listed path relative to the library root
+            library: Library name (used to skip the listed directory itself)
+        """
+        self.request_path = request_path
+        self.etag: Optional[str] = None  # ETag of the listed directory itself, once seen
+        self._parser = ET.XMLPullParser(events=("end",))
+        self._prefix = f"{request_path.strip('/')}/" if request_path.strip("/") else ""
+
+        # Href path of the listed directory (PROPFIND depth=1 includes it)
+        expected_parent = f"/seafdav/{library}"
+        if request_path:
+            expected_parent = f"{expected_parent}/{request_path}"
+        self._self_path = expected_parent.rstrip("/")
+
+    def feed(self, data: bytes) -> list[FileEntry]:
+        """
+        Parse the next chunk of the response body.
+
+        Args:
+            data: Raw body bytes
+
+        Returns:
+            Entries completed by this chunk (in server order)
+        """
+        try:
+            self._parser.feed(data)
+        except ET.ParseError as e:
+            raise StorageError(f"Failed to parse WebDAV XML response: {str(e)}")
+        return self._drain()
+
+    def close(self) -> list[FileEntry]:
+        """
+        Finish parsing after the last chunk.
+
+        Returns:
+            Entries completed by the end of the document
+        """
+        try:
+            self._parser.close()
+        except ET.ParseError as e:
+            raise StorageError(f"Failed to parse WebDAV XML response: {str(e)}")
+        return self._drain()
+
+    def _drain(self) -> list[FileEntry]:
+        """Turn finished <response> elements into entries and free them."""
+        entries = []
+        for _, elem in self._parser.read_events():
+            if elem.tag != _RESPONSE_TAG:
+                continue
+
+            entry = self._parse_response(elem)
+            if entry is not None:
+                entries.append(entry)
+            elem.clear()
+        return entries
+
+    def _parse_response(self, response: ET.Element) -> Optional[FileEntry]:
+        """Build a FileEntry from one <response> element (None for the listed directory)."""
+        href = response.findtext(f"{_DAV}href")
+        if not href:
+            return None
+        href = href.strip()
+
+        # Skip the listed directory itself, but remember its ETag
+        href_path = unquote(urlparse(href).path if "://" in href else href)
+        if href_path.rstrip("/") == self._self_path:
+            self.etag = _find_etag(response)
+            return None
+
+        # Extract properties
+        prop = response.find(f"{_DAV}propstat/{_DAV}prop")
+        if prop is None:
+            return None
+
+        # Check if it's a directory (collection)
+        resourcetype = prop.find(f"{_DAV}resourcetype")
+        is_dir = resourcetype is not None and resourcetype.find(f"{_DAV}collection") is not None
+
+        # Extract name from href
+        name = _extract_name_from_href(href)
+        if not name or name == ".":
+            return None
+
+        # File size and content type (only for files)
+        size = None
+        content_type = None
+        if not is_dir:
+            size_text = prop.findtext(f"{_DAV}getcontentlength")
+            if size_text:
+                try:
+                    size = int(size_text)
+                except ValueError:
+                    pass
+            content_type = prop.findtext(f"{_DAV}getcontenttype") or None
+
+        return FileEntry(
+            name=name,
+            path=f"{self._prefix}{name}",  # Relative to the library root
+            is_dir=is_dir,
+            size=size,
+            content_type=content_type,
+            modified_raw=prop.findtext(f"{_DAV}getlastmodified") or None,
+            etag=(prop.findtext(f"{_DAV}getetag") or "").strip() or None,
+        )
+
+
+def parse_propfind(
+    xml_text: str, request_path: str, library: str, collection: Optional[dict] = None
+) -> list[FileEntry]:
+    """
+    Parse a complete WebDAV PROPFIND (Depth: 1) multi-status response.
+
+    Args:
+        xml_text: Response body
+        request_path: Listed path relative to the library root
+        library: Library name (used to skip the listed directory itself)
+        collection: If given, receives the listed directory's own "etag"
+
+    Returns:
+        Sorted list of FileEntry objects (directories first)
+    """
+    parser = PropfindParser(request_path, library)
+    entries = parser.feed(xml_text.encode("utf-8")) + parser.close()
+    if collection is not None:
+        collection["etag"] = parser.etag
+    entries.sort(key=_listing_order)
+    return entries
+
+
+def parse_collection_etag(xml_text: str) -> Optional[str]:
+    """
+    Get the ETag from a Depth: 0 PROPFIND response.
+
+    Args:
+        xml_text: Response body
+
+    Returns:
+        ETag string, or None if the server reports none
+    """
+    try:
+        root = ET.fromstring(xml_text)
+    except ET.ParseError as e:
+        raise StorageError(f"Failed to parse WebDAV XML response: {str(e)}")
+
+    response = root.find("d:response", WEBDAV_NS)
+    return _find_etag(response) if response is not None else None
+
+
+def _find_etag(response: ET.Element) -> Optional[str]:
+    """Get the getetag property of a PROPFIND response element."""
+    etag_elem = response.find("d:propstat/d:prop/d:getetag", WEBDAV_NS)
+    if etag_elem is None or not etag_elem.text:
+        return None
+    return etag_elem.text.strip()
+
+
+def _extract_name_from_href(href: str) -> str:
+    """Extract filename/dirname from href."""
+    # Remove trailing slash for directories, take the last component
+    return unquote(href.rstrip("/").split("/")[-1])
+
+
+# =============================================================================
+# Listing Cache
+# =============================================================================
+
+# Listings kept alive by ETag revalidation are still refetched in full after
+# this long, for servers whose collection ETags don't track their content
+LISTING_MAX_AGE_SEC = 300.0
+
+
+@dataclass
+class _CachedListing:
+    """One cached directory listing."""
+    entries: list[FileEntry]
+    etag: Optional[str]  # ETag of the collection itself, if the server sent one
+    validated_at: float  # monotonic time of the last fetch or revalidation
+    loaded_at: float  # monotonic time of the last full fetch
+
+
+class ListingCache:
+    """
+    Directory listings keyed by path, shared by all threads of a backend.
+
+    Listings younger than the TTL are served as they are. Expired ones are
+    kept (up to max_listings, least recently used evicted first) so they can
+    be revalidated against the collection's ETag with a cheap Depth: 0
+    PROPFIND instead of being listed again. Writes made through the backend
+    drop the listings they change.
+    """
+
+    def __init__(self, ttl: float = 30.0, max_listings: int = 256):
+        """
+        Initialize listing cache.
+
+        Args:
+            ttl: Seconds a listing is served without asking the server (0 disables caching)
+            max_listings: Maximum number of directory listings kept
+        """
+        self.ttl = ttl
+        self.max_listings = max_listings
+        self._listings: OrderedDict[str, _CachedListing] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.invalidations = 0
+        self.stale_hits = 0
+
+    @staticmethod
+    def _key(path: str) -> str:
+        """Normalize a library path to a cache key."""
+        return str(path).strip("/")
+
+    def get(self, path: str) -> Optional[list[FileEntry]]:
+        """
+        Get a listing that is still within its TTL.
+
+        Args:
+            path: Directory path relative to the library root
+
+        Returns:
+            Copy of the cached entries, or None
+        """
+        key = self._key(path)
+        with self._lock:
+            cached = self._listings.get(key)
+            if cached is None or time.monotonic() - cached.validated_at > self.ttl:
+                self.misses += 1
+                return None
+            self._listings.move_to_end(key)
+            self.hits += 1
+            return list(cached.entries)
+
+    def get_etag(self, path: str) -> Optional[str]:
+        """
+        Get the ETag an expired listing can be revalidated with.
+
+        Args:
+            path: Directory path relative to the library root
+
+        Returns:
+            Collection ETag, or None if the listing must be fetched in full
+        """
+        with self._lock:
+            cached = self._listings.get(self._key(path))
+            if cached is None or time.monotonic() - cached.loaded_at > LISTING_MAX_AGE_SEC:
+                return None
+            return cached.etag
+
+    def get_stale(self, path: str) -> Optional[list[FileEntry]]:
+        """
+        Get a cached listing however old it is (offline mode).
+
+        Args:
+            path: Directory path relative to the library root
+
+        Returns:
+            Copy of the cached entries, or None
+        """
+        with self._lock:
+            cached = self._listings.get(self._key(path))
+            if cached is None:
+                return None
+            self.stale_hits += 1
+            return list(cached.entries)
+
+    def revalidate(self, path: str, etag: Optional[str]) -> Optional[list[FileEntry]]:
+        """
+        Renew a listing if the collection's current ETag matches the cached one.
+
+        Args:
+            path: Directory path relative to the library root
+            etag: ETag the server reports now
+
+        Returns:
+            Copy of the cached entries, or None if the listing changed
+        """
+        key = self._key(path)
+        with self._lock:
+            cached = self._listings.get(key)
+            if cached is None or not etag or cached.etag != etag:
+                return None
+            cached.validated_at = time.monotonic()
+            self._listings.move_to_end(key)
+            self.revalidated += 1
+            return list(cached.entries)
+
+    def put(self, path: str, entries: list[FileEntry], etag: Optional[str] = None) -> None:
+        """
+        Store a freshly fetched listing.
+
+        Args:
+            path: Directory path relative to the library root
+            entries: Directory entries
+            etag: ETag of the collection itself
+        """
+        if self.ttl <= 0:
+            return
+        key = self._key(path)
+        now = time.monotonic()
+        with self._lock:
+            self._listings[key] = _CachedListing(list(entries), etag, now, now)
+            self._listings.move_to_end(key)
+            while len(self._listings) > self.max_listings:
+                self._listings.popitem(last=False)
+
+    def lookup(self, path: str, stale: bool = False) -> tuple[bool, Optional[FileEntry]]:
+        """
+        Answer a stat from the fresh listing of the parent directory.
+
+        Args:
+            path: File or directory path relative to the library root
+            stale: Also use an expired parent listing (offline mode)
+
+        Returns:
+            (answered, entry): answered is False if no fresh parent listing is
+            cached; entry is None if the listing shows the path doesn't exist
+        """
+        key = self._key(path)
+        if not key:
+            return False, None
+
+        parent, _, name = key.rpartition("/")
+        entries = self.get_stale(parent) if stale else self.get(parent)
+        if entries is None:
+            return False, None
+        for entry in entries:
+            if entry.name == name:
+                return True, entry
+        return True, None
+
+    def invalidate(self, path: str, recursive: bool = False) -> None:
+        """
+        Drop the listings a write to a path changes.
+
+        Args:
+            path: Path that was created, changed or removed
+            recursive: Also drop all listings below it (moves and deletes)
+        """
+        key = self._key(path)
+        stale = {key.rpartition("/")[0], key}
+        with self._lock:
+            if recursive:
+                prefix = f"{key}/" if key else ""
+                stale.update(k for k in self._listings if k.startswith(prefix))
+            for k in stale:
+                if self._listings.pop(k, None) is not None:
+                    self.invalidations += 1
+
+    def clear(self) -> None:
+        """Drop all cached listings."""
+        with self._lock:
+            self._listings.clear()
+
+    def get_stats(self) -> dict[str, int]:
+        """Get cache counters for diagnostics."""
+        with self._lock:
+            return {
+                "listings": len(self._listings),
+                "hits": self.hits,
+                "misses": self.misses,
+                "revalidated": self.revalidated,
+                "invalidations": self.invalidations,
+                "stale_hits": self.stale_hits,
+            }
+
+
 # =============================================================================
 # WebDAV Storage Implementation
 # =============================================================================
 
+def collection_paths(paths) -> list[str]:
+    """
+    Expand directory paths to every collection that must exist for them.
+
+    Args:
+        paths: Directory paths relative to the library root
+
+    Returns:
+        Unique paths including all parents, parents first
+    """
+    collections = set()
+    for path in paths:
+        parts = [p for p in str(path).split("/") if p]
+        for i in range(len(parts)):
+            collections.add("/".join(parts[: i + 1]))
+    return sorted(collections, key=lambda p: (p.count("/"), p))
+
+
+class _ProgressReader:
+    """File wrapper that reports bytes read, for streaming request bodies."""
+
+    def __init__(self, f, total: int, progress: Optional[Callable[[int, int], None]]):
+        """Wrap an open binary file of known size."""
+        self._f = f
+        self._total = total
+        self._progress = progress
+        self._done = 0
+
+    def __len__(self) -> int:
+        # Lets requests send Content-Length instead of chunked encoding
+        return self._total
+
+    def read(self, size: int = -1) -> bytes:
+        """Read from the file and report progress."""
+        data = self._f.read(size)
+        if data and self._progress is not None:
+            self._done += len(data)
+            self._progress(self._done, self._total)
+        return data
+
+
 def _mask_auth(url: str) -> str:
     """Mask authentication info in URLs for logging."""
     parsed = urlparse(url)
@@ -91,14 +662,96 @@ def _mask_auth(url: str) -> str:
     return url
 
 
+# =============================================================================
+# Session Pooling
+# =============================================================================
+
+class SessionPool:
+    """
+    Per-thread requests sessions sharing one pool of keep-alive connections.
+
+    requests.Session is not guaranteed thread-safe, but urllib3's connection
+    pools are. Each thread leases its own Session (auth, headers); all of
+    them are mounted on the same HTTPAdapter, so connections opened by one
+    worker are reused by the next instead of being thrown away.
+    """
+
+    def __init__(self, auth: tuple[str, str], pool_size: int = 10, max_retries: int = 3):
+        """
+        Initialize session pool.
+
+        Args:
+            auth: (username, password) for HTTP basic auth
+            pool_size: Keep-alive connections per host; extra requests wait
+            max_retries: Max retry attempts on 5xx errors
+        """
+        self.auth = auth
+        self.pool_size = pool_size
+
+        # Retry strategy for 5xx errors
+        retry_strategy = Retry(
+            total=max_retries,
+            backoff_factor=0.5,
+            status_forcelist=[500, 502, 503, 504],
+            allowed_methods=["HEAD", "GET", "OPTIONS", "PROPFIND"],
+        )
+        self.adapter = HTTPAdapter(
+            max_retries=retry_strategy,
+            pool_maxsize=pool_size,
+            pool_block=True,  # Wait for a free connection instead of opening throwaway ones
+        )
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._sessions_created = 0
+        self._leases = 0
+
+    def lease(self) -> requests.Session:
+        """Get the calling thread's session (created on first use)."""
+        session = getattr(self._local, "session", None)
+        with self._lock:
+            self._leases += 1
+            if session is None:
+                self._sessions_created += 1
+        if session is None:
+            session = requests.Session()
+            session.auth = self.auth
+            session.mount("https://", self.adapter)
+            session.mount("http://", self.adapter)
+            self._local.session = session
+        return session
+
+    def get_stats(self) -> dict[str, int]:
+        """
+        Get session and connection reuse counters.
+
+        Returns:
+            Dict with size, sessions, leases, opened (connections) and
+            reused (requests served by an already open connection)
+        """
+        opened = requests_sent = 0
+        pools = self.adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is not None:
+                opened += pool.num_connections
+                requests_sent += pool.num_requests
+
+        with self._lock:
+            return {
+                "size": self.pool_size,
+                "sessions": self._sessions_created,
+                "leases": self._leases,
+                "opened": opened,
+                "reused": max(0, requests_sent - opened),
+            }
+
+
 class WebDAVStorage:
     """WebDAV storage backend for Seafile/Heibox."""
 
     # WebDAV XML namespaces
-    NS = {
-        "d": "DAV:",
-        "s": "http://sabredav.org/ns",
-    }
+    NS = WEBDAV_NS
 
     def __init__(
         self,
@@ -109,6 +762,10 @@ class WebDAVStorage:
         connect_timeout: int = 5,
         read_timeout: int = 60,
         max_retries: int = 3,
+        pool_size: int = 10,
+        cache_ttl: float = 30.0,
+        cache_size: int = 256,
+        coalesce_window: float = 1.0,
     ):
         """
         Initialize WebDAV storage backend.
@@ -121,6 +778,10 @@ class WebDAVStorage:
             connect_timeout: Connection timeout in seconds
             read_timeout: Read timeout in seconds
             max_retries: Max retry attempts on 5xx errors
+            pool_size: Keep-alive connections per host, shared by all threads
+            cache_ttl: Seconds a directory listing is reused without revalidation (0 disables)
+            cache_size: Maximum number of cached directory listings
+            coalesce_window: Seconds a finished listing/download is shared with new identical requests
         """
         self.base_url = base_url.rstrip("/")
         self.library = library.strip("/")
@@ -132,23 +793,53 @@ class WebDAVStorage:
         # Build full base path: base_url/library
         self.root_url = f"{self.base_url}/{self.library}"
 
-        # Setup session with retry logic
-        self.session = requests.Session()
-        self.session.auth = (username, password)
+        self.max_retries = max_retries
 
-        # Retry strategy for 5xx errors
-        retry_strategy = Retry(
-            total=max_retries,
-            backoff_factor=0.5,
-            status_forcelist=[500, 502, 503, 504],
-            allowed_methods=["HEAD", "GET", "OPTIONS", "PROPFIND"],
-        )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        self.session.mount("https://", adapter)
-        self.session.mount("http://", adapter)
+        # The storage instance is shared by the indexer and UI worker threads
+        self.sessions = SessionPool((username, password), pool_size=pool_size, max_retries=max_retries)
+        self.listing_cache = ListingCache(ttl=cache_ttl, max_listings=cache_size)
+        # Identical concurrent reads (e.g. indexer and detail screen) share one request
+        self.flights = SingleFlight(reuse_window=coalesce_window)
 
         logger.info(f"WebDAV storage initialized: {_mask_auth(self.root_url)}")
 
+    @property
+    def session(self) -> requests.Session:
+        """Session leased to the calling thread (with retry logic)."""
+        return self.sessions.lease()
+
+    def warmup(self) -> None:
+        """
+        Open a connection (DNS, TCP and TLS handshake) ahead of the first real request.
+
+        The connection goes back to the shared pool, so the first listing or
+        download does not pay the setup cost. Failures are only logged.
+        """
+        try:
+            self.session.request(
+                "OPTIONS", self.root_url, timeout=(self.connect_timeout, self.read_timeout)
+            )
+            logger.debug(f"Warmed up connection to {_mask_auth(self.root_url)}")
+        except Exception as e:
+            logger.debug(f"Connection warmup failed: {e}")
+
+    def get_pool_stats(self) -> dict[str, Any]:
+        """Get connection pool counters for diagnostics."""
+        return self.sessions.get_stats()
+
+    def get_cache_stats(self) -> dict[str, int]:
+        """Get listing cache counters for diagnostics."""
+        return self.listing_cache.get_stats()
+
+    def get_coalescing_stats(self) -> dict[str, int]:
+        """Get request coalescing counters for diagnostics."""
+        return self.flights.get_stats()
+
+    def _invalidate(self, path: str, recursive: bool = False) -> None:
+        """Forget cached listings and shared reads a write to `path` affects."""
+        self.listing_cache.invalidate(path, recursive)
+        self.flights.invalidate(path, recursive)
+
     def _get_url(self, path: str) -> str:
         """Build full URL for a given path."""
         # Normalize path (remove leading slash)
@@ -161,53 +852,137 @@ class WebDAVStorage:
         """
         List directory contents using WebDAV PROPFIND.
 
+        Listings fetched within the cache TTL are reused. Older ones are
+        revalidated with the directory's ETag and only fetched again if it
+        changed.
+
         Args:
             path: Path relative to library root
 
         Returns:
             Sorted list of FileEntry objects (directories first)
         """
+        entries = self.listing_cache.get(path)
+        if entries is None:
+            entries, _ = self.flights.do(("PROPFIND", path.strip("/")), lambda: self._load_listing(path))
+            entries = list(entries)
+        return entries
+
+    def iter_listdir(self, path: str = "") -> Iterator[FileEntry]:
+        """
+        Yield directory entries while the PROPFIND response is still arriving.
+
+        Entries come in server order (not sorted). A listing that is read to
+        the end is cached like one from listdir().
+
+        Args:
+            path: Path relative to library root
+
+        Yields:
+            FileEntry objects
+        """
+        entries = self._cached_listing(path)
+        if entries is not None:
+            yield from entries
+        else:
+            yield from self._fetch_listing(path)
+
+    def _cached_listing(self, path: str) -> Optional[list[FileEntry]]:
+        """Get a listing from the cache, revalidating it by ETag once expired."""
+        entries = self.listing_cache.get(path)
+        if entries is None:
+            entries = self._revalidated_listing(path)
+        return entries
+
+    def _load_listing(self, path: str) -> list[FileEntry]:
+        """Revalidate or fetch a listing that is not fresh in the cache."""
+        entries = self._revalidated_listing(path)
+        if entries is None:
+            entries = sorted(self._fetch_listing(path), key=_listing_order)
+        return entries
+
+    def _revalidated_listing(self, path: str) -> Optional[list[FileEntry]]:
+        """Renew an expired cached listing if the directory's ETag is unchanged."""
+        if self.listing_cache.get_etag(path):
+            response = self._propfind(path, "0", ETAG_PROPFIND_BODY)
+            if response is not None:
+                return self.listing_cache.revalidate(path, parse_collection_etag(response.text))
+        return None
+
+    def _fetch_listing(self, path: str) -> Iterator[FileEntry]:
+        """Stream and parse a Depth: 1 PROPFIND, caching the listing once complete."""
+        response = self._propfind(path, "1", PROPFIND_BODY, stream=True)
+        if response is None:
+            return
+
+        parser = PropfindParser(path, self.library)
+        fetched = []
+        try:
+            for chunk in response.iter_content(chunk_size=LISTING_CHUNK_SIZE):
+                batch = parser.feed(chunk)
+                fetched.extend(batch)
+                yield from batch
+            batch = parser.close()
+            fetched.extend(batch)
+            yield from batch
+        except requests.exceptions.Timeout:
+            raise StorageConnectionError(f"Listing timeout for {path or '/'}")
+        except (requests.exceptions.ConnectionError, requests.exceptions.ChunkedEncodingError) as e:
+            raise StorageConnectionError(f"Connection failed: {str(e)}")
+        finally:
+            response.close()
+
+        fetched.sort(key=_listing_order)
+        self.listing_cache.put(path, fetched, parser.etag)
+
+    def _propfind(
+        self, path: str, depth: str, body: str, stream: bool = False
+    ) -> Optional[requests.Response]:
+        """
+        Send a PROPFIND request.
+
+        Args:
+            path: Path relative to library root
+            depth: Depth header ("0" or "1")
+            body: XML request body
+            stream: Leave the response body unread (caller must close the response)
+
+        Returns:
+            Multi-status response, or None if the server answered with another success status
+        """
         url = self._get_url(path)
 
         # WebDAV PROPFIND request
         headers = {
-            "Depth": "1",  # Only immediate children
+            "Depth": depth,
             "Content-Type": "application/xml; charset=utf-8",
         }
 
-        # Request specific properties
-        propfind_xml = """<?xml version="1.0" encoding="utf-8"?>
-<d:propfind xmlns:d="DAV:">
-  <d:prop>
-    <d:resourcetype/>
-    <d:getcontentlength/>
-    <d:getlastmodified/>
-    <d:getcontenttype/>
-  </d:prop>
-</d:propfind>"""
-
         try:
-            logger.debug(f"PROPFIND {_mask_auth(url)}")
+            logger.debug(f"PROPFIND {_mask_auth(url)} (depth {depth})")
             response = self.session.request(
                 "PROPFIND",
                 url,
-                data=propfind_xml.encode("utf-8"),
+                data=body.encode("utf-8"),
                 headers=headers,
+                stream=stream,
                 timeout=(self.connect_timeout, self.read_timeout),
             )
 
+            if response.status_code == 207:
+                # Multi-Status response - XML
+                return response
+
+            response.close()
             if response.status_code == 401:
                 raise StorageAuthError("Authentication failed. Check HEIBOX_USERNAME and HEIBOX_WEBDAV_TOKEN.")
             elif response.status_code == 403:
                 raise StorageAuthError("Access forbidden. Check permissions for this library.")
             elif response.status_code == 404:
                 raise StorageNotFoundError(f"Path not found: {path}")
-            elif response.status_code == 207:
-                # Multi-Status response - parse XML
-                return self._parse_propfind_response(response.text, path)
             else:
                 response.raise_for_status()
-                return []
+                return None
 
         except requests.exceptions.Timeout:
             raise StorageConnectionError(f"Request timeout for {_mask_auth(url)}")
@@ -218,129 +993,48 @@ class WebDAVStorage:
         except Exception as e:
             raise StorageError(f"PROPFIND failed: {str(e)}")
 
-    def _parse_propfind_response(self, xml_text: str, request_path: str) -> list[FileEntry]:
+    def _parse_propfind_response(
+        self, xml_text: str, request_path: str, collection: Optional[dict] = None
+    ) -> list[FileEntry]:
         """Parse WebDAV PROPFIND XML response."""
-        try:
-            root = ET.fromstring(xml_text)
-            entries = []
-
-            for response in root.findall("d:response", self.NS):
-                href_elem = response.find("d:href", self.NS)
-                if href_elem is None or href_elem.text is None:
-                    continue
-
-                href = href_elem.text.strip()
-
-                # Skip the parent directory itself (PROPFIND depth=1 includes parent)
-                # Extract the path part from href and compare with request path
-                from urllib.parse import unquote, urlparse
-                href_path = unquote(urlparse(href).path if '://' in href else href)
-
-                # Build expected parent path
-                expected_parent = f"/seafdav/{self.library}"
-                if request_path:
-                    expected_parent = f"{expected_parent}/{request_path}"
-
-                # Skip if this href is the parent directory itself
-                if href_path.rstrip("/") == expected_parent.rstrip("/"):
-                    continue
-
-                # Extract properties
-                propstat = response.find("d:propstat", self.NS)
-                if propstat is None:
-                    continue
-
-                prop = propstat.find("d:prop", self.NS)
-                if prop is None:
-                    continue
-
-                # Check if it's a directory (collection)
-                resourcetype = prop.find("d:resourcetype", self.NS)
-                is_dir = resourcetype is not None and resourcetype.find("d:collection", self.NS) is not None
-
-                # Extract name from href
-                name = self._extract_name_from_href(href)
-                if not name or name == ".":
-                    continue
-
-                # File size (only for files)
-                size = None
-                if not is_dir:
-                    size_elem = prop.find("d:getcontentlength", self.NS)
-                    if size_elem is not None and size_elem.text:
-                        try:
-                            size = int(size_elem.text)
-                        except ValueError:
-                            pass
-
-                # Last modified
-                modified = None
-                modified_elem = prop.find("d:getlastmodified", self.NS)
-                if modified_elem is not None and modified_elem.text:
-                    try:
-                        # Parse RFC 2822 date format
-                        modified = datetime.strptime(
-                            modified_elem.text, "%a, %d %b %Y %H:%M:%S %Z"
-                        )
-                    except (ValueError, AttributeError):
-                        pass
-
-                # Content type
-                content_type = None
-                if not is_dir:
-                    ct_elem = prop.find("d:getcontenttype", self.NS)
-                    if ct_elem is not None and ct_elem.text:
-                        content_type = ct_elem.text
-
-                # Build relative path
-                rel_path = os.path.join(request_path, name) if request_path else name
-
-                entries.append(
-                    FileEntry(
-                        name=name,
-                        path=rel_path,
-                        is_dir=is_dir,
-                        size=size,
-                        modified=modified,
-                        content_type=content_type,
-                    )
-                )
-
-            # Sort: directories first, then alphabetically
-            entries.sort(key=lambda e: (not e.is_dir, e.name.lower()))
-            return entries
-
-        except ET.ParseError as e:
-            raise StorageError(f"Failed to parse WebDAV XML response: {str(e)}")
-
-    def _decode_href(self, href: str) -> str:
-        """Decode URL-encoded href."""
-        from urllib.parse import unquote
-        return unquote(href)
-
-    def _extract_name_from_href(self, href: str) -> str:
-        """Extract filename/dirname from href."""
-        # Remove trailing slash for directories
-        href = href.rstrip("/")
-        # Get last component
-        name = href.split("/")[-1]
-        # URL decode
-        from urllib.parse import unquote
-        return unquote(name)
+        return parse_propfind(xml_text, request_path, self.library, collection)
 
     def download(self, remote_path: str, local_path: str) -> None:
         """
         Download file from WebDAV to local filesystem.
 
+        Concurrent downloads of the same small file (up to
+        SHARED_DOWNLOAD_MAX_BYTES) share one GET; each caller still gets its
+        own local copy.
+
         Args:
             remote_path: Path in WebDAV library (e.g., "folder/file.txt")
             local_path: Local filesystem path (string or Path)
         """
-        from pathlib import Path
+        local_path_obj = Path(local_path)
+        data, shared = self.flights.do(
+            ("GET", remote_path.strip("/")), lambda: self._download_shared(remote_path, local_path_obj)
+        )
+        if not shared:
+            return
 
-        # Convert to Path if string
-        local_path_obj = Path(local_path) if isinstance(local_path, str) else local_path
+        if data is None:
+            # Too large to be handed around in memory: fetch our own copy
+            self._download(remote_path, local_path_obj)
+        else:
+            local_path_obj.parent.mkdir(parents=True, exist_ok=True)
+            local_path_obj.write_bytes(data)
+            logger.debug(f"Served {remote_path} from a concurrent download")
+
+    def _download_shared(self, remote_path: str, local_path: Path) -> Optional[bytes]:
+        """Download a file; returns its content for other waiters if it is small."""
+        self._download(remote_path, local_path)
+        if local_path.stat().st_size > SHARED_DOWNLOAD_MAX_BYTES:
+            return None
+        return local_path.read_bytes()
 
+    def _download(self, remote_path: str, local_path_obj: Path) -> None:
+        """Stream a file into a local path with a single GET."""
         url = self._get_url(remote_path)
         logger.info(f"Downloading from {_mask_auth(url)} to {local_path_obj}")
 
@@ -368,45 +1062,199 @@ class WebDAVStorage:
         except Exception as e:
             raise StorageError(f"Download failed: {str(e)}")
 
-    def upload(self, local_path: Path, remote_path: str) -> None:
+    def fetch_if_changed(
+        self,
+        remote_path: str,
+        local_path: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> Optional[RemoteFileInfo]:
+        """
+        Download a file unless the caller's copy is still current.
+
+        Sends a conditional GET (If-None-Match / If-Modified-Since), so an
+        unchanged file costs one 304 response without a body.
+
+        Args:
+            remote_path: Path in WebDAV library
+            local_path: Where the file is written if it changed
+            etag: ETag of the caller's copy
+            last_modified: Last-Modified header of the caller's copy
+
+        Returns:
+            Size and validators of the downloaded file, or None if the
+            caller's copy is current (nothing is written)
+        """
+        url = self._get_url(remote_path)
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        local_path_obj = Path(local_path)
+
+        try:
+            with self.session.get(
+                url, headers=headers, stream=True, timeout=(self.connect_timeout, self.read_timeout)
+            ) as response:
+                if response.status_code == 304:
+                    logger.debug(f"{remote_path} not modified")
+                    return None
+                if response.status_code in (401, 403):
+                    raise StorageAuthError(f"Access denied for {remote_path} ({response.status_code})")
+                elif response.status_code == 404:
+                    raise StorageNotFoundError(f"Path not found: {remote_path}")
+                elif response.status_code >= 400:
+                    raise StorageError(f"Download failed for {remote_path}: HTTP {response.status_code}")
+
+                local_path_obj.parent.mkdir(parents=True, exist_ok=True)
+                size = 0
+                with open(local_path_obj, "wb") as f:
+                    for chunk in response.iter_content(chunk_size=64 * 1024):
+                        if chunk:
+                            f.write(chunk)
+                            size += len(chunk)
+
+                return RemoteFileInfo(
+                    size=size,
+                    accepts_ranges=response.headers.get("Accept-Ranges", "").lower() == "bytes",
+                    etag=response.headers.get("ETag"),
+                    last_modified=response.headers.get("Last-Modified"),
+                )
+
+        except requests.exceptions.Timeout:
+            raise StorageConnectionError(f"Download timeout for {remote_path}")
+        except (requests.exceptions.ConnectionError, requests.exceptions.ChunkedEncodingError) as e:
+            raise StorageConnectionError(f"Connection failed: {str(e)}")
+
+    def probe(self, remote_path: str) -> RemoteFileInfo:
+        """
+        Get size and range support of a file via HEAD request.
+
+        Args:
+            remote_path: Path in WebDAV library
+
+        Returns:
+            RemoteFileInfo for the file
+        """
+        url = self._get_url(remote_path)
+
+        try:
+            response = self.session.head(url, timeout=(self.connect_timeout, self.read_timeout))
+        except requests.exceptions.Timeout:
+            raise StorageConnectionError(f"Request timeout for {remote_path}")
+        except requests.exceptions.ConnectionError as e:
+            raise StorageConnectionError(f"Connection failed: {str(e)}")
+
+        if response.status_code in (401, 403):
+            raise StorageAuthError(f"Access denied for {remote_path} ({response.status_code})")
+        elif response.status_code == 404:
+            raise StorageNotFoundError(f"Path not found: {remote_path}")
+        elif response.status_code >= 400:
+            raise StorageError(f"HEAD failed for {remote_path}: HTTP {response.status_code}")
+
+        length = response.headers.get("Content-Length")
+        return RemoteFileInfo(
+            size=int(length) if length and length.isdigit() else None,
+            accepts_ranges=response.headers.get("Accept-Ranges", "").lower() == "bytes",
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+
+    def _range_url(self, remote_path: str) -> str:
+        """URL that byte-range downloads of a file are read from."""
+        return self._get_url(remote_path)
+
+    def read_range(
+        self,
+        remote_path: str,
+        start: int,
+        end: Optional[int],
+        sink: Callable[[bytes], None],
+        chunk_size: int = 1024 * 1024,
+    ) -> None:
+        """
+        Stream a byte range of a file into a callback.
+
+        Args:
+            remote_path: Path in WebDAV library
+            start: First byte offset
+            end: Last byte offset (inclusive), or None for the rest of the file
+            sink: Called with each chunk, in order
+            chunk_size: Read size in bytes
+
+        Raises:
+            RangeNotSupportedError: If the server ignored the Range header
+            StorageConnectionError: If the transfer broke off (bytes already
+                passed to sink stay valid)
         """
-        Upload a file via HTTP PUT.
+        url = self._range_url(remote_path)
+        ranged = start > 0 or end is not None
+        headers = {"Range": f"bytes={start}-{'' if end is None else end}"} if ranged else {}
+
+        try:
+            with self.session.get(
+                url, headers=headers, stream=True, timeout=(self.connect_timeout, self.read_timeout)
+            ) as response:
+                if response.status_code in (401, 403):
+                    raise StorageAuthError(f"Access denied for {remote_path} ({response.status_code})")
+                elif response.status_code == 404:
+                    raise StorageNotFoundError(f"Path not found: {remote_path}")
+                elif response.status_code >= 400:
+                    raise StorageError(f"Download failed for {remote_path}: HTTP {response.status_code}")
+                elif ranged and response.status_code != 206:
+                    raise RangeNotSupportedError(f"Server ignored Range request for {remote_path}")
+
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    if chunk:
+                        sink(chunk)
+
+        except requests.exceptions.Timeout:
+            raise StorageConnectionError(f"Download timeout for {remote_path}")
+        except (requests.exceptions.ConnectionError, requests.exceptions.ChunkedEncodingError) as e:
+            raise StorageConnectionError(f"Connection failed: {str(e)}")
+
+    def upload(
+        self,
+        local_path: Path,
+        remote_path: str,
+        progress: Optional[Callable[[int, int], None]] = None,
+        exists: Optional[bool] = None,
+    ) -> None:
+        """
+        Upload a file via HTTP PUT, streaming the body once.
+
+        Overwrites are sent with `If-Match: *`. Whether the file exists is
+        decided before the body goes out (a HEAD request unless the caller
+        knows), so a new file is not rejected with 412 after a full upload.
 
         Args:
             local_path: Source local path
             remote_path: Destination path in storage
+            progress: Called with (bytes_sent, bytes_total) while streaming
+            exists: Whether the remote file exists, if known (skips the HEAD)
         """
+        local_path = Path(local_path)
         if not local_path.exists():
             raise StorageError(f"Local file not found: {local_path}")
 
         url = self._get_url(remote_path)
+        if exists is None:
+            exists = self.exists(remote_path)
 
         try:
             logger.debug(f"Uploading {local_path} to {_mask_auth(url)}")
+            response = self._put_file(url, local_path, progress, overwrite=exists)
 
-            with open(local_path, "rb") as f:
-                response = self.session.put(
-                    url,
-                    data=f,
-                    headers={
-                        "If-Match": "*",  # Allow overwriting existing files
-                    },
-                    timeout=(self.connect_timeout, self.read_timeout),
-                )
+            if response.status_code == 412:
+                # Changed between the check and the PUT (rare): send it once more
+                logger.debug(f"{remote_path} {'vanished' if exists else 'appeared'} during upload, retrying")
+                response = self._put_file(url, local_path, progress, overwrite=not exists)
 
             if response.status_code == 401:
                 raise StorageAuthError("Authentication failed")
             elif response.status_code == 403:
                 raise StorageAuthError("Access forbidden")
-            elif response.status_code == 412:
-                # Precondition failed - file doesn't exist, retry without If-Match
-                logger.debug("File doesn't exist, retrying without If-Match header")
-                with open(local_path, "rb") as f:
-                    response = self.session.put(
-                        url,
-                        data=f,
-                        timeout=(self.connect_timeout, self.read_timeout),
-                    )
 
             response.raise_for_status()
             logger.info(f"Uploaded {local_path} to {remote_path}")
@@ -419,6 +1267,71 @@ class WebDAVStorage:
             raise
         except Exception as e:
             raise StorageError(f"Upload failed: {str(e)}")
+        finally:
+            # Even a failed PUT may have reached the server
+            self._invalidate(remote_path)
+
+    def _put_file(
+        self,
+        url: str,
+        local_path: Path,
+        progress: Optional[Callable[[int, int], None]],
+        overwrite: bool,
+    ) -> requests.Response:
+        """Stream a file as a PUT body."""
+        # Allow overwriting existing files; new files go without a precondition
+        headers = {"If-Match": "*"} if overwrite else {}
+        with open(local_path, "rb") as f:
+            body = _ProgressReader(f, os.fstat(f.fileno()).st_size, progress)
+            return self.session.put(
+                url,
+                data=body,
+                headers=headers,
+                timeout=(self.connect_timeout, self.read_timeout),
+            )
+
+    def upload_if_match(self, local_path: Path, remote_path: str, etag: Optional[str]) -> Optional[str]:
+        """
+        Upload a file only if the remote file is still the one the caller read.
+
+        Args:
+            local_path: Source local path
+            remote_path: Destination path in storage
+            etag: ETag the remote file had when it was read, or None if it
+                did not exist (then the upload only creates it)
+
+        Returns:
+            ETag of the new file, if the server sent one
+
+        Raises:
+            StoragePreconditionError: If the file changed or appeared meanwhile
+        """
+        url = self._get_url(remote_path)
+        headers = {"If-Match": etag} if etag else {"If-None-Match": "*"}
+
+        try:
+            with open(local_path, "rb") as f:
+                response = self.session.put(
+                    url, data=f, headers=headers, timeout=(self.connect_timeout, self.read_timeout)
+                )
+            if response.status_code == 412:
+                raise StoragePreconditionError(f"{remote_path} changed on the server since it was read")
+            if response.status_code in (401, 403):
+                raise StorageAuthError(f"Access denied for {remote_path} ({response.status_code})")
+            response.raise_for_status()
+            logger.info(f"Uploaded {local_path} to {remote_path} (conditional)")
+            return response.headers.get("ETag")
+
+        except requests.exceptions.Timeout:
+            raise StorageConnectionError(f"Upload timeout for {remote_path}")
+        except requests.exceptions.ConnectionError as e:
+            raise StorageConnectionError(f"Connection failed: {str(e)}")
+        except StorageError:
+            raise
+        except Exception as e:
+            raise StorageError(f"Upload failed: {str(e)}")
+        finally:
+            self._invalidate(remote_path)
 
     def mkdir(self, remote_path: str) -> None:
         """
@@ -427,11 +1340,22 @@ class WebDAVStorage:
         Args:
             remote_path: Directory path to create
         """
-        # Split path and create each component
-        parts = [p for p in remote_path.split("/") if p]
+        self.make_collections([remote_path])
+        logger.info(f"Created directory: {remote_path}")
 
-        for i in range(len(parts)):
-            partial_path = "/".join(parts[: i + 1])
+    def make_collections(self, paths) -> set[str]:
+        """
+        Create directories and all their parents, one MKCOL per collection.
+
+        Args:
+            paths: Directory paths relative to the library root
+
+        Returns:
+            Paths that were newly created (the others already existed)
+        """
+        created = set()
+
+        for partial_path in collection_paths(paths):
             url = self._get_url(partial_path)
 
             try:
@@ -442,7 +1366,11 @@ class WebDAVStorage:
                 )
 
                 # 201 = created, 405 = already exists (method not allowed on existing collection)
-                if response.status_code in (201, 405):
+                if response.status_code == 201:
+                    created.add(partial_path)
+                    self._invalidate(partial_path)
+                    continue
+                elif response.status_code == 405:
                     continue
                 elif response.status_code == 401:
                     raise StorageAuthError("Authentication failed")
@@ -460,7 +1388,7 @@ class WebDAVStorage:
             except Exception as e:
                 raise StorageError(f"MKCOL failed for {partial_path}: {str(e)}")
 
-        logger.info(f"Created directory: {remote_path}")
+        return created
 
     def move(self, src_path: str, dest_path: str) -> None:
         """
@@ -507,10 +1435,13 @@ class WebDAVStorage:
             raise
         except Exception as e:
             raise StorageError(f"MOVE failed: {str(e)}")
+        finally:
+            self._invalidate(src_path, recursive=True)
+            self._invalidate(dest_path, recursive=True)
 
     def exists(self, remote_path: str) -> bool:
         """
-        Check if path exists via HEAD request.
+        Check if path exists, from the cached parent listing or via HEAD request.
 
         Args:
             remote_path: Path to check
@@ -518,6 +1449,10 @@ class WebDAVStorage:
         Returns:
             True if exists
         """
+        answered, entry = self.listing_cache.lookup(remote_path)
+        if answered:
+            return entry is not None
+
         url = self._get_url(remote_path)
 
         try:
@@ -530,7 +1465,7 @@ class WebDAVStorage:
 
     def get_info(self, remote_path: str) -> Optional[FileEntry]:
         """
-        Get file/directory info via PROPFIND.
+        Get file/directory info from its parent's (possibly cached) listing.
 
         Args:
             remote_path: Path to query
@@ -538,6 +1473,10 @@ class WebDAVStorage:
         Returns:
             FileEntry or None
         """
+        answered, entry = self.listing_cache.lookup(remote_path)
+        if answered:
+            return entry
+
         try:
             # List parent directory and find this entry
             parent_path = str(Path(remote_path).parent)
@@ -589,3 +1528,5 @@ class WebDAVStorage:
             raise
         except Exception as e:
             raise StorageError(f"DELETE failed: {str(e)}")
+        finally:
+            self._invalidate(remote_path, recursive=True)
@@ -2,12 +2,8 @@
 TUI application using Textual framework with Neovim-style keybindings.
 """
 import logging
-import os
-import tempfile
 from datetime import date
-from pathlib import Path
 
-import yaml
 from textual import on, work
 from textual.app import ComposeResult
 from textual.containers import Container, Horizontal, VerticalScroll
@@ -25,7 +21,7 @@ from textual.widgets import (
 from hei_datahub.infra.store import validate_metadata
 from hei_datahub.services.catalog import generate_id as generate_unique_id
 from hei_datahub.services.index_service import get_index_service
-from hei_datahub.services.storage_manager import get_storage_backend
+from hei_datahub.services.outbox import cloud_metadata, get_outbox
 from hei_datahub.ui.widgets.contextual_footer import ContextualFooter
 
 from .dataset_detail import CloudDatasetDetailsScreen
@@ -306,118 +302,77 @@ class AddDataScreen(Screen):
 
     @work(thread=True)
     def save_to_cloud(self, dataset_id: str, metadata: dict) -> None:
-        """Save dataset to cloud storage (WebDAV)."""
+        """Save a new dataset: add it to the search index now, upload through the outbox."""
         try:
-            self.app.call_from_thread(self.app.notify, "Uploading to cloud...", timeout=2)
-            logger.info(f"Starting upload for dataset {dataset_id}")
+            logger.info(f"Saving new dataset {dataset_id}")
 
-            # Get storage backend - this might fail if auth is not configured
-            try:
-                storage = get_storage_backend()
-            except Exception as auth_err:
-                logger.error(f"Failed to get storage backend: {auth_err}")
-                self.app.call_from_thread(
-                    self.app.notify,
-                    f"Authentication Error: {str(auth_err)}\nPlease run 'hei-datahub auth setup' or configure Settings.",
-                    severity="error",
-                    timeout=10
-                )
-                return
-
-            # Create dataset directory
-            remote_dir = dataset_id
-            try:
-                storage.mkdir(remote_dir)
-            except Exception as e:
-                # Directory might already exist, that's okay
-                logger.debug(f"Directory creation failed (might exist): {e}")
-                pass
-
-            # Create metadata.yaml in temp file
-            with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.yaml', encoding='utf-8') as tmp:
-                # Convert metadata to YAML-friendly format
-                yaml_metadata = {}
-                for key, value in metadata.items():
-                    # Convert dataset_name to name for consistency
-                    if key == 'dataset_name':
-                        yaml_metadata['name'] = value
-                    elif key != 'id':  # Skip id field, it's implicit from directory name
-                        yaml_metadata[key] = value
-
-                yaml.dump(yaml_metadata, tmp, sort_keys=False, allow_unicode=True)
-                tmp_path = tmp.name
+            # Queue folder creation and metadata.yaml upload
+            # (id is implicit from the directory name, dataset_name is stored as name)
+            outbox = get_outbox()
+            outbox.enqueue_put(dataset_id, cloud_metadata(metadata))
 
+            # Update fast search index for cloud dataset right away
             try:
-                # Upload metadata.yaml
-                remote_path = f"{dataset_id}/metadata.yaml"
-                logger.info(f"Uploading metadata to {remote_path}")
-                storage.upload(Path(tmp_path), remote_path)
-
-                # Update fast search index for cloud dataset
-                try:
-                    index_service = get_index_service()
-
-                    # Extract fields
-                    name = metadata.get('dataset_name', dataset_id)
-                    description = metadata.get('description', '')
-                    tags_list = metadata.get('tags', [])
-                    tags = " ".join(tags_list) if isinstance(tags_list, list) else str(tags_list)
-                    used_in_projects = metadata.get('used_in_projects', [])
-                    project = ", ".join(used_in_projects) if used_in_projects else None
-
-                    index_service.upsert_item(
-                        path=dataset_id,
-                        name=name,
-                        project=project,
-                        tags=tags,
-                        description=description,
-                        format=metadata.get('file_format'),
-                        source=metadata.get('source'),
-                        category=metadata.get('category'),
-                        spatial_coverage=metadata.get('spatial_coverage'),
-                        temporal_coverage=metadata.get('temporal_coverage'),
-                        access_method=metadata.get('access_method'),
-                        storage_location=metadata.get('storage_location'),
-                        reference=metadata.get('reference'),
-                        spatial_resolution=metadata.get('spatial_resolution'),
-                        temporal_resolution=metadata.get('temporal_resolution'),
-                        size=metadata.get('size'),
-                        is_remote=True,  # This is a cloud dataset
-                    )
-                except Exception as idx_err:
-                    # Don't fail upload if index update fails
-                    logger.warning(f"Failed to update search index: {idx_err}")
-
-                self.app.call_from_thread(
-                    self.app.notify,
-                    f"✓ Dataset '{dataset_id}' uploaded to cloud!",
-                    timeout=5
+                index_service = get_index_service()
+
+                # Extract fields
+                name = metadata.get('dataset_name', dataset_id)
+                description = metadata.get('description', '')
+                tags_list = metadata.get('tags', [])
+                tags = " ".join(tags_list) if isinstance(tags_list, list) else str(tags_list)
+                used_in_projects = metadata.get('used_in_projects', [])
+                project = ", ".join(used_in_projects) if used_in_projects else None
+
+                index_service.upsert_item(
+                    path=dataset_id,
+                    name=name,
+                    project=project,
+                    tags=tags,
+                    description=description,
+                    format=metadata.get('file_format'),
+                    source=metadata.get('source'),
+                    category=metadata.get('category'),
+                    spatial_coverage=metadata.get('spatial_coverage'),
+                    temporal_coverage=metadata.get('temporal_coverage'),
+                    access_method=metadata.get('access_method'),
+                    storage_location=metadata.get('storage_location'),
+                    reference=metadata.get('reference'),
+                    spatial_resolution=metadata.get('spatial_resolution'),
+                    temporal_resolution=metadata.get('temporal_resolution'),
+                    size=metadata.get('size'),
+                    is_remote=True,  # This is a cloud dataset
                 )
+            except Exception as idx_err:
+                # The outbox still uploads it; the next sync indexes it
+                logger.warning(f"Failed to update search index: {idx_err}")
+
+            self.app.call_from_thread(
+                self.app.notify,
+                f"✓ Dataset '{dataset_id}' saved, uploading in the background",
+                timeout=5
+            )
 
-                # Close form and show details
-                self.app.call_from_thread(self.app.pop_screen)
-                self.app.call_from_thread(self.app.push_screen, CloudDatasetDetailsScreen(dataset_id))
+            # Close form and show details
+            self.app.call_from_thread(self.app.pop_screen)
+            self.app.call_from_thread(self.app.push_screen, CloudDatasetDetailsScreen(dataset_id))
 
-                # Refresh the HomeScreen table to show new dataset
-                def refresh_home():
-                    for screen in self.app.screen_stack:
-                        if isinstance(screen, HomeScreen):
-                            logger.info("Refreshing HomeScreen table with new dataset (force refresh)")
-                            screen.load_all_datasets(force_refresh=True)
-                            break
+            # Refresh the HomeScreen table to show new dataset
+            def refresh_home():
+                for screen in self.app.screen_stack:
+                    if isinstance(screen, HomeScreen):
+                        logger.info("Refreshing HomeScreen table with new dataset (force refresh)")
+                        screen.load_all_datasets(force_refresh=True)
+                        break
 
-                self.app.call_from_thread(refresh_home)
+            self.app.call_from_thread(refresh_home)
 
-            finally:
-                # Cleanup temp file
-                if os.path.exists(tmp_path):
-                    os.unlink(tmp_path)
+            outbox.flush_in_background()
 
         except Exception as e:
-            logger.error(f"Upload failed: {e}", exc_info=True)
+            logger.error(f"Saving dataset failed: {e}", exc_info=True)
             self.app.call_from_thread(
                 self.app.notify,
-                f"Error uploading to cloud: {str(e)}",
+                f"Error saving dataset: {str(e)}",
                 severity="error",
                 timeout=10
             )
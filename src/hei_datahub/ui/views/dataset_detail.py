@@ -2,10 +2,8 @@
 Cloud dataset details screen.
 """
 import logging
-import os
-import tempfile
+import threading
 import time
-from datetime import datetime
 
 import pyperclip
 import yaml
@@ -21,6 +19,13 @@ from textual.widgets import (
     Static,
 )
 
+from hei_datahub.infra.index import delete_dataset
+from hei_datahub.services.index_events import ItemsRemoved, get_event_bus
+from hei_datahub.services.index_service import get_index_service
+from hei_datahub.services.storage_manager import get_storage_backend
+from hei_datahub.ui.utils.actions import ClipboardActionsMixin, NavActionsMixin, UrlActionsMixin
+from hei_datahub.ui.widgets.contextual_footer import ContextualFooter
+
 # Simple in-memory cache for metadata to avoid refetching on every view
 # Key: dataset_id, Value: (metadata_dict, timestamp)
 _METADATA_CACHE = {}
@@ -37,12 +42,6 @@ def update_metadata_cache(dataset_id: str, metadata: dict) -> None:
     """Update metadata cache with fresh data."""
     _METADATA_CACHE[dataset_id] = (metadata, time.time())
 
-from hei_datahub.infra.index import delete_dataset
-from hei_datahub.services.index_service import get_index_service
-from hei_datahub.services.storage_manager import get_storage_backend
-from hei_datahub.ui.utils.actions import ClipboardActionsMixin, NavActionsMixin, UrlActionsMixin
-from hei_datahub.ui.widgets.contextual_footer import ContextualFooter
-
 logger = logging.getLogger(__name__)
 
 
@@ -115,6 +114,8 @@ class CloudDatasetDetailsScreen(NavActionsMixin, UrlActionsMixin, Screen):
         ("e", "edit_cloud_dataset", "Edit"),
         ("o", "open_url", "Open URL"),
         ("d", "delete_dataset", "Delete"),
+        Binding("D", "download_all", "Download all"),
+        Binding("p", "preview_files", "Preview files"),
         Binding("j", "scroll_down", "Scroll Down", show=False),
         Binding("k", "scroll_up", "Scroll Up", show=False),
     ]
@@ -131,8 +132,10 @@ class CloudDatasetDetailsScreen(NavActionsMixin, UrlActionsMixin, Screen):
         super().__init__()
         self.dataset_id = dataset_id
         self.metadata = None
+        self._mirror_shown = False  # Full metadata from the local mirror is on screen
         self._yank_mode = False
         self._yank_auto_cancel_timer = None
+        self._download_cancel = None  # threading.Event while a download runs
 
         self.field_map = {
             'n': ('name', 'Name'),
@@ -168,6 +171,7 @@ class CloudDatasetDetailsScreen(NavActionsMixin, UrlActionsMixin, Screen):
     def compose(self) -> ComposeResult:
         yield VerticalScroll(
             Label(f"󱤟 Dataset: {self.dataset_id}", classes="title"),
+            Static("", id="download-status"),
             id="details-container",
         )
         footer = ContextualFooter()
@@ -178,10 +182,29 @@ class CloudDatasetDetailsScreen(NavActionsMixin, UrlActionsMixin, Screen):
 
     def on_mount(self) -> None:
         """Load metadata when screen is mounted."""
-        # 1. Start loading from cache/index immediately (fast)
-        self.load_metadata_from_index()
+        # 1. Full metadata from the local mirror, or the indexed fields (fast)
+        mirrored = self._load_metadata_from_mirror()
+        if mirrored is not None:
+            self.metadata = mirrored
+        else:
+            self.load_metadata_from_index()
+
+        # 2. Changes waiting in the outbox are newer than the cloud copy
+        try:
+            from hei_datahub.services.outbox import get_outbox
+            pending = get_outbox().pending_metadata(self.dataset_id)
+        except Exception as e:
+            logger.warning(f"Could not read the outbox: {e}")
+            pending = None
+        if pending is not None:
+            logger.info(f"Showing queued changes for {self.dataset_id}")
+            self.metadata = {**(self.metadata or {}), **pending}
+            if self.metadata.get('format') and not self.metadata.get('file_format'):
+                self.metadata['file_format'] = self.metadata['format']
+            self._display_metadata(is_loading=False)
+            return
 
-        # 2. Check in-memory cache for full metadata
+        # 3. Check in-memory cache for full metadata
         if self.dataset_id in _METADATA_CACHE:
              cached_meta, timestamp = _METADATA_CACHE[self.dataset_id]
              # Cache valid for 5 minutes
@@ -197,7 +220,28 @@ class CloudDatasetDetailsScreen(NavActionsMixin, UrlActionsMixin, Screen):
                  self._display_metadata(is_loading=False)
                  return
 
-        # 3. If not in cache, fetch from cloud (slower)
+        from hei_datahub.services.circuit_breaker import is_offline
+
+        # 4. Mirrored metadata is shown right away and revalidated in the background
+        if mirrored is not None:
+            logger.info(f"Showing mirrored metadata for {self.dataset_id}")
+            self._mirror_shown = True
+            self._display_metadata(is_loading=False)
+            if not is_offline():
+                self.load_metadata_from_cloud()
+            return
+
+        # 5. Offline: show what the index and cache have instead of waiting on timeouts
+        if is_offline():
+            logger.info(f"Storage offline, showing indexed metadata for {self.dataset_id}")
+            if self.dataset_id in _METADATA_CACHE:
+                cached_meta, _ = _METADATA_CACHE[self.dataset_id]
+                self.metadata = {**(self.metadata or {}), **cached_meta}
+            if self.metadata:
+                self._display_metadata(is_loading=False)
+                return
+
+        # 6. If not in cache, fetch from cloud (slower)
         self.load_metadata_from_cloud()
 
     def on_key(self, event: events.Key) -> None:
@@ -337,6 +381,22 @@ class CloudDatasetDetailsScreen(NavActionsMixin, UrlActionsMixin, Screen):
         except Exception as e:
             logger.warning(f"Failed to load from index: {e}")
 
+    def _load_metadata_from_mirror(self):
+        """Full metadata.yaml from the local mirror (instant, works offline), or None."""
+        try:
+            from hei_datahub.services.metadata_mirror import get_metadata_mirror
+
+            mirrored = get_metadata_mirror().get(self.dataset_id)
+        except Exception as e:
+            logger.warning(f"Could not read mirrored metadata: {e}")
+            return None
+        if mirrored is None:
+            return None
+        metadata = dict(mirrored.metadata)
+        if metadata.get('format') and not metadata.get('file_format'):
+            metadata['file_format'] = metadata['format']
+        return metadata
+
     @work(thread=True)
     def load_metadata_from_cloud(self) -> None:
         """Load metadata from cloud storage (WebDAV) to show full source of truth."""
@@ -345,30 +405,27 @@ class CloudDatasetDetailsScreen(NavActionsMixin, UrlActionsMixin, Screen):
             # self.app.call_from_thread(self.app.notify, f"Fetching details for {self.dataset_id}...", timeout=2)
             logger.info("Downloading metadata from cloud to ensure full details")
 
-            storage = get_storage_backend()
-            metadata_path = f"{self.dataset_id}/metadata.yaml"
-
-            # Download metadata.yaml
-            with tempfile.NamedTemporaryFile(mode='wb', delete=False, suffix='.yaml') as tmp:
-                storage.download(metadata_path, tmp.name)
-                tmp_path = tmp.name
-
-            try:
-                with open(tmp_path, encoding='utf-8') as f:
-                    self.metadata = yaml.safe_load(f)
+            from hei_datahub.services.metadata_mirror import get_metadata_mirror
 
-                # Ensure 'file_format' alias is present if 'format' exists (for compatibility)
-                if self.metadata.get('format') and not self.metadata.get('file_format'):
-                    self.metadata['file_format'] = self.metadata['format']
+            storage = get_storage_backend()
 
-                # Update cache
+            # Revalidate the mirrored metadata.yaml (one 304 if it is unchanged)
+            metadata, changed = get_metadata_mirror().fetch(storage, self.dataset_id, allow_stale=True)
+            if not changed and self._mirror_shown:
+                logger.debug(f"Mirrored metadata of {self.dataset_id} is current")
                 _METADATA_CACHE[self.dataset_id] = (self.metadata, time.time())
+                return
+            self.metadata = metadata
 
-                # Update UI on main thread
-                self.app.call_from_thread(self._display_metadata)
+            # Ensure 'file_format' alias is present if 'format' exists (for compatibility)
+            if self.metadata.get('format') and not self.metadata.get('file_format'):
+                self.metadata['file_format'] = self.metadata['format']
 
-            finally:
-                os.unlink(tmp_path)
+            # Update cache
+            _METADATA_CACHE[self.dataset_id] = (self.metadata, time.time())
+
+            # Update UI on main thread
+            self.app.call_from_thread(self._display_metadata)
 
         except Exception as e:
             # Only show error if we also failed to load from index (metadata is None)
@@ -378,6 +435,8 @@ class CloudDatasetDetailsScreen(NavActionsMixin, UrlActionsMixin, Screen):
                 self.app.call_from_thread(lambda: self.query_one("#details-content", Static).update(f"[red]{error_msg}[/red]"))
             else:
                 logger.warning(f"Failed to refresh metadata from cloud: {e}")
+                # Keep the indexed details, without the "Refreshing" note
+                self.app.call_from_thread(self._display_metadata)
 
     def _display_metadata(self, is_loading: bool = False) -> None:
         """Display formatted metadata in the details view."""
@@ -483,39 +542,15 @@ class CloudDatasetDetailsScreen(NavActionsMixin, UrlActionsMixin, Screen):
 
     @work(thread=True)
     def delete_from_cloud(self) -> None:
-        """Delete dataset from cloud storage and local index."""
+        """Delete dataset from the local index now and from cloud storage through the outbox."""
         try:
-            self.app.call_from_thread(
-                lambda: self.app.notify(f"Deleting {self.dataset_id} from cloud...", timeout=3)
-            )
+            from hei_datahub.services.outbox import get_outbox
 
-            # Delete from cloud storage (WebDAV)
-            storage = get_storage_backend()
-
-            # Delete the entire dataset folder
-            folder_path = self.dataset_id
-            try:
-                # Version control/Backup: Move to _DELETED_DATASETS instead of permanent deletion
-                # This ensures data can be restored from Heibox if needed.
-                backup_root = "_DELETED_DATASETS"
-                if not storage.exists(backup_root):
-                    storage.mkdir(backup_root)
-
-                # Append timestamp to avoid collisions
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                backup_path = f"{backup_root}/{folder_path}_{timestamp}"
-
-                # Move instead of delete
-                storage.move(folder_path, backup_path)
-                logger.info(f"Moved dataset folder to backup: {backup_path}")
-
-                self.app.call_from_thread(
-                    lambda: self.app.notify(f"Dataset moved to {backup_path} (recover via Heibox)", timeout=5)
-                )
-
-            except Exception as e:
-                logger.warning(f"Error moving to backup (cloud): {e}")
-                # Continue with local deletion even if cloud deletion/move fails
+            # Version control/Backup: the outbox moves the folder to _DELETED_DATASETS
+            # instead of deleting it, so data can be restored from Heibox if needed
+            outbox = get_outbox()
+            op = outbox.enqueue_delete(self.dataset_id)
+            clear_metadata_cache(self.dataset_id)
 
             # Delete from local SQLite index (datasets_store and datasets_fts)
             try:
@@ -529,26 +564,22 @@ class CloudDatasetDetailsScreen(NavActionsMixin, UrlActionsMixin, Screen):
                 index_service = get_index_service()
                 index_service.delete_item(self.dataset_id)
                 logger.info(f"Deleted dataset from search index: {self.dataset_id}")
+                # Home screen drops the row when it sees the event
+                get_event_bus().publish(ItemsRemoved(paths=(self.dataset_id,)))
             except Exception as e:
                 logger.warning(f"Error deleting from search index: {e}")
 
             # Success notification
-            self.app.call_from_thread(
-                lambda: self.app.notify(f"✓ Dataset '{self.dataset_id}' deleted successfully!", timeout=5)
-            )
+            if op is not None:
+                message = f"✓ Dataset '{self.dataset_id}' deleted, moving it to {op.backup_path} (recover via Heibox)"
+            else:
+                message = f"✓ Dataset '{self.dataset_id}' deleted (it was never uploaded)"
+            self.app.call_from_thread(lambda: self.app.notify(message, timeout=5))
 
             # Go back to home screen
             self.app.call_from_thread(lambda: self.app.pop_screen())
 
-            # Refresh the home screen table
-            def refresh_home():
-                from .home import HomeScreen
-                for screen in self.app.screen_stack:
-                    if isinstance(screen, HomeScreen):
-                        screen.refresh_data()
-                        break
-
-            self.app.call_from_thread(refresh_home)
+            outbox.flush_in_background()
 
         except Exception as e:
             error_msg = f"Error deleting dataset: {str(e)}"
@@ -560,8 +591,93 @@ class CloudDatasetDetailsScreen(NavActionsMixin, UrlActionsMixin, Screen):
             )
 
     def action_download_all(self) -> None:
-        """Download entire dataset directory."""
-        self.app.notify("Download all not yet implemented", severity="warning", timeout=3)
+        """Download entire dataset directory (press again to cancel)."""
+        if self._download_cancel is not None:
+            self._download_cancel.set()
+            self.app.notify("Cancelling download (partial files are kept for resuming)...", timeout=3)
+            return
+
+        from hei_datahub.services.dataset_download import DEFAULT_DOWNLOAD_DIR
+
+        self._download_cancel = threading.Event()
+        self._set_download_status("Listing dataset files...")
+        self.download_dataset(DEFAULT_DOWNLOAD_DIR / self.dataset_id, self._download_cancel)
+
+    def action_preview_files(self) -> None:
+        """Preview the dataset's files from their first bytes, without downloading them."""
+        from ..widgets.file_preview import FilePreviewScreen
+
+        self.app.push_screen(FilePreviewScreen(self.dataset_id))
+
+    @work(thread=True, exclusive=True, group="download")
+    def download_dataset(self, dest, cancel: threading.Event) -> None:
+        """Download the dataset folder in a background thread, reporting throughput and ETA."""
+        from hei_datahub.services.dataset_download import (
+            create_dataset_downloader,
+            format_bytes,
+            format_progress,
+        )
+        from hei_datahub.services.segmented_download import DownloadCancelledError
+
+        def update(text: str) -> None:
+            self.app.call_from_thread(self._set_download_status, text)
+
+        try:
+            downloader = create_dataset_downloader()
+            plan = downloader.plan(self.dataset_id, dest)
+            if not plan.transfers:
+                update("")
+                self.app.call_from_thread(
+                    lambda: self.app.notify(f"✓ {dest} is already up to date", timeout=5)
+                )
+                return
+
+            update(f"󰇚 Downloading {len(plan.transfers)} files ({format_bytes(plan.total_bytes)})...")
+            stats = downloader.run(
+                plan,
+                on_progress=lambda s: update(f"󰇚 {format_progress(s)}  [dim](D to cancel)[/dim]"),
+                cancel=cancel,
+            )
+
+            if stats.files_failed:
+                update(f"⚠ {format_progress(stats)}")
+                self.app.call_from_thread(
+                    lambda: self.app.notify(
+                        f"{stats.files_failed} files failed to download; press D to retry",
+                        severity="warning", timeout=8,
+                    )
+                )
+            else:
+                update(f"✓ Downloaded {format_bytes(stats.bytes_done)} to {dest}")
+                self.app.call_from_thread(
+                    lambda: self.app.notify(f"✓ Dataset downloaded to {dest}", timeout=5)
+                )
+
+        except DownloadCancelledError:
+            update("Download cancelled; press D to resume")
+        except Exception as e:
+            logger.error(f"Download of {self.dataset_id} failed: {e}")
+            update("")
+            self.app.call_from_thread(
+                lambda err=e: self.app.notify(f"Download failed: {err}", severity="error", timeout=5)
+            )
+        finally:
+            self._download_cancel = None
+
+    def _set_download_status(self, text: str) -> None:
+        """Show or hide the download progress line."""
+        try:
+            status = self.query_one("#download-status", Static)
+        except Exception:
+            # Screen already closed
+            return
+        status.update(text)
+        status.display = bool(text)
+
+    def on_unmount(self) -> None:
+        """Stop a running download when leaving the screen (it resumes next time)."""
+        if self._download_cancel is not None:
+            self._download_cancel.set()
 
     def action_edit_cloud_dataset(self) -> None:
         """Edit cloud dataset (e key)."""
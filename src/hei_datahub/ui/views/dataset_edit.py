@@ -2,7 +2,6 @@
 TUI application using Textual framework with Neovim-style keybindings.
 """
 import logging
-from pathlib import Path
 from typing import Any
 
 from textual import on, work
@@ -41,6 +40,8 @@ class CloudEditDetailsScreen(Screen):
     def __init__(self, dataset_id: str, metadata: dict):
         super().__init__()
         self.dataset_id = dataset_id
+        # Fields the details view may lack (date_created, schema_fields, ...) come from the local mirror
+        metadata = {**self._mirrored_metadata(dataset_id), **metadata}
         self.original_metadata = metadata.copy()
         self.metadata = metadata.copy()
 
@@ -182,6 +183,45 @@ class CloudEditDetailsScreen(Screen):
         self.query_one("#edit-name", Input).focus()
         self._update_status()
 
+        from hei_datahub.services.circuit_breaker import is_offline
+        if not is_offline():
+            self.revalidate_metadata()
+
+    @staticmethod
+    def _mirrored_metadata(dataset_id: str) -> dict:
+        """Full metadata.yaml from the local mirror ({} if not mirrored)."""
+        try:
+            from hei_datahub.services.metadata_mirror import get_metadata_mirror
+
+            mirrored = get_metadata_mirror().get(dataset_id)
+        except Exception as e:
+            logger.warning(f"Could not read mirrored metadata: {e}")
+            return {}
+        return dict(mirrored.metadata) if mirrored is not None else {}
+
+    @work(thread=True)
+    def revalidate_metadata(self) -> None:
+        """Check the server copy in the background and pick up fields the form doesn't show."""
+        try:
+            from hei_datahub.services.metadata_mirror import get_metadata_mirror
+            from hei_datahub.services.storage_manager import get_storage_backend
+
+            metadata, changed = get_metadata_mirror().fetch(get_storage_backend(), self.dataset_id, allow_stale=True)
+        except Exception as e:
+            logger.debug(f"Could not revalidate metadata of {self.dataset_id}: {e}")
+            return
+        if changed:
+            self.app.call_from_thread(self._merge_server_metadata, metadata)
+
+    def _merge_server_metadata(self, server: dict) -> None:
+        """Add fields missing from the form's copy; edited fields are merged on save (outbox)."""
+        for key, value in server.items():
+            if key not in self.original_metadata:
+                self.original_metadata[key] = value
+                self.metadata.setdefault(key, value)
+        if any(key in server and server[key] != value for key, value in self.original_metadata.items()):
+            self.app.notify("This dataset changed on the server; saving merges your edits into it", timeout=5)
+
     @on(Button.Pressed, "#save-btn")
     def on_save_button_pressed(self) -> None:
         """Handle Save button click."""
@@ -429,157 +469,122 @@ class CloudEditDetailsScreen(Screen):
 
     @work(thread=True)
     def save_to_cloud(self) -> None:
-        """Save dataset to cloud storage (WebDAV)."""
-        tmp_path = None
+        """Save dataset changes: update the search index now, upload through the outbox."""
         try:
-            import os
-            import tempfile
-
-            import yaml
-
-            from hei_datahub.services.storage_manager import get_storage_backend
-
-            storage = get_storage_backend()
+            from hei_datahub.services.outbox import cloud_metadata, get_outbox
 
-            logger.info(f"CloudEditDetailsScreen: Saving {self.dataset_id} to cloud")
+            logger.info(f"CloudEditDetailsScreen: Saving {self.dataset_id}")
             logger.debug(f"Metadata to save: {self.metadata}")
 
-            # Create metadata.yaml in temp file
-            with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.yaml', encoding='utf-8') as tmp:
-                # Convert metadata to cloud YAML format
-                yaml_metadata = {}
-                for key, value in self.metadata.items():
-                    # Use 'name' instead of 'dataset_name' for cloud
-                    if key == 'dataset_name':
-                        yaml_metadata['name'] = value
-                        logger.debug(f"Converting dataset_name '{value}' to name field")
-                    elif key != 'id':  # Skip id field
-                        yaml_metadata[key] = value
+            # Convert metadata to cloud YAML format (dataset_name -> name, no id)
+            yaml_metadata = cloud_metadata(self.metadata)
+
+            # We do NOT rename the folder when the dataset name changes
+            # The folder name (ID) is permanent to preserve links and avoid conflicts
+            new_folder_path = self.dataset_id
 
-                yaml.dump(yaml_metadata, tmp, sort_keys=False, allow_unicode=True)
-                tmp_path = tmp.name
-                logger.debug(f"Created temp file: {tmp_path}")
+            # Queue the upload; the outbox merges it with concurrent server changes
+            outbox = get_outbox()
+            outbox.enqueue_put(new_folder_path, yaml_metadata, base=cloud_metadata(self.original_metadata))
 
+            # Extract fields
+            name = self.metadata.get('dataset_name') or self.metadata.get('name', new_folder_path)
 
+            # Update fast search index for cloud dataset right away
             try:
-                # We do NOT rename the folder when the dataset name changes
-                # The folder name (ID) is permanent to preserve links and avoid conflicts
-                # new_name = self.metadata.get('dataset_name') or self.metadata.get('name')
-
-                # Always use the original dataset_id as the folder path
-                new_folder_path = self.dataset_id
-
-                # Upload metadata.yaml to the folder
-                remote_path = f"{new_folder_path}/metadata.yaml"
-                logger.info(f"Uploading to: {remote_path}")
-
-                storage.upload(Path(tmp_path), remote_path)
-
-                logger.info(f"✓ Successfully uploaded {remote_path}")
-
-                # Update fast search index for cloud dataset
-                try:
-                    from hei_datahub.services.index_service import get_index_service
-
-                    index_service = get_index_service()
-
-                    # Extract fields
-                    name = self.metadata.get('dataset_name') or self.metadata.get('name', new_folder_path)
-                    description = self.metadata.get('description', '')
-                    tags_list = self.metadata.get('tags', [])
-                    tags = " ".join(tags_list) if isinstance(tags_list, list) else str(tags_list)
-                    used_in_projects = self.metadata.get('used_in_projects', [])
-                    project = ", ".join(used_in_projects) if used_in_projects else None
-
-                    logger.info(f"Updating index for '{new_folder_path}': name='{name}', description='{description[:50]}...'")
-
-                    index_service.upsert_item(
-                        path=new_folder_path,  # Use new folder path
-                        name=name,
-                        project=project,
-                        tags=tags,
-                        description=description,
-                        format=self.metadata.get('file_format'),
-                        source=self.metadata.get('source'),
-                        category=self.metadata.get('category'),
-                        spatial_coverage=self.metadata.get('spatial_coverage'),
-                        temporal_coverage=self.metadata.get('temporal_coverage'),
-                        access_method=self.metadata.get('access_method'),
-                        storage_location=self.metadata.get('storage_location'),
-                        reference=self.metadata.get('reference'),
-                        spatial_resolution=self.metadata.get('spatial_resolution'),
-                        temporal_resolution=self.metadata.get('temporal_resolution'),
-                        size=self.metadata.get('size'),
-                        is_remote=True,
-                    )
-                    logger.info(f"✓ Search index updated successfully for '{new_folder_path}'")
-                except Exception as idx_err:
-                    logger.warning(f"Failed to update search index: {idx_err}")
-
-                self.app.call_from_thread(
-                    self.app.notify,
-                    f"✓ Dataset '{name}' updated in cloud!",
-                    timeout=5
+                from hei_datahub.services.index_service import get_index_service
+
+                index_service = get_index_service()
+
+                description = self.metadata.get('description', '')
+                tags_list = self.metadata.get('tags', [])
+                tags = " ".join(tags_list) if isinstance(tags_list, list) else str(tags_list)
+                used_in_projects = self.metadata.get('used_in_projects', [])
+                project = ", ".join(used_in_projects) if used_in_projects else None
+
+                logger.info(f"Updating index for '{new_folder_path}': name='{name}', description='{description[:50]}...'")
+
+                index_service.upsert_item(
+                    path=new_folder_path,  # Use new folder path
+                    name=name,
+                    project=project,
+                    tags=tags,
+                    description=description,
+                    format=self.metadata.get('file_format'),
+                    source=self.metadata.get('source'),
+                    category=self.metadata.get('category'),
+                    spatial_coverage=self.metadata.get('spatial_coverage'),
+                    temporal_coverage=self.metadata.get('temporal_coverage'),
+                    access_method=self.metadata.get('access_method'),
+                    storage_location=self.metadata.get('storage_location'),
+                    reference=self.metadata.get('reference'),
+                    spatial_resolution=self.metadata.get('spatial_resolution'),
+                    temporal_resolution=self.metadata.get('temporal_resolution'),
+                    size=self.metadata.get('size'),
+                    is_remote=True,
                 )
+                logger.info(f"✓ Search index updated successfully for '{new_folder_path}'")
+            except Exception as idx_err:
+                logger.warning(f"Failed to update search index: {idx_err}")
+
+            self.app.call_from_thread(
+                self.app.notify,
+                f"✓ Dataset '{name}' saved, uploading in the background",
+                timeout=5
+            )
 
-                # Close form and refresh details
-                self.app.call_from_thread(self.app.pop_screen)
+            # Close form and refresh details
+            self.app.call_from_thread(self.app.pop_screen)
 
-                # Refresh the parent CloudDatasetDetailsScreen
-                def refresh_parent():
-                    # Small delay to ensure index cache is cleared
-                    import time
+            # Refresh the parent CloudDatasetDetailsScreen
+            def refresh_parent():
+                # Small delay to ensure index cache is cleared
+                import time
 
-                    from .home import HomeScreen
-                    time.sleep(0.1)
+                from .home import HomeScreen
+                time.sleep(0.1)
 
-                    logger.info(f"Screen stack has {len(self.app.screen_stack)} screens")
-                    for i, screen in enumerate(self.app.screen_stack):
-                        logger.info(f"  [{i}] {type(screen).__name__}")
+                logger.info(f"Screen stack has {len(self.app.screen_stack)} screens")
+                for i, screen in enumerate(self.app.screen_stack):
+                    logger.info(f"  [{i}] {type(screen).__name__}")
 
-                    for screen in self.app.screen_stack:
-                        if isinstance(screen, CloudDatasetDetailsScreen) and screen.dataset_id == self.dataset_id:
-                            # Directly update metadata from what we just saved (no fetch needed)
-                            logger.info(f"Refreshing CloudDatasetDetailsScreen for {self.dataset_id} with saved data")
+                for screen in self.app.screen_stack:
+                    if isinstance(screen, CloudDatasetDetailsScreen) and screen.dataset_id == self.dataset_id:
+                        # Directly update metadata from what we just saved (no fetch needed)
+                        logger.info(f"Refreshing CloudDatasetDetailsScreen for {self.dataset_id} with saved data")
 
-                            # Update global cache
-                            update_metadata_cache(self.dataset_id, yaml_metadata)
+                        # Update global cache
+                        update_metadata_cache(self.dataset_id, yaml_metadata)
 
-                            # Update screen directly
-                            screen.metadata = yaml_metadata
-                            screen._display_metadata()
-                            break
+                        # Update screen directly
+                        screen.metadata = yaml_metadata
+                        screen._display_metadata()
+                        break
 
-                    # Also refresh the HomeScreen table to show updated name (force cache clear)
-                    home_found = False
-                    for screen in self.app.screen_stack:
-                        if isinstance(screen, HomeScreen):
-                            logger.info("✓ Found HomeScreen, refreshing table with updated dataset (force refresh)")
-                            screen.load_all_datasets(force_refresh=True)
-                            home_found = True
-                            break
+                # Also refresh the HomeScreen table to show updated name (force cache clear)
+                home_found = False
+                for screen in self.app.screen_stack:
+                    if isinstance(screen, HomeScreen):
+                        logger.info("✓ Found HomeScreen, refreshing table with updated dataset (force refresh)")
+                        screen.load_all_datasets(force_refresh=True)
+                        home_found = True
+                        break
 
-                    if not home_found:
-                        logger.warning("✗ HomeScreen not found in screen stack!")
+                if not home_found:
+                    logger.warning("✗ HomeScreen not found in screen stack!")
 
-                self.app.call_from_thread(refresh_parent)
+            self.app.call_from_thread(refresh_parent)
 
-            finally:
-                # Cleanup temp file
-                if tmp_path and os.path.exists(tmp_path):
-                    os.unlink(tmp_path)
-                    logger.debug(f"Cleaned up temp file: {tmp_path}")
+            outbox.flush_in_background()
 
         except Exception as e:
-            logger.error(f"Error uploading to cloud: {e}", exc_info=True)
+            logger.error(f"Error saving dataset: {e}", exc_info=True)
             self.app.call_from_thread(
                 self.app.notify,
-                f"Error uploading to cloud: {str(e)}",
+                f"Error saving dataset: {str(e)}",
                 severity="error",
                 timeout=5
             )
-            import traceback
-            traceback.print_exc()
 
     def action_cancel_edits(self) -> None:
         """Cancel editing and discard changes (Esc)."""
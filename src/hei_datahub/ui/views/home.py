@@ -11,6 +11,7 @@ from textual.reactive import reactive
 from textual.screen import Screen
 from textual.binding import Binding
 from textual.timer import Timer
+from rich.text import Text
 from textual.widgets import (
     DataTable,
     Footer,
@@ -29,6 +30,9 @@ from textual import events
 
 logger = logging.getLogger(__name__)
 
+# Index events arriving within this window are applied as one table update
+INDEX_EVENT_COALESCE_SEC = 0.1
+
 
 class HomeScreen(Screen):
     """Main screen with search functionality and Neovim-style navigation."""
@@ -53,6 +57,9 @@ class HomeScreen(Screen):
     # Track if update badge is shown
     _update_badge_shown: bool = False
 
+    # Rows rendered from the persisted index before this session's first sync
+    _stale_rows_shown: bool = False
+
     def compose(self) -> ComposeResult:
         from hei_datahub.ui.assets.loader import get_logo_widget_text
 
@@ -75,6 +82,14 @@ class HomeScreen(Screen):
                     id="update-badge",
                     classes="hidden"
                 ),
+                Container(
+                    Static(
+                        "⚠ [yellow]Offline[/yellow] • [dim]showing indexed data, reconnecting…[/dim]",
+                        id="offline-indicator-text"
+                    ),
+                    id="offline-indicator",
+                    classes="hidden"
+                ),
                 id="hero-section"
             ),
 
@@ -98,7 +113,9 @@ class HomeScreen(Screen):
     def on_mount(self) -> None:
         """Set up the screen when mounted."""
         table = self.query_one("#results-table", DataTable)
-        table.add_columns("Category", "Name", "Description", "Spatial Info", "Temporal Info", "Format")
+        self._column_keys = table.add_columns(
+            "Category", "Name", "Description", "Spatial Info", "Temporal Info", "Format"
+        )
         table.cursor_type = "row"
         table.show_row_labels = False
 
@@ -115,6 +132,18 @@ class HomeScreen(Screen):
         # Check for cached update state and show badge if update available
         self._check_cached_update_state()
 
+        # Show the offline indicator if storage is already known to be unreachable
+        self.update_heibox_status()
+
+        # Apply index changes as the background indexer publishes them
+        self._subscribe_index_events()
+
+    def on_unmount(self) -> None:
+        """Stop listening to index events when the screen goes away."""
+        from hei_datahub.services.index_events import get_event_bus
+
+        get_event_bus().unsubscribe(self._on_index_event)
+
     def _check_cached_update_state(self) -> None:
         """Check cached update state and show badge only if the cached
         latest version is genuinely newer than the *running* version."""
@@ -184,6 +213,19 @@ class HomeScreen(Screen):
         except Exception:
             pass
 
+    def update_heibox_status(self) -> None:
+        """Show or hide the offline indicator from the storage circuit breaker."""
+        from hei_datahub.services.circuit_breaker import is_offline
+
+        try:
+            indicator = self.query_one("#offline-indicator")
+            if is_offline():
+                indicator.remove_class("hidden")
+            else:
+                indicator.add_class("hidden")
+        except Exception as e:
+            logger.debug(f"Could not update offline indicator: {e}")
+
     def on_screen_resume(self) -> None:
         """Called when returning to this screen from a pushed screen."""
         table = self.query_one("#results-table", DataTable)
@@ -211,10 +253,9 @@ class HomeScreen(Screen):
              # We have a search query, restore search results
              self.perform_search(query)
         else:
-             # Load immediately - show what we have even if indexer not ready
+             # Load immediately - show what we have even if indexer not ready;
+             # index events fill in the rest as they arrive
              self.load_all_datasets()
-             # Set up a very fast timer to reload when indexer finishes (100ms checks)
-             self.set_interval(0.1, self._check_indexer_and_reload, name="indexer_check")
 
         # Focus results table if there are results AND it is visible, otherwise search bar
         results_wrapper = self.query_one("#results-wrapper")
@@ -274,78 +315,206 @@ class HomeScreen(Screen):
         except Exception:
             pass  # Footer not mounted yet
 
-    def _check_indexer_and_reload(self) -> None:
-        """Check if indexer is ready and add new datasets incrementally.
+    def _subscribe_index_events(self) -> None:
+        """Subscribe to index events from the background indexer."""
+        import asyncio
+        import threading
+
+        from hei_datahub.services.index_events import get_event_bus
 
-        NOTE: This should ONLY run when showing all datasets, NOT during search!
+        self._event_loop = asyncio.get_running_loop()
+        self._event_lock = threading.Lock()
+        self._pending_indexed: set[str] = set()
+        self._pending_removed: set[str] = set()
+        self._pending_progress = None
+        self._pending_finished = None
+        self._flush_scheduled = False
+
+        get_event_bus().subscribe(self._on_index_event)
+
+    def _on_index_event(self, event) -> None:
+        """Queue an index event for the next coalesced table update.
+
+        Called on the publisher's thread, so it only records the change and
+        hands a single flush over to the UI event loop per burst.
         """
-        # Get current search query to check if we're in search mode
+        from hei_datahub.services.index_events import (
+            IndexProgress,
+            ItemsIndexed,
+            ItemsRemoved,
+            SyncFinished,
+        )
+
+        with self._event_lock:
+            if isinstance(event, ItemsIndexed):
+                self._pending_indexed.update(event.paths)
+                self._pending_removed.difference_update(event.paths)
+            elif isinstance(event, ItemsRemoved):
+                self._pending_removed.update(event.paths)
+                self._pending_indexed.difference_update(event.paths)
+            elif isinstance(event, IndexProgress):
+                self._pending_progress = event
+            elif isinstance(event, SyncFinished):
+                self._pending_finished = event
+
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
+
+        try:
+            self._event_loop.call_soon_threadsafe(self._schedule_index_flush)
+        except RuntimeError:
+            # Event loop already closed (app shutting down)
+            pass
+
+    def _schedule_index_flush(self) -> None:
+        """Delay the flush briefly so a burst of events becomes one update."""
+        self.set_timer(INDEX_EVENT_COALESCE_SEC, self._flush_index_events)
+
+    def _flush_index_events(self) -> None:
+        """Apply queued index events to the results table.
+
+        NOTE: Rows are only touched when showing all datasets, NOT during search!
+        The end of a sync is applied either way, so rows shown later are not
+        left marked as cached.
+        """
+        with self._event_lock:
+            indexed = self._pending_indexed
+            removed = self._pending_removed
+            progress = self._pending_progress
+            finished = self._pending_finished
+            self._pending_indexed = set()
+            self._pending_removed = set()
+            self._pending_progress = None
+            self._pending_finished = None
+            self._flush_scheduled = False
+
+        # The first successful sync confirms every cached row
+        confirmed = finished is not None and finished.error is None and self._stale_rows_shown
+        if confirmed:
+            self._stale_rows_shown = False
+
         search_input = self.query_one("#search-input", Input)
         if search_input.value and search_input.value.strip():
             # We're in search mode - DO NOT add datasets
-            logger.debug("Timer skipped: in search mode")
+            logger.debug("Index row updates skipped: in search mode")
             return
 
-        from hei_datahub.services.fast_search import get_all_indexed
+        from hei_datahub.services.fast_search import get_indexed_by_paths
         from hei_datahub.services.indexer import get_indexer
 
-        indexer = get_indexer()
         table = self.query_one("#results-table", DataTable)
         label = self.query_one("#results-label", Label)
 
-        # Get current datasets from index
-        results = get_all_indexed()
-        cloud_results = [r for r in results if r.get("metadata", {}).get("is_remote", False)]
-
-        # Get existing row keys to check what's already displayed
-        existing_keys = set()
-        for row_key in table.rows.keys():
-            existing_keys.add(row_key.value)  # Use .value to get actual key string
-
-        # Add only NEW datasets that aren't already in the table
-        for result in cloud_results:
-            if result["id"] not in existing_keys:
-                # New dataset found - add it to the table immediately
-                display_name = result["name"]
-                snippet = result.get("snippet", "")
-                if not snippet or snippet.strip() == "":
-                    description = result.get("metadata", {}).get("description", "No description")
-                    snippet = description[:30] + "..." if len(description) > 30 else description
-                else:
-                    snippet = snippet.replace("<b>", "").replace("</b>", "")
-                    snippet = snippet[:30] + "..." if len(snippet) > 30 else snippet
+        for path in removed:
+            if path in table.rows:
+                table.remove_row(path)
 
-                meta = result.get("metadata", {})
-                s_cov = meta.get("spatial_coverage") or "N/A"
-                s_res = meta.get("spatial_resolution")
-                s_info = f"{s_cov} ({s_res})" if s_res else s_cov
+        if indexed:
+            results = get_indexed_by_paths(sorted(indexed))
+            for result in results:
+                if not result.get("metadata", {}).get("is_remote", False):
+                    continue
+                self._upsert_row(table, result)
+            logger.debug(f"Applied index events: {len(results)} updated, {len(removed)} removed")
 
-                t_cov = meta.get("temporal_coverage") or "N/A"
-                t_res = meta.get("temporal_resolution")
-                t_info = f"{t_cov} ({t_res})" if t_res else t_cov
+        if confirmed:
+            paths = [row_key.value for row_key in table.rows]
+            for result in get_indexed_by_paths(paths):
+                self._upsert_row(table, result)
 
-                table.add_row(
-                    meta.get("category") or "N/A",
-                    display_name[:25],
-                    snippet,
-                    s_info[:40],
-                    t_info[:40],
-                    meta.get("file_format") or "N/A",
-                    key=result["id"],
-                )
-                logger.info(f"Timer added dataset to table: {display_name}")
+        if table.row_count > 0:
+            self._record_first_results()
 
         # Update label with progress
-        if not indexer.is_ready():
-            label.update("🔄 Loading...")
+        indexer = get_indexer()
+        if progress is not None and finished is None and not indexer.is_ready():
+            label.update(
+                f"🔄 Loading cloud datasets... ☁️ {progress.done} of {progress.total} datasets"
+            )
         else:
-            label.update(f"☁️ Cloud Datasets ({len(cloud_results)} total)")
-            # Stop timer once indexer is done
-            try:
-                self.remove_timer("indexer_check")
-                logger.info(f"Indexing complete - {table.row_count} datasets")
-            except Exception:
-                pass
+            self._update_results_label(table.row_count)
+
+    def _upsert_row(self, table: DataTable, result: dict) -> None:
+        """Add a dataset row or refresh its cells in place."""
+        cells = self._result_cells(result)
+        if result["id"] in table.rows:
+            for column_key, value in zip(self._column_keys, cells):
+                table.update_cell(result["id"], column_key, value)
+        else:
+            table.add_row(*cells, key=result["id"])
+
+    def _update_results_label(self, count: int) -> None:
+        """Show the dataset count and whether it comes from a stale cache."""
+        from hei_datahub.services.indexer import get_indexer
+
+        label = self.query_one("#results-label", Label)
+        indexer = get_indexer()
+
+        if count == 0 and not indexer.is_ready():
+            label.update("🔄 Loading cloud datasets... ☁️ 0 of ? datasets")
+        elif count == 0:
+            label.update("☁️ No cloud datasets found - Add one with Ctrl+A")
+        elif self._stale_rows_shown:
+            label.update(f"☁️ Cloud Datasets ({count} total) · cached, may be out of date")
+        else:
+            label.update(f"☁️ Cloud Datasets ({count} total)")
+
+    def _record_first_results(self) -> None:
+        """Record time-to-first-results once, after the rows are painted."""
+        start = "warm" if self._stale_rows_shown else "cold"
+
+        def _record() -> None:
+            from hei_datahub.services.metrics import get_metrics
+
+            metrics = get_metrics()
+            elapsed = metrics.since("startup", clear=True)
+            if elapsed is None:
+                return
+            metrics.observe("startup.time_to_first_results_ms", elapsed)
+            logger.info(f"Time to first results: {elapsed:.0f} ms ({start} start)")
+
+        self.call_after_refresh(_record)
+
+    def _result_cells(self, result: dict, stale: bool = False) -> tuple:
+        """Build the results table cells for one indexed dataset.
+
+        Stale rows (loaded from the cache, not yet confirmed by a sync)
+        are dimmed.
+        """
+        # Get description from metadata or use snippet
+        snippet = result.get("snippet", "")
+        if not snippet or snippet.strip() == "":
+            # Use description from metadata if snippet is empty
+            description = result.get("metadata", {}).get("description") or "No description"
+            snippet = description[:30] + "..." if len(description) > 30 else description
+        else:
+            # Clean snippet of HTML tags for display
+            snippet = snippet.replace("<b>", "").replace("</b>", "")
+            snippet = snippet[:30] + "..." if len(snippet) > 30 else snippet
+
+        display_name = result["name"]  # Use metadata name, not folder path
+
+        meta = result.get("metadata", {})
+        s_cov = meta.get("spatial_coverage") or "N/A"
+        s_res = meta.get("spatial_resolution")
+        s_info = f"{s_cov} ({s_res})" if s_res else s_cov
+
+        t_cov = meta.get("temporal_coverage") or "N/A"
+        t_res = meta.get("temporal_resolution")
+        t_info = f"{t_cov} ({t_res})" if t_res else t_cov
+
+        cells = (
+            meta.get("category") or "N/A",
+            display_name[:25],
+            snippet,
+            s_info[:40],
+            t_info[:40],
+            meta.get("file_format") or "N/A",
+        )
+        if stale:
+            return tuple(Text(cell, style="dim") for cell in cells)
+        return cells
 
     def _setup_search_autocomplete(self) -> None:
         """Setup autocomplete suggester for search input."""
@@ -432,12 +601,6 @@ class HomeScreen(Screen):
         table = self.query_one("#results-table", DataTable)
         table.clear()
 
-        # Stop any existing indexer check timer
-        try:
-            self.remove_timer("indexer_check")
-        except Exception:
-            pass
-
         try:
             # Force cache clear if requested (e.g., after edit)
             if force_refresh:
@@ -457,57 +620,22 @@ class HomeScreen(Screen):
             cloud_results = [r for r in results if r.get("metadata", {}).get("is_remote", False)]
             logger.info(f"After filtering for remote: {len(cloud_results)} cloud datasets")
 
-            label = self.query_one("#results-label", Label)
-
-            # Show indexer status if warming
+            # Warm start: rows from the persisted index show on the first
+            # frame, dimmed until this session's first sync confirms them
             from hei_datahub.services.indexer import get_indexer
-            indexer = get_indexer()
-            if not indexer.is_ready():
-                label.update("🔄 Loading cloud datasets... ☁️ 0 of ? datasets")
-                # Don't populate table yet - timer will do it incrementally
-                return
-            elif len(cloud_results) == 0:
-                label.update("☁️ No cloud datasets found - Add one with Ctrl+A")
-            else:
-                label.update(f"☁️ Cloud Datasets ({len(cloud_results)} total)")
+            stale = bool(cloud_results) and not get_indexer().is_synced()
+            self._stale_rows_shown = stale
 
+            # Index events append, update or remove rows while the indexer runs
             for result in cloud_results:
-                # Get description from metadata or use snippet
-                snippet = result.get("snippet", "")
-                if not snippet or snippet.strip() == "":
-                    # Use description from metadata if snippet is empty
-                    description = result.get("metadata", {}).get("description", "No description")
-                    snippet = description[:30] + "..." if len(description) > 30 else description
-                else:
-                    # Clean snippet of HTML tags for display
-                    snippet = snippet.replace("<b>", "").replace("</b>", "")
-                    snippet = snippet[:30] + "..." if len(snippet) > 30 else snippet
-
-                # All datasets are cloud now, but keep the indicator
-                name_prefix = "☁️ "
-                display_name = result["name"]  # Use metadata name, not folder path
-
-                meta = result.get("metadata", {})
-                s_cov = meta.get("spatial_coverage") or "N/A"
-                s_res = meta.get("spatial_resolution")
-                s_info = f"{s_cov} ({s_res})" if s_res else s_cov
-
-                t_cov = meta.get("temporal_coverage") or "N/A"
-                t_res = meta.get("temporal_resolution")
-                t_info = f"{t_cov} ({t_res})" if t_res else t_cov
-
                 table.add_row(
-                    meta.get("category") or "N/A",
-                    display_name[:25],
-                    snippet,
-                    s_info[:40],
-                    t_info[:40],
-                    meta.get("file_format") or "N/A",
+                    *self._result_cells(result, stale=stale),
                     key=result["id"],  # Use folder path as internal key
                 )
 
-            # Restart the indexer check timer for incremental updates (only when showing all datasets)
-            self.set_interval(0.1, self._check_indexer_and_reload, name="indexer_check")
+            self._update_results_label(len(cloud_results))
+            if cloud_results:
+                self._record_first_results()
 
         except Exception as e:
             logger.error(f"Error loading datasets from index: {e}", exc_info=True)
@@ -658,23 +786,11 @@ class HomeScreen(Screen):
         import re
         stripped = re.sub(r'[^a-zA-Z0-9]', '', query)
         if not stripped:
-            # Stop indexer timer so it doesn't refill the table behind the tip
-            try:
-                self.remove_timer("indexer_check")
-            except Exception:
-                pass
             label = self.query_one("#results-label", Label)
             label.update("💡 Type a keyword to search (e.g. dataset name, tag, or use [italic]`all`[/italic] to list everything)")
             return
 
         try:
-            # Stop the indexer check timer during search to prevent interference
-            try:
-                self.remove_timer("indexer_check")
-                logger.info("✓ Stopped indexer_check timer during search")
-            except Exception as e:
-                logger.debug(f"Could not remove timer (may not exist): {e}")
-
             # Update filter badges
             self._update_filter_badges(query)
 
@@ -706,40 +822,11 @@ class HomeScreen(Screen):
                 return
 
             for result in cloud_results:
-                # Get description from metadata or use snippet
-                snippet = result.get("snippet", "")
-                if not snippet or snippet.strip() == "":
-                    # Use description from metadata if snippet is empty
-                    description = result.get("metadata", {}).get("description", "No description")
-                    snippet = description[:30] + "..." if len(description) > 30 else description
-                else:
-                    # Clean snippet of HTML tags for display
-                    snippet = snippet.replace("<b>", "").replace("</b>", "")
-                    snippet = snippet[:30] + "..." if len(snippet) > 30 else snippet
-
-                # All datasets are cloud now
-                name_prefix = "☁️ "
-                display_name = result["name"]  # Use metadata name, not folder path
-
-                meta = result.get("metadata", {})
-                s_cov = meta.get("spatial_coverage") or "N/A"
-                s_res = meta.get("spatial_resolution")
-                s_info = f"{s_cov} ({s_res})" if s_res else s_cov
-
-                t_cov = meta.get("temporal_coverage") or "N/A"
-                t_res = meta.get("temporal_resolution")
-                t_info = f"{t_cov} ({t_res})" if t_res else t_cov
-
                 table.add_row(
-                    meta.get("category") or "N/A",
-                    display_name[:25],
-                    snippet,
-                    s_info[:40],
-                    t_info[:40],
-                    meta.get("file_format") or "N/A",
+                    *self._result_cells(result),
                     key=result["id"],  # Use folder path as internal key
                 )
-                logger.info(f"Added to table: {display_name}")
+                logger.info(f"Added to table: {result['name']}")
 
             logger.info(f"Search complete. Final table row count: {table.row_count}")
             # Don't steal focus from search input
@@ -1319,10 +1406,13 @@ class HomeScreen(Screen):
 
 
     def action_refresh_data(self) -> None:
-        """Refresh/reload all datasets."""
-        self.notify("Refreshing datasets...", timeout=2)
+        """Reload datasets from the index and ask for a cloud sync now."""
+        from hei_datahub.services.indexer import get_indexer
+
         self.load_all_datasets()
-        self.notify("✓ Datasets refreshed", timeout=3)
+        # Repeated presses are coalesced into one sync by the scheduler
+        get_indexer().request_sync()
+        self.notify("🔄 Syncing with cloud...", timeout=3)
 
     def action_debug_console(self) -> None:
         """Open debug console (: key)."""
@@ -6,7 +6,7 @@ import logging
 from textual import work
 from textual.app import App
 from textual.binding import Binding
-from textual.events import Resize
+from textual.events import AppBlur, AppFocus, Event, Key, MouseDown, Resize
 from textual.reactive import reactive
 
 from hei_datahub.infra.db import ensure_database
@@ -43,6 +43,67 @@ class DataHubApp(App):
         else:
             self.remove_class("compact-layout")
 
+    async def on_event(self, event: Event) -> None:
+        """Track user input so background syncs pause while the terminal is idle."""
+        if isinstance(event, (Key, MouseDown)):
+            from hei_datahub.services.indexer import get_indexer
+            get_indexer().scheduler.note_activity()
+        await super().on_event(event)
+
+    def on_app_blur(self, event: AppBlur) -> None:
+        """Pause scheduled syncs while the terminal is in the background."""
+        from hei_datahub.services.indexer import get_indexer
+        get_indexer().scheduler.pause("blur")
+
+    def on_app_focus(self, event: AppFocus) -> None:
+        """Resume scheduled syncs when the terminal regains focus."""
+        from hei_datahub.services.indexer import get_indexer
+        get_indexer().scheduler.resume("blur")
+
+    def _follow_sync_daemon(self) -> None:
+        """Use the sync daemon's index events instead of a local indexer."""
+        from hei_datahub.services.indexer import get_indexer
+        from hei_datahub.services.sync_daemon import DaemonEventRelay
+
+        get_indexer().follow_daemon()
+
+        def _on_daemon_lost() -> None:
+            self.call_from_thread(self._start_local_indexer)
+
+        self._daemon_relay = DaemonEventRelay(on_lost=_on_daemon_lost)
+        self._daemon_relay.start()
+        logger.info("Sync daemon detected, skipping local background indexer")
+
+    def _start_local_indexer(self) -> None:
+        """Take over indexing after the sync daemon went away."""
+        import asyncio
+
+        from hei_datahub.services.indexer import get_indexer, start_background_indexer
+
+        get_indexer().follow_daemon(False)
+        asyncio.create_task(start_background_indexer())
+        logger.info("Sync daemon stopped, started local background indexer")
+
+    def _watch_suspend_signals(self) -> None:
+        """Pause scheduled syncs while the app is suspended (Ctrl+Z)."""
+        from hei_datahub.services.indexer import get_indexer
+        scheduler = get_indexer().scheduler
+
+        # Suspend/resume signals only exist in newer Textual releases
+        suspend_signal = getattr(self, "app_suspend_signal", None)
+        resume_signal = getattr(self, "app_resume_signal", None)
+        if suspend_signal is None or resume_signal is None:
+            return
+
+        def _on_suspend(*_) -> None:
+            scheduler.pause("suspended")
+
+        def _on_resume(*_) -> None:
+            scheduler.resume("suspended")
+
+        suspend_signal.subscribe(self, _on_suspend)
+        resume_signal.subscribe(self, _on_resume)
+
     def action_commands(self) -> None:
         """Open the custom command palette."""
         from hei_datahub.ui.widgets.command_palette import CustomCommandPalette
@@ -103,6 +164,11 @@ class DataHubApp(App):
         except Exception as e:
             self.notify(f"Error opening settings: {e}", severity="error")
 
+    def action_show_outbox(self) -> None:
+        """Show dataset changes waiting to be sent to Heibox (Global)."""
+        from hei_datahub.ui.views.outbox import OutboxScreen
+        self.push_screen(OutboxScreen())
+
     def on_mount(self) -> None:
         """Initialize the app."""
         # Check initial size for compact mode
@@ -126,45 +192,47 @@ class DataHubApp(App):
         # Load user configuration
         self._load_config()
 
-        # Ensure database is set up
+        # Ensure database is set up. The home screen renders straight from the
+        # persisted search index; the legacy store is only reindexed on demand
+        # (`hei-datahub reindex`), never on the startup path.
         try:
             ensure_database()
-
-            # Check if we need to do initial indexing
-            from hei_datahub.infra.index import reindex_all
-            from hei_datahub.infra.store import list_datasets
-
-            datasets = list_datasets()
-            if datasets:
-                # Reindex on startup to ensure consistency
-                count, errors = reindex_all()
-                if errors:
-                    self.notify(f"Indexed {count} datasets with {len(errors)} errors", severity="warning", timeout=5)
         except Exception as e:
             self.notify(f"Database initialization error: {str(e)}", severity="error", timeout=10)
 
         # Start background indexer (FAST - non-blocking)
         import asyncio
 
-        from hei_datahub.services.indexer import get_indexer, start_background_indexer
+        from hei_datahub.services.indexer import start_background_indexer
+        from hei_datahub.services.sync_daemon import is_daemon_running
         try:
-            # Force a fresh index on every startup for cloud datasets
-            logger.info("Forcing fresh reindex on startup")
-
-            # Reset the indexer flags to force reindexing
-            indexer = get_indexer()
-            indexer._remote_indexed = False
-            indexer._local_indexed = False
-
-            # Start the background indexer which will rebuild the index
-            asyncio.create_task(start_background_indexer())
-            logger.info("Background indexer started with forced reindex")
+            if is_daemon_running():
+                # A headless daemon keeps the shared index fresh; don't crawl twice
+                self._follow_sync_daemon()
+            else:
+                # The indexer's scheduler decides whether the cached index needs a sync
+                asyncio.create_task(start_background_indexer())
+                logger.info("Background indexer started")
+            self._watch_suspend_signals()
         except Exception as e:
             logger.warning(f"Failed to start background indexer: {e}")
 
+        # Pre-open the storage connection (TLS handshake) while the first screen renders
+        self.warmup_storage_async()
+
         # Check WebDAV/Heibox connection status (async — avoids blocking on_mount)
         self.check_heibox_connection_async()
 
+        # Switch to offline mode (and back) as soon as storage requests fail or recover
+        from hei_datahub.services.circuit_breaker import get_circuit_breaker
+        get_circuit_breaker().subscribe(self._on_storage_state)
+
+        # Report replayed changes, and send those left over from the last session
+        from hei_datahub.services.outbox import get_outbox
+        outbox = get_outbox()
+        outbox.subscribe(self._on_outbox_event)
+        outbox.flush_in_background()
+
         # Apply theme from config (safely)
         try:
             # Load theme from config, defaulting to 'gruvbox' if missing
@@ -190,13 +258,95 @@ class DataHubApp(App):
         # Startup pull prompt (async) - after screen is mounted
         self.startup_pull_check()
 
+    @work(thread=True)
+    def warmup_storage_async(self) -> None:
+        """Create the storage backend and open its first connection in a background thread."""
+        from hei_datahub.services.storage_manager import warmup_storage_backend
+
+        try:
+            warmup_storage_backend()
+        except Exception as e:
+            logger.debug(f"Storage warmup failed: {e}")
+
     @work(thread=True)
     def check_heibox_connection_async(self) -> None:
         """Check WebDAV/Heibox connection status in background thread."""
         self._do_heibox_check()
 
+    def _on_storage_state(self, state: str) -> None:
+        """Circuit breaker listener (called on whichever thread saw the change)."""
+        try:
+            self.call_from_thread(self._apply_storage_state, state)
+        except RuntimeError:
+            # Already on the app thread
+            self._apply_storage_state(state)
+
+    def _on_outbox_event(self, op, outcome: str) -> None:
+        """Outbox listener (called on the replaying thread)."""
+        if outcome == "queued":
+            return
+        try:
+            self.call_from_thread(self._apply_outbox_event, op, outcome)
+        except RuntimeError:
+            # Already on the app thread
+            self._apply_outbox_event(op, outcome)
+
+    def _apply_outbox_event(self, op, outcome: str) -> None:
+        """Tell the user how a queued change went."""
+        if outcome == "applied":
+            self.notify(f"✓ Saved to Heibox: {op.describe()}", timeout=3)
+        elif outcome == "conflict":
+            self.notify(
+                f"Not saved ({op.describe()}): {op.last_error}. Resolve it under Pending Changes (Ctrl+P)",
+                severity="warning",
+                timeout=10,
+            )
+        elif outcome == "failed":
+            self.notify(
+                f"Giving up on {op.describe()} after {op.attempts} tries: {op.last_error}",
+                severity="error",
+                timeout=10,
+            )
+
+    def _apply_storage_state(self, state: str) -> None:
+        """Update connection status and the offline indicator."""
+        from hei_datahub.services.circuit_breaker import CLOSED
+
+        online = state == CLOSED
+        if online == self.heibox_connected:
+            return
+        self.heibox_connected = online
+        if online:
+            self.notify("Heibox reachable again", timeout=3)
+            # Catch up on changes missed while offline
+            from hei_datahub.services.indexer import get_indexer
+            indexer = get_indexer()
+            if indexer.is_running():
+                indexer.request_sync()
+        else:
+            self.notify("Heibox unreachable: offline mode, showing indexed data", severity="warning", timeout=5)
+        for screen in self.screen_stack:
+            if isinstance(screen, HomeScreen):
+                screen.update_heibox_status()
+
     def _do_heibox_check(self) -> None:
         """Check WebDAV/Heibox connection status (actual logic)."""
+        from hei_datahub.services.circuit_breaker import get_circuit_breaker
+
+        breaker = get_circuit_breaker()
+        if not breaker.allow():
+            # Known unreachable: don't wait on another timeout, the breaker reports recovery
+            self.heibox_connected = False
+            return
+
+        try:
+            self._check_heibox_credentials_and_server(breaker)
+        finally:
+            # No outcome recorded (e.g. not configured): let the next check probe
+            breaker.release()
+
+    def _check_heibox_credentials_and_server(self, breaker) -> None:
+        """Look up credentials and send a quick request to the server."""
         try:
             from hei_datahub.infra.config_paths import get_config_path
 
@@ -256,9 +406,11 @@ class DataHubApp(App):
                 )
                 # Accept any non-error response (even 404 means server is reachable)
                 self.heibox_connected = response.status_code < 500
-            except requests.exceptions.RequestException:
+                breaker.record_success()
+            except requests.exceptions.RequestException as e:
                 # Network error - server not reachable
                 self.heibox_connected = False
+                breaker.record_failure(e)
 
         except Exception as e:
             logger.debug(f"Heibox connection check failed: {e}")
@@ -385,29 +537,24 @@ class DataHubApp(App):
         # 2. Check connection
         self.check_heibox_connection()
 
-        # 3. Trigger background re-index
+        # 3. Trigger background sync against the (possibly new) storage
         import asyncio
-        from hei_datahub.services.indexer import start_background_indexer
 
-        # We need to reset the indexer state correctly
-        try:
-            from hei_datahub.services.indexer import get_indexer
-            indexer = get_indexer()
-            indexer._remote_indexed = False
-            # We don't necessarily want to wipe local index, but we do want to fetch remote
-        except Exception:
-            pass
+        from hei_datahub.services.indexer import get_indexer, start_background_indexer
 
-        asyncio.create_task(start_background_indexer())
+        indexer = get_indexer()
+        if indexer.is_running() or indexer.is_following_daemon():
+            indexer.request_sync()
+        else:
+            asyncio.create_task(start_background_indexer())
 
         # 4. Refresh Home Screen (if active)
         if hasattr(self, 'screen_stack'):
             for screen in self.screen_stack:
                 if isinstance(screen, HomeScreen):
                     screen.update_heibox_status()
-                    # Force a check of the indexer which should pick up new data
-                    if hasattr(screen, '_check_indexer_and_reload'):
-                        screen._check_indexer_and_reload()
+                    # Show what is indexed now; index events stream in the new data
+                    screen.load_all_datasets()
 
     def apply_theme(self, theme_name: str) -> None:
         """
@@ -495,6 +642,11 @@ class DataHubApp(App):
 
 def run_tui():
     """Launch the TUI application."""
+    from hei_datahub.services.metrics import get_metrics
+
+    # Reference point for the time-to-first-results startup metric
+    get_metrics().mark("startup")
+
     app = DataHubApp()
     app.run()
 
@@ -0,0 +1,179 @@
+"""
+Pending changes screen: dataset changes waiting in the outbox.
+"""
+import logging
+from datetime import datetime
+
+from textual import work
+from textual.app import ComposeResult
+from textual.binding import Binding
+from textual.containers import Vertical
+from textual.screen import Screen
+from textual.widgets import DataTable, Label, Static
+
+from hei_datahub.ui.widgets.contextual_footer import ContextualFooter
+
+logger = logging.getLogger(__name__)
+
+# How often the list is re-read while the screen is open, in seconds
+REFRESH_INTERVAL_SEC = 2.0
+
+
+class OutboxScreen(Screen):
+    """List of queued dataset changes, with retry and discard."""
+
+    BINDINGS = [
+        Binding("escape", "back", "Back"),
+        Binding("s", "sync_now", "Sync now"),
+        Binding("r", "retry", "Retry"),
+        Binding("f", "force", "Overwrite server"),
+        Binding("x", "discard", "Discard"),
+        Binding("j", "cursor_down", "Down", show=False),
+        Binding("k", "cursor_up", "Up", show=False),
+    ]
+
+    CSS = """
+    OutboxScreen {
+        background: $surface;
+    }
+
+    #outbox-container {
+        height: 1fr;
+        border: round $primary 30%;
+        background: $panel;
+        margin: 1 2;
+        padding: 1 2;
+    }
+
+    #outbox-title {
+        text-style: bold;
+        color: $accent;
+        margin-bottom: 1;
+    }
+
+    #outbox-summary {
+        color: $text-muted;
+        margin-bottom: 1;
+    }
+
+    #outbox-table {
+        height: 1fr;
+    }
+    """
+
+    def compose(self) -> ComposeResult:
+        with Vertical(id="outbox-container"):
+            yield Label("󰇚 Pending changes", id="outbox-title")
+            yield Static("", id="outbox-summary")
+            yield DataTable(id="outbox-table", cursor_type="row")
+        footer = ContextualFooter()
+        footer.set_context("outbox")
+        yield footer
+
+    def on_mount(self) -> None:
+        table = self.query_one("#outbox-table", DataTable)
+        table.add_columns("ID", "Change", "Status", "Tries", "Queued", "Last error")
+        table.focus()
+        self.refresh_ops()
+        self.set_interval(REFRESH_INTERVAL_SEC, self.refresh_ops)
+
+    def refresh_ops(self) -> None:
+        """Re-read the outbox into the table (keeps the cursor row)."""
+        from hei_datahub.services.circuit_breaker import is_offline
+        from hei_datahub.services.outbox import get_outbox
+
+        table = self.query_one("#outbox-table", DataTable)
+        cursor = table.cursor_row
+        try:
+            ops = get_outbox().pending()
+        except Exception as e:
+            self.query_one("#outbox-summary", Static).update(f"[red]Could not read the outbox: {e}[/red]")
+            return
+
+        table.clear()
+        for op in ops:
+            status = op.status
+            if op.force:
+                status += " (overwrite)"
+            table.add_row(
+                op.id,
+                op.describe(),
+                status,
+                str(op.attempts),
+                datetime.fromtimestamp(op.created).strftime("%Y-%m-%d %H:%M"),
+                (op.last_error or "")[:80],
+                key=op.id,
+            )
+        if ops:
+            table.move_cursor(row=min(cursor, len(ops) - 1))
+
+        if not ops:
+            summary = "Everything is saved to Heibox."
+        elif is_offline():
+            summary = f"{len(ops)} change(s) waiting: Heibox is unreachable, they are sent when it is back."
+        else:
+            summary = f"{len(ops)} change(s) waiting to be sent."
+        self.query_one("#outbox-summary", Static).update(summary)
+
+    def _selected_id(self) -> str | None:
+        table = self.query_one("#outbox-table", DataTable)
+        if table.row_count == 0:
+            self.app.notify("No pending changes", timeout=2)
+            return None
+        return str(table.get_row_at(table.cursor_row)[0])
+
+    def action_cursor_down(self) -> None:
+        self.query_one("#outbox-table", DataTable).action_cursor_down()
+
+    def action_cursor_up(self) -> None:
+        self.query_one("#outbox-table", DataTable).action_cursor_up()
+
+    def action_back(self) -> None:
+        self.app.pop_screen()
+
+    def action_sync_now(self) -> None:
+        """Send all pending changes now, skipping backoff delays."""
+        from hei_datahub.services.outbox import get_outbox
+
+        outbox = get_outbox()
+        outbox.retry()
+        self._flush()
+        self.app.notify("Sending pending changes...", timeout=2)
+
+    def action_retry(self) -> None:
+        """Retry the selected change."""
+        from hei_datahub.services.outbox import get_outbox
+
+        op_id = self._selected_id()
+        if op_id is not None and get_outbox().retry(op_id):
+            self._flush()
+
+    def action_force(self) -> None:
+        """Retry the selected change, overwriting conflicting server changes."""
+        from hei_datahub.services.outbox import get_outbox
+
+        op_id = self._selected_id()
+        if op_id is not None and get_outbox().retry(op_id, force=True):
+            self.app.notify("Change will overwrite the server version", timeout=3)
+            self._flush()
+
+    def action_discard(self) -> None:
+        """Drop the selected change without sending it."""
+        from hei_datahub.services.outbox import get_outbox
+
+        op_id = self._selected_id()
+        if op_id is None:
+            return
+        op = get_outbox().discard(op_id)
+        if op is not None:
+            self.app.notify(f"Discarded: {op.describe()} (next sync restores the server version)", timeout=4)
+        self.refresh_ops()
+
+    @work(thread=True, exclusive=True)
+    def _flush(self) -> None:
+        """Replay the outbox and show the result."""
+        from hei_datahub.services.outbox import get_outbox
+
+        counts = get_outbox().flush()
+        logger.info(f"Outbox replay from pending changes screen: {counts}")
+        self.app.call_from_thread(self.refresh_ops)
@@ -83,6 +83,7 @@ class CustomCommandPalette(ModalScreen[str]):
             # Data
             ("Add Dataset", "add_dataset", "Ctrl+N", "Data"),
             ("Refresh", "refresh_data", "Ctrl+R", "Data"),
+            ("Pending Changes", "show_outbox", "", "Data"),
             # Navigation
             ("Settings", "settings", "Ctrl+Shift+S", "Navigation"),
             ("About", "show_about", "F1", "Navigation"),
@@ -69,7 +69,7 @@ class DebugConsoleScreen(Screen):
             with Vertical(id="output-container"):
                 yield Static("", id="command-output")
             yield Label(
-                "Available: reindex | version | logs | help",
+                "Available: reindex | version | logs | metrics | help",
                 id="help-text"
             )
 
@@ -116,6 +116,8 @@ class DebugConsoleScreen(Screen):
             return self._cmd_version()
         elif cmd == "logs":
             return self._cmd_logs(args)
+        elif cmd == "metrics":
+            return self._cmd_metrics()
         elif cmd == "clear":
             return ""
         else:
@@ -128,6 +130,7 @@ class DebugConsoleScreen(Screen):
 [yellow]reindex[/yellow]    - Rebuild search index from catalog
 [yellow]version[/yellow]    - Show version and repo info
 [yellow]logs[/yellow]       - Show recent log entries
+[yellow]metrics[/yellow]    - Show startup, sync and I/O metrics
 [yellow]clear[/yellow]      - Clear output
 [yellow]help[/yellow]       - Show this help
 
@@ -182,6 +185,61 @@ Press [bold]Escape[/bold] or [bold]Ctrl+C[/bold] to close."""
         except Exception as e:
             return f"[red]✗[/red] Error reading logs: {str(e)}"
 
+    def _cmd_metrics(self) -> str:
+        """Show collected performance metrics."""
+        from hei_datahub.services.metrics import get_metrics
+        from hei_datahub.services.storage_manager import (
+            get_breaker_stats,
+            get_coalescing_stats,
+            get_listing_cache_stats,
+            get_pool_stats,
+            get_scheduler_stats,
+        )
+
+        snapshot = get_metrics().snapshot()
+        pool_stats = get_pool_stats()
+        cache_stats = get_listing_cache_stats()
+        coalescing_stats = get_coalescing_stats()
+        scheduler_stats = get_scheduler_stats()
+        breaker_stats = get_breaker_stats()
+        if not snapshot["counters"] and not snapshot["timings"] and not pool_stats:
+            return "[yellow]⚠[/yellow] No metrics recorded yet"
+
+        output = ""
+        if snapshot["timings"]:
+            output += "[bold]Timings:[/bold]\n"
+            for name, stats in sorted(snapshot["timings"].items()):
+                output += (
+                    f"  {name}: last {stats['last']:.1f}, avg {stats['avg']:.1f}, "
+                    f"max {stats['max']:.1f} (n={stats['count']})\n"
+                )
+        if snapshot["counters"]:
+            output += "[bold]Counters:[/bold]\n"
+            for name, value in sorted(snapshot["counters"].items()):
+                output += f"  {name}: {value}\n"
+        if pool_stats:
+            output += "[bold]Connection pool:[/bold]\n"
+            for name, value in pool_stats.items():
+                output += f"  {name}: {value}\n"
+        if cache_stats:
+            output += "[bold]Listing cache:[/bold]\n"
+            for name, value in cache_stats.items():
+                output += f"  {name}: {value}\n"
+        if coalescing_stats:
+            output += "[bold]Request coalescing:[/bold]\n"
+            for name, value in coalescing_stats.items():
+                output += f"  {name}: {value}\n"
+        if scheduler_stats:
+            output += "[bold]Request scheduler:[/bold]\n"
+            for name, value in scheduler_stats.items():
+                output += f"  {name}: {value}\n"
+        if breaker_stats:
+            output += "[bold]Offline breaker:[/bold]\n"
+            for name, value in breaker_stats.items():
+                output += f"  {name}: {value}\n"
+
+        return output
+
     def action_dismiss(self) -> None:
         """Close console."""
         self.app.pop_screen()
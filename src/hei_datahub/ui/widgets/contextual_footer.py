@@ -84,6 +84,8 @@ class ContextualFooter(Widget):
         "details": [
             ("e", "Edit"),
             ("d", "Delete"),
+            ("D", "Download all"),
+            ("p", "Preview files"),
             ("o", "Open URL"),
             ("y", "Yank fields"),
             ("Esc", "Back"),
@@ -109,6 +111,13 @@ class ContextualFooter(Widget):
             ("o", "Open links"),
             ("Esc", "Back"),
         ],
+        "outbox": [
+            ("s", "Sync now"),
+            ("r", "Retry"),
+            ("f", "Overwrite server"),
+            ("x", "Discard"),
+            ("Esc", "Back"),
+        ],
     }
 
     def compose(self) -> ComposeResult:
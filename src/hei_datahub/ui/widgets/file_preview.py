@@ -0,0 +1,151 @@
+"""
+Preview of a dataset's files, read from their first bytes.
+"""
+import logging
+
+from rich.text import Text
+from textual import on, work
+from textual.app import ComposeResult
+from textual.binding import Binding
+from textual.containers import Vertical, VerticalScroll
+from textual.screen import ModalScreen
+from textual.widgets import Label, OptionList, Static
+from textual.widgets.option_list import Option
+
+logger = logging.getLogger(__name__)
+
+
+class FilePreviewScreen(ModalScreen):
+    """Lists a dataset's files and previews the selected one without downloading it."""
+
+    CSS = """
+    FilePreviewScreen {
+        align: center middle;
+        background: rgba(0, 0, 0, 0.5);
+    }
+
+    #file-preview-container {
+        width: 90%;
+        height: 85%;
+        background: $surface;
+        border: wide $accent;
+        padding: 1;
+    }
+
+    #file-preview-title {
+        color: $accent;
+        text-style: bold;
+        margin-bottom: 1;
+    }
+
+    #file-list {
+        height: 8;
+        border: none;
+        background: $surface;
+        margin-bottom: 1;
+    }
+
+    OptionList:focus {
+        border: none;
+    }
+
+    #file-preview-scroll {
+        height: 1fr;
+    }
+    """
+
+    BINDINGS = [
+        Binding("escape", "close", "Close"),
+        Binding("q", "close", "Close", show=False),
+        Binding("j", "scroll_preview_down", "Scroll Down", show=False),
+        Binding("k", "scroll_preview_up", "Scroll Up", show=False),
+    ]
+
+    def __init__(self, dataset_id: str):
+        super().__init__()
+        self.dataset_id = dataset_id
+        self._files = []
+
+    def compose(self) -> ComposeResult:
+        with Vertical(id="file-preview-container"):
+            yield Label(f"Preview: {self.dataset_id}", id="file-preview-title")
+            yield OptionList(id="file-list")
+            with VerticalScroll(id="file-preview-scroll"):
+                yield Static(Text("Listing files..."), id="file-preview")
+
+    def on_mount(self) -> None:
+        self.query_one(OptionList).focus()
+        self.load_files()
+
+    def action_close(self) -> None:
+        self.dismiss()
+
+    def action_scroll_preview_down(self) -> None:
+        self.query_one("#file-preview-scroll", VerticalScroll).scroll_down()
+
+    def action_scroll_preview_up(self) -> None:
+        self.query_one("#file-preview-scroll", VerticalScroll).scroll_up()
+
+    @work(thread=True, exclusive=True, group="file-list")
+    def load_files(self) -> None:
+        """List the dataset's files in a background thread."""
+        from hei_datahub.services.file_preview import list_files
+        from hei_datahub.services.storage_manager import get_storage_backend
+
+        try:
+            files = list_files(get_storage_backend(), self.dataset_id)
+        except Exception as e:
+            logger.warning(f"Could not list files of {self.dataset_id}: {e}")
+            self.app.call_from_thread(self._show_text, f"Could not list files: {e}")
+            return
+        self.app.call_from_thread(self._show_files, files)
+
+    def _show_files(self, files) -> None:
+        from hei_datahub.services.dataset_download import format_bytes
+
+        self._files = files
+        option_list = self.query_one(OptionList)
+        option_list.clear_options()
+        if not files:
+            self._show_text("This dataset has no files besides its metadata.")
+            return
+        prefix = f"{self.dataset_id.strip('/')}/"
+        for index, entry in enumerate(files):
+            size = format_bytes(entry.size) if entry.size is not None else "-"
+            name = entry.path.strip("/").removeprefix(prefix)
+            option_list.add_option(Option(f"{size:>10}  {name}", id=str(index)))
+        option_list.highlighted = 0
+        self._show_text("Select a file to preview it (Enter).")
+
+    @on(OptionList.OptionSelected)
+    def on_file_selected(self, event: OptionList.OptionSelected) -> None:
+        entry = self._files[int(event.option.id)]
+        self._show_text(f"Reading {entry.name}...")
+        self.load_preview(entry.path)
+
+    @work(thread=True, exclusive=True, group="file-preview")
+    def load_preview(self, remote_path: str) -> None:
+        """Peek at a file in a background thread."""
+        from hei_datahub.services.dataset_download import format_bytes
+        from hei_datahub.services.file_preview import format_preview, peek_file
+        from hei_datahub.services.storage_manager import get_storage_backend
+        from hei_datahub.services.webdav_storage import RangeNotSupportedError
+
+        try:
+            preview = peek_file(get_storage_backend(), remote_path)
+        except RangeNotSupportedError:
+            text = "The server does not support partial downloads and this file is too large to preview."
+        except Exception as e:
+            logger.warning(f"Could not preview {remote_path}: {e}")
+            text = f"Could not preview {remote_path}: {e}"
+        else:
+            read = "whole file" if preview.complete else f"first {format_bytes(preview.bytes_read)}"
+            text = "\n".join([f"({read})"] + format_preview(preview))
+        self.app.call_from_thread(self._show_text, text)
+
+    def _show_text(self, text: str) -> None:
+        try:
+            self.query_one("#file-preview", Static).update(Text(text))
+        except Exception:
+            # Screen already closed
+            pass
@@ -0,0 +1,25 @@
+"""
+Shared fixtures for the test suite.
+
+Storage tests run against the in-process fake servers in scripts/.
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[1] / "scripts"
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+
+@pytest.fixture
+def fake_webdav(tmp_path):
+    """Fake SeafDAV server serving a small synthetic library."""
+    from fake_webdav import build_library, start_fake_webdav
+
+    root = tmp_path / "library"
+    build_library(root, datasets=5, files_per_dataset=2, file_size=4096)
+    server = start_fake_webdav(root)
+    yield server
+    server.shutdown()
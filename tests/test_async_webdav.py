@@ -0,0 +1,139 @@
+"""Tests for the pooled WebDAV backend against scripts/fake_webdav.py."""
+import time
+
+import pytest
+from fake_webdav import DEFAULT_LIBRARY, DEFAULT_PASSWORD, build_library, start_fake_webdav
+
+from hei_datahub.services import async_webdav
+from hei_datahub.services.async_webdav import PooledWebDAVStorage
+from hei_datahub.services.webdav_storage import StorageError, WebDAVStorage
+
+
+@pytest.fixture
+def storage(fake_webdav, monkeypatch):
+    monkeypatch.setattr(async_webdav, "RETRY_BACKOFF_FACTOR", 0)
+    storage = PooledWebDAVStorage(
+        base_url=fake_webdav.base_url,
+        library=DEFAULT_LIBRARY,
+        username="tester",
+        password=DEFAULT_PASSWORD,
+        max_retries=2,
+        cache_ttl=0,
+    )
+    fake_webdav.reset_stats()
+    yield storage
+    storage.close()
+
+
+def test_listdir_uses_propfind(storage, fake_webdav):
+    entries = storage.listdir("")
+
+    assert [e.name for e in entries] == [f"dataset-{i:05d}" for i in range(5)]
+    assert all(e.is_dir for e in entries)
+    assert fake_webdav.stats["PROPFIND"] == 1
+
+    files = storage.listdir("dataset-00001/data")
+    assert [(e.name, e.size) for e in files] == [("part-000.bin", 4096), ("part-001.bin", 4096)]
+    assert all(e.etag for e in files)
+
+
+def test_upload_and_overwrite(storage, fake_webdav, tmp_path):
+    local = tmp_path / "notes.txt"
+    local.write_bytes(b"first version")
+    storage.upload(local, "dataset-00000/notes.txt")
+    assert (fake_webdav.root / "dataset-00000" / "notes.txt").read_bytes() == b"first version"
+
+    local.write_bytes(b"second, longer version")
+    storage.upload(local, "dataset-00000/notes.txt")
+    assert (fake_webdav.root / "dataset-00000" / "notes.txt").read_bytes() == b"second, longer version"
+    assert fake_webdav.stats["PUT"] == 2
+    assert storage.get_info("dataset-00000/notes.txt").size == len(b"second, longer version")
+
+
+def test_retries_on_503(storage, fake_webdav):
+    fake_webdav.faults.fail_next = 2
+
+    entries = storage.listdir("dataset-00002")
+
+    assert {e.name for e in entries} == {"data", "metadata.yaml"}
+    assert fake_webdav.stats["injected_errors"] == 2
+    assert fake_webdav.stats["PROPFIND"] == 3
+
+
+def test_gives_up_after_max_retries(storage, fake_webdav):
+    fake_webdav.faults.fail_next = 3
+
+    with pytest.raises(StorageError, match="503"):
+        storage.listdir("dataset-00002")
+    assert fake_webdav.stats["PROPFIND"] == 3
+
+
+def test_read_range(storage, fake_webdav):
+    payload = (fake_webdav.root / "dataset-00003" / "data" / "part-000.bin").read_bytes()
+    chunks = []
+
+    storage.read_range("dataset-00003/data/part-000.bin", 100, 299, chunks.append)
+    assert b"".join(chunks) == payload[100:300]
+
+    chunks.clear()
+    storage.read_range("dataset-00003/data/part-000.bin", 4000, None, chunks.append)
+    assert b"".join(chunks) == payload[4000:]
+    assert fake_webdav.stats["GET"] == 2
+
+
+def test_keep_alive_reuses_connections(storage, fake_webdav):
+    for i in range(5):
+        storage.listdir(f"dataset-{i:05d}")
+        storage.read_range(f"dataset-{i:05d}/metadata.yaml", 0, 9, lambda chunk: None)
+
+    assert fake_webdav.stats["connections"] == 1
+    assert storage.get_pool_stats()["reused"] == 9
+
+
+@pytest.mark.parametrize("transport", ["requests", "asyncio"])
+def test_iter_listdir_yields_before_the_listing_ends(transport, tmp_path):
+    root = tmp_path / "large"
+    build_library(root, datasets=400, files_per_dataset=0)
+    server = start_fake_webdav(root)
+    server.faults.bandwidth = 100 * 1024
+    options = dict(
+        base_url=server.base_url, library=DEFAULT_LIBRARY, username="tester", password=DEFAULT_PASSWORD, cache_ttl=5
+    )
+    storage = PooledWebDAVStorage(**options) if transport == "asyncio" else WebDAVStorage(**options)
+    try:
+        start = time.monotonic()
+        entries = storage.iter_listdir("")
+        first = next(entries)
+        first_at = time.monotonic() - start
+        names = [first.name] + [e.name for e in entries]
+        total = time.monotonic() - start
+
+        assert sorted(names) == [f"dataset-{i:05d}" for i in range(400)]
+        assert first_at < total / 4
+        # Read to the end: cached like a listdir() result
+        server.reset_stats()
+        assert [e.name for e in storage.listdir("")] == sorted(names)
+        assert server.stats["PROPFIND"] == 0
+    finally:
+        if transport == "asyncio":
+            storage.close()
+        server.shutdown()
+
+
+def test_dataset_walk_lists_nested_folders(fake_webdav):
+    from hei_datahub.services.dataset_download import DatasetDownloader
+
+    (fake_webdav.root / "dataset-00001" / "data" / "raw").mkdir()
+    fake_webdav.write("dataset-00001/data/raw/deep.bin", b"deep")
+    storage = WebDAVStorage(
+        base_url=fake_webdav.base_url, library=DEFAULT_LIBRARY, username="tester", password=DEFAULT_PASSWORD
+    )
+
+    files = DatasetDownloader(storage, connections=1)._walk("dataset-00001")
+
+    assert sorted(f.path for f in files) == [
+        "dataset-00001/data/part-000.bin",
+        "dataset-00001/data/part-001.bin",
+        "dataset-00001/data/raw/deep.bin",
+        "dataset-00001/metadata.yaml",
+    ]
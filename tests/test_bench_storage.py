@@ -0,0 +1,54 @@
+"""Smoke test for scripts/bench_storage.py against the fake WebDAV server."""
+import re
+
+import bench_storage
+import pytest
+
+EXPECTED = {
+    "full crawl": ("PROPFIND 2, GET 6, PUT 1", "5 datasets"),
+    "sync, nothing changed": ("PROPFIND 1", "0 changed"),
+    "sync, 2 changed": ("PROPFIND 2, GET 3", "2 changed"),
+    "manifest crawl, 2 stale": ("PROPFIND 2, GET 4, PUT 1", "5 datasets"),
+    "reindex command": ("PROPFIND 1, GET 5, HEAD 5", "exit code 0"),
+    "download dataset": ("PROPFIND 2, GET 3", "3 files, 0 cached"),
+    "download again, cached": ("PROPFIND 2", "3 files, 3 cached"),
+}
+
+
+def run_bench(transport, monkeypatch, capsys) -> dict[str, tuple[str, str]]:
+    argv = [
+        "bench_storage.py",
+        "--datasets", "5",
+        "--files", "2",
+        "--file-kb", "4",
+        "--latency-ms", "0",
+        "--changed", "2",
+        "--transport", transport,
+    ]
+    monkeypatch.setattr("sys.argv", argv)
+
+    assert bench_storage.main() == 0
+
+    results = {}
+    for line in capsys.readouterr().out.splitlines():
+        match = re.match(r"\s+(.+?)\s{2,}[\d.]+ ms  (.*?)  \((.*?)(?:, [\d.]+ MB/s)?\)$", line)
+        if match:
+            results[match.group(1)] = (match.group(2), match.group(3))
+    return results
+
+
+@pytest.mark.parametrize("transport", ["requests", "asyncio"])
+def test_bench_request_counts(transport, monkeypatch, capsys):
+    assert run_bench(transport, monkeypatch, capsys) == EXPECTED
+
+
+def test_bench_filesystem(monkeypatch, capsys):
+    results = run_bench("filesystem", monkeypatch, capsys)
+    assert {label: outcome for label, (_, outcome) in results.items()} == {
+        "full crawl": "5 datasets",
+        "sync, nothing changed": "0 changed",
+        "sync, 2 changed": "2 changed",
+        "manifest crawl, 2 stale": "5 datasets",
+        "reindex command": "exit code 0",
+        "download dataset": "3 files",
+    }
@@ -0,0 +1,154 @@
+"""Tests for the library change journal against scripts/fake_webdav.py."""
+import time
+
+import pytest
+from fake_webdav import DEFAULT_LIBRARY, DEFAULT_PASSWORD
+
+from hei_datahub.services import change_journal
+from hei_datahub.services.catalog_manifest import (
+    CATALOG_PATH,
+    decode_manifest,
+    folder_mtimes,
+    fresh_entries,
+    update_manifest,
+)
+from hei_datahub.services.change_journal import (
+    append_records,
+    delete_record,
+    put_record,
+    read_new_records,
+    segment_path,
+)
+from hei_datahub.services.webdav_storage import WebDAVStorage
+
+
+def make_storage(server):
+    """A client of the fake server; listings are never cached, as between syncs."""
+    return WebDAVStorage(
+        base_url=server.base_url,
+        library=DEFAULT_LIBRARY,
+        username="tester",
+        password=DEFAULT_PASSWORD,
+        cache_ttl=0,
+        coalesce_window=0,
+    )
+
+
+def put(dataset_id, name):
+    return put_record(dataset_id, 1_700_000_000, {"id": dataset_id, "dataset_name": name})
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(change_journal, "APPEND_BACKOFF_SEC", 0)
+
+
+def test_concurrent_append_to_one_segment_retries_on_412(fake_webdav):
+    first, second = make_storage(fake_webdav), make_storage(fake_webdav)
+    assert append_records(first, [put("dataset-00000", "Start")], client_id="laptop")
+
+    # The other process of the same client appends between our read and our upload
+    upload_if_match = first.upload_if_match
+    interleaved = []
+
+    def racing_upload(local_path, remote_path, etag):
+        if not interleaved:
+            interleaved.append(append_records(second, [put("dataset-00001", "Other process")], client_id="laptop"))
+        return upload_if_match(local_path, remote_path, etag)
+
+    first.upload_if_match = racing_upload
+    fake_webdav.reset_stats()
+    assert append_records(first, [put("dataset-00002", "This process")], client_id="laptop")
+
+    assert interleaved == [True]
+    assert fake_webdav.stats["PUT"] == 3  # The other process, our rejected upload, our retry
+    records, _ = read_new_records(make_storage(fake_webdav), {})
+    assert [r["id"] for r in records] == ["dataset-00000", "dataset-00001", "dataset-00002"]
+    assert len({r["gen"] for r in records}) == 1
+
+
+def test_clients_append_to_their_own_segments(fake_webdav):
+    laptop, desktop = make_storage(fake_webdav), make_storage(fake_webdav)
+    assert append_records(laptop, [put("dataset-00000", "From laptop")], client_id="laptop")
+    assert append_records(desktop, [delete_record("dataset-00001")], client_id="desktop")
+
+    segments = fake_webdav.root / change_journal.JOURNAL_FOLDER
+    assert sorted(p.name for p in segments.iterdir()) == ["desktop.jsonl", "laptop.jsonl"]
+
+    records, offsets = read_new_records(make_storage(fake_webdav), {})
+    assert {(r["op"], r["id"]) for r in records} == {("put", "dataset-00000"), ("delete", "dataset-00001")}
+    assert set(offsets) == {"desktop.jsonl", "laptop.jsonl"}
+
+
+def test_reader_fetches_only_new_bytes(fake_webdav):
+    writer, reader = make_storage(fake_webdav), make_storage(fake_webdav)
+    append_records(writer, [put("dataset-00000", "One"), put("dataset-00001", "Two")], client_id="laptop")
+    records, offsets = read_new_records(reader, {})
+    assert len(records) == 2
+
+    size = (fake_webdav.root / segment_path("laptop")).stat().st_size
+    assert offsets["laptop.jsonl"]["offset"] == size
+
+    # Nothing new: answered from the listing, no GET
+    fake_webdav.reset_stats()
+    records, offsets = read_new_records(reader, offsets)
+    assert records == [] and fake_webdav.stats["GET"] == 0
+
+    append_records(writer, [put("dataset-00002", "Three")], client_id="laptop")
+    ranges = []
+    read_range = reader.read_range
+
+    def recording_read_range(remote_path, start, end, sink, *args):
+        ranges.append(start)
+        read_range(remote_path, start, end, sink, *args)
+
+    reader.read_range = recording_read_range
+    records, offsets = read_new_records(reader, offsets)
+
+    assert [r["id"] for r in records] == ["dataset-00002"]
+    assert ranges == [size]
+    assert offsets["laptop.jsonl"]["offset"] == (fake_webdav.root / segment_path("laptop")).stat().st_size
+
+
+def test_compaction_starts_a_new_generation(fake_webdav, monkeypatch):
+    writer, reader = make_storage(fake_webdav), make_storage(fake_webdav)
+    assert update_manifest(writer, upserts={}, create=True)
+    monkeypatch.setattr(change_journal, "COMPACT_BYTES", 1024)
+
+    append_records(writer, [put("dataset-00000", "Before compaction")], client_id="laptop")
+    records, offsets = read_new_records(reader, {})
+    old_generation = offsets["laptop.jsonl"]["gen"]
+
+    # Grow the segment past COMPACT_BYTES: everything is folded into the manifest
+    for i in range(1, 20):
+        append_records(writer, [put(f"dataset-{i:05d}", "x" * 100)], client_id="laptop")
+    manifest = decode_manifest((fake_webdav.root / CATALOG_PATH).read_bytes())
+    assert "dataset-00000" in manifest
+
+    # The new generation is longer than the reader's offset, which now falls mid-line
+    segment = fake_webdav.root / segment_path("laptop")
+    while segment.stat().st_size <= offsets["laptop.jsonl"]["offset"]:
+        append_records(writer, [put("dataset-00100", "After compaction")], client_id="laptop")
+
+    records, offsets = read_new_records(reader, offsets)
+    generations = {r["gen"] for r in records}
+    assert len(generations) == 1 and old_generation not in generations
+    assert records[0]["id"] != "dataset-00000"
+    assert offsets["laptop.jsonl"] == {"gen": generations.pop(), "offset": segment.stat().st_size}
+
+
+@pytest.mark.parametrize("tz", ["UTC", "America/New_York", "Asia/Kolkata"])
+def test_folder_mtimes_do_not_depend_on_the_local_timezone(fake_webdav, monkeypatch, tz):
+    monkeypatch.setenv("TZ", tz)
+    time.tzset()
+    try:
+        storage = make_storage(fake_webdav)
+        mtimes = folder_mtimes(storage, {"dataset-00000"})
+        expected = int((fake_webdav.root / "dataset-00000").stat().st_mtime)
+        assert mtimes == {"dataset-00000": expected}
+
+        datasets = {"dataset-00000": {"mtime": expected, "metadata": {"id": "dataset-00000"}}}
+        assert fresh_entries(datasets, storage.listdir("")) == {"dataset-00000": {"id": "dataset-00000"}}
+    finally:
+        monkeypatch.undo()
+        time.tzset()
@@ -0,0 +1,33 @@
+"""Tests for the durable outbox of dataset changes."""
+import pytest
+
+from hei_datahub.services import change_journal
+from hei_datahub.services.filesystem_storage import FilesystemStorage
+from hei_datahub.services.outbox import Outbox
+
+fcntl = pytest.importorskip("fcntl")
+
+
+@pytest.fixture
+def outbox(tmp_path, monkeypatch):
+    monkeypatch.setattr(change_journal, "CLIENT_ID_FILE", tmp_path / "state" / "client-id")
+    outbox = Outbox(tmp_path / "state" / "outbox.json")
+    monkeypatch.setattr(outbox, "_mirror_changes", lambda written: None)
+    monkeypatch.setattr(outbox, "_schedule_retry", lambda ops: None)
+    return outbox
+
+
+def test_flush_waits_for_another_process(outbox, tmp_path):
+    library = tmp_path / "library"
+    library.mkdir()
+    storage = FilesystemStorage(str(library))
+    outbox.enqueue_put("dataset-a", {"id": "dataset-a", "dataset_name": "A"})
+
+    # Another process (e.g. the sync daemon) is replaying
+    with open(outbox._flush_lock_path, "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        assert outbox.flush(storage) == {"applied": 0, "conflict": 0, "failed": 0, "remaining": 1}
+        assert not (library / "dataset-a").exists()
+
+    assert outbox.flush(storage) == {"applied": 1, "conflict": 0, "failed": 0, "remaining": 0}
+    assert "dataset_name: A" in (library / "dataset-a" / "metadata.yaml").read_text()
@@ -0,0 +1,68 @@
+"""Tests for the priority lanes in front of the storage backend."""
+import pytest
+
+from hei_datahub.services.request_scheduler import (
+    BACKGROUND,
+    RequestScheduler,
+    ScheduledStorage,
+    request_priority,
+)
+
+
+class _Backend:
+    def iter_listdir(self, path=""):
+        for i in range(3):
+            yield f"{path}/entry-{i}"
+
+    def read_range(self, remote_path, start, end, sink, chunk_size=4):
+        data = bytes(range(start, end + 1))
+        for i in range(0, len(data), chunk_size):
+            sink(data[i:i + chunk_size])
+
+
+def test_read_range_throttles_after_releasing_the_slot():
+    scheduler = RequestScheduler(background_limit=1, background_kbps=1)
+    throttled = []
+
+    def throttle(priority, nbytes):
+        throttled.append((priority, nbytes, scheduler.get_stats()["background_active"]))
+
+    scheduler.throttle = throttle
+    storage = ScheduledStorage(_Backend(), scheduler)
+    chunks = []
+    with request_priority(BACKGROUND):
+        storage.read_range("dataset/file.bin", 0, 9, chunks.append)
+
+    assert b"".join(chunks) == bytes(range(10))
+    assert throttled == [(BACKGROUND, 10, 0)]
+
+
+def test_read_range_stopped_by_the_sink_is_still_charged():
+    scheduler = RequestScheduler(background_limit=1)
+    throttled = []
+    scheduler.throttle = lambda priority, nbytes: throttled.append(nbytes)
+    storage = ScheduledStorage(_Backend(), scheduler)
+
+    def sink(chunk):
+        raise EOFError
+
+    with request_priority(BACKGROUND):
+        with pytest.raises(EOFError):
+            storage.read_range("dataset/file.bin", 0, 9, sink)
+
+    assert throttled == [4]
+    assert scheduler.get_stats()["background_active"] == 0
+
+
+def test_iter_listdir_holds_no_slot_between_entries():
+    scheduler = RequestScheduler(background_limit=1)
+    storage = ScheduledStorage(_Backend(), scheduler)
+    seen = []
+    with request_priority(BACKGROUND):
+        for entry in storage.iter_listdir("dataset"):
+            # The consumer may start requests of its own class per entry
+            seen.append((entry, scheduler.try_acquire(BACKGROUND)))
+            scheduler.release(BACKGROUND)
+
+    assert seen == [(f"dataset/entry-{i}", True) for i in range(3)]
+    assert scheduler.get_stats()["background_active"] == 0
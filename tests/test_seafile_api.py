@@ -0,0 +1,143 @@
+"""Tests for the Seafile REST API backend against scripts/seafile_stub.py."""
+import socket
+import time
+
+import pytest
+from fake_webdav import DEFAULT_LIBRARY, DEFAULT_PASSWORD, build_library
+from seafile_stub import REPO_ID, start_stub
+
+from hei_datahub.services.circuit_breaker import CircuitBreaker
+from hei_datahub.services.request_scheduler import RequestScheduler, ScheduledStorage
+from hei_datahub.services.seafile_api import (
+    SeafileAPIStorage,
+    SeafileAPIUpgrade,
+    detect_seafile_api,
+)
+from hei_datahub.services.webdav_storage import StorageConnectionError, WebDAVStorage
+
+LIBRARY = "stub-library"
+TOKEN = "stub-token"
+
+
+@pytest.fixture
+def stub(tmp_path):
+    root = tmp_path / "library"
+    build_library(root, datasets=3, files_per_dataset=2, file_size=1024)
+    server = start_stub(root, library=LIBRARY, token=TOKEN)
+    yield server
+    server.shutdown()
+
+
+@pytest.fixture
+def storage(stub):
+    detected = detect_seafile_api(f"{stub.url}/seafdav", LIBRARY, TOKEN)
+    assert detected == (stub.url, REPO_ID)
+    server_url, repo_id = detected
+    stub.stats.clear()
+    return SeafileAPIStorage(
+        server_url=server_url,
+        repo_id=repo_id,
+        base_url=f"{stub.url}/seafdav",
+        library=LIBRARY,
+        username="tester",
+        password=TOKEN,
+        cache_ttl=0.05,
+        coalesce_window=0,
+    )
+
+
+def test_list_recursive_uses_one_request(storage, stub):
+    entries = storage.list_recursive("")
+
+    paths = [e.path for e in entries]
+    assert paths[:3] == ["dataset-00000", "dataset-00001", "dataset-00002"]
+    assert "dataset-00001/data/part-001.bin" in paths
+    assert len(paths) == 3 * 5
+    assert all(paths.index(p.rpartition("/")[0]) < paths.index(p) for p in paths if "/" in p)
+    assert stub.stats["dir"] == 1
+
+    data = storage.list_recursive("dataset-00002/data")
+    assert [e.path for e in data] == ["dataset-00002/data/part-000.bin", "dataset-00002/data/part-001.bin"]
+    assert all(e.size == 1024 and e.etag for e in data)
+
+
+def test_expired_listing_is_revalidated_by_oid(storage, stub):
+    first = storage.listdir("dataset-00000")
+    time.sleep(0.1)
+
+    second = storage.listdir("dataset-00000")
+    assert [e.name for e in second] == [e.name for e in first]
+    assert storage.listing_cache.revalidated == 1
+    assert stub.stats["dir"] == 2
+
+    (stub.root / "dataset-00000" / "notes.txt").write_text("changed")
+    time.sleep(0.1)
+    third = storage.listdir("dataset-00000")
+    assert "notes.txt" in {e.name for e in third}
+    assert storage.listing_cache.revalidated == 1
+    assert stub.stats["dir"] == 3
+
+
+def test_read_range_through_download_link(storage, stub):
+    payload = (stub.root / "dataset-00001" / "data" / "part-000.bin").read_bytes()
+    chunks = []
+
+    storage.read_range("dataset-00001/data/part-000.bin", 10, 109, chunks.append)
+    storage.read_range("dataset-00001/data/part-000.bin", 1000, None, chunks.append)
+
+    assert b"".join(chunks) == payload[10:110] + payload[1000:]
+    assert stub.stats["file"] == 1
+
+
+def test_detection_falls_back_to_webdav(stub, fake_webdav):
+    # Wrong token, unknown library, not a SeafDAV URL, no REST API at all
+    assert detect_seafile_api(f"{stub.url}/seafdav", LIBRARY, "wrong-token") is None
+    assert detect_seafile_api(f"{stub.url}/seafdav", "other-library", TOKEN) is None
+    assert detect_seafile_api(f"{stub.url}/dav", LIBRARY, TOKEN) is None
+    assert detect_seafile_api(fake_webdav.base_url, DEFAULT_LIBRARY, DEFAULT_PASSWORD) is None
+
+
+def test_detection_without_a_server_gives_no_verdict():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]  # Nothing listens here once closed
+
+    with pytest.raises(StorageConnectionError):
+        detect_seafile_api(f"http://127.0.0.1:{port}/seafdav", LIBRARY, TOKEN, timeout=1)
+
+
+def scheduled_webdav(stub, breaker):
+    options = dict(base_url=f"{stub.url}/seafdav", library=LIBRARY, username="tester", password=TOKEN)
+    return ScheduledStorage(WebDAVStorage(**options), RequestScheduler(), breaker), options
+
+
+def test_upgrade_switches_the_backend_in_the_background(stub):
+    storage, options = scheduled_webdav(stub, CircuitBreaker())
+
+    SeafileAPIUpgrade(storage, options).start()
+    assert isinstance(storage.backend, WebDAVStorage)  # Usable right away
+
+    deadline = time.monotonic() + 5
+    while not isinstance(storage.backend, SeafileAPIStorage) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert isinstance(storage.backend, SeafileAPIStorage)
+    assert storage.backend.repo_id == REPO_ID
+    assert [e.name for e in storage.listdir("")][:1] == ["dataset-00000"]
+    assert stub.stats["dir"] == 1
+
+
+def test_upgrade_waits_for_the_breaker_to_close(stub):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    breaker.record_failure(StorageConnectionError("offline at startup"))
+    storage, options = scheduled_webdav(stub, breaker)
+    upgrade = SeafileAPIUpgrade(storage, options)
+
+    upgrade.start()
+    assert not upgrade.done.wait(0.2)
+    assert stub.stats["ping"] == 0
+    assert type(storage.backend) is WebDAVStorage
+
+    breaker.record_success()
+    assert upgrade.done.wait(5)
+    assert isinstance(storage.backend, SeafileAPIStorage)
+    assert stub.stats["ping"] == 1
@@ -0,0 +1,65 @@
+"""Tests for request coalescing."""
+import asyncio
+
+import pytest
+
+from hei_datahub.services.single_flight import AsyncSingleFlight
+
+
+def test_concurrent_calls_share_one_request():
+    async def scenario():
+        group = AsyncSingleFlight()
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return "listing"
+
+        results = await asyncio.gather(*(group.do(("PROPFIND", "a"), fetch) for _ in range(3)))
+        return calls, results, await group.do(("PROPFIND", "a"), fetch)
+
+    calls, results, reused = asyncio.run(scenario())
+    assert calls == 1
+    assert results == [("listing", False), ("listing", True), ("listing", True)]
+    assert reused == ("listing", True)
+
+
+def test_cancelled_leader_does_not_cancel_waiters():
+    async def scenario():
+        group = AsyncSingleFlight(reuse_window=0)
+        started = asyncio.Event()
+
+        async def fetch():
+            started.set()
+            await asyncio.sleep(0.05)
+            return "listing"
+
+        leader = asyncio.ensure_future(group.do(("GET", "a"), fetch))
+        await started.wait()
+        waiter = asyncio.ensure_future(group.do(("GET", "a"), fetch))
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await waiter, group.get_stats()
+
+    result, stats = asyncio.run(scenario())
+    assert result == ("listing", True)
+    assert stats["requests"] == 1
+    assert stats["in_flight"] == 0
+
+
+def test_error_reaches_every_caller():
+    async def scenario():
+        group = AsyncSingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.01)
+            raise OSError("connection reset")
+
+        return await asyncio.gather(*(group.do(("GET", "a"), fetch) for _ in range(2)), return_exceptions=True)
+
+    errors = asyncio.run(scenario())
+    assert [str(e) for e in errors] == ["connection reset"] * 2
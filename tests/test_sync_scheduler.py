@@ -0,0 +1,62 @@
+"""Tests for the adaptive index sync scheduler."""
+import time
+
+import pytest
+
+from hei_datahub.services import sync_scheduler
+from hei_datahub.services.sync_scheduler import SYNC_ERROR_BACKOFF_SEC, SyncScheduler
+
+
+class _Meta:
+    """index_meta stand-in."""
+
+    def __init__(self, **values):
+        self.values = dict(values)
+
+    def get_meta(self, key):
+        return self.values.get(key)
+
+    def set_meta(self, key, value):
+        self.values[key] = value
+
+
+@pytest.fixture(autouse=True)
+def no_jitter(monkeypatch):
+    monkeypatch.setattr(sync_scheduler.random, "uniform", lambda low, high: high)
+
+
+def make_scheduler(meta):
+    return SyncScheduler(meta, base_interval=300, min_interval=120, max_interval=3600, idle_pause=0)
+
+
+@pytest.mark.parametrize("last_sync", [None, time.time() - 3600])
+def test_failures_back_off_from_the_latest_failure(last_sync):
+    meta = _Meta(last_sync=str(int(last_sync)) if last_sync else None)
+    scheduler = make_scheduler(meta)
+
+    waits = []
+    for _ in range(5):
+        scheduler.record_failure(OSError("offline"))
+        waits.append(scheduler.seconds_until_due())
+
+    expected = [SYNC_ERROR_BACKOFF_SEC * 2 ** i for i in range(5)]
+    assert waits == pytest.approx(expected, abs=2)
+    assert not scheduler.is_due()
+
+
+def test_backoff_survives_a_restart():
+    meta = _Meta()
+    scheduler = make_scheduler(meta)
+    for _ in range(3):
+        scheduler.record_failure(OSError("offline"))
+
+    restarted = make_scheduler(meta)
+    assert restarted.seconds_until_due() == pytest.approx(4 * SYNC_ERROR_BACKOFF_SEC, abs=2)
+
+
+def test_success_clears_the_backoff():
+    scheduler = make_scheduler(_Meta())
+    scheduler.record_failure(OSError("offline"))
+    scheduler.record_success(changes=0)
+
+    assert scheduler.seconds_until_due() == pytest.approx(450, abs=2)